@@ -9,6 +9,7 @@ from ai_scraper.providers import BaseProvider
 from ai_scraper.tools import Tool
 from ai_scraper.tools.search import search_tool
 from ai_scraper.tools.extract import extract_tool
+from ai_scraper.tools.dedup import deduplicate_contents, visible_text
 
 async def web_research_agent(
     provider: BaseProvider,
@@ -43,7 +44,15 @@ async def web_research_agent(
             "content": content
         })
     
-    # Step 3: Generate a summary using the provider
+    # Step 3: Drop mirrors and syndicated copies before prompting. Whole pages
+    # come back as HTML; compare their text, not their (shared) templates.
+    contents, dedup_report = deduplicate_contents(
+        contents,
+        get_text=lambda item: (visible_text(item["content"]["text"]) if item["content"].get("text")
+                               else "\n".join(item["content"].get("texts", [])))
+    )
+    
+    # Step 4: Generate a summary using the provider
     summary_prompt = f"""
     I've researched the following query: "{query}"
     
@@ -61,6 +70,8 @@ async def web_research_agent(
         "query": query,
         "search_results": search_results,
         "contents": contents,
+        "duplicates_removed": dedup_report["duplicates"],
+        "tokens_saved": dedup_report["tokens_saved"],
         "summary": summary
     }
 
@@ -0,0 +1,232 @@
+"""
+Cookie-consent handling and per-domain browser storage state.
+
+Consent dialogs are found with an in-page check for the buttons of
+common consent frameworks, so a page without one costs one round-trip
+instead of a click timeout. Watching for a dialog injected after load
+is opt-in and ends as soon as the page goes quiet. Once a dialog is
+dismissed, the
+context's cookies and local storage are saved for the domain and loaded
+into later contexts, so the dialog doesn't come back.
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from playwright.async_api import Browser, BrowserContext, Page
+
+# Accept buttons of known consent frameworks, most specific first
+CONSENT_SELECTORS = [
+    "#L2AGLb",                                              # Google
+    "#onetrust-accept-btn-handler",                         # OneTrust
+    "#CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll",  # Cookiebot
+    "#CybotCookiebotDialogBodyButtonAccept",
+    "#didomi-notice-agree-button",                          # Didomi
+    ".qc-cmp2-summary-buttons button[mode='primary']",      # Quantcast
+    "#truste-consent-button",                               # TrustArc
+    "[data-testid='uc-accept-all-button']",                 # Usercentrics
+    ".cc-btn.cc-allow",                                     # Cookie Consent (Osano)
+    ".fc-cta-consent",                                      # Funding Choices
+    "button[title='Accept all']",                           # Sourcepoint
+    "button[aria-label='Accept all']",
+]
+
+# Fallback: a visible button whose whole label is an accept phrase, inside
+# one of these containers only, so "OK" or "Got it" elsewhere on the page
+# is never clicked
+CONSENT_CONTAINERS = [
+    "#onetrust-banner-sdk", "#CybotCookiebotDialog", "#didomi-host",
+    "#usercentrics-root", ".qc-cmp2-container", "#truste-consent-track",
+    ".cc-window", ".fc-consent-root", "[id^='sp_message_container']",
+    "[id*='cookie' i]", "[class*='cookie' i]", "[id*='consent' i]", "[class*='consent' i]",
+]
+ACCEPT_TEXT = r"^(accept all|accept all cookies|accept cookies|accept|agree|i agree|allow all|got it|ok)$"
+
+# Generic dialogs only count as consent dialogs if they talk about cookies
+DIALOG_SELECTOR = "dialog, [role=dialog], [role=alertdialog], [aria-modal=true]"
+COOKIE_TEXT = r"cookie|consent|privacy|gdpr"
+
+# Milliseconds without DOM changes after which a watched page counts as
+# settled: a dialog that hasn't appeared by then isn't coming
+QUIET_MS = 150
+
+# Clicks the first visible match and returns what it clicked. With a wait,
+# a page that has no dialog yet is watched for one being injected (most
+# frameworks add theirs after load) until the wait is over or the page
+# has gone ``quiet`` milliseconds without changes.
+DISMISS_SCRIPT = """
+([selectors, containers, acceptText, dialogs, cookieText, wait, quiet]) => {
+    const visible = el => {
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0 &&
+            getComputedStyle(el).visibility !== 'hidden';
+    };
+    const accept = new RegExp(acceptText, 'i');
+    const cookie = new RegExp(cookieText, 'i');
+    // A "cookie" class on a page wrapper (e.g. body.cookie-banner-open) is not a container
+    const banner = el => el !== document.body && el !== document.documentElement &&
+        !el.querySelector('main, article');
+    const roots = () => [
+        ...[...document.querySelectorAll(containers.join(', '))].filter(banner),
+        ...[...document.querySelectorAll(dialogs)].filter(el => cookie.test(el.innerText || '')),
+    ];
+    const dismiss = () => {
+        for (const selector of selectors) {
+            const el = document.querySelector(selector);
+            if (el && visible(el)) { el.click(); return selector; }
+        }
+        for (const root of roots()) {
+            for (const el of root.querySelectorAll('button, [role=button]')) {
+                if (accept.test((el.innerText || '').trim()) && visible(el)) {
+                    el.click();
+                    return 'text:' + el.innerText.trim();
+                }
+            }
+        }
+        return null;
+    };
+    const clicked = dismiss();
+    if (clicked || !wait) return clicked;
+    return new Promise(resolve => {
+        let scheduled = false;
+        let settled = null;
+        const finish = result => {
+            observer.disconnect();
+            clearTimeout(timer);
+            clearTimeout(settled);
+            resolve(result);
+        };
+        const settle = () => {
+            clearTimeout(settled);
+            settled = setTimeout(() => finish(dismiss()), quiet);
+        };
+        const observer = new MutationObserver(() => {
+            settle();
+            // Re-check at most once per frame however many nodes were added
+            if (scheduled) return;
+            scheduled = true;
+            requestAnimationFrame(() => {
+                scheduled = false;
+                const result = dismiss();
+                if (result) finish(result);
+            });
+        });
+        const timer = setTimeout(() => finish(dismiss()), wait);
+        observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true,
+                                                    attributeFilter: ['style', 'class', 'hidden']});
+        settle();
+    });
+}
+"""
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9.-]")
+
+def domain_of(url: str) -> str:
+    """The host of a URL without a leading ``www.``."""
+    host = urlparse(url).hostname or ""
+    return host[4:] if host.startswith("www.") else host
+
+async def _dismiss_in_frames(page: Page, wait: int) -> Optional[str]:
+    for frame in page.frames:
+        try:
+            clicked = await frame.evaluate(DISMISS_SCRIPT, [
+                CONSENT_SELECTORS, CONSENT_CONTAINERS, ACCEPT_TEXT, DIALOG_SELECTOR,
+                COOKIE_TEXT, wait if frame is page.main_frame else 0, QUIET_MS
+            ])
+        except Exception:
+            # Detached or cross-origin frames that went away mid-check
+            continue
+        if clicked:
+            return clicked
+    return None
+
+async def dismiss_consent(page: Page, wait: int = 0) -> Optional[str]:
+    """
+    Dismiss a cookie-consent dialog if one is showing.
+    
+    The page and its child frames (some frameworks render in an iframe)
+    are checked once each. With a ``wait``, the main frame is then watched
+    for a dialog being injected until one shows up, the wait is over or
+    the page has gone ``QUIET_MS`` without DOM changes, and the child
+    frames (which may have been added meanwhile) are checked once more.
+    
+    Args:
+        page: The page to check
+        wait: Milliseconds to watch for a late dialog (0: check once)
+        
+    Returns:
+        The selector (or button text) that was clicked, or None
+    """
+    clicked = await _dismiss_in_frames(page, 0)
+    if clicked or not wait:
+        return clicked
+    return await _dismiss_in_frames(page, wait)
+
+class StorageStateStore:
+    """
+    Saves and loads Playwright storage state (cookies and local storage)
+    per domain as JSON files.
+    """
+    
+    def __init__(self, directory: str = "browser_state"):
+        """
+        Initialize the store.
+        
+        Args:
+            directory: Directory holding one ``<domain>.json`` per domain
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+    
+    def path(self, url: str) -> str:
+        """The state file for a URL's domain."""
+        return os.path.join(self.directory, f"{_UNSAFE.sub('_', domain_of(url))}.json")
+    
+    def load(self, url: str) -> Optional[Dict[str, Any]]:
+        """The saved state for a URL's domain, or None."""
+        try:
+            with open(self.path(url), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    async def save(self, context: BrowserContext, url: str) -> None:
+        """Save a context's current state for a URL's domain."""
+        state = await context.storage_state()
+        path = self.path(url)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(f"{path}.tmp", path)
+    
+    async def new_context(self, browser: Browser, url: str, **kwargs) -> BrowserContext:
+        """Create a browser context preloaded with the domain's saved state."""
+        state = self.load(url)
+        if state is not None:
+            kwargs.setdefault("storage_state", state)
+        return await browser.new_context(**kwargs)
+
+async def handle_consent(page: Page, url: str, states: Optional[StorageStateStore],
+                         wait: int = 0) -> Optional[str]:
+    """
+    Dismiss a consent dialog and, if one was dismissed, save the domain's state.
+    
+    Args:
+        page: The page to check
+        url: The page URL (its domain keys the saved state)
+        states: Where to save the state (None: don't save)
+        wait: Milliseconds to watch for a dialog injected after load
+            (0: check once; a page without one pays up to the wait, or
+            ``QUIET_MS`` once it stops changing)
+    
+    Returns:
+        What was clicked, or None
+    """
+    clicked = await dismiss_consent(page, wait)
+    if clicked and states is not None:
+        # Some frameworks write their consent cookie after a short round-trip.
+        await page.wait_for_timeout(250)
+        await states.save(page.context, url)
+    return clicked
@@ -0,0 +1,132 @@
+"""
+Near-duplicate detection for extracted page content.
+"""
+
+import hashlib
+import re
+from html.parser import HTMLParser
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_WORDS = re.compile(r"\w+", re.UNICODE)
+
+# Elements whose text is never shown on the page
+_HIDDEN_TAGS = {"script", "style", "noscript", "template", "head", "svg"}
+
+class _TextParser(HTMLParser):
+    """Collects the text of an HTML document outside hidden elements."""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.hidden = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in _HIDDEN_TAGS:
+            self.hidden += 1
+    
+    def handle_endtag(self, tag):
+        if tag in _HIDDEN_TAGS and self.hidden:
+            self.hidden -= 1
+    
+    def handle_data(self, data):
+        if not self.hidden:
+            self.parts.append(data)
+
+def visible_text(html: str) -> str:
+    """
+    Extract the visible text of an HTML page.
+    
+    Fingerprints should be taken from this rather than the markup: pages
+    built from the same site template share most of their HTML.
+    
+    Args:
+        html: The page HTML
+        
+    Returns:
+        The text outside scripts, styles and other hidden elements,
+        with whitespace collapsed
+    """
+    parser = _TextParser()
+    parser.feed(html)
+    parser.close()
+    return " ".join(" ".join(parser.parts).split())
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count for English text (about 4 characters per token)."""
+    return (len(text) + 3) // 4
+
+def simhash(text: str, shingle_size: int = 5) -> int:
+    """
+    Compute the 64-bit SimHash of a text from its word shingles.
+    
+    Args:
+        text: The text to fingerprint
+        shingle_size: Number of words per shingle
+        
+    Returns:
+        The SimHash fingerprint
+    """
+    words = _WORDS.findall(text.lower())
+    shingles = {
+        " ".join(words[i:i + shingle_size])
+        for i in range(max(1, len(words) - shingle_size + 1))
+    }
+    votes = [0] * 64
+    for shingle in shingles:
+        value = int.from_bytes(
+            hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little"
+        )
+        for bit in range(64):
+            votes[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if votes[bit] > 0)
+
+def deduplicate_contents(
+    contents: List[Dict[str, Any]],
+    text_key: str = "content",
+    max_distance: int = 3,
+    get_text: Optional[Callable[[Dict[str, Any]], str]] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Drop near-duplicate pages, keeping the first occurrence.
+    
+    Two pages are near-duplicates when their SimHashes differ in at most
+    ``max_distance`` bits. Dropped URLs are recorded on the kept page
+    under ``duplicate_urls``.
+    
+    Args:
+        contents: Pages in priority order, each with a ``url``
+        text_key: Key holding the page text
+        max_distance: Maximum SimHash distance of duplicates
+        get_text: Optional function returning a page's text (overrides ``text_key``)
+        
+    Returns:
+        The kept pages and a report with the number of ``duplicates``
+        and estimated ``tokens_saved``
+    """
+    kept = []
+    fingerprints = []
+    tokens_saved = 0
+    
+    for page in contents:
+        text = get_text(page) if get_text else page.get(text_key)
+        if not isinstance(text, str) or not text.strip():
+            kept.append(page)
+            continue
+        fingerprint = simhash(text)
+        original = next(
+            (other for other, seen in fingerprints
+             if bin(fingerprint ^ seen).count("1") <= max_distance),
+            None
+        )
+        if original is None:
+            fingerprints.append((page, fingerprint))
+            kept.append(page)
+        else:
+            original.setdefault("duplicate_urls", []).append(page.get("url"))
+            tokens_saved += estimate_tokens(text)
+    
+    return kept, {
+        "pages": len(contents),
+        "duplicates": len(contents) - len(kept),
+        "tokens_saved": tokens_saved
+    }
@@ -7,12 +7,17 @@ from typing import Dict, Any, Optional, List
 
 from playwright.async_api import async_playwright, Browser, Page
 from . import Tool
+from .consent import StorageStateStore, handle_consent
+from .store import PageStore
 
 async def extract_content(
     url: str,
     selector: Optional[str] = None,
     headless: bool = True,
     timeout: int = 30000,
+    store: Optional[PageStore] = None,
+    max_age: Optional[float] = None,
+    states: Optional[StorageStateStore] = None,
     **kwargs
 ) -> Dict[str, Any]:
     """
@@ -23,18 +28,32 @@ async def extract_content(
         selector: Optional CSS selector to target specific elements
         headless: Whether to run the browser in headless mode
         timeout: Timeout in milliseconds for navigation
+        store: Page store to serve whole-page extractions from and save them to
+        max_age: Seconds a stored page is reused instead of refetching
+        states: Per-domain storage state, so consent dialogs are only
+            dismissed once per site
         **kwargs: Additional arguments to pass to the browser
         
     Returns:
         A dictionary containing the extracted content
     """
+    if store is not None and not selector:
+        stored = store.get(url, max_age)
+        if stored is not None:
+            return {"url": url, "text": stored["text"], "from_store": True}
+    
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=headless, **kwargs)
-        page = await browser.new_page()
+        if states is not None:
+            context = await states.new_context(browser, url)
+        else:
+            context = await browser.new_context()
+        page = await context.new_page()
         
         try:
             # Navigate to the URL
             await page.goto(url, timeout=timeout)
+            await handle_consent(page, url, states)
             
             # Extract content based on selector or entire page
             if selector:
@@ -60,6 +79,8 @@ async def extract_content(
                     "url": url,
                     "text": text
                 }
+                if store is not None:
+                    store.put(result)
             
             return result
             
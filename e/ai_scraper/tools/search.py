@@ -1,43 +1,46 @@
 """
 Search tool that uses Playwright to search the internet.
+
+Searches go through a backend: the Google results page in a browser
+(the default), a self-hosted JSON metasearch API such as SearXNG, or an
+offline ``PageStore``. A query cache can be passed in; the library
+doesn't keep one of its own, since results are only valid for the
+backend they came from.
 """
 
 import asyncio
+import json
+import urllib.parse
+import urllib.request
 from typing import List, Dict, Any, Optional
 
 from playwright.async_api import async_playwright, Browser, Page
 from . import Tool
+from .consent import StorageStateStore, handle_consent
+from .store import PageStore
 
-async def search_web(
+async def _search_browser(
     query: str,
-    num_results: int = 5,
+    num_results: int,
     headless: bool = True,
+    states: Optional[StorageStateStore] = None,
     **kwargs
 ) -> List[Dict[str, str]]:
-    """
-    Search the web for a query and return relevant URLs.
-    
-    Args:
-        query: The search query
-        num_results: Number of results to return
-        headless: Whether to run the browser in headless mode
-        **kwargs: Additional arguments to pass to the browser
-        
-    Returns:
-        A list of dictionaries containing search results
-    """
+    """Search Google in a Playwright browser."""
+    home = "https://www.google.com"
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=headless, **kwargs)
-        page = await browser.new_page()
+        if states is not None:
+            context = await states.new_context(browser, home)
+        else:
+            context = await browser.new_context()
+        page = await context.new_page()
         
         # Navigate to Google
-        await page.goto("https://www.google.com")
+        await page.goto(home)
         
         # Accept cookies if the dialog appears
-        try:
-            await page.click('button:has-text("Accept all")')
-        except:
-            pass
+        await handle_consent(page, home, states)
         
         # Type the search query
         await page.fill('textarea[name="q"]', query)
@@ -70,9 +73,95 @@ async def search_web(
         await browser.close()
         return results
 
+def _fetch_json(endpoint: str, query: str, timeout: float) -> Dict[str, Any]:
+    url = f"{endpoint}?{urllib.parse.urlencode({'q': query, 'format': 'json'})}"
+    request = urllib.request.Request(url, headers={"Accept": "application/json"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.load(response)
+
+async def _search_http(
+    query: str,
+    num_results: int,
+    endpoint: str,
+    timeout: float = 10.0
+) -> List[Dict[str, str]]:
+    """Query a SearXNG-compatible JSON endpoint (``GET ?q=...&format=json``)."""
+    data = await asyncio.to_thread(_fetch_json, endpoint, query, timeout)
+    results = []
+    for item in data.get("results", []):
+        if item.get("url", "").startswith("http"):
+            results.append({
+                "title": (item.get("title") or "").strip(),
+                "url": item["url"],
+                "snippet": item.get("content") or ""
+            })
+        if len(results) >= num_results:
+            break
+    return results
+
+async def _search_offline(query: str, num_results: int, store: PageStore) -> List[Dict[str, str]]:
+    """Full-text search over pages already in a ``PageStore``."""
+    pages = await asyncio.to_thread(store.search, query, num_results)
+    return [{"title": "", "url": page["url"], "snippet": page["snippet"]} for page in pages]
+
+async def search_web(
+    query: str,
+    num_results: int = 5,
+    headless: bool = True,
+    backend: str = "browser",
+    endpoint: Optional[str] = None,
+    store: Optional[PageStore] = None,
+    cache: Optional[Any] = None,
+    states: Optional[StorageStateStore] = None,
+    **kwargs
+) -> List[Dict[str, str]]:
+    """
+    Search the web for a query and return relevant URLs.
+    
+    Args:
+        query: The search query
+        num_results: Number of results to return
+        headless: Whether to run the browser in headless mode
+        backend: "browser" (Google in Playwright), "http" (a JSON
+            metasearch API at ``endpoint``) or "offline" (``store``)
+        endpoint: Search URL for the http backend, e.g. a SearXNG ``/search``
+        store: Page store for the offline backend
+        cache: Query cache with ``get(query, num_results)`` and
+            ``put(query, num_results, results)``, such as the exo scraper's
+            ``SearchCache``. Use one cache per backend: entries aren't keyed
+            by where the results came from.
+        states: Per-domain storage state for the browser backend, so
+            consent dialogs are only dismissed once
+        **kwargs: Additional arguments to pass to the browser
+        
+    Returns:
+        A list of dictionaries containing search results
+    """
+    if cache is not None:
+        cached = cache.get(query, num_results)
+        if cached is not None:
+            return cached
+    
+    if backend == "browser":
+        results = await _search_browser(query, num_results, headless, states, **kwargs)
+    elif backend == "http":
+        if not endpoint:
+            raise ValueError("The http search backend needs an endpoint")
+        results = await _search_http(query, num_results, endpoint)
+    elif backend == "offline":
+        if store is None:
+            raise ValueError("The offline search backend needs a store")
+        results = await _search_offline(query, num_results, store)
+    else:
+        raise ValueError(f"Unknown search backend: {backend}")
+    
+    if cache is not None:
+        cache.put(query, num_results, results)
+    return results
+
 # Create the tool
 search_tool = Tool(
     search_web,
     name="web_search",
     description="Search the web for a query and return relevant URLs"
-) 
\ No newline at end of file
+) 
@@ -0,0 +1,131 @@
+"""
+Persistent SQLite store of extracted pages with full-text search.
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+_WORDS = re.compile(r"\w+", re.UNICODE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    fetched_at REAL NOT NULL,
+    content_hash TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(
+    text, content='pages', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS pages_ai AFTER INSERT ON pages BEGIN
+    INSERT INTO pages_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS pages_ad AFTER DELETE ON pages BEGIN
+    INSERT INTO pages_fts (pages_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS pages_au AFTER UPDATE OF text ON pages BEGIN
+    INSERT INTO pages_fts (pages_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    INSERT INTO pages_fts (rowid, text) VALUES (new.id, new.text);
+END;
+"""
+
+class PageStore:
+    """
+    Stores extracted pages by URL with fetch time and content hash.
+    
+    Pages whose text is unchanged only get their fetch time refreshed,
+    so the full-text index is not rewritten for them.
+    """
+    
+    def __init__(self, path: str = "pages.db"):
+        """
+        Open (or create) a page store.
+        
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+    
+    def put_many(self, pages: List[Dict[str, Any]], text_key: str = "text") -> None:
+        """
+        Store pages in a single transaction.
+        
+        Args:
+            pages: Pages with ``url`` and text under ``text_key``
+            text_key: Key holding the page text
+        """
+        now = time.time()
+        rows = [
+            (page["url"], now, hashlib.sha256(page[text_key].encode("utf-8")).hexdigest(),
+             page[text_key])
+            for page in pages
+            if page.get("url") and isinstance(page.get(text_key), str)
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO pages (url, fetched_at, content_hash, text) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (url) DO UPDATE SET fetched_at = excluded.fetched_at, "
+                "content_hash = excluded.content_hash, text = excluded.text "
+                "WHERE pages.content_hash != excluded.content_hash",
+                rows
+            )
+            # Unchanged pages: only the fetch time moves forward.
+            self._conn.executemany(
+                "UPDATE pages SET fetched_at = ? WHERE url = ? AND content_hash = ?",
+                [(now, url, digest) for url, _, digest, _ in rows]
+            )
+    
+    def put(self, page: Dict[str, Any], text_key: str = "text") -> None:
+        """Store one page."""
+        self.put_many([page], text_key)
+    
+    def get(self, url: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get a stored page, if there is one fetched within ``max_age`` seconds.
+        
+        Returns:
+            Dictionary with ``url``, ``text``, ``fetched_at`` and ``content_hash``
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM pages WHERE url = ?", (url,)).fetchone()
+        if row is None or (max_age is not None and time.time() - row["fetched_at"] > max_age):
+            return None
+        return {"url": row["url"], "text": row["text"],
+                "fetched_at": row["fetched_at"], "content_hash": row["content_hash"]}
+    
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Full-text search over stored pages (any term may match, BM25-ranked).
+        
+        Returns:
+            Matching pages, best first, with a ``snippet``
+        """
+        terms = dict.fromkeys(_WORDS.findall(query.lower()))
+        if not terms:
+            return []
+        expression = " OR ".join(f'"{term}"' for term in terms)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT pages.url, pages.fetched_at, "
+                "snippet(pages_fts, 0, '', '', ' ... ', 24) AS snippet "
+                "FROM pages_fts JOIN pages ON pages.id = pages_fts.rowid "
+                "WHERE pages_fts MATCH ? ORDER BY bm25(pages_fts) LIMIT ?",
+                (expression, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+    
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,155 @@
+"""
+Tests for consent-dialog detection, run against a scripted DOM in Node.
+
+The fake document answers ``querySelector(All)`` from the selectors each
+element is declared to match, so the tests cover the script's own logic
+(framework buttons first, containers, accept labels, visibility, cookie
+dialogs and the watch for late dialogs) without a browser.
+"""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from ai_scraper.tools.consent import (
+    ACCEPT_TEXT, CONSENT_CONTAINERS, CONSENT_SELECTORS, COOKIE_TEXT, DIALOG_SELECTOR,
+    DISMISS_SCRIPT, QUIET_MS
+)
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+
+FAKE_DOM = r"""
+const scenario = JSON.parse(process.argv[1]);
+const clicked = [];
+const observers = [];
+let byId = {};
+
+function build(spec, parent) {
+    const el = {
+        spec, parent, children: [],
+        get innerText() {
+            return (spec.text || "") + this.children.map(child => child.innerText).join(" ");
+        },
+        getBoundingClientRect() {
+            const [width, height] = spec.size || [100, 20];
+            return {width, height};
+        },
+        click() { clicked.push(spec.id || spec.tag); },
+        matches(selector) { return (spec.matches || []).includes(selector) || spec.tag === selector; },
+        descendants() { return this.children.flatMap(child => [child, ...child.descendants()]); },
+        querySelectorAll(list) {
+            const selectors = list.split(/,\s*/);
+            return this.descendants().filter(el => selectors.some(s => el.matches(s)));
+        },
+        querySelector(list) { return this.querySelectorAll(list)[0] || null; },
+    };
+    if (spec.id) byId[spec.id] = el;
+    el.children = (spec.children || []).map(child => build(child, el));
+    return el;
+}
+
+const root = build({tag: "html", children: [Object.assign({tag: "body"}, scenario.body)]});
+globalThis.document = {
+    documentElement: root,
+    body: root.children[0],
+    querySelectorAll: list => root.querySelectorAll(list),
+    querySelector: list => root.querySelector(list),
+};
+globalThis.getComputedStyle = el => ({visibility: el.spec.visibility || "visible"});
+globalThis.requestAnimationFrame = callback => setTimeout(callback, 16);
+globalThis.MutationObserver = class {
+    constructor(callback) { this.callback = callback; }
+    observe() { observers.push(this); }
+    disconnect() { observers.splice(observers.indexOf(this), 1); }
+};
+for (const change of scenario.later || []) {
+    setTimeout(() => {
+        const parent = byId[change.parent] || document.body;
+        parent.children.push(build(change.add, parent));
+        for (const observer of [...observers]) observer.callback([]);
+    }, change.at);
+}
+
+const start = Date.now();
+Promise.resolve(eval(scenario.script)(scenario.args)).then(result => {
+    console.log(JSON.stringify({result, clicked, elapsed: Date.now() - start}));
+    process.exit(0);
+});
+"""
+
+def dismiss(body, wait=0, later=()):
+    scenario = {
+        "script": DISMISS_SCRIPT,
+        "args": [CONSENT_SELECTORS, CONSENT_CONTAINERS, ACCEPT_TEXT, DIALOG_SELECTOR,
+                 COOKIE_TEXT, wait, QUIET_MS],
+        "body": body,
+        "later": list(later),
+    }
+    output = subprocess.run(["node", "-e", FAKE_DOM, json.dumps(scenario)], capture_output=True,
+                            text=True, timeout=30, check=True).stdout
+    return json.loads(output)
+
+def button(text, id=None, size=(80, 20), **kwargs):
+    return dict({"tag": "button", "id": id or text, "text": text, "size": list(size)}, **kwargs)
+
+def test_framework_button_is_clicked_first():
+    outcome = dismiss({"children": [
+        {"tag": "div", "matches": ["[id*='cookie' i]"], "children": [button("Accept all", "generic")]},
+        button("Allow", "onetrust", matches=["#onetrust-accept-btn-handler"]),
+    ]})
+    assert outcome["result"] == "#onetrust-accept-btn-handler"
+    assert outcome["clicked"] == ["onetrust"]
+
+def test_hidden_framework_button_falls_back_to_a_container_label():
+    outcome = dismiss({"children": [
+        button("Allow", "onetrust", size=(0, 0), matches=["#onetrust-accept-btn-handler"]),
+        {"tag": "div", "matches": ["[class*='cookie' i]"], "children": [
+            button("Manage options", "manage"),
+            button("Accept all", "hidden-accept", visibility="hidden"),
+            button("  Accept all ", "accept"),
+        ]},
+    ]})
+    assert outcome["result"] == "text:Accept all"
+    assert outcome["clicked"] == ["accept"]
+
+def test_accept_labels_outside_containers_are_ignored():
+    outcome = dismiss({"children": [
+        button("OK", "ok"),
+        {"tag": "div", "matches": ["[id*='consent' i]"], "children": [button("Accept and subscribe")]},
+    ]})
+    assert outcome == {"result": None, "clicked": [], "elapsed": outcome["elapsed"]}
+
+def test_page_wrappers_with_cookie_classes_are_not_containers():
+    outcome = dismiss({"matches": ["[class*='cookie' i]"], "children": [
+        {"tag": "div", "matches": ["[class*='cookie' i]"], "children": [
+            {"tag": "main", "children": [button("Got it", "article-button")]},
+        ]},
+    ]})
+    assert outcome["result"] is None and outcome["clicked"] == []
+
+def test_generic_dialogs_need_cookie_text():
+    dialog = {"tag": "div", "matches": ["[role=dialog]"]}
+    newsletter = dict(dialog, text="Join our newsletter", children=[button("OK", "newsletter")])
+    cookies = dict(dialog, text="We use cookies to improve", children=[button("Agree", "cookies")])
+    assert dismiss({"children": [newsletter]})["clicked"] == []
+    assert dismiss({"children": [newsletter, cookies]})["clicked"] == ["cookies"]
+
+def test_late_dialog_is_caught_while_watching():
+    late = {"tag": "div", "id": "banner", "matches": ["#didomi-host"],
+            "children": [button("Agree", "didomi", matches=["#didomi-notice-agree-button"])]}
+    outcome = dismiss({"children": []}, wait=2000, later=[{"at": 50, "add": late}])
+    assert outcome["result"] == "#didomi-notice-agree-button"
+    assert outcome["elapsed"] < 1000
+    assert dismiss({"children": []}, wait=0, later=[{"at": 50, "add": late}])["result"] is None
+
+def test_quiet_page_ends_the_watch_early():
+    outcome = dismiss({"children": [{"tag": "p", "text": "Just an article"}]}, wait=2000)
+    assert outcome["result"] is None
+    assert QUIET_MS <= outcome["elapsed"] < 1000
+
+    # A page that keeps changing is watched until the wait is over
+    changes = [{"at": at, "add": {"tag": "p", "text": "ticker"}} for at in range(50, 600, 50)]
+    busy = dismiss({"children": []}, wait=400, later=changes)
+    assert busy["result"] is None and busy["elapsed"] >= 400
@@ -0,0 +1,60 @@
+"""
+Tests for near-duplicate detection of extracted pages.
+"""
+
+import random
+
+from ai_scraper.tools.dedup import deduplicate_contents, simhash, visible_text
+
+WORDS = ("market growth report analysis data model system policy research energy climate "
+         "city health school network software design history science river bank").split()
+
+def _article(seed: int) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(60))
+
+def _page(article: str) -> str:
+    """A page whose shared template (scripts, styles, markup) outweighs its article."""
+    styles = "".join(f".block-{i} {{ margin: {i}px; padding: {i % 7}px; }}" for i in range(150))
+    script = "".join(f"function track{i}(event) {{ return send('event{i}', event); }}"
+                     for i in range(150))
+    menu = "".join(f'<li class="nav-item"><a class="nav-link" href="/s/{i}">S{i}</a></li>'
+                   for i in range(30))
+    return (
+        f"<html><head><title>Site</title><style>{styles}</style>"
+        f"<script>{script}</script></head>"
+        f'<body><nav><ul class="menu">{menu}</ul></nav>'
+        f"<article><p>{article}</p></article></body></html>"
+    )
+
+def test_visible_text_skips_hidden_elements():
+    """Scripts, styles and markup are dropped and whitespace collapsed."""
+    html = ("<html><head><title>T</title><style>p {}</style></head><body>"
+            "<script>var x = 1;</script><p>Hello\n  <b>world</b> &amp; more</p></body></html>")
+    assert visible_text(html) == "Hello world & more"
+
+def test_simhash_near_duplicates():
+    """Light edits keep the fingerprint close; different texts don't."""
+    text = _article(1)
+    edited = text.replace(text.split()[10], "changed", 1)
+    assert bin(simhash(text) ^ simhash(edited)).count("1") <= 10
+    assert bin(simhash(text) ^ simhash(_article(2))).count("1") > 10
+
+def test_shared_template_is_not_a_duplicate():
+    """Different articles on the same template are kept."""
+    pages = [{"url": f"https://site.test/{i}", "text": _page(_article(i))} for i in range(3)]
+    kept, report = deduplicate_contents(pages, get_text=lambda page: visible_text(page["text"]))
+    assert report["duplicates"] == 0
+    assert len(kept) == 3
+
+def test_mirror_is_a_duplicate():
+    """The same article on another site is dropped and recorded."""
+    pages = [
+        {"url": "https://site.test/story",
+         "text": f"<html><body><article><p>{_article(1)}</p></article></body></html>"},
+        {"url": "https://mirror.test/story",
+         "text": f'<html><body><div class="post"><p>{_article(1)}</p></div></body></html>'},
+    ]
+    kept, report = deduplicate_contents(pages, get_text=lambda page: visible_text(page["text"]))
+    assert report["duplicates"] == 1
+    assert kept[0]["duplicate_urls"] == ["https://mirror.test/story"]
@@ -5,27 +5,65 @@ import logging
 import json
 from typing import Dict, Any, List, Optional
 
-from ..core.exceptions import AgentError
+from ..core.config import get_config
+from ..core.exceptions import AgentError, DeadlineExceeded
 from ..providers.base import BaseProvider
+from ..scraper.prefetch import Prefetcher
 from ..scraper.tools import web_search, scrape_website
+from ..scraper.tools.web_tools import search_store
+from ..storage.content_index import ContentIndex
+from ..storage.document_store import DocumentStore, get_document_store
+from ..utils.async_utils import get_retry_policy
+from ..utils.deadline import deadline, remaining, within
 from .base import BaseAgent
 
 logger = logging.getLogger(__name__)
 
+def _partial_answer(tool_result: Dict[str, Any]) -> str:
+    """Answer with the raw tool result when there's no time left to write one."""
+    if "content" in tool_result:
+        found = [f"From {tool_result.get('url')}:\n{tool_result['content']}"]
+    else:
+        found = [str(item) for item in tool_result.get("results", [])
+                 if not str(item).startswith("Error:")]
+    if not found:
+        return "Sorry, I ran out of time before I could find an answer."
+    return ("I ran out of time before I could write a full answer. Here is what I found:\n\n"
+            + "\n\n".join(found))
+
 class WebAgent(BaseAgent):
     """
     Agent that can use any AI provider and web scraping tools.
     """
     
-    def __init__(self, provider: BaseProvider, **kwargs):
+    def __init__(self, provider: BaseProvider, content_index: Optional[ContentIndex] = None,
+                 document_store: Optional[DocumentStore] = None,
+                 prefetcher: Optional[Prefetcher] = None, **kwargs):
         """
         Initialize the web agent.
         
         Args:
             provider: The AI provider to use
+            content_index: Index of already scraped pages, consulted before
+                scraping again and updated with every scraped page
+            document_store: Store of scraped pages used to answer repeat
+                searches offline (default: the configured store, if any)
+            prefetcher: Keeps the pages a search scraped, and loads the ones
+                that timed out while the model writes its answer, for the
+                scrape that usually follows (default: one from config,
+                unless prefetch is disabled)
             **kwargs: Additional configuration
         """
-        super().__init__(provider, **kwargs)
+        super().__init__(provider)
+        self.config = kwargs
+        self.content_index = content_index
+        # An empty store is falsy
+        self.document_store = document_store if document_store is not None else get_document_store()
+        if prefetcher is None and get_config()["prefetch"].get("enabled", True):
+            prefetcher = Prefetcher()
+        self.prefetcher = prefetcher
+        # Rate limits and provider outages are retried with backoff
+        self.retry = get_retry_policy("provider")
         self.tools = [
             {
                 "name": "web_search",
@@ -41,7 +79,8 @@ class WebAgent(BaseAgent):
                 "description": "Scrape content from a website",
                 "parameters": {
                     "url": "The URL to scrape",
-                    "selector": "Optional CSS selector to target specific content"
+                    "selector": "Optional CSS selector to target specific content",
+                    "query": "Optional description of what to look for on the page"
                 },
                 "function": scrape_website
             }
@@ -52,6 +91,10 @@ class WebAgent(BaseAgent):
         """Initialize the agent with configuration."""
         await self.provider.initialize(**self.config)
     
+    async def execute(self, task: str, **kwargs) -> str:
+        """Answer a task as a user message."""
+        return await self.process_message(task, **kwargs)
+    
     def _create_system_prompt(self) -> str:
         """Create the system prompt for the agent."""
         tools_description = "\n".join([
@@ -86,27 +129,116 @@ Always be helpful, accurate, and concise in your responses.
         try:
             result = await tool["function"](**kwargs)
             return result
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.error(f"Error using tool {tool_name}: {e}")
             raise AgentError(f"Error using tool {tool_name}: {str(e)}")
     
-    async def process_message(self, message: str, **kwargs) -> str:
+    async def _recall(self, tool_name: str, tool_params: Dict[str, Any],
+                      message: str) -> Optional[Dict[str, Any]]:
+        """
+        Answer a tool call from local pages instead of the web.
+        
+        Searches are answered from the document store when enough fresh
+        stored pages match. With a content index, a page is reused while it
+        is fresh and a search is answered when enough fresh indexed
+        passages are similar to the query.
+        
+        Returns:
+            A tool result built from stored pages, or None to run the tool
+        """
+        if tool_name == "web_search" and self.document_store is not None:
+            stored = search_store(tool_params.get("query") or message, self.document_store,
+                                  int(tool_params.get("num_results") or 3))
+            if stored is not None:
+                return stored
+        if self.content_index is None:
+            return None
+        index_config = get_config()["index"]
+        max_age = index_config.get("max_age", 86400)
+        
+        if tool_name == "scrape_website" and not tool_params.get("selector"):
+            url = tool_params.get("url")
+            if not url or not self.content_index.is_fresh(url, max_age):
+                return None
+            passages = await self.content_index.query(tool_params.get("query") or message,
+                                                      urls=[url], max_age=max_age)
+            if not passages:
+                return None
+            logger.info(f"Answering from indexed copy of {url}")
+            return {
+                "url": url,
+                "content": "\n...\n".join(passage["text"] for passage in passages),
+                "source": "index"
+            }
+        
+        if tool_name == "web_search":
+            query = tool_params.get("query") or message
+            passages = await self.content_index.query(
+                query, k=max(5, index_config.get("min_hits", 3)), max_age=max_age,
+                min_score=index_config.get("min_score", 0.5)
+            )
+            if len(passages) < index_config.get("min_hits", 3):
+                return None
+            logger.info(f"Answering search from {len(passages)} indexed passages")
+            return {
+                "query": query,
+                "results": [f"From {passage['url']}:\n{passage['text']}" for passage in passages],
+                "source": "index"
+            }
+        return None
+    
+    async def _generate(self, prompt: str, **kwargs) -> str:
+        """A model call, retried on transient failures, within the request's deadline."""
+        return await within(self.retry.call(self.provider.generate, prompt, **kwargs),
+                            what="model call")
+    
+    def _tool_budget(self) -> Optional[float]:
+        """Seconds a tool may run, keeping time back for the final answer."""
+        left = remaining()
+        if left is None:
+            return None
+        agent_config = get_config()["agent"]
+        reserve = max(agent_config.get("answer_min", 5.0), left * agent_config.get("answer_share", 0.3))
+        # Short budgets are split evenly rather than all kept for the answer
+        return left - min(reserve, left / 2)
+    
+    async def process_message(self, message: str, timeout: Optional[float] = None,
+                              **kwargs) -> str:
         """
         Process a user message and return a response.
         
+        Everything the message leads to (model calls, searches, page
+        loads, retries) shares one deadline. Tools get the time left
+        minus a reserve for the final answer; if the final answer can't
+        be written in time, the tool results are returned as they are.
+        
         Args:
             message: The user message
+            timeout: Seconds the whole request may take (default: from config)
             **kwargs: Additional arguments for the provider
             
         Returns:
             The agent's response
         """
+        if timeout is None:
+            timeout = get_config()["agent"].get("request_timeout")
+        with deadline(timeout):
+            return await self._respond(message, **kwargs)
+    
+    async def _respond(self, message: str, **kwargs) -> str:
+        """Answer a user message, calling at most one tool."""
         # Create the initial prompt
         system_prompt = self._create_system_prompt()
         prompt = f"{system_prompt}\n\nUser: {message}\n\nAssistant:"
         
         # Generate an initial response
-        response = await self.provider.generate(prompt, **kwargs)
+        try:
+            response = await self._generate(prompt, **kwargs)
+        except DeadlineExceeded:
+            logger.warning("Request ran out of time before the model answered")
+            return "Sorry, I ran out of time before I could answer."
         
         # Check if the response indicates tool usage
         if any(tool["name"] in response for tool in self.tools):
@@ -130,9 +262,26 @@ Always be helpful, accurate, and concise in your responses.
                     break
             
             if tool_name and tool_params:
+                # Rank page passages against the user's question by default
+                if tool_name == "scrape_website":
+                    tool_params.setdefault("query", message)
                 try:
-                    # Use the tool
-                    tool_result = await self.use_tool(tool_name, **tool_params)
+                    try:
+                        with deadline(self._tool_budget()):
+                            # Reuse indexed pages before going back to the web
+                            tool_result = await self._recall(tool_name, tool_params, message)
+                            if tool_result is None:
+                                if self.content_index is not None:
+                                    tool_params["content_index"] = self.content_index
+                                if self.prefetcher is not None and tool_name in ("web_search",
+                                                                                  "scrape_website"):
+                                    tool_params["prefetcher"] = self.prefetcher
+                                tool_result = await within(self.use_tool(tool_name, **tool_params),
+                                                           what=tool_name)
+                    except DeadlineExceeded:
+                        # Answer without the tool in the time kept back
+                        logger.warning(f"{tool_name} ran out of time")
+                        tool_result = {"error": f"{tool_name} ran out of time"}
                     
                     # Format the tool result
                     tool_result_str = json.dumps(tool_result, indent=2)
@@ -141,8 +290,11 @@ Always be helpful, accurate, and concise in your responses.
                     new_prompt = f"{system_prompt}\n\nUser: {message}\n\nAssistant: I'll search for information about that.\n\nTool result:\n{tool_result_str}\n\nBased on this information, here's my answer:"
                     
                     # Generate a final response
-                    final_response = await self.provider.generate(new_prompt, **kwargs)
-                    return final_response
+                    try:
+                        return await self._generate(new_prompt, **kwargs)
+                    except DeadlineExceeded:
+                        logger.warning("Request ran out of time during the final answer")
+                        return _partial_answer(tool_result)
                 except Exception as e:
                     logger.error(f"Error processing tool result: {e}")
                     return f"I encountered an error while searching for information: {str(e)}"
@@ -151,5 +303,9 @@ Always be helpful, accurate, and concise in your responses.
     
     async def close(self) -> None:
         """Clean up resources."""
+        if self.content_index is not None:
+            self.content_index.save()
+        if self.prefetcher is not None:
+            await self.prefetcher.close()
         await self.provider.close()
         logger.info("WebAgent closed")
\ No newline at end of file
@@ -11,14 +11,114 @@ DEFAULT_CONFIG = {
         "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     },
     "browser": {
+        "backend": "http",  # "http" (no JavaScript, falls back to "playwright" when needed) or "playwright"
         "headless": True,
         "timeout": 30000,  # milliseconds
-        "viewport": {"width": 1280, "height": 720}
+        "viewport": {"width": 1280, "height": 720},
+        "readiness": {
+            "timeout": 10000,  # milliseconds, hard cap on readiness waits
+            "quiet_ms": 500,  # DOM considered settled after this long without mutations
+            "plateau_ms": 1000,  # text length unchanged for this long
+            "min_text_length": 1  # characters before quiet/plateau can fire
+        },
+        "recycle": {
+            "page_uses": 50,  # scrapes before a pooled page is replaced
+            "context_navigations": 500,  # scrapes before the browser context is replaced
+            "max_rss_mb": 1500,  # browser memory that triggers recycling (None: unchecked)
+            "rss_check_every": 25  # scrapes between memory checks
+        }
     },
     "scraping": {
         "max_retries": 3,
-        "delay_between_requests": 1.0,  # seconds
-        "max_content_length": 1000000  # characters
+        "user_agent": "Mozilla/5.0 (compatible; exo-crawler/0.1)",
+        "delay_between_requests": 1.0,  # seconds between requests to one host
+        "per_host_concurrency": 2,  # concurrent requests to one host
+        "respect_robots": True,
+        "robots_ttl": 3600,  # seconds robots.txt stays cached
+        "max_content_length": 1000000,  # characters of page text/HTML pulled from the browser
+        "content_chunk_chars": 262144,  # characters per round trip when reading whole pages
+        "context_budget_tokens": 1000,  # page text passed to the agent per tool call
+        "max_concurrency": 4,  # pages scraped at once
+        "result_timeout": 20.0  # seconds per search result
+    },
+    "retry": {
+        "max_attempts": 3,  # attempts per call, including the first
+        "base_delay": 0.5,  # seconds; backoff cap of the first retry, doubling after
+        "max_delay": 10.0,  # seconds; largest backoff cap
+        "max_elapsed": 30.0,  # seconds after which no new attempt starts
+        "budget_ratio": 0.2,  # retries allowed per call, shared across calls
+        "budget_min": 10,  # retries available before the ratio applies
+        "navigation": {"max_attempts": 3, "base_delay": 1.0},  # page fetches and navigations
+        "provider": {"max_attempts": 4, "base_delay": 1.0, "max_elapsed": 60.0}  # model calls
+    },
+    "agent": {
+        "request_timeout": 120.0,  # seconds per message, model calls and tools included (None: no limit)
+        "answer_share": 0.3,  # share of the time left kept for the final answer while a tool runs
+        "answer_min": 5.0  # seconds kept for the final answer at least
+    },
+    "processing": {
+        "workers": None,  # HTML processing processes (None: CPU count; 0: inline)
+        "batch_size": 8,  # pages per worker task
+        "max_delay_ms": 5,  # wait this long for a batch to fill
+        "inline_chars": 20000,  # smaller pages are processed inline
+        "start_method": "spawn"  # multiprocessing start method of the workers
+    },
+    "workers": {
+        "processes": 0,  # scrape worker processes, each with its own browser (0: scrape in-process)
+        "start_method": "spawn"  # multiprocessing start method of the workers
+    },
+    "embeddings": {
+        "batch_size": {  # texts per backend call
+            "openai": 256,
+            "ollama": 32,
+            "huggingface": 16
+        },
+        "cache_entries": 100000,  # vectors kept in the content-hash cache
+        "cache_path": None,  # .npz file to persist the cache to
+        "cache_save_every": 1000  # new vectors between saves (also saved at exit)
+    },
+    "index": {
+        "path": None,  # directory for the memory-mapped vector index
+        "dtype": "float32",  # or "float16" to halve memory
+        "chunk_chars": 800,  # passage length when indexing pages
+        "ivf_threshold": 50000,  # vectors before switching to IVF search
+        "nlist": None,  # IVF clusters (default: about sqrt(vectors))
+        "nprobe": 16,  # IVF clusters scanned per query
+        "max_age": 86400,  # seconds indexed pages count as fresh
+        "min_score": 0.5,  # cosine similarity for a passage to count as a hit
+        "min_hits": 3  # hits needed to answer a search from the index
+    },
+    "store": {
+        "path": None,  # SQLite file for scraped pages (None: no persistent store)
+        "max_age": 86400,  # seconds a stored page is served instead of refetching
+        "batch_size": 64  # pages committed per transaction
+    },
+    "archive": {
+        "path": None,  # directory for the raw HTML archive (None: don't archive)
+        "level": 3,  # zstd compression level
+        "dict_size": 112640,  # bytes per trained per-domain dictionary
+        "train_after": 50,  # pages of a domain archived before training its dictionary
+        "sample_bytes": 2097152,  # training sample bytes buffered per domain
+        "sample_domains": 32  # domains buffering samples at once (least recent dropped)
+    },
+    "corpus": {
+        "path": None  # directory of the memory-mapped text corpus (None: don't write one)
+    },
+    "search": {
+        "backend": "google",  # "google" (browser), "http" (JSON API) or "offline"
+        "endpoint": None,  # JSON search URL for the http backend, e.g. a SearXNG /search
+        "timeout": 10.0,  # seconds per search request
+        "cache_ttl": 3600,  # seconds search results stay cached
+        "empty_ttl": 60,  # seconds an empty result list stays cached (consent pages, CAPTCHAs)
+        "cache_size": 1024,  # cached queries
+        "similarity": 0.8  # term overlap for a similar query to reuse cached results
+    },
+    "prefetch": {
+        "enabled": True,  # load top search results while the model generates
+        "top_k": 3,  # result URLs prefetched per search
+        "max_bytes": 8000000,  # page text held by the prefetch cache
+        "max_concurrency": 2,  # pages prefetched at once
+        "max_age": 300  # seconds a prefetched page is served
     }
 }
 
@@ -22,10 +22,30 @@ class ParserError(ScraperError):
     """Raised when there's an error parsing content."""
     pass
 
+class RobotsDisallowedError(ScraperError):
+    """Raised when robots.txt disallows fetching a URL."""
+    pass
+
 class AgentError(ExoError):
     """Raised when there's an error with an agent."""
     pass
 
 class ConfigError(ExoError):
     """Raised when there's an error with configuration."""
-    pass 
\ No newline at end of file
+    pass 
+
+class HttpStatusError(BrowserError):
+    """Raised when a page answers with an HTTP error status."""
+    
+    def __init__(self, status: int, url: str):
+        super().__init__(f"HTTP {status} for {url}")
+        self.status = status
+        self.url = url
+
+class PoolClosedError(BrowserError):
+    """Raised when borrowing a page from a page pool that was closed."""
+    pass
+
+class DeadlineExceeded(ExoError):
+    """Raised when a request runs out of its time budget."""
+    pass
@@ -6,7 +6,7 @@ import logging
 import json
 import argparse
 from exo.agents.web_agent import WebAgent
-from exo.tools.web_tools import web_search, scrape_website
+from exo.scraper.tools import web_search, scrape_website
 
 # Configure logging
 logging.basicConfig(
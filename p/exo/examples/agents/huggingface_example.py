@@ -2,7 +2,7 @@
 Example demonstrating how to use the Hugging Face provider.
 """
 import logging
-from exo.agents.providers import HuggingFaceProvider
+from exo.providers import HuggingFaceProvider
 
 # Configure logging
 logging.basicConfig(
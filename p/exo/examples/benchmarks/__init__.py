@@ -0,0 +1,3 @@
+"""
+Benchmarks for the scraping pipeline, run against local fixture servers.
+"""
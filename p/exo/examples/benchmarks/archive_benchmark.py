@@ -0,0 +1,109 @@
+"""
+Compression ratio and decode throughput of the raw HTML archive.
+
+The fixture corpus mimics crawled sites: each site has its own template
+(inline styles and scripts, navigation, footer) around varying article
+text. Pages are archived without dictionaries and with per-domain trained
+dictionaries, and compared with gzip. Run with:
+
+    python -m exo.examples.benchmarks.archive_benchmark [pages_per_site]
+"""
+import logging
+import random
+import sys
+import tempfile
+import time
+import zlib
+
+from exo.scraper.readability import extract_main_content
+from exo.storage.html_archive import HtmlArchive
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+random.seed(11)
+WORDS = ("market growth report analysis data model system policy research energy "
+         "climate city health school network software design history science "
+         "council budget election transport housing water river museum").split()
+
+def site_template(site: str) -> str:
+    css = "".join(f".{site}-c{i}{{margin:{i}px;padding:{i % 7}px;color:#{i * 97 % 4096:03x}}}"
+                  for i in range(120))
+    script = "".join(f"window.{site}_cfg{i}={{id:{i},track:'{site}-{i}',enabled:true}};"
+                     for i in range(80))
+    nav = "".join(f'<li class="{site}-nav-item"><a href="https://{site}.example/section/{i}">'
+                  f"Section {i}</a></li>" for i in range(40))
+    footer = "".join(f'<a href="https://{site}.example/legal/{i}">Legal page {i}</a>' for i in range(30))
+    return (f"<!doctype html><html lang=\"en\"><head><meta charset=\"utf-8\"><title>{{title}} | {site}</title>"
+            f"<style>{css}</style><script>{script}</script></head><body>"
+            f'<header class="{site}-header"><nav><ul>{nav}</ul></nav></header>'
+            f'<main class="{site}-main"><article><h1>{{title}}</h1>{{body}}</article></main>'
+            f'<footer class="{site}-footer">{footer}<p>Copyright {site} media group</p></footer>'
+            f"</body></html>")
+
+def article() -> str:
+    paragraphs = []
+    for _ in range(random.randint(4, 12)):
+        words = [random.choice(WORDS) for _ in range(random.randint(40, 120))]
+        paragraphs.append(f"<p>{' '.join(words).capitalize()}.</p>")
+    return "".join(paragraphs)
+
+def corpus(pages_per_site: int):
+    pages = []
+    for site in ("dailynews", "techblog", "cityhall", "sciencemag"):
+        template = site_template(site)
+        for i in range(pages_per_site):
+            title = " ".join(random.choice(WORDS) for _ in range(6)).title()
+            html = template.replace("{title}", title).replace("{body}", article())
+            pages.append((f"https://{site}.example/article/{i}", html))
+    random.shuffle(pages)
+    return pages
+
+def archive(pages, train_after: int):
+    path = tempfile.mkdtemp()
+    archive = HtmlArchive(path, train_after=train_after)
+    start = time.perf_counter()
+    for url, html in pages:
+        archive.add(url, html)
+    archive.flush()
+    return archive, time.perf_counter() - start
+
+def main():
+    pages_per_site = int(sys.argv[1]) if len(sys.argv) > 1 else 250
+    pages = corpus(pages_per_site)
+    raw_bytes = sum(len(html.encode("utf-8")) for _, html in pages)
+    logger.info(f"{len(pages)} pages, {raw_bytes / 1e6:.1f} MB raw")
+
+    gzip_bytes = sum(len(zlib.compress(html.encode("utf-8"), 6)) for _, html in pages)
+    logger.info(f"{'gzip -6 per page':<26}ratio {raw_bytes / gzip_bytes:5.1f}x")
+
+    for label, train_after in (("zstd, no dictionary", 10 ** 9), ("zstd, per-domain dicts", 30)):
+        store, elapsed = archive(pages, train_after)
+        stats = store.stats()
+        logger.info(f"{label:<26}ratio {stats['ratio']:5.1f}x  "
+                    f"write {raw_bytes / elapsed / 1e6:6.1f} MB/s  dictionaries={stats['dictionaries']}")
+
+        urls = [url for url, _ in pages]
+        random.shuffle(urls)
+        start = time.perf_counter()
+        for url in urls:
+            store.get(url)
+        elapsed = time.perf_counter() - start
+        logger.info(f"{'':<26}random access {len(urls) / elapsed:8.0f} pages/s  "
+                    f"{raw_bytes / elapsed / 1e6:6.1f} MB/s decoded")
+
+        start = time.perf_counter()
+        count = sum(1 for _ in store.iter_pages())
+        elapsed = time.perf_counter() - start
+        logger.info(f"{'':<26}streaming     {count / elapsed:8.0f} pages/s  "
+                    f"{raw_bytes / elapsed / 1e6:6.1f} MB/s decoded")
+        store.close()
+
+    store, _ = archive(pages[:40], 30)
+    start = time.perf_counter()
+    titles = [result["title"] for _, result in store.reextract(extract_main_content)]
+    logger.info(f"re-extracted {len(titles)} pages in {time.perf_counter() - start:.2f}s")
+    store.close()
+
+if __name__ == "__main__":
+    main()
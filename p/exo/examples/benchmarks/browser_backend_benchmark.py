@@ -0,0 +1,92 @@
+"""
+Memory and latency per page for the HTTP and Playwright browser backends.
+
+Serves server-rendered article pages from a local fixture server and
+scrapes each with ``HttpBrowser`` (fetch plus a standard-library DOM)
+and ``PlaywrightBrowser`` (headless Chromium), extracting the body text
+and the headings through a selector. Latency is per page, sequentially;
+memory is the resident size of this process plus any browser child
+processes after the run. Run with:
+
+    python -m exo.examples.benchmarks.browser_backend_benchmark [pages]
+"""
+import asyncio
+import logging
+import random
+import statistics
+import sys
+import time
+
+import psutil
+
+from exo.scraper.browser import HttpBrowser, PlaywrightBrowser
+
+from .fixtures import FixtureServer
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+WORDS = ("market growth report analysis data model system policy research energy "
+         "climate city health school network software design history science").split()
+
+def article(rng: random.Random, index: int) -> str:
+    sections = []
+    for s in range(6):
+        paragraphs = "".join(
+            "<p>" + " ".join(rng.choice(WORDS) for _ in range(60)) + ".</p>" for _ in range(4)
+        )
+        sections.append(f"<section><h2>Section {s}</h2>{paragraphs}</section>")
+    nav = "".join(f'<li><a href="/p/{i}">Page {i}</a></li>' for i in range(30))
+    return (f"<!DOCTYPE html><html><head><title>Article {index}</title></head><body>"
+            f"<nav><ul>{nav}</ul></nav><main><article><h1>Article {index}</h1>"
+            f"{''.join(sections)}</article></main><footer>Footer</footer></body></html>")
+
+def resident_mb() -> float:
+    process = psutil.Process()
+    total = process.memory_info().rss
+    for child in process.children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / 1e6
+
+async def run(browser, urls):
+    await browser.initialize()
+    page = await browser.new_page()
+    timings = []
+    for url in urls:
+        start = time.perf_counter()
+        await browser.goto(url, page=page)
+        text = await browser.get_content(text=True, page=page)
+        headings = await browser.query_all("article h2", page=page)
+        timings.append(time.perf_counter() - start)
+        assert text and headings["count"] == 6
+    memory = resident_mb()
+    await browser.close()
+    return timings, memory
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    rng = random.Random(11)
+    routes = {f"/a/{i}": ("text/html; charset=utf-8", article(rng, i)) for i in range(count)}
+    page_kb = sum(len(body) for _, body in routes.values()) / count / 1000
+    logger.info(f"{count} pages of {page_kb:.0f} KB, baseline {resident_mb():.0f} MB resident")
+
+    with FixtureServer(routes) as server:
+        urls = [server.url(path) for path in routes]
+        for name, browser in (("http", HttpBrowser()), ("playwright", PlaywrightBrowser())):
+            try:
+                timings, memory = await run(browser, urls)
+            except Exception as e:
+                logger.info(f"{name:>10}: skipped ({str(e).splitlines()[0]})")
+                await browser.close()
+                continue
+            timings.sort()
+            logger.info(f"{name:>10}: median {statistics.median(timings) * 1000:6.1f} ms/page, "
+                        f"p95 {timings[int(len(timings) * 0.95) - 1] * 1000:6.1f} ms, "
+                        f"{memory:6.0f} MB resident")
+
+if __name__ == "__main__":
+    asyncio.run(main())
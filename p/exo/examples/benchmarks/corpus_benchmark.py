@@ -0,0 +1,83 @@
+"""
+Memory-mapped corpus versus pickling page dicts to worker processes.
+
+Runs the same per-document jobs over a synthetic corpus two ways:
+passing page dicts through ``ProcessPoolExecutor.map``, which pickles
+every text into the workers, and handing workers row ranges of a corpus
+they ``mmap``. A light job (token estimate) shows the transfer overhead;
+a heavy one (SimHash fingerprinting, as used by deduplication) shows
+how much of it remains when the work dominates. Run with:
+
+    python -m exo.examples.benchmarks.corpus_benchmark [documents] [workers]
+"""
+import logging
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from exo.scraper.dedup import estimate_tokens, shingle_hashes, simhash
+from exo.storage.corpus import CorpusWriter, map_corpus
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+WORDS = ("market growth report analysis data model system policy research energy "
+         "climate city health school network software design history science").split()
+
+def tokens(url: str, text: str) -> int:
+    return estimate_tokens(text)
+
+def fingerprint(url: str, text: str) -> int:
+    return int(simhash(shingle_hashes(text)))
+
+def tokens_document(document: dict) -> int:
+    return tokens(document["url"], document["content"])
+
+def fingerprint_document(document: dict) -> int:
+    return fingerprint(document["url"], document["content"])
+
+def documents(count: int, words: int = 1500):
+    rng = random.Random(5)
+    for i in range(count):
+        yield {"url": f"https://site{i % 50}.example/page/{i}",
+               "content": " ".join(rng.choice(WORDS) for _ in range(words))}
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else min(4, os.cpu_count() or 1)
+    docs = list(documents(count))
+    text_bytes = sum(len(doc["content"]) for doc in docs)
+    logger.info(f"{count} documents, {text_bytes / 1e6:.0f} MB of text, {workers} workers")
+
+    path = tempfile.mkdtemp()
+    start = time.perf_counter()
+    with CorpusWriter(path) as writer:
+        for doc in docs:
+            writer.append_result(doc)
+    logger.info(f"{'write corpus':<22}{time.perf_counter() - start:8.2f}s")
+
+    with ProcessPoolExecutor(workers) as executor:
+        list(executor.map(int, range(workers)))  # start the workers
+
+        pickled = sum(len(pickle.dumps(doc)) for doc in docs)
+        tasks = len(range(0, count, 256))
+        logger.info(f"pickled to workers: {pickled / 1e6:.0f} MB as dicts, "
+                    f"{len(pickle.dumps((path, 0, 256, tokens))) * tasks / 1e3:.0f} kB as row ranges")
+        for job, per_document in ((tokens, tokens_document), (fingerprint, fingerprint_document)):
+            start = time.perf_counter()
+            baseline = list(executor.map(per_document, docs, chunksize=256))
+            pickled_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            mapped = list(map_corpus(path, job, executor, batch_size=256))
+            mapped_time = time.perf_counter() - start
+            assert mapped == baseline
+            logger.info(f"{job.__name__:<12} pickled dicts {pickled_time:7.2f}s  "
+                        f"mmap corpus {mapped_time:7.2f}s")
+
+if __name__ == "__main__":
+    main()
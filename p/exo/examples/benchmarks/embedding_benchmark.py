@@ -0,0 +1,57 @@
+"""
+Throughput benchmark for local Hugging Face embeddings.
+
+Embeds a corpus of passages with very uneven lengths (like chunks of
+scraped pages) three ways: batches in input order, length-bucketed
+batches, and a second pass that is answered from the content-hash
+cache. Requires ``transformers`` and ``torch``. Run with:
+
+    python -m exo.examples.benchmarks.embedding_benchmark [model_name]
+"""
+import logging
+import random
+import sys
+import time
+
+from exo.providers.embeddings import EmbeddingCache, embed_with_cache
+from exo.providers.huggingface import HuggingFaceModel
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+random.seed(3)
+WORDS = ("search result page article data model price review city energy health "
+         "software history science network policy research market").split()
+
+def corpus(size: int) -> list:
+    texts = []
+    for _ in range(size):
+        length = random.choice((8, 16, 32, 64, 128, 256))
+        texts.append(" ".join(random.choice(WORDS) for _ in range(length)))
+    return texts
+
+def timed(label: str, texts: list, run) -> None:
+    start = time.perf_counter()
+    vectors = run()
+    elapsed = time.perf_counter() - start
+    logger.info(f"{label:<22}{len(texts) / elapsed:>10.1f} texts/s  shape={vectors.shape}")
+
+def main():
+    model_name = sys.argv[1] if len(sys.argv) > 1 else "sshleifer/tiny-gpt2"
+    model = HuggingFaceModel(model_name, device="cpu")
+    texts = corpus(512)
+    batch_size = model.embedding_batch_size
+    logger.info(f"{model_name}, {len(texts)} texts, batch size {batch_size}")
+
+    timed("input order", texts, lambda: embed_with_cache(
+        texts, model_name, model._embed_batch, batch_size, length=None))
+    timed("length-bucketed", texts, lambda: embed_with_cache(
+        texts, model_name, model._embed_batch, batch_size, length=model._embed_length))
+
+    model.embedding_cache = EmbeddingCache()
+    timed("bucketed + cache (cold)", texts, lambda: model.embed(texts))
+    timed("bucketed + cache (warm)", texts, lambda: model.embed(texts))
+    logger.info(f"cache hits={model.embedding_cache.hits} misses={model.embedding_cache.misses}")
+
+if __name__ == "__main__":
+    main()
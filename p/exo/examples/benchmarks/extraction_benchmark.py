@@ -0,0 +1,62 @@
+"""
+Micro-benchmark: per-element handles vs batched in-page extraction.
+
+Loads a fixture page with 1,000 matching elements and extracts their text
+both ways. Run with:
+
+    python -m exo.examples.benchmarks.extraction_benchmark
+"""
+import asyncio
+import logging
+import time
+
+from playwright.async_api import async_playwright
+
+from exo.scraper.extraction import extract_selectors
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+NUM_ELEMENTS = 1000
+
+FIXTURE = "<html><body><ul>" + "".join(
+    f'<li class="item"><a href="/item/{i}">Item {i}</a> <span>{"detail " * 20}</span></li>'
+    for i in range(NUM_ELEMENTS)
+) + "</ul></body></html>"
+
+async def per_element(page) -> list:
+    elements = await page.query_selector_all("li.item")
+    results = []
+    for element in elements:
+        text = await element.text_content()
+        results.append(text.strip())
+    return results
+
+async def batched(page) -> list:
+    extracted = await extract_selectors(page, [
+        {"name": "text", "selector": "li.item"},
+        {"name": "links", "selector": "li.item a", "type": "attr", "attribute": "href"},
+    ])
+    return extracted["text"]["results"]
+
+async def timed(func, page, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        results = await func(page)
+        assert len(results) == NUM_ELEMENTS
+    return (time.perf_counter() - start) / rounds
+
+async def main(rounds: int = 5):
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.set_content(FIXTURE)
+        slow = await timed(per_element, page, rounds)
+        fast = await timed(batched, page, rounds)
+        logger.info(f"per-element handles: {slow * 1000:8.1f} ms")
+        logger.info(f"batched evaluation:  {fast * 1000:8.1f} ms (text + hrefs)")
+        logger.info(f"speedup:             {slow / fast:8.1f}x")
+        await browser.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
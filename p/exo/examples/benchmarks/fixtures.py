@@ -0,0 +1,102 @@
+"""
+Local fixture HTTP server used by the benchmarks.
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple, Union
+
+# A route is either a static (content_type, body) pair or a callable that
+# receives the request path and returns (status, content_type, body).
+Route = Union[Tuple[str, str], Callable[[str], Tuple[int, str, str]]]
+
+class FixtureServer:
+    """
+    Threaded HTTP server serving in-memory fixture pages.
+
+    Can be used as a context manager; the server listens on an ephemeral
+    port on localhost and ``url(path)`` builds absolute URLs for it.
+    """
+    
+    def __init__(self, routes: Optional[Dict[str, Route]] = None,
+                 fallback: Optional[Callable[[str], Tuple[int, str, str]]] = None):
+        """
+        Initialize the fixture server.
+        
+        Args:
+            routes: Mapping of path (without query string) to route
+            fallback: Handler for paths not in ``routes`` (default: 404)
+        """
+        self.routes = routes or {}
+        self.fallback = fallback
+        self.hits: Dict[str, int] = {}
+        self._server = None
+        self._thread = None
+    
+    def _make_handler(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                server.hits[path] = server.hits.get(path, 0) + 1
+                route = server.routes.get(path)
+                if route is None and server.fallback is not None:
+                    route = server.fallback
+                if route is None:
+                    status, content_type, body = 404, "text/plain", "not found"
+                elif callable(route):
+                    status, content_type, body = route(self.path)
+                else:
+                    status, (content_type, body) = 200, route
+                payload = body.encode("utf-8") if isinstance(body, str) else body
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", content_type)
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+    
+    def start(self) -> "FixtureServer":
+        """Start serving in a background thread."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+    
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def url(self, path: str) -> str:
+        """Build an absolute URL for a path on this server."""
+        return f"{self.base_url}{path}"
+    
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+    
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+def slow_route(delay: float, content_type: str = "text/plain", body: str = "ok"):
+    """Build a route that sleeps before answering (e.g. a long-poll endpoint)."""
+    def handler(path: str) -> Tuple[int, str, str]:
+        time.sleep(delay)
+        return 200, content_type, body
+    return handler
@@ -0,0 +1,131 @@
+"""
+End-to-end latency of search follow-ups with and without prefetch.
+
+Replays a scripted agent session against local fixtures: each turn the
+agent searches (a stub search engine returns five result URLs, which
+are scraped like the ``web_search`` tool does, with a per-result
+timeout), the model spends a while writing its answer, the user follows
+up, the model picks a page to scrape (usually a top result, sometimes
+the one that was too slow for the search, sometimes a page outside the
+results) and writes a final answer from it. Pages are served with a
+fixed delay, one result per search with four times that, and model
+calls sleep for a fixed "thinking" time. Reports the time from search
+results to final answer per turn, the page requests made, and the
+prefetch cache's hits, joined fetches and cancellations. Run with:
+
+    python -m exo.examples.benchmarks.prefetch_benchmark [turns] [page_ms] [think_ms]
+"""
+import asyncio
+import logging
+import random
+import statistics
+import sys
+import time
+
+from exo.scraper.politeness import HostScheduler
+from exo.scraper.prefetch import Prefetcher
+from exo.scraper.processing import HtmlProcessor
+from exo.scraper.search import HttpJsonBackend, StubSearchServer
+from exo.scraper.tools.scraper import WebScraper
+
+from .fixtures import FixtureServer, slow_route
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logging.getLogger("exo").setLevel(logging.ERROR)
+logger = logging.getLogger(__name__)
+
+WORDS = ("market growth report analysis data model system policy research energy "
+         "climate city health school network software design history science").split()
+RESULTS_PER_SEARCH = 5
+# Page the model scrapes next: a result rank, "slow" for the result the
+# search timed out on, or None for a page outside the results.
+PICKS = [0] * 5 + [1] * 2 + [2] + ["slow"] + [None]
+
+def article(rng: random.Random, index: int) -> str:
+    paragraphs = "".join(
+        "<p>" + " ".join(rng.choice(WORDS) for _ in range(80)) + ".</p>" for _ in range(12)
+    )
+    return (f"<!DOCTYPE html><html><head><title>Page {index}</title></head><body>"
+            f"<main><article><h1>Page {index}</h1>{paragraphs}</article></main></body></html>")
+
+async def think(seconds: float) -> None:
+    """A model call."""
+    await asyncio.sleep(seconds)
+
+async def turn(scraper: WebScraper, prefetcher, query, pick, think_time):
+    results = await scraper.search_and_scrape(query, RESULTS_PER_SEARCH, main_content=True)
+    start = time.perf_counter()
+    if prefetcher is not None:
+        # What web_search does with a prefetcher
+        prefetcher.cancel()
+        prefetcher.add(results)
+        prefetcher.prefetch(result["url"] for result in results if result.get("timed_out"))
+    await think(think_time)  # answer from the search results
+    await think(think_time)  # read the follow-up, choose a page
+    page = None
+    if prefetcher is not None:
+        page = await prefetcher.get(pick)
+    if page is None:
+        page = await scraper.scrape_url(pick, main_content=True)
+    assert "content" in page, page
+    await think(think_time)  # answer from the page
+    return time.perf_counter() - start
+
+async def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    page_delay = (float(sys.argv[2]) if len(sys.argv) > 2 else 400) / 1000
+    think_time = (float(sys.argv[3]) if len(sys.argv) > 3 else 300) / 1000
+    rng = random.Random(5)
+    pages_per_turn = RESULTS_PER_SEARCH + 1
+    routes = {}
+    script = []
+    for t in range(turns):
+        base = t * pages_per_turn
+        slow = rng.randrange(RESULTS_PER_SEARCH)
+        for i in range(pages_per_turn):
+            delay = page_delay * 4 if i == slow else page_delay
+            routes[f"/p/{base + i}"] = slow_route(delay, "text/html; charset=utf-8",
+                                                  article(rng, base + i))
+        pick = rng.choice(PICKS)
+        path = (f"/p/{base + RESULTS_PER_SEARCH}" if pick is None else
+                f"/p/{base + (slow if pick == 'slow' else pick)}")
+        script.append((f"turn {t}", path))
+    logger.info(f"{turns} turns, page delay {page_delay * 1000:.0f} ms, "
+                f"model call {think_time * 1000:.0f} ms")
+
+    with FixtureServer(routes) as server:
+        def search_results(query):
+            base = int(query.split()[-1]) * pages_per_turn
+            return [{"url": server.url(f"/p/{base + rank}"), "title": f"Result {rank}",
+                     "content": ""} for rank in range(RESULTS_PER_SEARCH)]
+
+        with StubSearchServer(results=search_results) as engine:
+            for prefetch in (False, True):
+                # Same script in both modes; count page requests per mode.
+                server.hits.clear()
+                scraper = WebScraper(backend="http", processor=HtmlProcessor(workers=0),
+                                     search_backend=HttpJsonBackend(endpoint=engine.endpoint),
+                                     result_timeout=page_delay * 2)
+                scraper.scheduler = HostScheduler(min_delay=0, per_host_concurrency=8,
+                                                  respect_robots=False)
+                prefetcher = Prefetcher(fetch=lambda url: scraper.scrape_url(url, main_content=True),
+                                        top_k=3, max_concurrency=2) if prefetch else None
+                timings = []
+                for query, pick in script:
+                    timings.append(await turn(scraper, prefetcher, query, server.url(pick),
+                                              think_time))
+                label = "prefetch" if prefetch else "baseline"
+                logger.info(f"{label:>9}: median {statistics.median(timings) * 1000:6.0f} ms/turn, "
+                            f"mean {statistics.mean(timings) * 1000:6.0f} ms, "
+                            f"{sum(server.hits.values())} page requests")
+                if prefetcher is not None:
+                    stats = prefetcher.stats()
+                    logger.info(f"           hits {stats['hits']}, joined {stats['joined']}, "
+                                f"cancelled {stats['cancelled']}, "
+                                f"cache {stats['pages']} pages / {stats['bytes'] / 1000:.0f} KB")
+                    await prefetcher.close()
+                await scraper.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
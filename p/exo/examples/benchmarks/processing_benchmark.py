@@ -0,0 +1,82 @@
+"""
+HTML processing inline versus in a process pool.
+
+Processes a batch of large synthetic article pages (main content, links
+and tables) with ``HtmlProcessor`` inline and with 1, 2, 4, ... worker
+processes, reporting pages per second and the worst event-loop stall
+seen by a 10 ms ticker running alongside. Inline processing blocks the
+loop for the length of each parse; the pool keeps it responsive and
+scales with cores. Run with:
+
+    python -m exo.examples.benchmarks.processing_benchmark [pages] [max_workers]
+"""
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+
+from exo.scraper.processing import HtmlProcessor
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+WORDS = ("market growth report analysis data model system policy research energy "
+         "climate city health school network software design history science").split()
+
+def page(rng: random.Random, index: int) -> str:
+    paragraphs = "".join(
+        "<p>" + " ".join(rng.choice(WORDS) for _ in range(80)) + ", and more.</p>" for _ in range(120)
+    )
+    links = "".join(f'<li><a href="/section/{i}?ref={index}">Section {i}</a></li>' for i in range(200))
+    rows = "".join(f"<tr><td>{i}</td><td>{rng.random():.3f}</td><td>{rng.choice(WORDS)}</td></tr>"
+                   for i in range(100))
+    return (f"<html><head><title>Page {index}</title></head><body><nav><ul>{links}</ul></nav>"
+            f"<main><article><h1>Page {index}</h1>{paragraphs}"
+            f"<table><thead><tr><th>n</th><th>value</th><th>word</th></tr></thead>{rows}</table>"
+            f"</article></main><footer>Footer</footer></body></html>")
+
+async def run(processor: HtmlProcessor, pages):
+    stall = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal stall
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            stall = max(stall, time.perf_counter() - start - 0.01)
+
+    # Warm the pool up so process start-up isn't timed
+    await processor.process(pages[0][0], pages[0][1], ("main", "links", "tables"))
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    results = await processor.process_many(pages, ("main", "links", "tables"))
+    elapsed = time.perf_counter() - start
+    done = True
+    await tick
+    await processor.close()
+    assert all(result["tables"] and result["links"] for result in results)
+    return elapsed, stall
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else max(4, os.cpu_count() or 1)
+    rng = random.Random(2)
+    pages = [(page(rng, i), f"https://example.com/page/{i}") for i in range(count)]
+    size = sum(len(html) for html, _ in pages) / count / 1000
+    logger.info(f"{count} pages of {size:.0f} KB, {os.cpu_count()} CPUs")
+
+    configs = [0] + [n for n in (1, 2, 4, 8, 16) if n <= max_workers]
+    baseline = None
+    for workers in configs:
+        processor = HtmlProcessor(workers=workers, batch_size=4, inline_chars=0)
+        elapsed, stall = await run(processor, pages)
+        baseline = baseline or elapsed
+        label = "inline" if workers == 0 else f"{workers} workers"
+        logger.info(f"{label:>10}: {count / elapsed:6.1f} pages/s ({baseline / elapsed:.2f}x), "
+                    f"worst loop stall {stall * 1000:7.1f} ms")
+
+if __name__ == "__main__":
+    asyncio.run(main())
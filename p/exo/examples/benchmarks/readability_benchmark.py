@@ -0,0 +1,91 @@
+"""
+Quality and speed benchmark for main-content extraction.
+
+Each fixture wraps a known article in typical boilerplate (navigation,
+cookie banners, sidebars, related links, comments, footers). Quality is
+the word-level F1 between the extracted text and the article text, and
+is compared with dumping every text node. Run with:
+
+    python -m exo.examples.benchmarks.readability_benchmark
+"""
+import logging
+import random
+import time
+from collections import Counter
+
+from exo.scraper.dom import parse_html
+from exo.scraper.readability import extract_main_content
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+random.seed(7)
+WORDS = ("market growth report analysis data model system policy research energy "
+         "climate city health school network software design history science").split()
+
+def sentence() -> str:
+    words = [random.choice(WORDS) for _ in range(random.randint(8, 20))]
+    return " ".join(words).capitalize() + ", " + " ".join(random.choice(WORDS) for _ in range(6)) + "."
+
+def paragraphs(count: int) -> list:
+    return [" ".join(sentence() for _ in range(random.randint(3, 6))) for _ in range(count)]
+
+NAV = '<nav class="site-nav"><ul>' + "".join(f'<li><a href="/s{i}">Section {i}</a></li>' for i in range(15)) + "</ul></nav>"
+COOKIE = '<div id="cookie-banner" class="consent">We use cookies to improve your experience. <button>Accept all</button></div>'
+FOOTER = '<footer><p>Copyright 2024 Example Media. All rights reserved. Terms, privacy, contact.</p>' + "".join(f'<a href="/f{i}">Link {i}</a>' for i in range(20)) + "</footer>"
+SIDEBAR = '<aside class="sidebar"><h3>Trending</h3><ul>' + "".join(f'<li><a href="/t{i}">Trending story number {i} about things</a></li>' for i in range(10)) + "</ul></aside>"
+RELATED = '<div class="related-posts">' + "".join(f'<div><a href="/r{i}">Related article {i}: a long headline for the link list</a></div>' for i in range(8)) + "</div>"
+
+def news_page(body: list) -> str:
+    article = "".join(f"<p>{p}</p>" for p in body)
+    return (f'<html lang="en"><head><title>Story | Example News</title>'
+            f'<meta property="og:title" content="The Story"><meta name="author" content="A. Writer">'
+            f'<meta property="article:published_time" content="2024-05-01T10:00:00Z"></head>'
+            f'<body><header class="masthead"><a href="/">Example News</a>{NAV}</header>{COOKIE}'
+            f'<div class="layout"><main><article><h1>The Story</h1>{article}</article></main>'
+            f'{SIDEBAR}</div>{RELATED}{FOOTER}</body></html>')
+
+def blog_page(body: list) -> str:
+    post = "".join(f"<p>{p}</p>" for p in body)
+    comments = '<div id="comments">' + "".join(f'<div class="comment"><p>Nice post! {sentence()}</p></div>' for _ in range(5)) + "</div>"
+    return (f"<html><head><title>My blog post</title></head><body>{NAV}"
+            f'<div id="wrapper"><div class="post-content">{post}</div>{comments}</div>{FOOTER}</body></html>')
+
+def div_page(body: list) -> str:
+    content = "".join(f"<div>{p}</div>" for p in body)
+    return (f"<html><head><title>Docs</title></head><body>{COOKIE}{NAV}"
+            f'<div class="container"><div class="menu">{"".join(f"<div><a href=#>Item {i}</a></div>" for i in range(12))}</div>'
+            f'<div class="main-text">{content}</div></div>{FOOTER}</body></html>')
+
+def f1(predicted: str, expected: str) -> float:
+    predicted_words, expected_words = Counter(predicted.lower().split()), Counter(expected.lower().split())
+    overlap = sum((predicted_words & expected_words).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(predicted_words.values())
+    recall = overlap / sum(expected_words.values())
+    return 2 * precision * recall / (precision + recall)
+
+def main():
+    logger.info(f"{'fixture':<10}{'all text F1':>12}{'main F1':>10}")
+    for name, template in (("news", news_page), ("blog", blog_page), ("divs", div_page)):
+        body = paragraphs(8)
+        html = template(body)
+        result = extract_main_content(html, "https://example.com/story")
+        baseline = parse_html(html).find("body").text()
+        expected = "\n".join(body)
+        logger.info(f"{name:<10}{f1(baseline, expected):>12.2f}{f1(result['text'], expected):>10.2f}")
+    logger.info(f"metadata: {extract_main_content(news_page(paragraphs(2)), 'https://example.com')['metadata']}")
+
+    logger.info(f"\n{'size':>10}{'ms/page':>10}")
+    for count in (10, 100, 1000):
+        html = news_page(paragraphs(count))
+        rounds = max(1, 200 // count)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            extract_main_content(html)
+        elapsed = (time.perf_counter() - start) / rounds
+        logger.info(f"{len(html) // 1024:>8}KB{elapsed * 1000:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark adaptive readiness detection against ``networkidle`` waits.
+
+The fixture pages never go network-idle: one long-polls the server in a
+loop, another fires an analytics beacon every 250 ms. Run with:
+
+    python -m exo.examples.benchmarks.readiness_benchmark
+"""
+import asyncio
+import logging
+import time
+
+from playwright.async_api import async_playwright
+
+from exo.scraper.readiness import wait_until_ready
+from exo.examples.benchmarks.fixtures import FixtureServer, slow_route
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+ARTICLE = "<article>" + "<p>Benchmark paragraph with some text.</p>" * 50 + "</article>"
+
+LONG_POLL_PAGE = f"""<html><body>{ARTICLE}
+<script>
+(function poll() {{ fetch('/poll').then(poll, poll); }})();
+</script></body></html>"""
+
+BEACON_PAGE = f"""<html><body>{ARTICLE}
+<script>
+setInterval(() => fetch('/beacon?t=' + Date.now()), 250);
+</script></body></html>"""
+
+LATE_CONTENT_PAGE = """<html><body><div id="app">Loading...</div>
+<script>
+setTimeout(() => {
+    document.getElementById('app').innerHTML = '<div class="result">Loaded</div>';
+}, 800);
+(function poll() { fetch('/poll').then(poll, poll); })();
+</script></body></html>"""
+
+ROUTES = {
+    "/long-poll": ("text/html", LONG_POLL_PAGE),
+    "/beacon-page": ("text/html", BEACON_PAGE),
+    "/late-content": ("text/html", LATE_CONTENT_PAGE),
+    "/poll": slow_route(2.0),
+    "/beacon": ("text/plain", "ok"),
+}
+
+async def time_networkidle(page, url: str, timeout: int) -> float:
+    start = time.perf_counter()
+    try:
+        await page.goto(url, wait_until="networkidle", timeout=timeout)
+    except Exception:
+        pass
+    return time.perf_counter() - start
+
+async def time_readiness(page, url: str, selector=None) -> tuple:
+    start = time.perf_counter()
+    await page.goto(url, wait_until="domcontentloaded")
+    result = await wait_until_ready(page, selector=selector)
+    return time.perf_counter() - start, result["reason"]
+
+async def main(timeout: int = 30000):
+    with FixtureServer(ROUTES) as server:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+            cases = [
+                ("/long-poll", None),
+                ("/beacon-page", None),
+                ("/late-content", ".result"),
+            ]
+            logger.info(f"{'page':<16}{'networkidle':>14}{'readiness':>12}  reason")
+            for path, selector in cases:
+                url = server.url(path)
+                idle = await time_networkidle(page, url, timeout)
+                ready, reason = await time_readiness(page, url, selector)
+                logger.info(f"{path:<16}{idle:>13.2f}s{ready:>11.2f}s  {reason}")
+            await browser.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+"""
+Scrape throughput in-process versus across scrape worker processes.
+
+Serves article pages from several local fixture servers (one "host"
+each, so jobs shard across workers) and scrapes every page's main
+content with the HTTP backend: once in this process, then through a
+``ScrapeWorkerPool`` of each size given. Politeness delays are turned
+off so the numbers measure orchestration and extraction, which is what
+worker processes spread over cores; expect no gain on a single core.
+Run with:
+
+    python -m exo.examples.benchmarks.scrape_workers_benchmark [pages] [workers ...]
+"""
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+
+from exo.core.config import get_config
+
+# Worker processes read their config from the environment.
+os.environ["EXO_SCRAPING"] = repr({**get_config()["scraping"], "delay_between_requests": 0,
+                                   "respect_robots": False, "per_host_concurrency": 8})
+
+from exo.scraper.processing import HtmlProcessor
+from exo.scraper.tools.scraper import WebScraper
+from exo.scraper.workers import ScrapeWorkerPool, shard
+
+from .fixtures import FixtureServer
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logging.getLogger("exo").setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+HOSTS = 4
+WORDS = ("market growth report analysis data model system policy research energy "
+         "climate city health school network software design history science").split()
+
+def article(rng: random.Random, index: int) -> str:
+    sections = []
+    for s in range(8):
+        paragraphs = "".join(
+            "<p>" + " ".join(rng.choice(WORDS) for _ in range(60)) + ".</p>" for _ in range(5)
+        )
+        sections.append(f"<section><h2>Section {s}</h2>{paragraphs}</section>")
+    nav = "".join(f'<li><a href="/a/{i}">Page {i}</a></li>' for i in range(60))
+    return (f"<!DOCTYPE html><html><head><title>Article {index}</title></head><body>"
+            f"<nav><ul>{nav}</ul></nav><main><article><h1>Article {index}</h1>"
+            f"{''.join(sections)}</article></main><footer>Footer</footer></body></html>")
+
+async def run(scraper: WebScraper, urls) -> float:
+    start = time.perf_counter()
+    results = await asyncio.gather(*(scraper.scrape_url(url, main_content=True) for url in urls))
+    elapsed = time.perf_counter() - start
+    errors = [result["error"] for result in results if "error" in result]
+    assert not errors, errors[:3]
+    return elapsed
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    sizes = [int(arg) for arg in sys.argv[2:]] or [2, 4]
+    rng = random.Random(17)
+    per_host = count // HOSTS
+    servers = [FixtureServer({f"/a/{i}": ("text/html; charset=utf-8", article(rng, i))
+                              for i in range(per_host)}).start() for _ in range(HOSTS)]
+    try:
+        urls = [server.url(f"/a/{i}") for i in range(per_host) for server in servers]
+        logger.info(f"{len(urls)} pages on {HOSTS} hosts, {os.cpu_count()} CPUs")
+
+        scraper = WebScraper(backend="http", processor=HtmlProcessor(workers=0), max_concurrency=16)
+        await run(scraper, urls[:HOSTS])  # warm up connections
+        elapsed = await run(scraper, urls)
+        await scraper.close()
+        logger.info(f"in-process: {elapsed:6.2f}s, {len(urls) / elapsed:7.1f} pages/s")
+
+        for size in sizes:
+            pool = ScrapeWorkerPool(processes=size)
+            scraper = WebScraper(backend="http", processor=HtmlProcessor(workers=0),
+                                 max_concurrency=16, workers=pool)
+            await run(scraper, urls[:HOSTS])  # start the workers
+            elapsed = await run(scraper, urls)
+            shards = sorted({shard(url, size) for url in urls})
+            await scraper.close()
+            logger.info(f"{size} workers: {elapsed:6.2f}s, {len(urls) / elapsed:7.1f} pages/s "
+                        f"(hosts on workers {shards})")
+    finally:
+        for server in servers:
+            server.stop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
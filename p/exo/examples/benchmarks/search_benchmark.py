@@ -0,0 +1,79 @@
+"""
+Search backends with and without the query cache.
+
+Replays a workload of agent-style queries, where many are repeats or
+rewordings of earlier ones ("python asyncio tutorial", "Tutorial: asyncio
+in Python"), against the HTTP JSON backend pointed at a local stub
+engine that answers with a fixed delay. Reports engine requests and
+wall time with the cache off and on. Run with:
+
+    python -m exo.examples.benchmarks.search_benchmark [queries] [delay_ms]
+"""
+import asyncio
+import logging
+import random
+import sys
+import time
+
+from exo.scraper.search import (
+    CachedSearchBackend, HttpJsonBackend, SearchCache, StubSearchServer
+)
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+TOPICS = [
+    ["python", "asyncio", "tutorial"],
+    ["rust", "borrow", "checker", "lifetimes"],
+    ["solar", "panel", "efficiency", "2024"],
+    ["sqlite", "fts5", "ranking", "bm25"],
+    ["kubernetes", "pod", "autoscaling", "metrics"],
+    ["sourdough", "starter", "hydration"],
+    ["zstd", "dictionary", "compression", "ratio"],
+    ["mars", "rover", "landing", "sites"],
+]
+FILLERS = ["the", "how", "to", "a", "for", "in", "what", "is"]
+
+def workload(count: int):
+    """Queries drawn from a few topics, reordered and padded with stopwords."""
+    rng = random.Random(3)
+    for _ in range(count):
+        terms = list(rng.choice(TOPICS))
+        rng.shuffle(terms)
+        if rng.random() < 0.3:
+            terms.insert(rng.randrange(len(terms) + 1), rng.choice(FILLERS))
+        if rng.random() < 0.2:
+            terms = [term.capitalize() for term in terms]
+        yield " ".join(terms)
+
+async def run(backend, queries):
+    start = time.perf_counter()
+    for query in queries:
+        await backend.search(query, 10)
+    return time.perf_counter() - start
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    delay = (float(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+    queries = list(workload(count))
+    logger.info(f"{count} queries, {len(set(queries))} distinct strings, "
+                f"engine delay {delay * 1000:.0f} ms")
+
+    for cached in (False, True):
+        with StubSearchServer(delay=delay) as server:
+            backend = HttpJsonBackend(endpoint=server.endpoint)
+            cache = SearchCache(ttl=3600)
+            if cached:
+                backend = CachedSearchBackend(backend, cache)
+            elapsed = await run(backend, queries)
+            await backend.close()
+            label = "cached" if cached else "uncached"
+            logger.info(f"{label:>9}: {len(server.queries):4d} engine requests, "
+                        f"{elapsed:.2f}s ({elapsed / count * 1000:.1f} ms/query)")
+            if cached:
+                logger.info(f"           cache hits {cache.hits}, similar hits {cache.similar_hits}, "
+                            f"misses {cache.misses}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
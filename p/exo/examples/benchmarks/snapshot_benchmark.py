@@ -0,0 +1,123 @@
+"""
+Visible-text extraction on heavy pages: XPath walk versus a CDP DOM snapshot.
+
+Builds a page with tens of thousands of nodes (nested lists, tables and
+hidden blocks), loads it in Chromium and extracts its text three ways:
+the XPath text-node walk ``SimpleScraper`` uses, ``innerText``, and
+``extract_snapshot_text`` (one ``DOMSnapshot.captureSnapshot`` call
+rebuilt in Python). Without Chromium only the Python reconstruction is
+timed, on a synthetic snapshot of the same size. Run with:
+
+    python -m exo.examples.benchmarks.snapshot_benchmark [sections]
+"""
+import asyncio
+import logging
+import random
+import sys
+import time
+
+from exo.scraper.snapshot import extract_snapshot_text, snapshot_text
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+WORDS = ("market growth report analysis data model system policy research energy "
+         "climate city health school network software design history science").split()
+
+XPATH_SCRIPT = """
+() => {
+    const nodes = document.evaluate('//text()[normalize-space(.)!=""]', document.body,
+        null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const texts = [];
+    for (let i = 0; i < nodes.snapshotLength; i++) {
+        const node = nodes.snapshotItem(i);
+        if (!node.parentElement.closest('script, style')) texts.push(node.textContent.trim());
+    }
+    return texts.join('\\n');
+}
+"""
+
+def heavy_page(sections: int, rng: random.Random) -> str:
+    parts = []
+    for s in range(sections):
+        items = "".join(f"<li><a href='/{s}/{i}'>{rng.choice(WORDS)} {i}</a></li>" for i in range(20))
+        cells = "".join(f"<tr><td>{i}</td><td>{rng.choice(WORDS)}</td></tr>" for i in range(10))
+        hidden = f"<div style='display:none'>{' '.join(rng.choice(WORDS) for _ in range(30))}</div>"
+        parts.append(f"<section><h2>Section {s}</h2><p>{' '.join(rng.choice(WORDS) for _ in range(40))}</p>"
+                     f"<ul>{items}</ul><table>{cells}</table>{hidden}</section>")
+    return f"<html><body>{''.join(parts)}</body></html>"
+
+def synthetic_snapshot(nodes: int, rng: random.Random) -> dict:
+    """A flat snapshot shaped like Chromium's: body with nested p/span/text runs."""
+    strings = ["#document", "HTML", "BODY", "P", "SPAN", "#text", "visible", "1", "hidden"]
+    strings.extend(WORDS)
+    parents, types, names, values = [-1, 0, 1], [9, 1, 1], [0, 1, 2], [-1, -1, -1]
+    layout_nodes, styles = [1, 2], [[6, 7], [6, 7]]
+    while len(parents) < nodes:
+        p = len(parents)
+        parents.append(2); types.append(1); names.append(3); values.append(-1)
+        layout_nodes.append(p); styles.append([6, 7])
+        for _ in range(3):
+            span = len(parents)
+            parents.append(p); types.append(1); names.append(4); values.append(-1)
+            text = len(parents)
+            parents.append(span); types.append(3); names.append(5)
+            values.append(9 + rng.randrange(len(WORDS)))
+            hidden = rng.random() < 0.1
+            layout_nodes.extend([span, text])
+            styles.extend([[8 if hidden else 6, 7]] * 2)
+    return {"strings": strings, "documents": [{
+        "nodes": {"parentIndex": parents, "nodeType": types, "nodeName": names, "nodeValue": values},
+        "layout": {"nodeIndex": layout_nodes, "styles": styles}
+    }]}
+
+def timed(func, repeat: int = 3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+async def timed_async(func, repeat: int = 3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = await func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+async def in_browser(html: str) -> None:
+    from playwright.async_api import async_playwright
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.set_content(html)
+        count = await page.evaluate("() => document.getElementsByTagName('*').length")
+        logger.info(f"page with {count} elements, {len(html) / 1e6:.1f} MB of HTML")
+        for label, run in (
+            ("xpath walk", lambda: page.evaluate(XPATH_SCRIPT)),
+            ("innerText", lambda: page.evaluate("() => document.body.innerText")),
+            ("snapshot", lambda: extract_snapshot_text(page)),
+        ):
+            elapsed, result = await timed_async(run)
+            text = result["text"] if isinstance(result, dict) else result
+            extra = f", {result['hidden_chars']} hidden chars skipped" if isinstance(result, dict) else ""
+            logger.info(f"{label:>12}: {elapsed * 1000:7.1f} ms, {len(text)} chars{extra}")
+        await browser.close()
+
+async def main():
+    sections = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rng = random.Random(4)
+    snapshot = synthetic_snapshot(sections * 100, rng)
+    elapsed, result = timed(lambda: snapshot_text(snapshot))
+    logger.info(f"rebuild of a {result['nodes']}-node synthetic snapshot: {elapsed * 1000:.1f} ms "
+                f"({result['nodes'] / elapsed / 1e6:.1f} M nodes/s), "
+                f"{result['hidden_chars']} hidden chars skipped")
+    try:
+        await in_browser(heavy_page(sections, rng))
+    except Exception as e:
+        logger.info(f"browser comparison skipped ({str(e).splitlines()[0]})")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+"""
+Soak test: memory of a long-running scraper over thousands of pages.
+
+Scrapes generated local pages with one ``WebScraper`` for a long run
+and samples the resident memory of this process plus the browser
+processes as it goes. With page and context recycling the memory
+should plateau after warm-up; the script fails (exit status 1) if the
+last samples are more than the tolerance above the first post-warm-up
+sample. Uses Chromium when it is installed, otherwise the HTTP
+backend. Run with:
+
+    python -m exo.examples.benchmarks.soak_benchmark [pages] [backend] [tolerance_mb]
+"""
+import asyncio
+import logging
+import random
+import sys
+import time
+
+import psutil
+from playwright.async_api import async_playwright
+
+from exo.scraper.politeness import HostScheduler
+from exo.scraper.processing import HtmlProcessor
+from exo.scraper.tools.scraper import WebScraper
+
+from .fixtures import FixtureServer
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logging.getLogger("exo").setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+WORDS = ("market growth report analysis data model system policy research energy "
+         "climate city health school network software design history science").split()
+SAMPLES = 10
+
+def page(path: str) -> tuple:
+    rng = random.Random(path)
+    paragraphs = "".join(
+        "<p>" + " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120))) + ".</p>"
+        for _ in range(rng.randint(5, 20))
+    )
+    script = "<script>window.items = Array.from({length: 5000}, (_, i) => ({i, s: 'x'.repeat(50)}));</script>"
+    return 200, "text/html; charset=utf-8", (
+        f"<!DOCTYPE html><html><head><title>{path}</title>{script}</head><body>"
+        f"<main><article><h1>{path}</h1>{paragraphs}</article></main></body></html>"
+    )
+
+def resident_mb() -> float:
+    process = psutil.Process()
+    total = process.memory_info().rss
+    for child in process.children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / 1e6
+
+async def chromium_available() -> bool:
+    try:
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch()
+            await browser.close()
+        return True
+    except Exception as e:
+        logger.info(f"Chromium unavailable ({str(e).splitlines()[0]}); using the http backend")
+        return False
+
+async def soak(backend: str, urls, concurrency: int = 4):
+    scraper = WebScraper(backend=backend, processor=HtmlProcessor(workers=0),
+                         max_concurrency=concurrency)
+    scraper.scheduler = HostScheduler(min_delay=0, per_host_concurrency=concurrency,
+                                      respect_robots=False)
+    samples = []
+    errors = 0
+    step = max(1, len(urls) // SAMPLES)
+    start = time.perf_counter()
+    try:
+        for offset in range(0, len(urls), step):
+            batch = urls[offset:offset + step]
+            results = await asyncio.gather(*(scraper.scrape_url(url, main_content=True, max_age=0)
+                                             for url in batch))
+            errors += sum(1 for result in results if "error" in result)
+            samples.append((offset + len(batch), resident_mb()))
+            logger.info(f"{offset + len(batch):6d} pages  {samples[-1][1]:7.0f} MB  "
+                        f"recycles {scraper.recycles}, relaunches {scraper.relaunches}")
+    finally:
+        await scraper.close()
+    return samples, errors, time.perf_counter() - start
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    backend = sys.argv[2] if len(sys.argv) > 2 else "playwright"
+    tolerance = float(sys.argv[3]) if len(sys.argv) > 3 else 50
+
+    if backend == "playwright" and not await chromium_available():
+        backend = "http"
+    with FixtureServer(fallback=page) as server:
+        urls = [server.url(f"/soak/{i}") for i in range(count)]
+        samples, errors, elapsed = await soak(backend, urls)
+
+    # The first samples include warm-up (browser start, caches, pools).
+    baseline = samples[min(2, len(samples) - 1)][1]
+    final = max(mb for _, mb in samples[-3:])
+    growth = final - baseline
+    logger.info(f"{backend}: {count} pages in {elapsed:.1f}s, {errors} errors, "
+                f"memory {baseline:.0f} MB after warm-up -> {final:.0f} MB at the end "
+                f"({growth:+.0f} MB, tolerance {tolerance:.0f} MB)")
+    if growth > tolerance or errors:
+        logger.info("FAIL")
+        sys.exit(1)
+    logger.info("OK")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+"""
+Search speed and recall benchmark for the local vector index.
+
+Builds an index of clustered random vectors (a stand-in for embedded page
+chunks), then compares exact search over float32 and float16 matrices
+with IVF search at several ``nprobe`` values. Recall@10 is measured
+against exact float32 results. Run with:
+
+    python -m exo.examples.benchmarks.vector_index_benchmark [rows] [dim]
+"""
+import logging
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from exo.storage.vector_index import VectorIndex
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+def clustered_vectors(rows: int, dim: int, clusters: int = 200, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, rows)
+    return centers[labels] + 0.6 * rng.standard_normal((rows, dim)).astype(np.float32)
+
+def build(vectors: np.ndarray, dtype: str, path=None) -> VectorIndex:
+    index = VectorIndex(vectors.shape[1], dtype=dtype, path=path,
+                        capacity=len(vectors), ivf_threshold=len(vectors) + 1)
+    urls = [f"https://site{i % 500}.example/page{i // 8}" for i in range(len(vectors))]
+    for start in range(0, len(vectors), 50_000):
+        index.add(vectors[start:start + 50_000], urls[start:start + 50_000])
+    return index
+
+def run(index: VectorIndex, queries: np.ndarray, **kwargs):
+    start = time.perf_counter()
+    results = [[match["id"] for match in index.search(q, 10, **kwargs)] for q in queries]
+    return results, (time.perf_counter() - start) / len(queries) * 1000
+
+def recall(results, truth) -> float:
+    return np.mean([len(set(r) & set(t)) / len(t) for r, t in zip(results, truth)])
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    dim = int(sys.argv[2]) if len(sys.argv) > 2 else 384
+    vectors = clustered_vectors(rows, dim)
+    queries = clustered_vectors(50, dim, seed=1)
+    logger.info(f"{rows} vectors of dimension {dim}")
+
+    index32 = build(vectors, "float32")
+    truth, ms = run(index32, queries, exact=True)
+    logger.info(f"{'exact float32':<24}{ms:>8.2f} ms/query  recall@10=1.000")
+
+    with tempfile.TemporaryDirectory() as path:
+        index16 = build(vectors, "float16", path)
+        results, ms = run(index16, queries, exact=True)
+        logger.info(f"{'exact float16 (mmap)':<24}{ms:>8.2f} ms/query  recall@10={recall(results, truth):.3f}")
+        index16.save()
+        reopened = VectorIndex(dim, dtype="float16", path=path)
+        assert len(reopened) == rows
+
+    results, ms = run(index32, queries, domains=["site7.example"], exact=True)
+    logger.info(f"{'exact, domain filter':<24}{ms:>8.2f} ms/query")
+
+    start = time.perf_counter()
+    index32.train()
+    logger.info(f"IVF training: {time.perf_counter() - start:.1f}s, {len(index32.centroids)} clusters")
+    for nprobe in (4, 8, 16, 32):
+        results, ms = run(index32, queries, nprobe=nprobe)
+        logger.info(f"{f'IVF nprobe={nprobe}':<24}{ms:>8.2f} ms/query  recall@10={recall(results, truth):.3f}")
+
+if __name__ == "__main__":
+    main()
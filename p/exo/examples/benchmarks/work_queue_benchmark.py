@@ -0,0 +1,77 @@
+"""
+Bounded work queue versus ``asyncio.gather`` with a semaphore.
+
+Runs the same simulated I/O jobs (a short random sleep each, with a
+result of a few KB) through the old ``gather_with_concurrency`` helper,
+which creates every coroutine up front and returns only when all are
+done, and through ``stream_map`` in completion and input order. Reports
+wall time, time to the first result and peak traced memory. Run with:
+
+    python -m exo.examples.benchmarks.work_queue_benchmark [tasks] [concurrency]
+"""
+import asyncio
+import logging
+import random
+import sys
+import time
+import tracemalloc
+
+from exo.utils.async_utils import stream_map
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+RESULT_BYTES = 4096
+
+async def job(seed: int) -> bytes:
+    await asyncio.sleep(random.Random(seed).uniform(0.0005, 0.005))
+    return bytes(RESULT_BYTES)
+
+async def gather_with_semaphore(n: int, *tasks):
+    """The helper ``stream_map`` replaces."""
+    semaphore = asyncio.Semaphore(n)
+
+    async def sem_task(task):
+        async with semaphore:
+            return await task
+    return await asyncio.gather(*(sem_task(task) for task in tasks))
+
+async def consume(result: bytes) -> int:
+    # What a caller does with each result: handle it, then drop it.
+    return len(result)
+
+async def run_gather(count: int, concurrency: int):
+    results = await gather_with_semaphore(concurrency, *(job(i) for i in range(count)))
+    first = time.perf_counter()
+    for result in results:
+        await consume(result)
+    return first
+
+async def run_stream(count: int, concurrency: int, ordered: bool):
+    first = None
+    async for result in stream_map(job, range(count), concurrency, ordered=ordered):
+        if first is None:
+            first = time.perf_counter()
+        await consume(result)
+    return first
+
+async def measure(label: str, run) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = await run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    logger.info(f"{label:>23}: {elapsed:6.2f}s total, first result after "
+                f"{(first - start) * 1000:7.1f} ms, peak memory {peak / 1e6:7.1f} MB")
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    logger.info(f"{count} jobs, concurrency {concurrency}, {RESULT_BYTES} B results")
+    await measure("gather_with_concurrency", lambda: run_gather(count, concurrency))
+    await measure("stream_map (completed)", lambda: run_stream(count, concurrency, False))
+    await measure("stream_map (ordered)", lambda: run_stream(count, concurrency, True))
+
+if __name__ == "__main__":
+    asyncio.run(main())
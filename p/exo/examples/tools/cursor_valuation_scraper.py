@@ -4,7 +4,7 @@ Example demonstrating how to use the web tools to scrape Cursor's valuation hist
 import asyncio
 import logging
 import json
-from exo.tools.web_tools import web_search, scrape_website
+from exo.scraper.tools import web_search, scrape_website
 
 # Configure logging
 logging.basicConfig(
@@ -1,10 +1,23 @@
 """
 Providers package for model imports.
+
+Each provider needs its own client library, so providers are imported
+on first use: ``from exo.providers import OpenAIProvider`` only needs
+``openai``.
 """
+from importlib import import_module
+
+_PROVIDERS = {
+    "OpenAIProvider": ".openai",
+    "GeminiProvider": ".gemini",
+    "OllamaProvider": ".ollama",
+    "HuggingFaceProvider": ".huggingface"
+}
 
-from exo.agents.providers.openai import OpenAIProvider
-from exo.agents.providers.gemini import GeminiProvider
-from exo.agents.providers.ollama import OllamaProvider
-from exo.agents.providers.huggingface import HuggingFaceProvider
+def __getattr__(name):
+    module = _PROVIDERS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module, __name__), name)
 
-__all__ = ["OpenAIProvider", "GeminiProvider", "OllamaProvider", "HuggingFaceProvider"] 
\ No newline at end of file
+__all__ = ["OpenAIProvider", "GeminiProvider", "OllamaProvider", "HuggingFaceProvider"]
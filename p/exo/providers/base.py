@@ -4,6 +4,11 @@ Base interface for AI providers.
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
 
+import numpy as np
+
+from ..core.exceptions import ProviderError
+from .embeddings import EmbeddingCache, embed_with_cache, get_embedding_cache
+
 class BaseProvider(ABC):
     """Base class for all AI providers."""
     
@@ -47,4 +52,43 @@ class BaseModel(ABC):
     @abstractmethod
     async def get_model_info(self) -> Dict[str, Any]:
         """Get information about the model."""
-        pass 
\ No newline at end of file
+        pass
+    
+    # Overridden by models that support embeddings
+    embedding_model: Optional[str] = None
+    embedding_batch_size: int = 32
+    # Default: the cache shared by every model (see ``get_embedding_cache``)
+    embedding_cache: Optional[EmbeddingCache] = None
+    
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        """Embed one batch of texts; implemented by models that support embeddings."""
+        raise ProviderError(f"{self.__class__.__name__} does not support embeddings")
+    
+    def _embed_length(self, text: str) -> int:
+        """Length used to bucket texts into batches of similar size."""
+        return len(text)
+    
+    def embed(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """
+        Embed texts into vectors.
+        
+        Texts are deduplicated, looked up in the content-hash cache, and
+        only the missing ones are embedded, in length-sorted batches.
+        
+        Args:
+            texts: The texts to embed
+            batch_size: Texts per backend call (default: ``embedding_batch_size``)
+            
+        Returns:
+            ``float32`` array of shape ``(len(texts), dim)``
+        """
+        if self.embedding_cache is None:
+            self.embedding_cache = get_embedding_cache()
+        return embed_with_cache(
+            texts,
+            self.embedding_model or self.model_name,
+            self._embed_batch,
+            batch_size or self.embedding_batch_size,
+            self.embedding_cache,
+            self._embed_length
+        )
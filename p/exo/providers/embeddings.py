@@ -0,0 +1,227 @@
+"""
+Embedding helpers shared by the providers: content-hash cache and batching.
+"""
+import atexit
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from ..core.config import get_config
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingCache:
+    """
+    Content-hash cache of embedding vectors.
+
+    Keys are hashes of the embedding model name and the exact text, so a
+    text is never embedded twice by the same model. The cache is an LRU in
+    memory and can be saved to and loaded from a ``.npz`` file. With a
+    path, new vectors are saved every ``save_every`` additions and at
+    interpreter exit. The cache is safe to use from several threads.
+    Models should share one cache per file through
+    ``get_embedding_cache``; separate caches on one file overwrite each
+    other's saves.
+    """
+
+    def __init__(self, max_entries: Optional[int] = 100_000, path: Optional[str] = None,
+                 save_every: Optional[int] = 1000):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached vectors (None: unbounded)
+            path: ``.npz`` file to load now and write on ``save()``
+            save_every: New vectors after which ``autosave`` writes the file
+                (None: only on ``save``/``flush`` and at exit)
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self.save_every = save_every
+        self._vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._unsaved = 0
+        self.hits = 0
+        self.misses = 0
+        if path:
+            if os.path.exists(path):
+                self.load(path)
+            atexit.register(self.flush)
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        """Cache key for a text embedded by a model."""
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Get a cached vector, counting the hit or miss."""
+        with self._lock:
+            vector = self._vectors.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._vectors.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        """Store a vector, evicting the least recently used one if full."""
+        with self._lock:
+            self._put(key, vector)
+            self._unsaved += 1
+
+    def _put(self, key: str, vector: np.ndarray) -> None:
+        self._vectors[key] = vector
+        self._vectors.move_to_end(key)
+        if self.max_entries is not None and len(self._vectors) > self.max_entries:
+            self._vectors.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def save(self, path: Optional[str] = None) -> None:
+        """
+        Write the cache to a ``.npz`` file (atomically).
+
+        Args:
+            path: Destination (default: the path given at construction)
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("No path given for saving the embedding cache")
+        with self._save_lock:
+            self._save(path)
+
+    def _save(self, path: str) -> None:
+        with self._lock:
+            entries = list(self._vectors.items())
+            self._unsaved = 0
+        vectors = {}
+        for key, vector in entries:
+            vectors.setdefault(vector.shape[0], []).append((key, vector))
+        # Group by dimension so vectors from different models can coexist.
+        arrays = {}
+        for dim, dim_entries in vectors.items():
+            arrays[f"keys_{dim}"] = np.array([key for key, _ in dim_entries])
+            arrays[f"vectors_{dim}"] = np.stack([vector for _, vector in dim_entries])
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+        logger.debug(f"Saved {len(entries)} cached embeddings to {path}")
+
+    def flush(self) -> None:
+        """Save to the cache's path if vectors were added since the last save."""
+        if self.path and self._unsaved:
+            self.save()
+
+    def autosave(self) -> None:
+        """Save to the cache's path once ``save_every`` vectors were added since the last save."""
+        if not (self.path and self.save_every and self._unsaved >= self.save_every):
+            return
+        # Skip while another thread is saving; a later autosave or flush writes the rest
+        if self._save_lock.acquire(blocking=False):
+            try:
+                self._save(self.path)
+            finally:
+                self._save_lock.release()
+
+    def load(self, path: str) -> None:
+        """Load vectors from a ``.npz`` file written by ``save``."""
+        with np.load(path) as data, self._lock:
+            for name in data.files:
+                if name.startswith("keys_"):
+                    dim = name[len("keys_"):]
+                    for key, vector in zip(data[name], data[f"vectors_{dim}"]):
+                        self._put(str(key), vector)
+        logger.info(f"Loaded {len(self)} cached embeddings from {path}")
+
+# Path (None: in memory) -> the cache shared by every model using it
+_caches: Dict[Optional[str], EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+def get_embedding_cache(path: Optional[str] = None) -> EmbeddingCache:
+    """
+    The shared embedding cache for a file, created on first use.
+
+    Args:
+        path: ``.npz`` file (default: ``embeddings.cache_path`` from
+            config; without one, the shared in-memory cache)
+
+    Returns:
+        The cache every caller with the same path gets
+    """
+    embeddings_config = get_config()["embeddings"]
+    path = path or embeddings_config.get("cache_path")
+    key = os.path.abspath(path) if path else None
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = EmbeddingCache(embeddings_config.get("cache_entries"), path,
+                                   embeddings_config.get("cache_save_every", 1000))
+            _caches[key] = cache
+        return cache
+
+def default_batch_size(provider: str, fallback: int = 32) -> int:
+    """The configured embedding batch size for a provider."""
+    return get_config()["embeddings"].get("batch_size", {}).get(provider, fallback)
+
+def embed_with_cache(texts: List[str], model: str,
+                     embed_batch: Callable[[List[str]], np.ndarray],
+                     batch_size: int, cache: Optional[EmbeddingCache] = None,
+                     length: Optional[Callable[[str], int]] = len) -> np.ndarray:
+    """
+    Embed texts in batches, skipping anything already cached.
+
+    Duplicate texts are embedded once. Texts that need embedding are
+    sorted by length before batching, so each batch holds texts of similar
+    length and padding (for local models) is kept to a minimum.
+
+    Args:
+        texts: Texts to embed
+        model: Embedding model name (part of the cache key)
+        embed_batch: Function embedding one batch of texts into a 2-D array
+        batch_size: Maximum texts per call to ``embed_batch``
+        cache: Cache to consult and fill
+        length: Length measure used to bucket texts (None: keep input order)
+
+    Returns:
+        ``float32`` array of shape ``(len(texts), dim)``
+    """
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    keys = [EmbeddingCache.key(model, text) for text in texts]
+    vectors = {}
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key in vectors or key in missing:
+            continue
+        vector = cache.get(key) if cache is not None else None
+        if vector is None:
+            missing[key] = text
+        else:
+            vectors[key] = vector
+
+    pending = list(missing.items())
+    if length is not None:
+        pending.sort(key=lambda item: length(item[1]))
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        embedded = np.asarray(embed_batch([text for _, text in batch]), dtype=np.float32)
+        for (key, _), vector in zip(batch, embedded):
+            vectors[key] = vector
+            if cache is not None:
+                cache.put(key, vector)
+
+    if pending:
+        logger.debug(f"Embedded {len(pending)} of {len(texts)} texts with {model}")
+        if cache is not None:
+            cache.autosave()
+    return np.stack([vectors[key] for key in keys])
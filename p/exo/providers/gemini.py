@@ -8,7 +8,7 @@ from typing import Dict, Any, List, Optional
 import google.generativeai as genai
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 
-from exo.agents.models import BaseModel
+from .base import BaseModel
 
 logger = logging.getLogger(__name__)
 
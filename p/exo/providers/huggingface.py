@@ -6,9 +6,11 @@ import logging
 from typing import Dict, Any, List, Optional
 
 from transformers import AutoModelForCausalLM, AutoTokenizer
+import numpy as np
 import torch
 
-from exo.agents.models import BaseModel
+from .base import BaseModel
+from .embeddings import default_batch_size
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +21,8 @@ class HuggingFaceModel(BaseModel):
     
     def __init__(self, model_name: str, device: str = "cuda" if torch.cuda.is_available() else "cpu",
                  temperature: float = 0.7, top_p: float = 0.9, 
-                 max_tokens: int = 2048, **kwargs):
+                 max_tokens: int = 2048, embedding_batch_size: Optional[int] = None,
+                 max_embedding_length: int = 512, **kwargs):
         """
         Initialize a Hugging Face model.
         
@@ -29,6 +32,8 @@ class HuggingFaceModel(BaseModel):
             temperature: The temperature for sampling (default: 0.7)
             top_p: The top-p value for sampling (default: 0.9)
             max_tokens: The maximum number of tokens to generate (default: 2048)
+            embedding_batch_size: Texts per forward pass in ``embed`` (default: from config)
+            max_embedding_length: Tokens per text kept when embedding (default: 512)
             **kwargs: Additional arguments to pass to the model
         """
         self.model_name = model_name
@@ -38,11 +43,15 @@ class HuggingFaceModel(BaseModel):
         self.temperature = temperature
         self.top_p = top_p
         self.max_tokens = max_tokens
+        self.embedding_batch_size = embedding_batch_size or default_batch_size("huggingface")
+        self.max_embedding_length = max_embedding_length
         
         # Load the model and tokenizer
         try:
             self.tokenizer = AutoTokenizer.from_pretrained(model_name)
             self.model = AutoModelForCausalLM.from_pretrained(model_name).to(device)
+            if self.tokenizer.pad_token is None:
+                self.tokenizer.pad_token = self.tokenizer.eos_token
             logger.info(f"Loaded Hugging Face model: {model_name} on {device}")
         except Exception as e:
             logger.error(f"Error loading model: {e}")
@@ -84,6 +93,31 @@ class HuggingFaceModel(BaseModel):
             logger.error(f"Error generating response: {e}")
             raise
     
+    def _embed_length(self, text: str) -> int:
+        """Token count, so each embedding batch pads as little as possible."""
+        return len(self.tokenizer(text, truncation=True,
+                                  max_length=self.max_embedding_length)["input_ids"])
+    
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed one batch as mean-pooled final hidden states.
+        
+        Args:
+            texts: The texts to embed
+            
+        Returns:
+            Array of embeddings in input order
+        """
+        inputs = self.tokenizer(texts, padding=True, truncation=True,
+                                max_length=self.max_embedding_length,
+                                return_tensors="pt").to(self.device)
+        with torch.no_grad():
+            outputs = self.model(**inputs, output_hidden_states=True)
+        hidden = outputs.hidden_states[-1]
+        mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+        pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+        return pooled.float().cpu().numpy()
+    
     def get_model_info(self) -> Dict[str, Any]:
         """
         Get information about the model.
@@ -4,11 +4,14 @@ Ollama provider implementation using LangChain.
 import logging
 from typing import Dict, Any, List, Optional
 
+import httpx
+import numpy as np
 from langchain_community.llms import Ollama
 from langchain.callbacks.manager import CallbackManager
 from langchain.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
 
-from exo.agents.models import BaseModel
+from .base import BaseModel
+from .embeddings import default_batch_size
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +23,8 @@ class OllamaModel(BaseModel):
     def __init__(self, model_name: str, base_url: Optional[str] = None, 
                  temperature: float = 0.7, top_p: float = 0.9, 
                  top_k: int = 40, num_ctx: int = 4096, 
-                 repeat_penalty: float = 1.1, **kwargs):
+                 repeat_penalty: float = 1.1, embedding_model: Optional[str] = None,
+                 embedding_batch_size: Optional[int] = None, **kwargs):
         """
         Initialize an Ollama model.
         
@@ -32,10 +36,14 @@ class OllamaModel(BaseModel):
             top_k: The top-k value for sampling (default: 40)
             num_ctx: The context window size (default: 4096)
             repeat_penalty: The repeat penalty (default: 1.1)
+            embedding_model: The model used by ``embed`` (default: model_name)
+            embedding_batch_size: Texts per embed request (default: from config)
             **kwargs: Additional arguments to pass to the Ollama model
         """
         self.model_name = model_name
         self.base_url = base_url or "http://localhost:11434"
+        self.embedding_model = embedding_model or model_name
+        self.embedding_batch_size = embedding_batch_size or default_batch_size("ollama")
         
         # Create a callback manager for streaming output
         callback_manager = CallbackManager([StreamingStdOutCallbackHandler()])
@@ -73,6 +81,28 @@ class OllamaModel(BaseModel):
             logger.error(f"Error generating response: {e}")
             raise
     
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a batch of texts with the Ollama ``/api/embed`` endpoint.
+        
+        Args:
+            texts: The texts to embed (one request)
+            
+        Returns:
+            Array of embeddings in input order
+        """
+        try:
+            response = httpx.post(
+                f"{self.base_url.rstrip('/')}/api/embed",
+                json={"model": self.embedding_model, "input": texts},
+                timeout=120.0
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.error(f"Error creating embeddings: {e}")
+            raise
+        return np.array(response.json()["embeddings"], dtype=np.float32)
+    
     def get_model_info(self) -> Dict[str, Any]:
         """
         Get information about the model.
@@ -5,10 +5,12 @@ import os
 import logging
 from typing import Dict, Any, List, Optional, Union
 
+import numpy as np
 from openai import OpenAI
 from openai.types.chat import ChatCompletion, ChatCompletionMessage
 
-from exo.agents.models import BaseModel
+from .base import BaseModel
+from .embeddings import default_batch_size
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +22,9 @@ class OpenAIModel(BaseModel):
     def __init__(self, model_name: str, api_key: Optional[str] = None, 
                  temperature: float = 0.7, top_p: float = 0.9, 
                  max_tokens: int = 2048, presence_penalty: float = 0.0,
-                 frequency_penalty: float = 0.0, **kwargs):
+                 frequency_penalty: float = 0.0,
+                 embedding_model: str = "text-embedding-3-small",
+                 embedding_batch_size: Optional[int] = None, **kwargs):
         """
         Initialize an OpenAI model.
         
@@ -32,6 +36,8 @@ class OpenAIModel(BaseModel):
             max_tokens: The maximum number of tokens to generate (default: 2048)
             presence_penalty: The presence penalty (default: 0.0)
             frequency_penalty: The frequency penalty (default: 0.0)
+            embedding_model: The model used by ``embed`` (default: text-embedding-3-small)
+            embedding_batch_size: Texts per embeddings request (default: from config)
             **kwargs: Additional arguments to pass to the OpenAI model
         """
         self.model_name = model_name
@@ -49,6 +55,8 @@ class OpenAIModel(BaseModel):
         self.max_tokens = max_tokens
         self.presence_penalty = presence_penalty
         self.frequency_penalty = frequency_penalty
+        self.embedding_model = embedding_model
+        self.embedding_batch_size = embedding_batch_size or default_batch_size("openai")
         
         logger.info(f"Initialized OpenAI model: {model_name}")
     
@@ -84,6 +92,24 @@ class OpenAIModel(BaseModel):
             logger.error(f"Error generating response: {e}")
             raise
     
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a batch of texts with the OpenAI embeddings API.
+        
+        Args:
+            texts: The texts to embed (one request)
+            
+        Returns:
+            Array of embeddings in input order
+        """
+        try:
+            response = self.client.embeddings.create(model=self.embedding_model, input=texts)
+        except Exception as e:
+            logger.error(f"Error creating embeddings: {e}")
+            raise
+        data = sorted(response.data, key=lambda item: item.index)
+        return np.array([item.embedding for item in data], dtype=np.float32)
+    
     def get_model_info(self) -> Dict[str, Any]:
         """
         Get information about the model.
@@ -0,0 +1,38 @@
+"""
+Browser backends: a real browser and a cheap HTTP one.
+"""
+from typing import Optional
+
+from ...core.config import get_config
+from ...core.exceptions import ConfigError
+from .base import BaseBrowser
+from .http_browser import HttpBrowser, HttpPage, needs_browser
+from .playwright_browser import PlaywrightBrowser
+
+BROWSER_BACKENDS = {
+    "http": HttpBrowser,
+    "playwright": PlaywrightBrowser
+}
+
+def create_browser(name: Optional[str] = None) -> BaseBrowser:
+    """
+    Create a browser backend by name.
+
+    Args:
+        name: ``"http"`` or ``"playwright"`` (default: ``browser.backend`` from config)
+
+    Returns:
+        An uninitialized browser
+
+    Raises:
+        ConfigError: If the backend name is unknown
+    """
+    name = name or get_config()["browser"].get("backend", "http")
+    if name not in BROWSER_BACKENDS:
+        raise ConfigError(f"Unknown browser backend: {name}")
+    return BROWSER_BACKENDS[name]()
+
+__all__ = [
+    "BaseBrowser", "HttpBrowser", "HttpPage", "PlaywrightBrowser", "BROWSER_BACKENDS",
+    "create_browser", "needs_browser"
+]
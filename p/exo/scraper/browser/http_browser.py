@@ -0,0 +1,254 @@
+"""
+Browser backend without a browser: HTTP fetches and a lightweight DOM.
+
+Pages are fetched with a pooled ``httpx`` client and parsed with the
+standard-library HTML parser (``exo.scraper.dom``). No JavaScript runs,
+so this costs a few megabytes and one round trip per page instead of a
+Chromium renderer, and suits server-rendered pages. ``needs_browser``
+tells when a page only renders its content client-side.
+"""
+import logging
+import re
+from typing import Dict, Any, List, Optional
+
+import httpx
+
+from ...core.config import get_config
+from ...core.exceptions import BrowserError, ParserError
+from ..dom import VOID_ELEMENTS, Node, parse_html, select
+from ...utils.deadline import check, time_left
+from .base import BaseBrowser
+
+logger = logging.getLogger(__name__)
+
+_TAGS = re.compile(r"<script\b.*?</script>|<style\b.*?</style>|<[^>]+>", re.S | re.I)
+
+def needs_browser(html: str, min_text_length: int = 200) -> bool:
+    """
+    Guess whether a page only renders its content with JavaScript.
+
+    Args:
+        html: HTML returned by a plain HTTP fetch
+        min_text_length: Pages with less visible text than this are suspect
+
+    Returns:
+        True if the page has scripts but almost no server-rendered text
+    """
+    if "<script" not in html.lower():
+        return False
+    text = _TAGS.sub(" ", html)
+    return len(" ".join(text.split())) < min_text_length
+
+class HttpPage:
+    """A fetched page: its URL, response status and lazily parsed DOM."""
+
+    def __init__(self):
+        self.url: Optional[str] = None
+        self.status: Optional[int] = None
+        self.content_type = ""
+        self.html = ""
+        self._root: Optional[Node] = None
+
+    @property
+    def root(self) -> Node:
+        """The parsed document (parsed on first access)."""
+        if self._root is None:
+            self._root = parse_html(self.html)
+        return self._root
+
+    def _load(self, response: httpx.Response) -> None:
+        self.url = str(response.url)
+        self.status = response.status_code
+        self.content_type = response.headers.get("content-type", "")
+        is_text = self.content_type.startswith(("text/", "application/xhtml", "application/xml"))
+        self.html = response.text if is_text or not self.content_type else ""
+        self._root = None
+
+    def text(self) -> str:
+        """The visible text of the page body."""
+        body = self.root.find("body") or self.root
+        return body.text()
+
+class HttpBrowser(BaseBrowser):
+    """
+    ``BaseBrowser`` over plain HTTP. Cheap, but runs no JavaScript.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, max_connections: int = 100,
+                 user_agent: Optional[str] = None):
+        """
+        Initialize the HTTP browser.
+
+        Args:
+            timeout: Request timeout in seconds (default: the browser timeout from config)
+            max_connections: Maximum number of open connections
+            user_agent: User-Agent header to send (default: from config)
+        """
+        self.timeout = timeout or get_config()["browser"].get("timeout", 30000) / 1000
+        self.max_connections = max_connections
+        self.user_agent = user_agent or get_config()["scraping"]["user_agent"]
+        self.client: Optional[httpx.AsyncClient] = None
+        self.page: Optional[HttpPage] = None
+
+    async def initialize(self, **kwargs) -> None:
+        """Open the connection pool (extra arguments go to ``httpx.AsyncClient``)."""
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={"User-Agent": self.user_agent},
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+                **kwargs
+            )
+
+    async def new_page(self) -> HttpPage:
+        """Create a page and make it the current one."""
+        await self.initialize()
+        self.page = HttpPage()
+        return self.page
+
+    def _page(self, page: Optional[HttpPage]) -> HttpPage:
+        page = page or self.page
+        if page is None:
+            raise BrowserError("No page open; call new_page() or goto() first")
+        return page
+
+    async def goto(self, url: str, page: Optional[HttpPage] = None, **kwargs) -> HttpPage:
+        """
+        Fetch a URL into a page.
+
+        Args:
+            url: The URL to fetch
+            page: Page to load into (default: the current page, or a new one)
+
+        Returns:
+            The loaded page
+
+        Raises:
+            BrowserError: If the request fails
+            DeadlineExceeded: If the request's deadline has passed
+        """
+        if page is None:
+            page = self.page or await self.new_page()
+        await self.initialize()
+        check(f"fetching {url}")
+        try:
+            response = await self.client.get(url, timeout=time_left(self.timeout))
+        except httpx.HTTPError as e:
+            raise BrowserError(f"Failed to fetch {url}: {e}") from e
+        page._load(response)
+        return page
+
+    async def get_content(self, selector: Optional[str] = None, text: bool = False,
+                          page: Optional[HttpPage] = None, **kwargs) -> str:
+        """
+        Get the page's HTML or text, or that of the elements matching a selector.
+
+        Args:
+            selector: CSS selector (matches are joined with newlines)
+            text: Return visible text instead of HTML
+            page: Page to read (default: the current page)
+
+        Returns:
+            The content
+        """
+        page = self._page(page)
+        if selector is None:
+            return page.text() if text else page.html
+        matches = await self.query_all(selector, text=text, page=page)
+        return "\n".join(matches["results"])
+
+    async def query_all(self, selector: str, text: bool = True,
+                        max_items: Optional[int] = None, max_chars: Optional[int] = None,
+                        page: Optional[HttpPage] = None) -> Dict[str, Any]:
+        """
+        Extract every element matching a selector.
+
+        Args:
+            selector: CSS selector
+            text: Extract text if True, inner HTML otherwise
+            max_items: Maximum number of matches to return
+            max_chars: Maximum characters per match
+            page: Page to read (default: the current page)
+
+        Returns:
+            Dictionary with ``count``, ``results`` and ``truncated``, like
+            ``extract_selectors``
+
+        Raises:
+            ParserError: If the selector is outside the supported subset
+        """
+        page = self._page(page)
+        try:
+            nodes = select(page.root, selector)
+        except ValueError as e:
+            raise ParserError(str(e)) from e
+        limit = len(nodes) if max_items is None else max_items
+        results: List[str] = []
+        clipped = False
+        for node in nodes[:limit]:
+            value = node.text(" ") if text else _inner_html(node)
+            if max_chars is not None and len(value) > max_chars:
+                value = value[:max_chars]
+                clipped = True
+            results.append(value)
+        return {"count": len(nodes), "results": results,
+                "truncated": clipped or len(results) < len(nodes)}
+
+    async def wait_for_selector(self, selector: str, page: Optional[HttpPage] = None,
+                                **kwargs) -> None:
+        """
+        Check that an element is present; nothing can appear later without JavaScript.
+
+        Raises:
+            BrowserError: If no element matches
+        """
+        matches = await self.query_all(selector, max_items=1, page=page)
+        if not matches["count"]:
+            raise BrowserError(f"Selector not found in static HTML: {selector}")
+
+    async def screenshot(self, path: str, **kwargs) -> None:
+        """Not available without a rendering engine."""
+        raise BrowserError("HttpBrowser cannot take screenshots; use PlaywrightBrowser")
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        self.page = None
+
+# Elements whose text the parser keeps raw, so it is written back unescaped
+_RAW_TEXT_ELEMENTS = {"script", "style"}
+
+def _escape_text(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+def _escape_attribute(value: str) -> str:
+    return value.replace("&", "&amp;").replace('"', "&quot;")
+
+def _children(node: Node) -> List[Any]:
+    """Children to serialize, raw text marked as already serialized."""
+    if node.tag in _RAW_TEXT_ELEMENTS:
+        return [("raw", child) if isinstance(child, str) else child for child in node.children]
+    return list(node.children)
+
+def _inner_html(node: Node) -> str:
+    """Serialize an element's children back to HTML."""
+    parts: List[str] = []
+    stack: List[Any] = list(reversed(_children(node)))
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(_escape_text(item))
+        elif isinstance(item, tuple):
+            parts.append(item[1])
+        else:
+            attrs = "".join(f' {name}="{_escape_attribute(value)}"'
+                            for name, value in item.attrs.items())
+            parts.append(f"<{item.tag}{attrs}>")
+            if item.tag not in VOID_ELEMENTS:
+                stack.append(("end", f"</{item.tag}>"))
+                stack.extend(reversed(_children(item)))
+    return "".join(parts)
@@ -0,0 +1,151 @@
+"""
+Browser backend driving Chromium through Playwright.
+"""
+import logging
+from typing import Dict, Any, Optional
+
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
+
+from ...core.config import get_config
+from ...core.exceptions import BrowserError
+from ..extraction import extract_page_content, extract_selectors, selector_spec
+from ..readiness import wait_until_ready
+from .base import BaseBrowser
+
+logger = logging.getLogger(__name__)
+
+class PlaywrightBrowser(BaseBrowser):
+    """
+    ``BaseBrowser`` on a real headless Chromium. Runs JavaScript and can
+    take screenshots, at the cost of a renderer process per browser.
+    """
+
+    def __init__(self, headless: Optional[bool] = None):
+        """
+        Initialize the Playwright browser.
+
+        Args:
+            headless: Run without a window (default: from config)
+        """
+        browser_config = get_config()["browser"]
+        self.headless = browser_config.get("headless", True) if headless is None else headless
+        self.timeout = browser_config.get("timeout", 30000)
+        self.viewport = browser_config.get("viewport")
+        self.max_content_length = get_config()["scraping"].get("max_content_length")
+        self.playwright: Optional[Playwright] = None
+        self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
+        self.page: Optional[Page] = None
+
+    async def initialize(self, **kwargs) -> None:
+        """Launch Chromium (extra arguments go to ``chromium.launch``)."""
+        if self.browser is not None:
+            return
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(headless=self.headless, **kwargs)
+        self.context = await self.browser.new_context(viewport=self.viewport)
+        self.context.set_default_timeout(self.timeout)
+        logger.info("Playwright browser launched")
+
+    async def new_page(self) -> Page:
+        """Open a page and make it the current one."""
+        await self.initialize()
+        self.page = await self.context.new_page()
+        return self.page
+
+    def _page(self, page: Optional[Page]) -> Page:
+        page = page or self.page
+        if page is None:
+            raise BrowserError("No page open; call new_page() or goto() first")
+        return page
+
+    async def goto(self, url: str, page: Optional[Page] = None, **kwargs) -> Page:
+        """
+        Navigate to a URL and wait until the page is ready.
+
+        Args:
+            url: The URL to open
+            page: Page to navigate (default: the current page, or a new one)
+            **kwargs: Passed to ``page.goto`` (default ``wait_until``:
+                ``"domcontentloaded"``)
+
+        Returns:
+            The page
+
+        Raises:
+            BrowserError: If navigation fails
+        """
+        if page is None:
+            page = self.page or await self.new_page()
+        kwargs.setdefault("wait_until", "domcontentloaded")
+        try:
+            await page.goto(url, **kwargs)
+        except Exception as e:
+            raise BrowserError(f"Failed to load {url}: {e}") from e
+        await wait_until_ready(page)
+        return page
+
+    async def get_content(self, selector: Optional[str] = None, text: bool = False,
+                          page: Optional[Page] = None, max_chars: Optional[int] = None,
+                          **kwargs) -> str:
+        """
+        Get the page's HTML or text, or that of the elements matching a selector.
+
+        Args:
+            selector: CSS selector (matches are joined with newlines)
+            text: Return rendered text instead of HTML
+            page: Page to read (default: the current page)
+            max_chars: Characters to read (default: ``max_content_length``
+                from config)
+
+        Returns:
+            The content
+        """
+        page = self._page(page)
+        if selector is None:
+            extracted = await extract_page_content(page, "text" if text else "html",
+                                                   max_chars or self.max_content_length)
+            return extracted["content"]
+        matches = await self.query_all(selector, text=text, max_chars=max_chars, page=page)
+        return "\n".join(matches["results"])
+
+    async def query_all(self, selector: str, text: bool = True,
+                        max_items: Optional[int] = None, max_chars: Optional[int] = None,
+                        page: Optional[Page] = None) -> Dict[str, Any]:
+        """
+        Extract every element matching a selector in one evaluation.
+
+        Returns:
+            Dictionary with ``count``, ``results`` and ``truncated``
+        """
+        spec = selector_spec(selector, text, name="results")
+        extracted = await extract_selectors(self._page(page), [spec],
+                                            max_items=max_items, max_chars=max_chars)
+        return extracted["results"]
+
+    async def wait_for_selector(self, selector: str, page: Optional[Page] = None,
+                                **kwargs) -> None:
+        """
+        Wait for an element to appear.
+
+        Raises:
+            BrowserError: If it doesn't appear within the timeout
+        """
+        readiness = await wait_until_ready(self._page(page), selector=selector, **kwargs)
+        if readiness["reason"] != "selector":
+            raise BrowserError(f"Timed out waiting for selector: {selector}")
+
+    async def screenshot(self, path: str, page: Optional[Page] = None, **kwargs) -> None:
+        """Save a screenshot of the page."""
+        await self._page(page).screenshot(path=path, **kwargs)
+
+    async def close(self) -> None:
+        """Close Chromium and stop the Playwright driver."""
+        if self.browser is not None:
+            await self.browser.close()
+            self.browser = None
+            self.context = None
+            self.page = None
+        if self.playwright is not None:
+            await self.playwright.stop()
+            self.playwright = None
@@ -0,0 +1,14 @@
+"""
+Crawler subsystem built on top of the scraper.
+"""
+from .urls import canonicalize_url, url_host
+from .seen import BloomFilter, SeenSet
+from .frontier import Frontier
+from .links import extract_links
+from .fetchers import HttpFetcher, BrowserFetcher
+from .crawler import Crawler
+
+__all__ = [
+    "canonicalize_url", "url_host", "BloomFilter", "SeenSet", "Frontier",
+    "extract_links", "HttpFetcher", "BrowserFetcher", "Crawler"
+]
@@ -0,0 +1,211 @@
+"""
+Concurrent crawler driving the HTTP and browser fetch tiers.
+"""
+import asyncio
+import logging
+import os
+from typing import AsyncIterator, Callable, Dict, Any, Iterable, List, Optional
+
+from ...core.exceptions import RobotsDisallowedError
+from ..politeness import HostScheduler
+from .fetchers import HttpFetcher, BrowserFetcher, needs_browser
+from .frontier import Frontier
+from ..processing import HtmlProcessor, get_html_processor
+from .urls import url_host
+
+logger = logging.getLogger(__name__)
+
+CRAWL_TIERS = ("http", "browser", "auto")
+
+class Crawler:
+    """
+    Crawls sites from a set of seed URLs.
+
+    URLs are popped from a shared ``Frontier`` into a backlog of fetch
+    tasks (a few times ``concurrency``), each of which waits for a slot
+    from a ``HostScheduler``; the scheduler enforces per-host spacing,
+    concurrency caps and robots.txt while interleaving hosts. Pages are fetched through the
+    HTTP tier, the browser tier, or (``"auto"``) HTTP first with escalation
+    to the browser for pages that only render with JavaScript. Both tiers
+    run at the same time; the browser tier is additionally bounded by the
+    scraper's page pool.
+    """
+
+    def __init__(self, seeds: Iterable[str], max_depth: int = 2, max_pages: int = 100,
+                 concurrency: int = 8, tier: str = "auto",
+                 allowed_hosts: Optional[Iterable[str]] = None,
+                 scorer: Optional[Callable[[str, int], float]] = None,
+                 frontier: Optional[Frontier] = None,
+                 state_path: Optional[str] = None,
+                 checkpoint_every: int = 100,
+                 http_fetcher: Optional[HttpFetcher] = None,
+                 browser_fetcher: Optional[BrowserFetcher] = None,
+                 scheduler: Optional[HostScheduler] = None,
+                 processor: Optional[HtmlProcessor] = None):
+        """
+        Initialize the crawler.
+
+        Args:
+            seeds: URLs to start from
+            max_depth: Maximum link depth from a seed
+            max_pages: Maximum number of pages to fetch
+            concurrency: Number of concurrent fetches
+            tier: "http", "browser" or "auto"
+            allowed_hosts: Hosts to stay on (default: the hosts of the seeds)
+            scorer: Function ``(url, depth) -> priority``; lower is sooner
+            frontier: Existing frontier to continue (default: loaded from
+                ``state_path`` if it exists, otherwise a new one)
+            state_path: File the frontier is checkpointed to for resuming
+            checkpoint_every: Save the frontier after this many pages
+            http_fetcher: HTTP tier to use (default: a new HttpFetcher)
+            browser_fetcher: Browser tier to use (default: a new BrowserFetcher)
+            scheduler: Politeness scheduler (default: a new HostScheduler
+                capped at ``concurrency``)
+            processor: Process pool that extracts links off the event loop
+                (default: the shared one)
+        """
+        if tier not in CRAWL_TIERS:
+            raise ValueError(f"Unknown crawl tier '{tier}', expected one of {CRAWL_TIERS}")
+        self.tier = tier
+        self.concurrency = concurrency
+        self.scorer = scorer
+        self.state_path = state_path
+        self.checkpoint_every = checkpoint_every
+        self.http_fetcher = http_fetcher
+        self.browser_fetcher = browser_fetcher
+        self.scheduler = scheduler
+        self.processor = processor or get_html_processor()
+
+        if frontier is None and state_path and os.path.exists(state_path):
+            frontier = Frontier.load(state_path)
+        resumed = frontier is not None
+        self.frontier = frontier or Frontier(max_depth=max_depth, max_pages=max_pages)
+
+        seeds = list(seeds)
+        self.allowed_hosts = set(allowed_hosts) if allowed_hosts is not None else {
+            url_host(seed) for seed in seeds
+        }
+        if not resumed:
+            for seed in seeds:
+                self._enqueue(seed, 0)
+
+        self.stats = {"fetched": 0, "errors": 0, "disallowed": 0,
+                      "http": 0, "browser": 0, "links": 0}
+
+    def _enqueue(self, url: str, depth: int) -> bool:
+        if self.allowed_hosts and url_host(url) not in self.allowed_hosts:
+            return False
+        priority = self.scorer(url, depth) if self.scorer else None
+        return self.frontier.add(url, depth, priority)
+
+    async def _fetch(self, url: str) -> Dict[str, Any]:
+        if self.tier == "browser":
+            result = await self.browser_fetcher.fetch(url)
+            result["tier"] = "browser"
+            return result
+
+        result = await self.http_fetcher.fetch(url)
+        result["tier"] = "http"
+        if (self.tier == "auto" and result["status"] == 200
+                and "html" in result["content_type"] and needs_browser(result["content"])):
+            logger.debug(f"Escalating {url} to the browser tier")
+            result = await self.browser_fetcher.fetch(url)
+            result["tier"] = "browser"
+        return result
+
+    async def _process(self, url: str, depth: int) -> Dict[str, Any]:
+        try:
+            async with self.scheduler.slot(url):
+                result = await self._fetch(url)
+        except RobotsDisallowedError as e:
+            self.stats["disallowed"] += 1
+            return {"url": url, "depth": depth, "error": str(e)}
+        except Exception as e:
+            logger.warning(f"Error crawling {url}: {e}")
+            self.stats["errors"] += 1
+            return {"url": url, "depth": depth, "error": str(e)}
+
+        self.stats["fetched"] += 1
+        self.stats[result["tier"]] += 1
+        result["depth"] = depth
+        result["links"] = []
+        if result["content"] and "html" in result["content_type"]:
+            processed = await self.processor.process(result["content"], result["final_url"],
+                                                     ("links",))
+            result["links"] = processed["links"]
+            if depth < self.frontier.max_depth:
+                for link in result["links"]:
+                    if self._enqueue(link, depth + 1):
+                        self.stats["links"] += 1
+        return result
+
+    async def crawl(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the crawl, yielding each page as soon as it has been fetched.
+
+        Yields:
+            Dictionaries with ``url``, ``final_url``, ``status``,
+            ``content_type``, ``content``, ``tier``, ``depth`` and ``links``
+            (or ``url``, ``depth`` and ``error`` for failures)
+        """
+        owns_http = self.http_fetcher is None and self.tier != "browser"
+        if owns_http:
+            self.http_fetcher = HttpFetcher(max_connections=self.concurrency)
+        if self.browser_fetcher is None and self.tier != "http":
+            self.browser_fetcher = BrowserFetcher()
+
+        owns_scheduler = self.scheduler is None
+        if owns_scheduler:
+            self.scheduler = HostScheduler(max_concurrency=self.concurrency)
+
+        # Keep more URLs in play than can run at once so that the scheduler
+        # always has other hosts to hand slots to while one host cools down.
+        backlog = self.concurrency * 4
+        tasks = {}
+        processed = 0
+        try:
+            while True:
+                while len(tasks) < backlog:
+                    entry = self.frontier.pop()
+                    if entry is None:
+                        break
+                    tasks[asyncio.ensure_future(self._process(*entry))] = entry[0]
+                if not tasks:
+                    break
+
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    # Only finished URLs leave the in-flight set; anything
+                    # cancelled below is re-queued by the checkpoint.
+                    self.frontier.done(tasks.pop(task))
+                    processed += 1
+                    if self.state_path and processed % self.checkpoint_every == 0:
+                        self.frontier.save(self.state_path)
+                    yield task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            if self.state_path:
+                self.frontier.save(self.state_path)
+            if owns_scheduler:
+                await self.scheduler.close()
+                self.scheduler = None
+            if owns_http:
+                await self.http_fetcher.close()
+                self.http_fetcher = None
+            logger.info(f"Crawl finished: {self.stats}")
+
+    async def run(self) -> List[Dict[str, Any]]:
+        """
+        Run the crawl to completion.
+
+        Returns:
+            List of page results, without page content
+        """
+        pages = []
+        async for result in self.crawl():
+            result.pop("content", None)
+            pages.append(result)
+        return pages
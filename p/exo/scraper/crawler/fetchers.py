@@ -0,0 +1,104 @@
+"""
+Fetch tiers used by the crawler: plain HTTP and a real browser.
+"""
+import logging
+from typing import Dict, Any, Optional
+
+import httpx
+
+from ...core.config import get_config
+from ..browser.http_browser import needs_browser
+from ..readiness import wait_until_ready
+# Module import: the scraper imports storage, which imports this package.
+from ..tools import scraper as scraper_tools
+
+logger = logging.getLogger(__name__)
+
+class HttpFetcher:
+    """Cheap fetch tier: a plain HTTP GET with connection pooling."""
+
+    def __init__(self, timeout: float = 15.0, max_connections: int = 100,
+                 user_agent: Optional[str] = None):
+        """
+        Initialize the HTTP fetcher.
+
+        Args:
+            timeout: Request timeout in seconds
+            max_connections: Maximum number of open connections
+            user_agent: User-Agent header to send (default: from config)
+        """
+        user_agent = user_agent or get_config()["scraping"]["user_agent"]
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            follow_redirects=True,
+            headers={"User-Agent": user_agent},
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections)
+        )
+
+    async def fetch(self, url: str) -> Dict[str, Any]:
+        """
+        Fetch a URL.
+
+        Args:
+            url: The URL to fetch
+
+        Returns:
+            Dictionary with ``url``, ``final_url``, ``status``,
+            ``content_type`` and ``content``
+        """
+        response = await self.client.get(url)
+        content_type = response.headers.get("content-type", "")
+        is_text = content_type.startswith(("text/", "application/xhtml", "application/xml"))
+        return {
+            "url": url,
+            "final_url": str(response.url),
+            "status": response.status_code,
+            "content_type": content_type,
+            "content": response.text if is_text else ""
+        }
+
+    async def close(self) -> None:
+        """Close the underlying connection pool."""
+        await self.client.aclose()
+
+class BrowserFetcher:
+    """Expensive fetch tier: renders the page in the shared browser pool."""
+
+    def __init__(self, scraper: Optional["scraper_tools.WebScraper"] = None):
+        """
+        Initialize the browser fetcher.
+
+        Args:
+            scraper: WebScraper whose page pool to use (default: the singleton)
+        """
+        self.scraper = scraper
+
+    async def fetch(self, url: str) -> Dict[str, Any]:
+        """
+        Render a URL and return its HTML.
+
+        Args:
+            url: The URL to fetch
+
+        Returns:
+            Dictionary with ``url``, ``final_url``, ``status``,
+            ``content_type`` and ``content``
+        """
+        if self.scraper is None:
+            self.scraper = await scraper_tools.get_scraper()
+
+        async with self.scraper.borrow_page() as page:
+            response = await page.goto(url, wait_until="domcontentloaded")
+            await wait_until_ready(page)
+            return {
+                "url": url,
+                "final_url": page.url,
+                "status": response.status if response else None,
+                "content_type": "text/html",
+                "content": await page.content()
+            }
+
+    async def close(self) -> None:
+        """The shared scraper owns the browser; nothing to release here."""
+        pass
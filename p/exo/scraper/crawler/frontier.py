@@ -0,0 +1,145 @@
+"""
+Priority-queue crawl frontier with budgets and persistence.
+"""
+import heapq
+import itertools
+import json
+import logging
+import os
+from typing import Dict, Any, Optional, Tuple
+
+from .seen import SeenSet
+from .urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+class Frontier:
+    """
+    Crawl frontier: a priority queue of URLs still to be fetched.
+
+    URLs are canonicalized and deduplicated through a ``SeenSet`` before
+    they are queued. Lower priority values are popped first; by default
+    the priority is the link depth, which gives a breadth-first crawl.
+    URLs that have been popped but not yet marked done are "in flight";
+    they are written back to the queue when the frontier is saved, so a
+    resumed crawl does not lose them.
+    """
+
+    def __init__(self, max_depth: int = 3, max_pages: int = 1000,
+                 seen: Optional[SeenSet] = None):
+        """
+        Initialize the frontier.
+
+        Args:
+            max_depth: Links deeper than this are not queued
+            max_pages: Maximum number of URLs handed out by ``pop``
+            seen: Seen-set to deduplicate with (default: a new one)
+        """
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.seen = seen or SeenSet()
+        self._heap = []
+        self._counter = itertools.count()
+        self.in_flight: Dict[str, Tuple[float, int]] = {}
+        self.scheduled = 0
+
+    def add(self, url: str, depth: int = 0, priority: Optional[float] = None,
+            base: Optional[str] = None) -> bool:
+        """
+        Queue a URL if it is crawlable, within budget and not seen before.
+
+        Args:
+            url: The URL to queue (may be relative to ``base``)
+            depth: Link depth of the URL (seeds are 0)
+            priority: Priority (lower is sooner; default: the depth)
+            base: Base URL for resolving relative URLs
+
+        Returns:
+            True if the URL was queued
+        """
+        if depth > self.max_depth:
+            return False
+        canonical = canonicalize_url(url, base)
+        if canonical is None or not self.seen.add(canonical):
+            return False
+        priority = depth if priority is None else priority
+        heapq.heappush(self._heap, (priority, next(self._counter), canonical, depth))
+        return True
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        """
+        Take the next URL to fetch.
+
+        Returns:
+            ``(url, depth)`` or None if the queue is empty or the page
+            budget is spent
+        """
+        if not self._heap or self.exhausted:
+            return None
+        priority, _, url, depth = heapq.heappop(self._heap)
+        self.in_flight[url] = (priority, depth)
+        self.scheduled += 1
+        return url, depth
+
+    def done(self, url: str) -> None:
+        """Mark a popped URL as finished (successfully or not)."""
+        self.in_flight.pop(url, None)
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether the page budget has been spent."""
+        return self.scheduled >= self.max_pages
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the frontier, re-queueing in-flight URLs."""
+        pending = [(priority, url, depth) for url, (priority, depth) in self.in_flight.items()]
+        pending += [(priority, url, depth) for priority, _, url, depth in sorted(self._heap)]
+        return {
+            "max_depth": self.max_depth,
+            "max_pages": self.max_pages,
+            # In-flight URLs were counted when popped but will be fetched again.
+            "scheduled": self.scheduled - len(self.in_flight),
+            "pending": pending,
+            "seen": self.seen.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Frontier":
+        """Restore a frontier serialized with ``to_dict``."""
+        frontier = cls(data["max_depth"], data["max_pages"], SeenSet.from_dict(data["seen"]))
+        frontier.scheduled = data["scheduled"]
+        for priority, url, depth in data["pending"]:
+            heapq.heappush(frontier._heap, (priority, next(frontier._counter), url, depth))
+        return frontier
+
+    def save(self, path: str) -> None:
+        """
+        Persist the frontier to a JSON file (written atomically).
+
+        Args:
+            path: Destination file path
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+        logger.debug(f"Saved frontier with {len(self)} pending URLs to {path}")
+
+    @classmethod
+    def load(cls, path: str) -> "Frontier":
+        """
+        Load a frontier saved with ``save``.
+
+        Args:
+            path: Source file path
+
+        Returns:
+            The restored frontier
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            frontier = cls.from_dict(json.load(f))
+        logger.info(f"Resumed frontier with {len(frontier)} pending URLs from {path}")
+        return frontier
@@ -0,0 +1,57 @@
+"""
+Link extraction from raw HTML.
+"""
+from html.parser import HTMLParser
+from typing import List, Optional
+
+from .urls import canonicalize_url
+
+class _LinkParser(HTMLParser):
+    """Collects hrefs from anchors and image-map areas, honouring ``<base>``."""
+
+    def __init__(self, respect_nofollow: bool):
+        super().__init__(convert_charrefs=True)
+        self.respect_nofollow = respect_nofollow
+        self.base: Optional[str] = None
+        self.hrefs: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag not in ("a", "area", "base"):
+            return
+        attributes = dict(attrs)
+        href = attributes.get("href")
+        if not href:
+            return
+        if tag == "base":
+            if self.base is None:
+                self.base = href
+            return
+        if self.respect_nofollow and "nofollow" in (attributes.get("rel") or "").lower().split():
+            return
+        self.hrefs.append(href)
+
+def extract_links(html: str, base_url: str, respect_nofollow: bool = True) -> List[str]:
+    """
+    Extract the crawlable links of a page.
+
+    Args:
+        html: The page HTML
+        base_url: URL the page was fetched from
+        respect_nofollow: Skip links marked ``rel="nofollow"``
+
+    Returns:
+        Canonical, de-duplicated http(s) URLs in document order
+    """
+    parser = _LinkParser(respect_nofollow)
+    parser.feed(html)
+    parser.close()
+
+    base = canonicalize_url(parser.base, base_url) if parser.base else base_url
+    links = []
+    found = set()
+    for href in parser.hrefs:
+        url = canonicalize_url(href, base or base_url)
+        if url and url not in found:
+            found.add(url)
+            links.append(url)
+    return links
@@ -0,0 +1,158 @@
+"""
+Memory-efficient seen-set for crawl deduplication.
+"""
+import base64
+import hashlib
+import math
+from typing import Dict, Any, Optional
+
+class BloomFilter:
+    """
+    A Bloom filter over a flat bit array with double hashing.
+
+    Membership tests may return false positives at roughly the configured
+    rate, but never false negatives.
+    """
+
+    def __init__(self, expected_items: int = 1_000_000, false_positive_rate: float = 0.001):
+        """
+        Initialize the Bloom filter.
+
+        Args:
+            expected_items: Number of items the filter is sized for
+            false_positive_rate: Target false-positive rate at that size
+        """
+        if expected_items < 1 or not 0 < false_positive_rate < 1:
+            raise ValueError("Bloom filter needs expected_items >= 1 and 0 < false_positive_rate < 1")
+        self.expected_items = expected_items
+        self.false_positive_rate = false_positive_rate
+        self.num_bits = max(8, math.ceil(-expected_items * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / expected_items * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: bytes):
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: bytes) -> bool:
+        """
+        Add a key.
+
+        Returns:
+            True if the key was (definitely) not present before
+        """
+        added = False
+        for position in self._positions(key):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, key: bytes) -> bool:
+        for position in self._positions(key):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                return False
+        return True
+
+    @property
+    def size_bytes(self) -> int:
+        """Size of the bit array in bytes."""
+        return len(self.bits)
+
+class SeenSet:
+    """
+    Seen-set of URLs backed by a Bloom filter with an exact fallback.
+
+    While fewer than ``exact_limit`` URLs have been added, Bloom-filter hits
+    are confirmed against a set of 64-bit fingerprints, so no URL is ever
+    wrongly skipped. Past the limit the fingerprints are released and the
+    Bloom filter alone decides, keeping memory bounded at the cost of its
+    small false-positive rate.
+    """
+
+    def __init__(self, expected_items: int = 1_000_000, false_positive_rate: float = 0.001,
+                 exact_limit: Optional[int] = 100_000):
+        """
+        Initialize the seen-set.
+
+        Args:
+            expected_items: Number of URLs the Bloom filter is sized for
+            false_positive_rate: Target Bloom-filter false-positive rate
+            exact_limit: Number of URLs tracked exactly (None: always exact)
+        """
+        self.bloom = BloomFilter(expected_items, false_positive_rate)
+        self.exact_limit = exact_limit
+        self.fingerprints = set()
+        self.exact = True
+        self._count = 0
+
+    @staticmethod
+    def _fingerprint(key: bytes) -> int:
+        return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+    def add(self, url: str) -> bool:
+        """
+        Add a URL.
+
+        Returns:
+            True if the URL had not been seen before
+        """
+        key = url.encode("utf-8")
+        new_in_bloom = self.bloom.add(key)
+        if self.exact:
+            fingerprint = self._fingerprint(key)
+            if fingerprint in self.fingerprints:
+                return False
+            self.fingerprints.add(fingerprint)
+            self._count += 1
+            if self.exact_limit is not None and self._count > self.exact_limit:
+                self.exact = False
+                self.fingerprints = set()
+            return True
+        if new_in_bloom:
+            self._count += 1
+        return new_in_bloom
+
+    def __contains__(self, url: str) -> bool:
+        key = url.encode("utf-8")
+        if key not in self.bloom:
+            return False
+        if self.exact:
+            return self._fingerprint(key) in self.fingerprints
+        return True
+
+    def __len__(self) -> int:
+        return self._count
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the seen-set to a JSON-compatible dictionary."""
+        return {
+            "expected_items": self.bloom.expected_items,
+            "false_positive_rate": self.bloom.false_positive_rate,
+            "exact_limit": self.exact_limit,
+            "count": self._count,
+            "bloom_count": self.bloom.count,
+            "bits": base64.b64encode(bytes(self.bloom.bits)).decode("ascii"),
+            "fingerprints": sorted(self.fingerprints) if self.exact else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SeenSet":
+        """Restore a seen-set serialized with ``to_dict``."""
+        seen = cls(data["expected_items"], data["false_positive_rate"], data["exact_limit"])
+        seen.bloom.bits = bytearray(base64.b64decode(data["bits"]))
+        seen.bloom.count = data["bloom_count"]
+        seen._count = data["count"]
+        if data["fingerprints"] is None:
+            seen.exact = False
+        else:
+            seen.fingerprints = set(data["fingerprints"])
+        return seen
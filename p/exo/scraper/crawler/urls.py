@@ -0,0 +1,90 @@
+"""
+URL canonicalization for crawl deduplication.
+"""
+import re
+from typing import Optional
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Query parameters that only track the visitor and never change the content.
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "yclid", "_ga", "ref_src"}
+
+_UNRESERVED = set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~")
+_PERCENT_ESCAPE = re.compile(r"%([0-9A-Fa-f]{2})")
+
+def _normalize_escapes(value: str) -> str:
+    """Decode escaped unreserved characters and uppercase the remaining escapes."""
+    def replace(match):
+        char = chr(int(match.group(1), 16))
+        return char if char in _UNRESERVED else "%" + match.group(1).upper()
+    return _PERCENT_ESCAPE.sub(replace, value)
+
+def _remove_dot_segments(path: str) -> str:
+    """Resolve ``.`` and ``..`` segments (RFC 3986, section 5.2.4)."""
+    segments = []
+    for segment in path.split("/"):
+        if segment == "..":
+            if len(segments) > 1:
+                segments.pop()
+        elif segment != ".":
+            segments.append(segment)
+    if path.endswith(("/.", "/..")):
+        segments.append("")
+    return "/".join(segments) or "/"
+
+def canonicalize_url(url: str, base: Optional[str] = None,
+                     strip_tracking: bool = True) -> Optional[str]:
+    """
+    Canonicalize a URL so that equivalent spellings compare equal.
+
+    Lowercases the scheme and host, drops default ports, fragments and
+    tracking parameters, resolves dot segments, normalizes percent escapes
+    and sorts the query string.
+
+    Args:
+        url: The URL to canonicalize (may be relative)
+        base: Base URL to resolve relative URLs against
+        strip_tracking: Whether to drop ``utm_*`` and similar parameters
+
+    Returns:
+        The canonical URL, or None if it is not a crawlable http(s) URL
+    """
+    url = url.strip()
+    if base:
+        url = urljoin(base, url)
+
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return None
+
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return None
+
+    try:
+        host = parts.hostname.rstrip(".").encode("idna").decode("ascii").lower()
+    except UnicodeError:
+        return None
+    netloc = host if port in (None, DEFAULT_PORTS[scheme]) else f"{host}:{port}"
+    if parts.username:
+        userinfo = parts.username + (f":{parts.password}" if parts.password else "")
+        netloc = f"{userinfo}@{netloc}"
+
+    path = _remove_dot_segments(_normalize_escapes(parts.path or "/"))
+
+    query_items = parse_qsl(parts.query, keep_blank_values=True)
+    if strip_tracking:
+        query_items = [
+            (key, value) for key, value in query_items
+            if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+        ]
+    query = urlencode(sorted(query_items))
+
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+def url_host(url: str) -> str:
+    """Return the lowercase host (with port, if any) of a URL."""
+    return urlsplit(url).netloc.lower().rsplit("@", 1)[-1]
@@ -0,0 +1,297 @@
+"""
+Near-duplicate detection for scraped pages.
+
+Mirrors, syndicated copies and the same article under different URLs are
+detected from word shingles of the extracted text with two signatures:
+
+- SimHash: a 64-bit fingerprint; near-duplicates differ in few bits.
+  All kept fingerprints are compared against a new one in one vectorized
+  Hamming-distance pass.
+- MinHash: a vector of minimum permuted hashes whose agreement rate
+  estimates Jaccard similarity. Candidates are found through an LSH
+  index (banding), so documents are never compared all-against-all.
+"""
+import hashlib
+import logging
+import re
+from typing import Dict, Any, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+_WORDS = re.compile(r"\w+", re.UNICODE)
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count for English text (about 4 characters per token)."""
+    return (len(text) + 3) // 4
+
+def shingle_hashes(text: str, size: int = 5) -> np.ndarray:
+    """
+    Hash the distinct word shingles of a text.
+
+    Args:
+        text: The text to shingle
+        size: Number of words per shingle
+
+    Returns:
+        Array of 64-bit shingle hashes (stable across processes)
+    """
+    words = _WORDS.findall(text.lower())
+    if len(words) <= size:
+        shingles = {" ".join(words)} if words else set()
+    else:
+        shingles = {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+         for s in shingles),
+        dtype=np.uint64, count=len(shingles)
+    )
+
+def simhash(hashes: np.ndarray) -> np.uint64:
+    """
+    Compute the 64-bit SimHash of a set of shingle hashes.
+
+    Args:
+        hashes: Array of 64-bit shingle hashes
+
+    Returns:
+        The SimHash fingerprint
+    """
+    if hashes.size == 0:
+        return np.uint64(0)
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - hashes.size
+    return np.packbits(votes > 0, bitorder="little").view(np.uint64)[0]
+
+def hamming_distances(fingerprint: np.uint64, fingerprints: np.ndarray) -> np.ndarray:
+    """
+    Hamming distance between one SimHash and an array of SimHashes.
+
+    Args:
+        fingerprint: The SimHash to compare
+        fingerprints: Array of SimHashes
+
+    Returns:
+        Array of bit distances
+    """
+    diff = np.bitwise_xor(fingerprints, fingerprint)
+    return np.unpackbits(diff.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+class MinHasher:
+    """Computes MinHash signatures with ``num_perm`` universal hash permutations."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1, chunk_size: int = 4096):
+        """
+        Initialize the MinHasher.
+
+        Args:
+            num_perm: Number of permutations (signature length)
+            seed: Seed for the permutation parameters
+            chunk_size: Shingles processed per vectorized block
+        """
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.chunk_size = chunk_size
+        self.a = rng.integers(1, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+
+    def signature(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Compute the MinHash signature of a set of shingle hashes.
+
+        Args:
+            hashes: Array of 64-bit shingle hashes
+
+        Returns:
+            Array of ``num_perm`` 32-bit minimum hashes (as uint64)
+        """
+        signature = np.full(self.num_perm, MAX_HASH, dtype=np.uint64)
+        values = hashes & MAX_HASH
+        with np.errstate(over="ignore"):
+            for start in range(0, values.size, self.chunk_size):
+                block = values[start:start + self.chunk_size]
+                permuted = (np.outer(block, self.a) + self.b) % MERSENNE_PRIME & MAX_HASH
+                np.minimum(signature, permuted.min(axis=0), out=signature)
+        return signature
+
+class LSHIndex:
+    """
+    Locality-sensitive hashing index over MinHash signatures.
+
+    Signatures are split into ``bands`` bands; documents sharing any band
+    become candidates, which are then confirmed by their estimated Jaccard
+    similarity.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 32, threshold: float = 0.8):
+        """
+        Initialize the LSH index.
+
+        Args:
+            num_perm: Signature length
+            bands: Number of bands (must divide ``num_perm``)
+            threshold: Minimum estimated Jaccard similarity for a match
+        """
+        if num_perm % bands:
+            raise ValueError("bands must divide num_perm")
+        self.rows = num_perm // bands
+        self.bands = bands
+        self.threshold = threshold
+        self.keys: List[Hashable] = []
+        self.signatures: List[np.ndarray] = []
+        self.buckets: Dict[Tuple[int, bytes], List[int]] = {}
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def add(self, key: Hashable, signature: np.ndarray) -> None:
+        """Index a signature under a key."""
+        position = len(self.keys)
+        self.keys.append(key)
+        self.signatures.append(signature)
+        for band_key in self._band_keys(signature):
+            self.buckets.setdefault(band_key, []).append(position)
+
+    def query(self, signature: np.ndarray) -> List[Tuple[Hashable, float]]:
+        """
+        Find indexed signatures similar to the given one.
+
+        Returns:
+            ``(key, estimated Jaccard)`` pairs above the threshold, most
+            similar first
+        """
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates.update(self.buckets.get(band_key, ()))
+        if not candidates:
+            return []
+        positions = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        matrix = np.stack([self.signatures[i] for i in positions])
+        similarity = (matrix == signature).mean(axis=1)
+        order = np.argsort(-similarity)
+        return [(self.keys[positions[i]], float(similarity[i]))
+                for i in order if similarity[i] >= self.threshold]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+class NearDuplicateFilter:
+    """
+    Streaming near-duplicate filter combining SimHash and MinHash LSH.
+
+    A text is a near-duplicate of an earlier one if their SimHashes are
+    within ``max_hamming`` bits or their estimated Jaccard similarity is at
+    least ``threshold``.
+    """
+
+    def __init__(self, threshold: float = 0.8, max_hamming: int = 3,
+                 num_perm: int = 128, bands: int = 32, shingle_size: int = 5):
+        """
+        Initialize the filter.
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity of duplicates
+            max_hamming: Maximum SimHash distance of duplicates
+            num_perm: MinHash signature length
+            bands: LSH bands
+            shingle_size: Words per shingle
+        """
+        self.max_hamming = max_hamming
+        self.shingle_size = shingle_size
+        self.minhasher = MinHasher(num_perm)
+        self.lsh = LSHIndex(num_perm, bands, threshold)
+        self._simhashes = np.empty(0, dtype=np.uint64)
+        self._simhash_keys: List[Hashable] = []
+        self._exact: Dict[bytes, Hashable] = {}
+
+    def check(self, key: Hashable, text: str) -> Optional[Hashable]:
+        """
+        Check a text and remember it if it is new.
+
+        Args:
+            key: Identifier of the text (e.g. its URL)
+            text: The text to check
+
+        Returns:
+            Key of the earlier text it duplicates, or None if it is new
+        """
+        digest = hashlib.blake2b(" ".join(text.split()).encode("utf-8"), digest_size=16).digest()
+        if digest in self._exact:
+            return self._exact[digest]
+
+        hashes = shingle_hashes(text, self.shingle_size)
+        fingerprint = simhash(hashes)
+        if self._simhashes.size:
+            distances = hamming_distances(fingerprint, self._simhashes)
+            closest = int(np.argmin(distances))
+            if distances[closest] <= self.max_hamming:
+                return self._simhash_keys[closest]
+
+        signature = self.minhasher.signature(hashes)
+        matches = self.lsh.query(signature)
+        if matches:
+            return matches[0][0]
+
+        self._exact[digest] = key
+        self._simhashes = np.append(self._simhashes, fingerprint)
+        self._simhash_keys.append(key)
+        self.lsh.add(key, signature)
+        return None
+
+def deduplicate(documents: List[Dict[str, Any]], text_key: str = "content",
+                url_key: str = "url", merge: bool = True,
+                **filter_kwargs) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Drop near-duplicate documents, keeping the first occurrence.
+
+    Documents without text under ``text_key`` (errors, selector results)
+    are passed through unchanged.
+
+    Args:
+        documents: Documents in priority order (e.g. search rank)
+        text_key: Key holding the extracted text
+        url_key: Key holding the document URL
+        merge: Record dropped URLs on the kept document under ``duplicate_urls``
+        **filter_kwargs: Passed to ``NearDuplicateFilter``
+
+    Returns:
+        The kept documents and a report with the number of ``duplicates``,
+        estimated ``tokens_saved`` and a ``duplicate_of`` URL mapping
+    """
+    dedup_filter = NearDuplicateFilter(**filter_kwargs)
+    kept = []
+    by_position = {}
+    duplicate_of = {}
+    tokens_saved = 0
+
+    for position, document in enumerate(documents):
+        text = document.get(text_key)
+        if not isinstance(text, str) or not text.strip():
+            kept.append(document)
+            continue
+        original = dedup_filter.check(position, text)
+        if original is None:
+            by_position[position] = document
+            kept.append(document)
+            continue
+        tokens_saved += estimate_tokens(text)
+        original_document = by_position[original]
+        duplicate_of[document.get(url_key)] = original_document.get(url_key)
+        if merge:
+            original_document.setdefault("duplicate_urls", []).append(document.get(url_key))
+
+    report = {
+        "documents": len(documents),
+        "kept": len(kept),
+        "duplicates": len(documents) - len(kept),
+        "tokens_saved": tokens_saved,
+        "duplicate_of": duplicate_of
+    }
+    if duplicate_of:
+        logger.info(f"Dropped {report['duplicates']} near-duplicate pages, ~{tokens_saved} tokens saved")
+    return kept, report
@@ -0,0 +1,327 @@
+"""
+Lightweight DOM built with the standard-library HTML parser.
+
+Good enough for content scoring and text extraction on raw HTML without
+a browser or third-party parser. Malformed markup is handled the way
+browsers roughly do: void elements never get children, an end tag
+closes every element opened after its matching start tag, and a start
+tag ends the elements HTML says it implies the end of (a block closes
+an open ``<p>``, a row or cell closes the cells and rows before it, an
+``<li>`` the previous item).
+
+``select`` supports the CSS selectors scrapers mostly use: type, ``*``,
+``#id``, ``.class``, attribute selectors (``[a]``, ``=``, ``~=``,
+``^=``, ``$=``, ``*=``), descendant and child combinators and
+comma-separated groups.
+"""
+import re
+from html.parser import HTMLParser
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr"
+}
+
+# Elements whose text is never content.
+SKIP_TEXT_ELEMENTS = {"script", "style", "noscript", "template", "svg", "canvas", "iframe"}
+
+BLOCK_ELEMENTS = {
+    "address", "article", "aside", "blockquote", "body", "dd", "details", "div", "dl",
+    "dt", "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4",
+    "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section",
+    "table", "tbody", "td", "tfoot", "th", "thead", "tr", "ul", "br"
+}
+
+# Elements an implied end never reaches past ("button scope" in the spec).
+_SCOPE = {"applet", "button", "caption", "html", "marquee", "object", "table", "td",
+          "template", "th"}
+
+# Start tags that close the nearest open element of a kind, unless a
+# boundary element comes first: tag -> (closed tags, boundaries).
+_AUTO_CLOSE = {
+    "li": ({"li"}, _SCOPE | {"ol", "ul", "menu"}),
+    "dt": ({"dt", "dd"}, _SCOPE | {"dl"}),
+    "dd": ({"dt", "dd"}, _SCOPE | {"dl"}),
+    "option": ({"option"}, {"select", "datalist", "optgroup"}),
+    "optgroup": ({"option", "optgroup"}, {"select", "datalist"}),
+}
+
+# Start tags that close an open <p>.
+_CLOSES_P = {
+    "address", "article", "aside", "blockquote", "dd", "details", "dialog", "div", "dl",
+    "dt", "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4",
+    "h5", "h6", "header", "hgroup", "hr", "li", "main", "menu", "nav", "ol", "p", "pre",
+    "section", "summary", "table", "ul"
+}
+
+# Table parts end everything opened inside the nearest open container
+# they belong in: a cell ends the previous cell, a row the previous row.
+_TABLE_CONTEXT = {
+    "caption": {"table"}, "colgroup": {"table"},
+    "thead": {"table"}, "tbody": {"table"}, "tfoot": {"table"},
+    "tr": {"tbody", "thead", "tfoot", "table"},
+    "td": {"tr", "tbody", "thead", "tfoot", "table"},
+    "th": {"tr", "tbody", "thead", "tfoot", "table"},
+}
+
+class Node:
+    """An element in the parsed document."""
+
+    __slots__ = ("tag", "attrs", "children", "parent")
+
+    def __init__(self, tag: str, attrs: Optional[Dict[str, str]] = None,
+                 parent: Optional["Node"] = None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.children: List[Union["Node", str]] = []
+        self.parent = parent
+
+    def get(self, name: str, default: str = "") -> str:
+        """Get an attribute value."""
+        value = self.attrs.get(name)
+        return default if value is None else value
+
+    def iter(self, tag: Optional[str] = None) -> Iterator["Node"]:
+        """Iterate over this element and its descendants in document order."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if tag is None or node.tag == tag:
+                yield node
+            stack.extend(child for child in reversed(node.children) if isinstance(child, Node))
+
+    def find(self, tag: str) -> Optional["Node"]:
+        """Find the first descendant (or self) with the given tag."""
+        return next(self.iter(tag), None)
+
+    def text_parts(self, block_separator: str = "\n") -> Iterator[str]:
+        """
+        Yield the text of this element, skipping scripts and styles.
+
+        A ``block_separator`` is yielded around block-level elements.
+        """
+        stack: List[Union[Node, str, None]] = [self]
+        while stack:
+            item = stack.pop()
+            if item is None:
+                yield block_separator
+            elif isinstance(item, str):
+                yield item
+            elif item.tag not in SKIP_TEXT_ELEMENTS:
+                is_block = item.tag in BLOCK_ELEMENTS
+                if is_block:
+                    yield block_separator
+                    stack.append(None)
+                stack.extend(reversed(item.children))
+
+    def text(self, block_separator: str = "\n") -> str:
+        """
+        The text of this element with whitespace collapsed.
+
+        Block-level elements become separate lines.
+        """
+        raw = "".join(self.text_parts(block_separator))
+        lines = (" ".join(line.split()) for line in raw.split(block_separator))
+        return block_separator.join(line for line in lines if line)
+
+    def __repr__(self) -> str:
+        return f"<Node {self.tag} children={len(self.children)}>"
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document")
+        self.stack = [self.root]
+
+    def _close(self, tags, boundaries):
+        """Close the nearest open element in ``tags`` below any boundary."""
+        for depth in range(len(self.stack) - 1, 0, -1):
+            current = self.stack[depth].tag
+            if current in tags:
+                del self.stack[depth:]
+                return
+            if current in boundaries:
+                return
+
+    def _clear_to(self, context):
+        """Close everything opened inside the nearest element in ``context``."""
+        for depth in range(len(self.stack) - 1, 0, -1):
+            if self.stack[depth].tag in context:
+                del self.stack[depth + 1:]
+                return
+
+    def handle_starttag(self, tag, attrs):
+        context = _TABLE_CONTEXT.get(tag)
+        if context:
+            self._clear_to(context)
+        closes = _AUTO_CLOSE.get(tag)
+        if closes:
+            self._close(*closes)
+        if tag in _CLOSES_P:
+            self._close({"p"}, _SCOPE)
+        parent = self.stack[-1]
+        node = Node(tag, {name: value or "" for name, value in attrs}, parent)
+        parent.children.append(node)
+        if tag not in VOID_ELEMENTS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        parent = self.stack[-1]
+        parent.children.append(Node(tag, {name: value or "" for name, value in attrs}, parent))
+
+    def handle_endtag(self, tag):
+        for depth in range(len(self.stack) - 1, 0, -1):
+            if self.stack[depth].tag == tag:
+                del self.stack[depth:]
+                return
+
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
+
+def parse_html(html: str) -> Node:
+    """
+    Parse an HTML document.
+
+    Args:
+        html: The HTML source
+
+    Returns:
+        The ``#document`` root node
+    """
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+_SELECTOR_TOKEN = re.compile(r"""
+    \s*(?P<comma>,)\s*
+  | \s*(?P<child>>)\s*
+  | (?P<space>\s+)
+  | (?P<tag>\*|[A-Za-z][\w-]*)
+  | \#(?P<id>[\w-]+)
+  | \.(?P<cls>[\w-]+)
+  | \[\s*(?P<attr>[\w:-]+)\s*(?:(?P<op>[~^$*]?=)\s*
+        (?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\]\s]+))\s*)?\]
+""", re.X)
+
+# A compound selector: (tag, id, classes, [(attribute, operator, value)])
+_Compound = Tuple[Optional[str], Optional[str], Tuple[str, ...], Tuple[Tuple[str, Optional[str], str], ...]]
+
+def _parse_selector(selector: str) -> List[List[Tuple[str, _Compound]]]:
+    """Parse a selector group into chains of (combinator, compound), left to right."""
+    groups, chain = [], []
+    combinator = " "
+    tag = node_id = None
+    classes, attrs = [], []
+    empty = True
+
+    def finish_compound():
+        nonlocal tag, node_id, classes, attrs, empty
+        if not empty:
+            chain.append((combinator, (tag, node_id, tuple(classes), tuple(attrs))))
+        tag = node_id = None
+        classes, attrs = [], []
+        empty = True
+
+    position = 0
+    selector = selector.strip()
+    while position < len(selector):
+        match = _SELECTOR_TOKEN.match(selector, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Unsupported selector: {selector}")
+        position = match.end()
+        if match.group("comma"):
+            finish_compound()
+            if not chain:
+                raise ValueError(f"Unsupported selector: {selector}")
+            groups.append(chain)
+            chain, combinator = [], " "
+        elif match.group("child") or match.group("space") is not None:
+            if empty:
+                if match.group("child") and chain:
+                    combinator = ">"
+                continue
+            finish_compound()
+            combinator = ">" if match.group("child") else " "
+        elif match.group("tag"):
+            tag = None if match.group("tag") == "*" else match.group("tag").lower()
+            empty = False
+        elif match.group("id"):
+            node_id = match.group("id")
+            empty = False
+        elif match.group("cls"):
+            classes.append(match.group("cls"))
+            empty = False
+        else:
+            value = next((v for v in (match.group("dq"), match.group("sq"), match.group("bare"))
+                          if v is not None), "")
+            attrs.append((match.group("attr").lower(), match.group("op"), value))
+            empty = False
+    finish_compound()
+    if not chain:
+        raise ValueError(f"Unsupported selector: {selector}")
+    groups.append(chain)
+    return groups
+
+def _matches_compound(node: Node, compound: _Compound) -> bool:
+    tag, node_id, classes, attrs = compound
+    if tag is not None and node.tag != tag:
+        return False
+    if node_id is not None and node.attrs.get("id") != node_id:
+        return False
+    if classes:
+        node_classes = node.get("class").split()
+        if any(cls not in node_classes for cls in classes):
+            return False
+    for name, op, value in attrs:
+        actual = node.attrs.get(name)
+        if actual is None:
+            return False
+        if op == "=" and actual != value:
+            return False
+        if op == "~=" and value not in actual.split():
+            return False
+        if op == "^=" and not (value and actual.startswith(value)):
+            return False
+        if op == "$=" and not (value and actual.endswith(value)):
+            return False
+        if op == "*=" and not (value and value in actual):
+            return False
+    return True
+
+def _matches_chain(node: Node, chain: List[Tuple[str, _Compound]], index: int) -> bool:
+    # Right to left: compound ``index`` must match the node itself.
+    if not _matches_compound(node, chain[index][1]):
+        return False
+    if index == 0:
+        return True
+    ancestor = node.parent
+    if chain[index][0] == ">":
+        return ancestor is not None and _matches_chain(ancestor, chain, index - 1)
+    while ancestor is not None:
+        if _matches_chain(ancestor, chain, index - 1):
+            return True
+        ancestor = ancestor.parent
+    return False
+
+def select(root: Node, selector: str) -> List[Node]:
+    """
+    Find the elements matching a CSS selector, in document order.
+
+    Args:
+        root: Element to search under (not matched itself)
+        selector: CSS selector (see the module docstring for the subset)
+
+    Returns:
+        Matching elements
+
+    Raises:
+        ValueError: If the selector uses unsupported syntax
+    """
+    groups = _parse_selector(selector)
+    return [
+        node for node in root.iter()
+        if node is not root and node.tag != "#document"
+        and any(_matches_chain(node, chain, len(chain) - 1) for chain in groups)
+    ]
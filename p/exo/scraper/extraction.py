@@ -0,0 +1,246 @@
+"""
+Batched DOM extraction.
+
+Selector scrapes used to call ``query_selector_all`` and then await
+``text_content()``/``inner_html()`` on every element, one CDP round trip
+per element. Here one or more selector specs are compiled into a single
+in-page evaluation that returns all results at once, with size caps
+applied before anything is serialized. Whole-page text and HTML are
+read the same way: clipped in the page, or fetched in chunks when the
+caller needs all of it.
+
+A spec is a dictionary::
+
+    {
+        "name": "titles",        # key in the result (default: the selector)
+        "selector": "h2 a",      # CSS selector
+        "type": "text",          # "text", "html", "outer_html" or "attr"
+        "attribute": "href",     # required when type is "attr"
+        "max_items": 100,        # optional per-spec overrides
+        "max_chars": 500
+    }
+"""
+import logging
+from typing import Dict, Any, AsyncIterator, List, Optional
+
+from playwright.async_api import Page
+
+from ..core.exceptions import ParserError
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_TYPES = ("text", "html", "outer_html", "attr")
+
+EXTRACTION_SCRIPT = """
+({specs, maxItems, maxChars}) => {
+    const out = {};
+    for (const spec of specs) {
+        const nodes = document.querySelectorAll(spec.selector);
+        const limit = spec.max_items ?? maxItems ?? nodes.length;
+        const cap = spec.max_chars ?? maxChars;
+        const results = [];
+        let clipped = false;
+        for (let i = 0; i < nodes.length && results.length < limit; i++) {
+            const el = nodes[i];
+            let value;
+            if (spec.type === "html") value = el.innerHTML;
+            else if (spec.type === "outer_html") value = el.outerHTML;
+            else if (spec.type === "attr") value = el.getAttribute(spec.attribute);
+            else value = (el.textContent || "").trim();
+            if (value !== null && cap != null && value.length > cap) {
+                value = value.slice(0, cap);
+                clipped = true;
+            }
+            results.push(value);
+        }
+        out[spec.name] = {
+            count: nodes.length,
+            results: results,
+            truncated: clipped || results.length < nodes.length
+        };
+    }
+    return out;
+}
+"""
+
+def selector_spec(selector: str, extract_text: bool = True,
+                  name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build the spec equivalent to the classic text/HTML selector scrape.
+
+    Args:
+        selector: CSS selector to match
+        extract_text: Extract trimmed text if True, inner HTML otherwise
+        name: Key for the result (default: the selector)
+
+    Returns:
+        An extraction spec
+    """
+    return {
+        "name": name or selector,
+        "selector": selector,
+        "type": "text" if extract_text else "html"
+    }
+
+def compile_specs(specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Validate and normalize extraction specs.
+
+    Args:
+        specs: List of extraction specs
+
+    Returns:
+        Normalized specs ready to be passed to the page
+
+    Raises:
+        ParserError: If a spec is malformed or two specs share a name
+    """
+    compiled = []
+    names = set()
+    for spec in specs:
+        selector = spec.get("selector")
+        if not selector:
+            raise ParserError(f"Extraction spec is missing a selector: {spec}")
+
+        kind = spec.get("type", "text")
+        if kind not in EXTRACTION_TYPES:
+            raise ParserError(f"Unknown extraction type '{kind}' for selector {selector}")
+        if kind == "attr" and not spec.get("attribute"):
+            raise ParserError(f"Extraction type 'attr' requires an attribute for selector {selector}")
+
+        name = spec.get("name") or selector
+        if name in names:
+            raise ParserError(f"Duplicate extraction spec name: {name}")
+        names.add(name)
+
+        compiled.append({
+            "name": name,
+            "selector": selector,
+            "type": kind,
+            "attribute": spec.get("attribute"),
+            "max_items": spec.get("max_items"),
+            "max_chars": spec.get("max_chars")
+        })
+    return compiled
+
+async def extract_selectors(page: Page, specs: List[Dict[str, Any]],
+                            max_items: Optional[int] = None,
+                            max_chars: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Extract every spec from the page in a single evaluation.
+
+    Args:
+        page: The Playwright page to extract from
+        specs: List of extraction specs
+        max_items: Default cap on results per spec
+        max_chars: Default cap on characters per result
+
+    Returns:
+        Dictionary mapping each spec name to ``count`` (number of matching
+        elements), ``results`` (extracted values) and ``truncated``
+    """
+    compiled = compile_specs(specs)
+    results = await page.evaluate(EXTRACTION_SCRIPT, {
+        "specs": compiled,
+        "maxItems": max_items,
+        "maxChars": max_chars
+    })
+    logger.debug(f"Extracted {len(compiled)} selector specs in one evaluation")
+    return results
+
+# Whole-page text or HTML, sliced before it is serialized. Chunked reads
+# keep the string on the window between calls instead of rebuilding a
+# multi-megabyte string per chunk; the first chunk (offset 0) rebuilds it.
+# Offsets and limits are UTF-16 units, as JS strings index; a slice never
+# ends between the halves of a surrogate pair, and ``length`` counts code
+# points, as Python does.
+PAGE_CONTENT_SCRIPT = """
+({kind, offset, limit, keep}) => {
+    const key = "__exoPageContent_" + kind;
+    let entry = offset > 0 ? window[key] : undefined;
+    if (entry === undefined) {
+        let content;
+        if (kind === "html") {
+            const doctype = document.doctype
+                ? "<!DOCTYPE " + document.doctype.name + ">" : "";
+            content = doctype + document.documentElement.outerHTML;
+        } else {
+            const root = document.body || document.documentElement;
+            content = root ? (root.innerText || root.textContent || "") : "";
+        }
+        const pairs = content.match(/[\\uD800-\\uDBFF][\\uDC00-\\uDFFF]/g);
+        entry = {content: content, length: content.length - (pairs ? pairs.length : 0)};
+    }
+    const content = entry.content;
+    let end = limit == null ? content.length : Math.min(content.length, offset + limit);
+    const high = code => code >= 0xD800 && code <= 0xDBFF;
+    if (end < content.length && high(content.charCodeAt(end - 1))) {
+        // Keep the pair together: end before it, or after it if it is all there is
+        end += end - 1 > offset ? -1 : 1;
+    }
+    if (keep && end < content.length) window[key] = entry;
+    else delete window[key];
+    return {chunk: content.slice(offset, end), length: entry.length,
+            nextOffset: end, truncated: end < content.length};
+}
+"""
+
+async def iter_page_content(page: Page, kind: str = "text",
+                            chunk_chars: int = 262144) -> AsyncIterator[str]:
+    """
+    Stream the page's whole text or HTML in chunks.
+
+    Args:
+        page: The Playwright page to read
+        kind: ``"text"`` (rendered text) or ``"html"`` (serialized document)
+        chunk_chars: UTF-16 units per round trip
+
+    Yields:
+        Consecutive chunks of the content
+    """
+    offset = 0
+    while True:
+        part = await page.evaluate(PAGE_CONTENT_SCRIPT, {
+            "kind": kind, "offset": offset, "limit": chunk_chars, "keep": True
+        })
+        if part["chunk"]:
+            yield part["chunk"]
+        # The page's own offset: JS counts UTF-16 units, Python code points
+        if not part["truncated"] or part["nextOffset"] <= offset:
+            break
+        offset = part["nextOffset"]
+
+async def extract_page_content(page: Page, kind: str = "text",
+                               max_chars: Optional[int] = None,
+                               chunk_chars: int = 262144) -> Dict[str, Any]:
+    """
+    Read the page's text or HTML, clipped inside the page.
+
+    Only the first ``max_chars`` characters cross the CDP connection, so
+    a multi-megabyte page costs no more to serialize than the limit.
+
+    Args:
+        page: The Playwright page to read
+        kind: ``"text"`` (rendered text) or ``"html"`` (serialized document)
+        max_chars: Maximum characters to return, counted in UTF-16 units
+            (None: everything, fetched in chunks)
+        chunk_chars: UTF-16 units per round trip when fetching everything
+
+    Returns:
+        Dictionary with ``content``, ``length`` (the full size in code
+        points) and ``truncated``
+    """
+    if kind not in ("text", "html"):
+        raise ParserError(f"Unknown page content kind: {kind}")
+    if max_chars is None:
+        chunks = [chunk async for chunk in iter_page_content(page, kind, chunk_chars)]
+        content = "".join(chunks)
+        return {"content": content, "length": len(content), "truncated": False}
+
+    part = await page.evaluate(PAGE_CONTENT_SCRIPT, {
+        "kind": kind, "offset": 0, "limit": max_chars, "keep": False
+    })
+    if part["truncated"]:
+        logger.debug(f"Clipped page {kind} from {part['length']} to {len(part['chunk'])} characters")
+    return {"content": part["chunk"], "length": part["length"],
+            "truncated": part["truncated"]}
@@ -0,0 +1,363 @@
+"""
+Per-host politeness: robots.txt caching and request scheduling.
+"""
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+from ..core.config import get_config
+from ..core.exceptions import RobotsDisallowedError
+
+logger = logging.getLogger(__name__)
+
+def parse_crawl_delays(lines: List[str]) -> Dict[str, float]:
+    """
+    Parse ``Crawl-delay`` values per user-agent token.
+
+    ``RobotFileParser`` only understands whole seconds; fractional delays
+    such as ``Crawl-delay: 0.5`` are common, so they are parsed here.
+
+    Args:
+        lines: Lines of a robots.txt file
+
+    Returns:
+        Mapping of lowercase user-agent token to delay in seconds
+    """
+    delays = {}
+    group = []
+    in_agents = False
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if ":" not in line:
+            continue
+        field, value = (part.strip() for part in line.split(":", 1))
+        field = field.lower()
+        if field == "user-agent":
+            if not in_agents:
+                group = []
+            group.append(value.lower())
+            in_agents = True
+            continue
+        in_agents = False
+        if field == "crawl-delay":
+            try:
+                delay = float(value)
+            except ValueError:
+                continue
+            for agent in group:
+                delays.setdefault(agent, delay)
+    return delays
+
+class RobotsCache:
+    """
+    Fetches, parses and caches robots.txt per origin with a TTL.
+
+    Following common crawler practice, a missing robots.txt (4xx) allows
+    everything, 401/403 disallow everything, and server or network errors
+    allow everything but are cached only for ``error_ttl`` so they are
+    retried soon.
+    """
+
+    def __init__(self, user_agent: Optional[str] = None, ttl: Optional[float] = None,
+                 error_ttl: float = 60.0, timeout: float = 10.0,
+                 client: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize the robots.txt cache.
+
+        Args:
+            user_agent: User agent to evaluate rules for (default: from config)
+            ttl: Seconds a fetched robots.txt stays cached (default: from config)
+            error_ttl: Seconds a failed fetch stays cached
+            timeout: Timeout for fetching robots.txt in seconds
+            client: HTTP client to fetch with (default: a private one)
+        """
+        scraping_config = get_config()["scraping"]
+        self.user_agent = user_agent or scraping_config["user_agent"]
+        self.ttl = ttl if ttl is not None else scraping_config.get("robots_ttl", 3600)
+        self.error_ttl = error_ttl
+        self.timeout = timeout
+        self._client = client
+        self._owns_client = client is None
+        self._entries: Dict[str, Tuple[RobotFileParser, float]] = {}
+        self._delays: Dict[str, Dict[str, float]] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    async def _fetch(self, origin: str) -> Tuple[RobotFileParser, float]:
+        parser = RobotFileParser(f"{origin}/robots.txt")
+        self._delays.pop(origin, None)
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout, follow_redirects=True,
+                                             headers={"User-Agent": self.user_agent})
+        try:
+            response = await self._client.get(f"{origin}/robots.txt")
+        except httpx.HTTPError as e:
+            logger.debug(f"Could not fetch robots.txt for {origin}: {e}")
+            parser.allow_all = True
+            return parser, self.error_ttl
+
+        if response.status_code in (401, 403):
+            parser.disallow_all = True
+        elif 400 <= response.status_code < 500:
+            parser.allow_all = True
+        elif response.status_code >= 500:
+            parser.allow_all = True
+            return parser, self.error_ttl
+        else:
+            lines = response.text.splitlines()
+            parser.parse(lines)
+            self._delays[origin] = parse_crawl_delays(lines)
+        parser.modified()
+        return parser, self.ttl
+
+    async def get(self, url: str) -> RobotFileParser:
+        """
+        Get the parsed robots.txt for the origin of a URL.
+
+        Concurrent lookups for the same origin share a single fetch.
+
+        Args:
+            url: Any URL on the origin
+
+        Returns:
+            The parsed robots.txt rules
+        """
+        origin = self._origin(url)
+        entry = self._entries.get(origin)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+
+        pending = self._pending.get(origin)
+        if pending is None:
+            pending = asyncio.ensure_future(self._load(origin))
+            self._pending[origin] = pending
+        # Shielded so one cancelled caller doesn't cancel the shared fetch.
+        return await asyncio.shield(pending)
+
+    async def _load(self, origin: str) -> RobotFileParser:
+        try:
+            parser, ttl = await self._fetch(origin)
+            self._entries[origin] = (parser, time.monotonic() + ttl)
+            return parser
+        finally:
+            self._pending.pop(origin, None)
+
+    async def can_fetch(self, url: str) -> bool:
+        """Whether robots.txt allows our user agent to fetch the URL."""
+        parser = await self.get(url)
+        return parser.can_fetch(self.user_agent, url)
+
+    async def crawl_delay(self, url: str) -> Optional[float]:
+        """
+        The crawl delay requested for our user agent, if any.
+
+        A ``Request-rate`` line is converted to the equivalent delay.
+        """
+        parser = await self.get(url)
+        delays = self._delays.get(self._origin(url), {})
+        product = self.user_agent.split("/")[0].lower()
+        for agent, delay in delays.items():
+            if agent != "*" and agent in product:
+                return delay
+        if "*" in delays:
+            return delays["*"]
+        rate = parser.request_rate(self.user_agent)
+        if rate is not None and rate.requests:
+            return rate.seconds / rate.requests
+        return None
+
+    async def close(self) -> None:
+        """Close the HTTP client if this cache created it."""
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+        self._client = None
+
+class _HostState:
+    """Waiters and timing for one host."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.waiters = deque()
+        self.active = 0
+        self.next_start = 0.0
+        # When the host was last granted a slot (scheduler-wide counter; -1: never)
+        self.turn = -1
+
+class HostScheduler:
+    """
+    Schedules requests so that no host is hammered while others sit idle.
+
+    Every host has its own FIFO queue of waiting requests, a minimum
+    spacing between request starts (the configured delay, or the
+    robots.txt crawl-delay if that is longer) and a concurrency cap.
+    Requests waiting for their host's spacing do not hold a global slot,
+    and free global slots are handed to hosts round-robin, so throughput
+    across many hosts stays high within the per-host limits.
+    """
+
+    def __init__(self, min_delay: Optional[float] = None,
+                 per_host_concurrency: Optional[int] = None,
+                 max_concurrency: Optional[int] = None,
+                 robots: Optional[RobotsCache] = None,
+                 respect_robots: Optional[bool] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            min_delay: Seconds between request starts per host (default: from config)
+            per_host_concurrency: Concurrent requests per host (default: from config)
+            max_concurrency: Concurrent requests overall (default: from config)
+            robots: robots.txt cache (default: a new one when robots are respected)
+            respect_robots: Whether to honour robots.txt (default: from config)
+        """
+        scraping_config = get_config()["scraping"]
+        self.min_delay = (min_delay if min_delay is not None
+                          else scraping_config.get("delay_between_requests", 1.0))
+        self.per_host_concurrency = (per_host_concurrency
+                                     or scraping_config.get("per_host_concurrency", 2))
+        self.max_concurrency = max_concurrency or scraping_config.get("max_concurrency", 4)
+        self.respect_robots = (respect_robots if respect_robots is not None
+                               else scraping_config.get("respect_robots", True))
+        self.robots = (robots or RobotsCache()) if self.respect_robots else None
+        self._hosts: Dict[str, _HostState] = {}
+        self._rotation = deque()
+        self._turns = itertools.count()
+        self._active = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def _host_state(self, url: str, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            delay = self.min_delay
+            if self.robots is not None:
+                crawl_delay = await self.robots.crawl_delay(url)
+                if crawl_delay is not None:
+                    delay = max(delay, crawl_delay)
+            # Another request for this host may have created it meanwhile.
+            state = self._hosts.setdefault(host, _HostState(delay))
+        return state
+
+    def _dispatch(self) -> None:
+        """Grant slots to waiting requests whose host and the global cap allow it."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        earliest = None
+        progress = True
+        while progress and self._active < self.max_concurrency:
+            progress = False
+            for host in list(self._rotation):
+                if self._active >= self.max_concurrency:
+                    break
+                state = self._hosts[host]
+                while state.waiters and state.waiters[0].done():
+                    state.waiters.popleft()  # cancelled while waiting
+                if not state.waiters:
+                    self._rotation.remove(host)
+                    continue
+                if state.active >= self.per_host_concurrency:
+                    continue
+                if state.next_start > now:
+                    earliest = state.next_start if earliest is None else min(earliest, state.next_start)
+                    continue
+                waiter = state.waiters.popleft()
+                state.active += 1
+                self._active += 1
+                state.next_start = now + state.delay
+                state.turn = next(self._turns)
+                waiter.set_result(None)
+                # Round-robin: the host just served goes to the back.
+                self._rotation.remove(host)
+                self._rotation.append(host)
+                progress = True
+
+        if earliest is not None:
+            if self._timer is not None and self._timer.when() > earliest:
+                self._timer.cancel()
+                self._timer = None
+            if self._timer is None:
+                self._timer = loop.call_at(earliest, self._on_timer)
+
+    def _join_rotation(self, host: str, state: _HostState) -> None:
+        """Add a host to the rotation behind every host served less recently."""
+        # The rotation is ordered by last grant, so a host that was just
+        # served (or a new one) doesn't jump ahead of hosts already waiting.
+        for index, other in enumerate(self._rotation):
+            if self._hosts[other].turn > state.turn:
+                self._rotation.insert(index, host)
+                return
+        self._rotation.append(host)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    def _release(self, host: str) -> None:
+        self._hosts[host].active -= 1
+        self._active -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """
+        Wait for this URL's turn and hold its host slot for the block.
+
+        Args:
+            url: The URL about to be requested
+
+        Raises:
+            RobotsDisallowedError: If robots.txt disallows the URL
+        """
+        if self.robots is not None and not await self.robots.can_fetch(url):
+            raise RobotsDisallowedError(f"robots.txt disallows {url}")
+
+        host = urlsplit(url).netloc.lower()
+        state = await self._host_state(url, host)
+        if host not in self._rotation:
+            self._join_rotation(host, state)
+
+        waiter = asyncio.get_running_loop().create_future()
+        state.waiters.append(waiter)
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release(host)  # granted just as we were cancelled
+            else:
+                waiter.cancel()
+            raise
+
+        try:
+            yield
+        finally:
+            self._release(host)
+
+    @property
+    def waiting(self) -> int:
+        """Number of requests waiting for a slot."""
+        return sum(len(state.waiters) for state in self._hosts.values())
+
+    @property
+    def active(self) -> int:
+        """Number of requests currently holding a slot."""
+        return self._active
+
+    async def close(self) -> None:
+        """Release the robots.txt cache and pending timers."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self.robots is not None:
+            await self.robots.close()
@@ -0,0 +1,162 @@
+"""
+Pool of browser pages shared by concurrent scrapes.
+"""
+import asyncio
+import logging
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from playwright.async_api import BrowserContext, Page
+
+from ..core.exceptions import PoolClosedError
+
+logger = logging.getLogger(__name__)
+
+# Pages whose renderer crashed; they stay open but every call on them fails.
+_crashed_pages: "weakref.WeakSet[Page]" = weakref.WeakSet()
+
+def _on_crash(page: Page) -> None:
+    logger.warning(f"Page crashed: {page.url}")
+    _crashed_pages.add(page)
+
+def watch_page(page: Page) -> None:
+    """Track renderer crashes of a page, for ``page_alive``."""
+    page.on("crash", _on_crash)
+
+def page_alive(page: Page) -> bool:
+    """Whether a page is open, not crashed, and its browser still connected."""
+    if page.is_closed() or page in _crashed_pages:
+        return False
+    browser = page.context.browser
+    return browser is None or browser.is_connected()
+
+class PagePool:
+    """
+    A bounded pool of pages opened lazily on one browser context.
+
+    At most ``size`` pages exist at a time, so the pool doubles as the
+    concurrency cap for everything that scrapes through it. Pages that
+    crashed, and pages borrowed ``max_uses`` times, are closed on
+    release and replaced by fresh ones on demand.
+    """
+
+    def __init__(self, context: BrowserContext, size: int = 4, max_uses: Optional[int] = None):
+        """
+        Initialize the page pool.
+
+        Args:
+            context: The browser context to open pages on
+            size: Maximum number of pages (and concurrent scrapes)
+            max_uses: Borrows before a page is closed and replaced, to
+                shed what pages accumulate (default: never)
+        """
+        if size < 1:
+            raise ValueError("Page pool size must be at least 1")
+        self.context = context
+        self.size = size
+        # Holds idle pages, or None for a free slot where no page exists yet.
+        self._slots: asyncio.Queue = asyncio.Queue()
+        for _ in range(size):
+            self._slots.put_nowait(None)
+        self.max_uses = max_uses
+        self._uses: Dict[Page, int] = {}
+        self._closed = False
+        self._drained = asyncio.Event()
+
+    async def _acquire(self) -> Page:
+        page = await self._slots.get()
+        if self._closed:
+            # Closed while waiting: don't open pages on a context being retired
+            self._slots.put_nowait(page)
+            raise PoolClosedError("Page pool is closed")
+        if page is not None and page_alive(page):
+            return page
+        if page is not None:
+            self._uses.pop(page, None)
+            await self._close_page(page)
+        # Free slot, or the idle page crashed/was closed: open a fresh one.
+        try:
+            page = await self.context.new_page()
+        except BaseException:
+            self._slots.put_nowait(None)
+            raise
+        watch_page(page)
+        return page
+
+    async def _release(self, page: Page) -> None:
+        uses = self._uses[page] = self._uses.get(page, 0) + 1
+        if (self._closed or not page_alive(page)
+                or (self.max_uses is not None and uses >= self.max_uses)):
+            self._uses.pop(page, None)
+            self._slots.put_nowait(None)
+            await self._close_page(page)
+        else:
+            self._slots.put_nowait(page)
+        if self._closed and not self.in_use:
+            self._drained.set()
+
+    async def _close_page(self, page: Page) -> None:
+        if page.is_closed():
+            return
+        try:
+            await page.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled page: {e}")
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """
+        Borrow a page for the duration of the ``async with`` block.
+
+        Yields:
+            A page that is not in use by anyone else
+
+        Raises:
+            PoolClosedError: If the pool is closed, or closes while waiting
+        """
+        if self._closed:
+            raise PoolClosedError("Page pool is closed")
+        page = await self._acquire()
+        try:
+            yield page
+        finally:
+            await self._release(page)
+
+    @property
+    def in_use(self) -> int:
+        """Number of pages currently borrowed."""
+        return self.size - self._slots.qsize()
+
+    async def close(self) -> None:
+        """
+        Close all idle pages; borrowed pages are closed on release.
+
+        Callers still waiting for a page get ``PoolClosedError``.
+        """
+        self._closed = True
+        for _ in range(self._slots.qsize()):
+            page = self._slots.get_nowait()
+            if page is not None:
+                await self._close_page(page)
+            self._slots.put_nowait(None)
+        self._uses.clear()
+        if not self.in_use:
+            self._drained.set()
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Close the pool and wait for borrowed pages to come back.
+
+        Args:
+            timeout: Seconds to wait for borrowers (default: no limit)
+
+        Returns:
+            Whether every page was returned in time
+        """
+        await self.close()
+        try:
+            await asyncio.wait_for(self._drained.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
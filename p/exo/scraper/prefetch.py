@@ -0,0 +1,231 @@
+"""
+Speculative prefetch of pages an agent is likely to ask for next.
+
+After a search, the agent usually scrapes one of the top results next.
+The search already scraped them, so it hands those pages to a
+``Prefetcher``, which keeps them in a small in-memory cache bounded in
+bytes; results the search gave up on (timeouts) keep loading in the
+background, bounded in concurrent fetches, while the model writes its
+answer. When the agent asks for one of them, it gets the cached page,
+or joins the fetch already in flight, and the prefetches it did not
+pick are cancelled.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..core.config import get_config
+from ..utils.deadline import no_deadline
+
+logger = logging.getLogger(__name__)
+
+Fetch = Callable[[str], Awaitable[Dict[str, Any]]]
+
+def result_bytes(result: Dict[str, Any]) -> int:
+    """Size in bytes of the page text or HTML in a scrape result."""
+    content = result.get("content")
+    return len(content.encode("utf-8")) if isinstance(content, str) else 0
+
+class Prefetcher:
+    """
+    Background page loader with a byte-bounded cache.
+    """
+
+    def __init__(self, fetch: Optional[Fetch] = None, top_k: Optional[int] = None,
+                 max_bytes: Optional[int] = None, max_concurrency: Optional[int] = None,
+                 max_age: Optional[float] = None):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            fetch: Coroutine function scraping a URL (default: the shared
+                scraper's ``scrape_url`` with main content, as the
+                ``scrape_website`` tool reads pages)
+            top_k: URLs prefetched per call to ``prefetch`` (default: from config)
+            max_bytes: Page text kept in the cache; least recently used
+                pages are evicted first (default: from config)
+            max_concurrency: Pages fetched at once (default: from config)
+            max_age: Seconds a prefetched page is served (default: from config)
+        """
+        prefetch_config = get_config()["prefetch"]
+        self.fetch = fetch or self._scrape
+        self.top_k = top_k or prefetch_config.get("top_k", 3)
+        self.max_bytes = max_bytes or prefetch_config.get("max_bytes", 8000000)
+        self.max_age = max_age if max_age is not None else prefetch_config.get("max_age", 300)
+        self._semaphore = asyncio.Semaphore(max_concurrency or prefetch_config.get("max_concurrency", 2))
+        # url -> (fetched_at, result, size), least recently used first
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any], int]]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.bytes = 0
+        self.fetched = 0
+        self.hits = 0
+        self.joined = 0
+        self.cancelled = 0
+
+    async def _scrape(self, url: str) -> Dict[str, Any]:
+        # Imported here: the scraper module imports storage, which imports the crawler.
+        from .tools.scraper import scrape_url
+        return await scrape_url(url, main_content=True)
+
+    def _store(self, url: str, result: Dict[str, Any]) -> None:
+        size = result_bytes(result)
+        if "error" in result or size > self.max_bytes:
+            return
+        self._evict(url)
+        while self._cache and self.bytes + size > self.max_bytes:
+            self._evict(next(iter(self._cache)))
+        self._cache[url] = (time.monotonic(), result, size)
+        self.bytes += size
+
+    def _evict(self, url: str) -> None:
+        entry = self._cache.pop(url, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+
+    def _cached(self, url: str) -> Optional[Dict[str, Any]]:
+        entry = self._cache.get(url)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > self.max_age:
+            self._evict(url)
+            return None
+        self._cache.move_to_end(url)
+        return dict(entry[1])
+
+    async def _prefetch_one(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            # Prefetches serve the next request, so the current one's deadline doesn't apply
+            with no_deadline():
+                async with self._semaphore:
+                    result = await self.fetch(url)
+            self.fetched += 1
+            self._store(url, result)
+            return result
+        finally:
+            if self._tasks.get(url) is asyncio.current_task():
+                del self._tasks[url]
+
+    def add(self, results: Iterable[Dict[str, Any]]) -> int:
+        """
+        Cache pages fetched elsewhere, e.g. the results a search scraped.
+
+        Results with an error or without a URL are skipped.
+
+        Args:
+            results: Scrape results, as ``fetch`` returns them
+
+        Returns:
+            Number of pages cached
+        """
+        added = 0
+        for result in results:
+            url = result.get("url")
+            if url and "error" not in result:
+                # A copy: callers go on to annotate their results
+                self._store(url, dict(result))
+                if url in self._cache:
+                    added += 1
+        return added
+
+    def prefetch(self, urls: Iterable[str]) -> List[str]:
+        """
+        Start loading the first ``top_k`` URLs in the background.
+
+        URLs already cached or in flight are skipped. Must be called from
+        a running event loop.
+
+        Args:
+            urls: Candidate URLs, most likely first
+
+        Returns:
+            The URLs a fetch was started for
+        """
+        started = []
+        for url in list(dict.fromkeys(urls))[:self.top_k]:
+            if url in self._tasks or self._cached(url) is not None:
+                continue
+            self._tasks[url] = asyncio.ensure_future(self._prefetch_one(url))
+            started.append(url)
+        if started:
+            logger.debug(f"Prefetching {len(started)} pages: {', '.join(started)}")
+        return started
+
+    async def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Take a prefetched page, cancelling the other prefetches.
+
+        Waits for the page if its prefetch is still running, since that
+        is never slower than starting a new fetch.
+
+        Args:
+            url: The URL the agent asked for
+
+        Returns:
+            The scrape result (with ``prefetched`` set), or None if the
+            URL was not prefetched or its fetch failed
+        """
+        self.cancel(keep=url)
+        result = self._cached(url)
+        if result is not None:
+            self.hits += 1
+        else:
+            task = self._tasks.get(url)
+            if task is None:
+                return None
+            try:
+                # Shielded so the page is still cached if the caller gives up.
+                fetched = await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if task.cancelled():
+                    return None
+                raise
+            except Exception as e:
+                logger.debug(f"Prefetch of {url} failed: {e}")
+                return None
+            if fetched is None or "error" in fetched:
+                return None
+            self.joined += 1
+            result = dict(fetched)
+        logger.info(f"Serving {url} from the prefetch cache")
+        result["prefetched"] = True
+        return result
+
+    def cancel(self, keep: Optional[str] = None) -> int:
+        """
+        Cancel prefetches still in flight.
+
+        Args:
+            keep: A URL whose prefetch should keep running
+
+        Returns:
+            Number of prefetches cancelled
+        """
+        cancelled = 0
+        for url, task in list(self._tasks.items()):
+            if url != keep and not task.done():
+                task.cancel()
+                cancelled += 1
+        self.cancelled += cancelled
+        return cancelled
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and fetch, hit and cancellation counts."""
+        return {
+            "pages": len(self._cache),
+            "bytes": self.bytes,
+            "in_flight": len(self._tasks),
+            "fetched": self.fetched,
+            "hits": self.hits,
+            "joined": self.joined,
+            "cancelled": self.cancelled
+        }
+
+    async def close(self) -> None:
+        """Cancel all prefetches and drop the cache."""
+        tasks = list(self._tasks.values())
+        self.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._cache.clear()
+        self.bytes = 0
@@ -0,0 +1,229 @@
+"""
+HTML processing off the event loop, in a pool of worker processes.
+
+Parsing, boilerplate removal, link and table extraction are pure-Python
+and CPU-bound; run inline they stall every other scrape on the loop and
+use one core. ``HtmlProcessor`` sends them to a ``ProcessPoolExecutor``
+instead. Jobs arriving close together are grouped into batches, so one
+pickle round trip carries several pages. Small pages are processed
+inline, where the IPC would cost more than the work.
+
+Each page is parsed once per job, and the requested tasks share the tree:
+
+- ``"main"``: main article ``title``, ``text`` and ``metadata``
+- ``"text"``: visible ``body_text`` of the whole page
+- ``"links"``: canonical crawlable ``links``
+- ``"tables"``: data ``tables``
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from ..core.config import get_config
+from .dom import parse_html
+from .readability import extract_main_content
+from .tables import extract_tables
+
+logger = logging.getLogger(__name__)
+
+PROCESSING_TASKS = ("main", "text", "links", "tables")
+
+def process_html(html: str, url: Optional[str] = None,
+                 tasks: Sequence[str] = ("main",)) -> Dict[str, Any]:
+    """
+    Run processing tasks on a page (in the calling process).
+
+    Args:
+        html: The page HTML
+        url: URL the page was fetched from
+        tasks: Any of ``"main"``, ``"text"``, ``"links"`` and ``"tables"``
+
+    Returns:
+        Dictionary with the keys each task produces
+    """
+    unknown = set(tasks) - set(PROCESSING_TASKS)
+    if unknown:
+        raise ValueError(f"Unknown processing tasks: {sorted(unknown)}")
+    result: Dict[str, Any] = {}
+    if "links" in tasks:
+        # Imported here: the crawler package imports the scraper, which imports this.
+        from .crawler.links import extract_links
+        result["links"] = extract_links(html, url or "")
+    root = parse_html(html)
+    if "tables" in tasks:
+        result["tables"] = extract_tables(root)
+    if "text" in tasks:
+        body = root.find("body") or root
+        result["body_text"] = body.text()
+    if "main" in tasks:
+        # Prunes the tree, so it runs last
+        article = extract_main_content(root, url)
+        result.update(title=article["title"], text=article["text"],
+                      metadata=article["metadata"])
+    return result
+
+def _process_batch(jobs: List[Tuple[str, Optional[str], Tuple[str, ...]]]) -> List[Any]:
+    results = []
+    for html, url, tasks in jobs:
+        try:
+            results.append(process_html(html, url, tasks))
+        except Exception as e:
+            # One bad page must not fail the rest of its batch
+            results.append(e)
+    return results
+
+class HtmlProcessor:
+    """
+    Batches HTML processing jobs into a process pool behind an async API.
+    """
+
+    def __init__(self, workers: Optional[int] = None, batch_size: Optional[int] = None,
+                 max_delay: Optional[float] = None, inline_chars: Optional[int] = None):
+        """
+        Initialize the processor. Worker processes start on first use.
+
+        Args:
+            workers: Worker processes (default: from config, else the CPU
+                count; 0 processes everything inline)
+            batch_size: Maximum pages per worker task (default: from config)
+            max_delay: Seconds to wait for more jobs before sending a
+                partial batch (default: from config)
+            inline_chars: Pages shorter than this are processed inline
+                (default: from config)
+        """
+        processing_config = get_config()["processing"]
+        if workers is None:
+            workers = processing_config.get("workers")
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.batch_size = batch_size or processing_config.get("batch_size", 8)
+        self.max_delay = (processing_config.get("max_delay_ms", 5) / 1000
+                          if max_delay is None else max_delay)
+        self.inline_chars = (processing_config.get("inline_chars", 20000)
+                             if inline_chars is None else inline_chars)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._batches = set()
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned workers don't inherit the parent's threads and locks
+            context = multiprocessing.get_context(get_config()["processing"].get("start_method", "spawn"))
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=context)
+            logger.info(f"Started HTML processing pool with {self.workers} workers")
+        return self._executor
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._dispatcher is None or self._dispatcher.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            batch = [(job, future) for job, future in batch if not future.cancelled()]
+            if batch:
+                # Keep a reference so the task isn't garbage collected mid-run
+                task = asyncio.create_task(self._run_batch(batch))
+                self._batches.add(task)
+                task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch: List[Tuple[tuple, asyncio.Future]]) -> None:
+        loop = asyncio.get_running_loop()
+        # (Re)started here, so batches after a broken pool get a fresh one
+        executor = self._ensure_pool()
+        try:
+            results = await loop.run_in_executor(
+                executor, _process_batch, [job for job, _ in batch]
+            )
+        except BrokenProcessPool as e:
+            # A worker died (e.g. killed for memory); the next batch starts a
+            # fresh pool, unless one already replaced this one
+            logger.warning(f"HTML processing pool broke: {e}")
+            if self._executor is executor:
+                self._executor = None
+                executor.shutdown(wait=False)
+            results = [e] * len(batch)
+        except asyncio.CancelledError:
+            # Closing: don't leave callers waiting on the batch
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            results = [e] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def process(self, html: str, url: Optional[str] = None,
+                      tasks: Sequence[str] = ("main",)) -> Dict[str, Any]:
+        """
+        Process a page in the pool.
+
+        Args:
+            html: The page HTML
+            url: URL the page was fetched from
+            tasks: Any of ``"main"``, ``"text"``, ``"links"`` and ``"tables"``
+
+        Returns:
+            The ``process_html`` result
+        """
+        if self.workers == 0 or len(html) < self.inline_chars:
+            return process_html(html, url, tasks)
+        self._ensure_started()
+        future = self._loop.create_future()
+        self._queue.put_nowait(((html, url, tuple(tasks)), future))
+        return await future
+
+    async def process_many(self, pages: Sequence[Tuple[str, Optional[str]]],
+                           tasks: Sequence[str] = ("main",)) -> List[Dict[str, Any]]:
+        """Process ``(html, url)`` pairs concurrently; results are in input order."""
+        return await asyncio.gather(*(self.process(html, url, tasks) for html, url in pages))
+
+    async def main_content(self, html: str, url: Optional[str] = None) -> Dict[str, Any]:
+        """Async ``extract_main_content``: ``title``, ``text`` and ``metadata``."""
+        return await self.process(html, url, ("main",))
+
+    async def close(self) -> None:
+        """Stop the dispatcher, cancel running batches and shut the worker processes down."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            self._dispatcher = None
+        batches, self._batches = list(self._batches), set()
+        for task in batches:
+            task.cancel()
+        if batches and self._loop is asyncio.get_running_loop():
+            await asyncio.gather(*batches, return_exceptions=True)
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown, True, cancel_futures=True)
+
+_processor = None
+
+def get_html_processor() -> HtmlProcessor:
+    """The shared HTML processor."""
+    global _processor
+    if _processor is None:
+        _processor = HtmlProcessor()
+    return _processor
@@ -0,0 +1,210 @@
+"""
+Query-aware passage selection for prompts.
+
+Scraped pages are split into passages, a compact BM25 inverted index is
+built over them for the current request, and only the best-scoring
+passages that fit the prompt budget are passed on to the model.
+"""
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from .dedup import estimate_tokens
+
+_TOKENS = re.compile(r"\w+", re.UNICODE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have he her his i if in into is it its
+me my not of on or our she so than that the their them then there these they this
+to was we were what when where which who why will with you your
+""".split())
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords."""
+    return [token for token in _TOKENS.findall(text.lower()) if token not in STOPWORDS]
+
+def _split_long(block: str, max_chars: int) -> List[str]:
+    """Split a block that is too long on sentence boundaries (hard-split as a last resort)."""
+    pieces = []
+    current = ""
+    for sentence in _SENTENCE_END.split(block):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+def chunk_text(text: str, max_chars: int = 800) -> List[str]:
+    """
+    Split text into passages of at most ``max_chars`` characters.
+
+    Consecutive lines (paragraphs, list items) are merged until the limit
+    is reached; longer paragraphs are split on sentence boundaries.
+
+    Args:
+        text: The text to split
+        max_chars: Maximum passage length
+
+    Returns:
+        List of passages in document order
+    """
+    passages = []
+    current = ""
+    for line in text.splitlines():
+        line = " ".join(line.split())
+        if not line:
+            continue
+        for block in (_split_long(line, max_chars) if len(line) > max_chars else [line]):
+            if current and len(current) + 1 + len(block) > max_chars:
+                passages.append(current)
+                current = block
+            else:
+                current = f"{current}\n{block}" if current else block
+    if current:
+        passages.append(current)
+    return passages
+
+class BM25Index:
+    """
+    Okapi BM25 over a set of passages.
+
+    Postings are stored per term as two NumPy arrays (passage ids and term
+    frequencies), so a query is scored with one vectorized update per
+    query term.
+    """
+
+    def __init__(self, passages: List[str], k1: float = 1.5, b: float = 0.75):
+        """
+        Build the index.
+
+        Args:
+            passages: The passages to index
+            k1: Term-frequency saturation
+            b: Length normalization strength
+        """
+        self.k1 = k1
+        self.b = b
+        self.size = len(passages)
+        postings: Dict[str, Dict[int, int]] = {}
+        lengths = np.zeros(self.size, dtype=np.float32)
+        for passage_id, passage in enumerate(passages):
+            tokens = tokenize(passage)
+            lengths[passage_id] = len(tokens)
+            for token in tokens:
+                counts = postings.setdefault(token, {})
+                counts[passage_id] = counts.get(passage_id, 0) + 1
+
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {
+            term: (np.fromiter(counts.keys(), dtype=np.int32, count=len(counts)),
+                   np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+            for term, counts in postings.items()
+        }
+        average = lengths.mean() if self.size else 0.0
+        # Per-passage part of the BM25 denominator, computed once.
+        self._norm = k1 * (1 - b + b * lengths / average) if average else np.full(self.size, k1)
+
+    def idf(self, term: str) -> float:
+        """Inverse document frequency of a term (BM25+ style, never negative)."""
+        frequency = len(self.postings[term][0]) if term in self.postings else 0
+        return float(np.log(1 + (self.size - frequency + 0.5) / (frequency + 0.5)))
+
+    def score(self, query: str) -> np.ndarray:
+        """
+        Score every passage against a query.
+
+        Returns:
+            Array of BM25 scores, one per passage
+        """
+        scores = np.zeros(self.size, dtype=np.float32)
+        for term in set(tokenize(query)):
+            if term not in self.postings:
+                continue
+            ids, tfs = self.postings[term]
+            scores[ids] += self.idf(term) * tfs * (self.k1 + 1) / (tfs + self._norm[ids])
+        return scores
+
+    def top(self, query: str, k: int) -> List[Tuple[int, float]]:
+        """The ``k`` best passages with a positive score as ``(id, score)``."""
+        scores = self.score(query)
+        if k < self.size:
+            candidates = np.argpartition(-scores, k)[:k]
+        else:
+            candidates = np.arange(self.size)
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(i), float(scores[i])) for i in ranked if scores[i] > 0]
+
+def select_passages(documents: List[Dict[str, Any]], query: str,
+                    budget_tokens: int = 1000, passage_chars: int = 800,
+                    text_key: str = "content", url_key: str = "url",
+                    top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Pick the passages most relevant to a query that fit the prompt budget.
+
+    If no passage shares a term with the query (or there is no query),
+    documents are read from the top instead: every document's opening
+    passage first, then the second ones, and so on, within the budget.
+
+    Args:
+        documents: Documents with text under ``text_key``
+        query: The user query
+        budget_tokens: Maximum estimated tokens across selected passages
+        passage_chars: Maximum passage length in characters
+        text_key: Key holding the document text
+        url_key: Key holding the document URL
+        top_k: Maximum number of passages (default: as many as fit)
+
+    Returns:
+        Selected passages as dictionaries with ``url``, ``text``,
+        ``score``, ``document`` (index in ``documents``) and ``position``
+        (index within the document), best first
+    """
+    passages = []
+    for document_index, document in enumerate(documents):
+        text = document.get(text_key)
+        if not isinstance(text, str):
+            continue
+        for position, passage in enumerate(chunk_text(text, passage_chars)):
+            passages.append({
+                "url": document.get(url_key),
+                "text": passage,
+                "document": document_index,
+                "position": position
+            })
+    if not passages:
+        return []
+
+    index = BM25Index([passage["text"] for passage in passages])
+    ranked = index.top(query, top_k or len(passages))
+    if ranked:
+        ordered = []
+        for passage_id, score in ranked:
+            passages[passage_id]["score"] = score
+            ordered.append(passages[passage_id])
+    else:
+        ordered = [dict(passage, score=0.0) for passage in
+                   sorted(passages, key=lambda passage: (passage["position"], passage["document"]))]
+
+    selected = []
+    used = 0
+    for passage in ordered:
+        cost = estimate_tokens(passage["text"])
+        if used + cost > budget_tokens:
+            continue
+        selected.append(passage)
+        used += cost
+        if top_k and len(selected) >= top_k:
+            break
+    return selected
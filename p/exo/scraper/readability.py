@@ -0,0 +1,223 @@
+"""
+Readability-style main-content extraction.
+
+Scraped pages carry navigation, footers, cookie banners and sidebars
+around the article. Following the classic readability approach, the
+document is pruned of unlikely elements, text blocks are scored by their
+length and comma count, scores propagate to parents and grandparents,
+and each candidate's score is discounted by its link density. The best
+candidate plus related siblings becomes the main text.
+"""
+import re
+from typing import Dict, Any, List, Optional, Union
+from urllib.parse import urljoin
+
+from .dom import Node, parse_html
+
+NEGATIVE_PATTERN = re.compile(
+    r"comment|footer|foot|nav|menu|sidebar|side-bar|cookie|consent|gdpr|banner|popup|"
+    r"modal|share|social|related|promo|sponsor|advert|\bads?\b|breadcrumb|subscribe|"
+    r"newsletter|masthead|widget|login|signup|pagination|skip", re.I
+)
+POSITIVE_PATTERN = re.compile(r"article|content|main|post|entry|story|text|body|blog", re.I)
+
+UNLIKELY_TAGS = {"nav", "footer", "aside", "form", "button", "select", "dialog", "menu"}
+UNLIKELY_ROLES = {"navigation", "banner", "contentinfo", "complementary", "dialog",
+                  "alertdialog", "menu", "menubar", "search"}
+SCORED_TAGS = {"p", "pre", "td", "blockquote"}
+BLOCK_CHILD_TAGS = {"div", "p", "pre", "table", "ul", "ol", "section", "article",
+                    "blockquote", "h1", "h2", "h3", "h4", "h5", "h6"}
+TAG_BONUS = {"article": 10, "main": 5, "div": 5, "pre": 3, "td": 3, "blockquote": 3,
+             "section": 2, "address": -3, "ol": -3, "ul": -3, "dl": -3, "dd": -3,
+             "dt": -3, "li": -3, "form": -3, "h1": -5, "h2": -5, "h3": -5, "h4": -5,
+             "h5": -5, "h6": -5, "th": -5}
+
+MIN_BLOCK_LENGTH = 25
+
+def _class_weight(node: Node) -> int:
+    weight = 0
+    for name in ("class", "id"):
+        value = node.get(name)
+        if value:
+            if NEGATIVE_PATTERN.search(value):
+                weight -= 25
+            if POSITIVE_PATTERN.search(value):
+                weight += 25
+    return weight
+
+def _is_hidden(node: Node) -> bool:
+    style = node.get("style").replace(" ", "").lower()
+    return ("hidden" in node.attrs or node.get("aria-hidden") == "true"
+            or "display:none" in style or "visibility:hidden" in style)
+
+def _is_unlikely(node: Node) -> bool:
+    if node.tag in ("html", "body", "article", "main"):
+        return False
+    if node.tag in UNLIKELY_TAGS or node.get("role") in UNLIKELY_ROLES or _is_hidden(node):
+        return True
+    if node.tag == "header":
+        # Page headers are boilerplate; an article's own header holds its title.
+        ancestor = node.parent
+        while ancestor is not None and ancestor.tag not in ("article", "main"):
+            ancestor = ancestor.parent
+        return ancestor is None
+    names = f"{node.get('class')} {node.get('id')}"
+    return bool(NEGATIVE_PATTERN.search(names)) and not POSITIVE_PATTERN.search(names)
+
+def _prune(root: Node) -> None:
+    """Remove unlikely elements (navigation, banners, hidden nodes) in place."""
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        kept = []
+        for child in node.children:
+            if isinstance(child, Node) and _is_unlikely(child):
+                continue
+            kept.append(child)
+            if isinstance(child, Node):
+                stack.append(child)
+        node.children = kept
+
+def _link_density(node: Node, text_length: int) -> float:
+    if not text_length:
+        return 0.0
+    link_length = sum(len(a.text(" ")) for a in node.iter("a"))
+    return min(1.0, link_length / text_length)
+
+def _is_text_block(node: Node) -> bool:
+    if node.tag in SCORED_TAGS:
+        return True
+    # Divs used as paragraphs: direct text and no block-level children.
+    return (node.tag == "div"
+            and any(isinstance(child, str) and child.strip() for child in node.children)
+            and not any(isinstance(child, Node) and child.tag in BLOCK_CHILD_TAGS
+                        for child in node.children))
+
+def _score_candidates(body: Node) -> Dict[int, List[Any]]:
+    candidates: Dict[int, List[Any]] = {}
+
+    def candidate(node: Node) -> List[Any]:
+        entry = candidates.get(id(node))
+        if entry is None:
+            entry = [node, float(TAG_BONUS.get(node.tag, 0) + _class_weight(node))]
+            candidates[id(node)] = entry
+        return entry
+
+    for node in body.iter():
+        if not _is_text_block(node):
+            continue
+        text = node.text(" ")
+        if len(text) < MIN_BLOCK_LENGTH:
+            continue
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        parent = node.parent
+        if parent is None or parent.tag == "#document":
+            continue
+        candidate(parent)[1] += score
+        if parent.parent is not None and parent.parent.tag != "#document":
+            candidate(parent.parent)[1] += score / 2
+
+    for entry in candidates.values():
+        text_length = len(entry[0].text(" "))
+        entry[1] *= 1 - _link_density(entry[0], text_length)
+    return candidates
+
+def extract_metadata(root: Node, url: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Extract structured metadata from the document head.
+
+    Args:
+        root: The parsed document
+        url: URL the page was fetched from (to resolve the canonical link)
+
+    Returns:
+        Dictionary with whichever of ``title``, ``description``, ``author``,
+        ``published``, ``site_name``, ``type``, ``image``, ``canonical_url``
+        and ``language`` the page declares
+    """
+    meta = {}
+    for node in root.iter("meta"):
+        key = (node.get("property") or node.get("name") or node.get("itemprop")).lower()
+        if key and node.get("content") and key not in meta:
+            meta[key] = node.get("content").strip()
+
+    metadata = {}
+    fields = {
+        "title": ("og:title", "twitter:title"),
+        "description": ("og:description", "description", "twitter:description"),
+        "author": ("author", "article:author", "parsely-author"),
+        "published": ("article:published_time", "datepublished", "date", "pubdate"),
+        "site_name": ("og:site_name", "application-name"),
+        "type": ("og:type",),
+        "image": ("og:image", "twitter:image"),
+    }
+    for field, keys in fields.items():
+        value = next((meta[key] for key in keys if meta.get(key)), None)
+        if value:
+            metadata[field] = value
+
+    for node in root.iter("link"):
+        if "canonical" in node.get("rel").lower().split() and node.get("href"):
+            metadata["canonical_url"] = urljoin(url or "", node.get("href"))
+            break
+
+    html = root.find("html")
+    if html is not None and html.get("lang"):
+        metadata["language"] = html.get("lang")
+    return metadata
+
+def extract_main_content(html: Union[str, Node], url: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Extract the main article text, title and metadata of a page.
+
+    Args:
+        html: The page HTML, or an already parsed root (which is pruned
+            in place)
+        url: URL the page was fetched from
+
+    Returns:
+        Dictionary with ``title``, ``text`` (main content, one block per
+        line), ``metadata`` and ``length``
+    """
+    root = parse_html(html) if isinstance(html, str) else html
+    metadata = extract_metadata(root, url)
+
+    title_node = root.find("title")
+    title = metadata.get("title") or (title_node.text(" ") if title_node else "")
+
+    body = root.find("body") or root
+    _prune(body)
+    candidates = _score_candidates(body)
+
+    if candidates:
+        top, top_score = max(candidates.values(), key=lambda entry: entry[1])
+        threshold = max(10.0, top_score * 0.2)
+        blocks = []
+        siblings = top.parent.children if top.parent is not None else [top]
+        for sibling in siblings:
+            if not isinstance(sibling, Node):
+                continue
+            include = sibling is top
+            if not include:
+                entry = candidates.get(id(sibling))
+                if entry is not None and entry[1] >= threshold:
+                    include = True
+                elif sibling.tag == "p":
+                    text = sibling.text(" ")
+                    include = len(text) > 80 and _link_density(sibling, len(text)) < 0.25
+            if include:
+                blocks.append(sibling.text())
+        text = "\n".join(block for block in blocks if block)
+    else:
+        text = body.text()
+
+    if not title:
+        heading = body.find("h1")
+        title = heading.text(" ") if heading else ""
+
+    return {
+        "title": title,
+        "text": text,
+        "metadata": metadata,
+        "length": len(text)
+    }
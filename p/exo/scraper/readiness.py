@@ -0,0 +1,127 @@
+"""
+Adaptive page-readiness detection.
+
+Instead of waiting for ``networkidle`` (which never fires on pages with
+long-polling or analytics beacons), pages are navigated to
+``domcontentloaded`` and then watched from inside the page until one of
+the following happens:
+
+- a target selector appears,
+- the DOM stops mutating for ``quiet_ms``,
+- the length of the body text stops changing for ``plateau_ms``,
+- the hard ``timeout`` is reached.
+"""
+import asyncio
+import logging
+from typing import Dict, Any, Optional
+
+from playwright.async_api import Page
+
+from ..core.config import get_config
+from ..utils.deadline import time_left
+
+logger = logging.getLogger(__name__)
+
+# Runs entirely inside the page so the whole wait costs a single round trip.
+READINESS_SCRIPT = """
+async ({selector, quietMs, plateauMs, minTextLength, timeout, pollMs}) => {
+    const start = performance.now();
+    let lastMutation = start;
+    let lastLength = -1;
+    let lastLengthChange = start;
+
+    const observer = new MutationObserver(() => { lastMutation = performance.now(); });
+    observer.observe(document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+
+    try {
+        return await new Promise((resolve) => {
+            const check = () => {
+                const now = performance.now();
+                const elapsed = now - start;
+                const textLength = document.body ? document.body.textContent.length : 0;
+                if (textLength !== lastLength) {
+                    lastLength = textLength;
+                    lastLengthChange = now;
+                }
+                const done = (reason) => resolve({
+                    reason: reason,
+                    elapsed: Math.round(elapsed),
+                    text_length: textLength
+                });
+
+                if (selector) {
+                    // An explicit target is the only early exit when given.
+                    if (document.querySelector(selector)) return done("selector");
+                } else if (textLength >= minTextLength) {
+                    if (now - lastMutation >= quietMs) return done("dom_quiet");
+                    if (now - lastLengthChange >= plateauMs) return done("text_plateau");
+                }
+                if (elapsed >= timeout) return done("timeout");
+                setTimeout(check, pollMs);
+            };
+            check();
+        });
+    } finally {
+        observer.disconnect();
+    }
+}
+"""
+
+async def wait_until_ready(page: Page, selector: Optional[str] = None,
+                           timeout: Optional[int] = None,
+                           quiet_ms: Optional[int] = None,
+                           plateau_ms: Optional[int] = None,
+                           min_text_length: Optional[int] = None,
+                           poll_ms: int = 100) -> Dict[str, Any]:
+    """
+    Wait until the current page is ready for extraction.
+
+    The page should already have been navigated with
+    ``wait_until="domcontentloaded"``. When ``selector`` is given the wait
+    ends as soon as it matches; otherwise DOM quiescence or a text-length
+    plateau ends it. In every case ``timeout`` is a hard cap, shortened
+    to the time left before the request's deadline.
+
+    Args:
+        page: The Playwright page to watch
+        selector: CSS selector that marks the page as ready
+        timeout: Hard cap in milliseconds (default: from config)
+        quiet_ms: Milliseconds without DOM mutations (default: from config)
+        plateau_ms: Milliseconds without text-length change (default: from config)
+        min_text_length: Minimum body text length before quiet/plateau count
+        poll_ms: Polling interval inside the page in milliseconds
+
+    Returns:
+        Dictionary with the ``reason`` the wait ended ("selector",
+        "dom_quiet", "text_plateau", "timeout" or "error"), the elapsed
+        milliseconds and the body text length at that point
+    """
+    settings = get_config()["browser"].get("readiness", {})
+    args = {
+        "selector": selector,
+        "timeout": timeout if timeout is not None else settings.get("timeout", 10000),
+        "quietMs": quiet_ms if quiet_ms is not None else settings.get("quiet_ms", 500),
+        "plateauMs": plateau_ms if plateau_ms is not None else settings.get("plateau_ms", 1000),
+        "minTextLength": (min_text_length if min_text_length is not None
+                          else settings.get("min_text_length", 1)),
+        "pollMs": poll_ms
+    }
+    args["timeout"] = int(time_left(args["timeout"] / 1000) * 1000)
+
+    try:
+        # Guard against the in-page timer being throttled or the page hanging.
+        result = await asyncio.wait_for(
+            page.evaluate(READINESS_SCRIPT, args),
+            timeout=args["timeout"] / 1000 + 1.0
+        )
+    except asyncio.TimeoutError:
+        result = {"reason": "timeout", "elapsed": args["timeout"], "text_length": None}
+    except Exception as e:
+        # Usually a navigation destroyed the execution context mid-wait.
+        logger.debug(f"Readiness check failed: {e}")
+        result = {"reason": "error", "elapsed": None, "text_length": None, "error": str(e)}
+
+    logger.debug(f"Page ready ({result['reason']}) after {result['elapsed']} ms")
+    return result
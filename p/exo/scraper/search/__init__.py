@@ -0,0 +1,16 @@
+"""
+Pluggable search backends with a query cache.
+"""
+from .base import SearchBackend
+from .google import GoogleBrowserBackend
+from .http_json import HttpJsonBackend
+from .offline import OfflineBackend
+from .cache import SearchCache, CachedSearchBackend, query_terms
+from .stub import StubSearchServer
+from .backends import create_search_backend
+
+__all__ = [
+    "SearchBackend", "GoogleBrowserBackend", "HttpJsonBackend", "OfflineBackend",
+    "SearchCache", "CachedSearchBackend", "query_terms", "StubSearchServer",
+    "create_search_backend"
+]
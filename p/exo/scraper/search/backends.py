@@ -0,0 +1,41 @@
+"""
+Construction of the configured search backend.
+"""
+from typing import Any, Optional
+
+from ...core.config import get_config
+from ...core.exceptions import ConfigError
+from .base import SearchBackend
+from .cache import CachedSearchBackend, SearchCache
+from .google import GoogleBrowserBackend
+from .http_json import HttpJsonBackend
+from .offline import OfflineBackend
+
+def create_search_backend(name: Optional[str] = None, scraper: Any = None,
+                          cache: bool = True) -> SearchBackend:
+    """
+    Create a search backend by name.
+
+    Args:
+        name: ``"google"``, ``"http"`` or ``"offline"`` (default: from config)
+        scraper: ``WebScraper`` whose browser the Google backend uses
+        cache: Wrap the backend in a query cache
+
+    Returns:
+        The backend
+
+    Raises:
+        ConfigError: If the backend name is unknown
+    """
+    name = name or get_config()["search"].get("backend", "google")
+    if name == "google":
+        if scraper is None:
+            raise ConfigError("The google search backend needs a scraper")
+        backend = GoogleBrowserBackend(scraper)
+    elif name == "http":
+        backend = HttpJsonBackend()
+    elif name == "offline":
+        backend = OfflineBackend()
+    else:
+        raise ConfigError(f"Unknown search backend: {name}")
+    return CachedSearchBackend(backend, SearchCache()) if cache else backend
@@ -0,0 +1,33 @@
+"""
+Search backend interface.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+class SearchBackend(ABC):
+    """
+    Turns a query into ranked result links.
+
+    Results are dictionaries with ``url``, ``title`` and ``snippet``, best
+    first.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def search(self, query: str, num_results: int = 10) -> List[Dict[str, str]]:
+        """
+        Search for a query.
+
+        Args:
+            query: The search query
+            num_results: Maximum number of results
+
+        Returns:
+            Results in rank order
+        """
+        pass
+
+    async def close(self) -> None:
+        """Release any resources held by the backend."""
+        pass
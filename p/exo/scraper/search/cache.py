@@ -0,0 +1,171 @@
+"""
+Query-to-results cache for search backends.
+"""
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from ...core.config import get_config
+from ..ranking import tokenize
+from .base import SearchBackend
+
+logger = logging.getLogger(__name__)
+
+def query_terms(query: str) -> FrozenSet[str]:
+    """Normalized terms of a query (lowercase, no stopwords, order-free)."""
+    return frozenset(tokenize(query))
+
+class SearchCache:
+    """
+    LRU cache of search results with a TTL.
+
+    Queries are keyed by their normalized terms, so case, word order and
+    stopwords don't matter. A query with no exact entry can also be
+    served by a cached query whose terms are similar enough (Jaccard
+    similarity of at least ``similarity``). Empty result lists, which a
+    consent page or CAPTCHA also produces, are kept only for
+    ``empty_ttl`` and never serve similar queries.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None,
+                 similarity: Optional[float] = None, empty_ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds results stay valid (default: from config)
+            max_entries: Maximum cached queries (default: from config)
+            similarity: Minimum term overlap for a similar query to hit
+                (default: from config; 1.0 disables similar hits)
+            empty_ttl: Seconds an empty result list stays valid (default:
+                from config; 0 doesn't cache empty results)
+        """
+        search_config = get_config()["search"]
+        self.ttl = ttl if ttl is not None else search_config.get("cache_ttl", 3600)
+        self.max_entries = max_entries or search_config.get("cache_size", 1024)
+        self.similarity = similarity if similarity is not None else search_config.get("similarity", 0.8)
+        self.empty_ttl = empty_ttl if empty_ttl is not None else search_config.get("empty_ttl", 60)
+        # terms -> (expires, results, requested)
+        self._entries: "OrderedDict[FrozenSet[str], Tuple[float, List[Dict[str, str]], int]]" = OrderedDict()
+        self._by_term: Dict[str, Set[FrozenSet[str]]] = {}
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+
+    def _drop(self, terms: FrozenSet[str]) -> None:
+        self._entries.pop(terms, None)
+        for term in terms:
+            keys = self._by_term.get(term)
+            if keys is not None:
+                keys.discard(terms)
+                if not keys:
+                    del self._by_term[term]
+
+    def _valid(self, terms: FrozenSet[str], num_results: int, now: float) -> Optional[List[Dict[str, str]]]:
+        entry = self._entries.get(terms)
+        if entry is None:
+            return None
+        expires, results, requested = entry
+        if expires <= now:
+            self._drop(terms)
+            return None
+        # Enough results, or the backend had no more than it returned.
+        if requested < num_results and len(results) >= requested:
+            return None
+        self._entries.move_to_end(terms)
+        return results[:num_results]
+
+    def get(self, query: str, num_results: int) -> Optional[List[Dict[str, str]]]:
+        """
+        Look up cached results for a query.
+
+        Args:
+            query: The search query
+            num_results: Number of results needed
+
+        Returns:
+            The cached results, or None on a miss
+        """
+        terms = query_terms(query)
+        if not terms:
+            return None
+        now = time.monotonic()
+        results = self._valid(terms, num_results, now)
+        if results is not None:
+            self.hits += 1
+            return results
+
+        if self.similarity < 1.0:
+            candidates = set()
+            for term in terms:
+                candidates.update(self._by_term.get(term, ()))
+            best, best_score = None, self.similarity
+            for candidate in candidates:
+                if not self._entries[candidate][1]:
+                    continue
+                score = len(terms & candidate) / len(terms | candidate)
+                if score >= best_score:
+                    best, best_score = candidate, score
+            if best is not None:
+                results = self._valid(best, num_results, now)
+                if results is not None:
+                    self.similar_hits += 1
+                    logger.debug(f"Search cache: '{query}' served by similar query {sorted(best)}")
+                    return results
+
+        self.misses += 1
+        return None
+
+    def put(self, query: str, num_results: int, results: List[Dict[str, str]]) -> None:
+        """
+        Cache the results of a query.
+
+        Args:
+            query: The search query
+            num_results: Number of results that were requested
+            results: The results returned
+        """
+        terms = query_terms(query)
+        if not terms:
+            return
+        self._drop(terms)
+        ttl = self.ttl if results else min(self.ttl, self.empty_ttl)
+        if ttl <= 0:
+            return
+        self._entries[terms] = (time.monotonic() + ttl, list(results), num_results)
+        for term in terms:
+            self._by_term.setdefault(term, set()).add(terms)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class CachedSearchBackend(SearchBackend):
+    """
+    Wraps a backend so repeated and similar queries skip the search.
+    """
+
+    def __init__(self, backend: SearchBackend, cache: Optional[SearchCache] = None):
+        """
+        Initialize the cached backend.
+
+        Args:
+            backend: The backend to query on cache misses
+            cache: The cache to use (default: a new one from config)
+        """
+        self.backend = backend
+        self.cache = cache if cache is not None else SearchCache()
+        self.name = f"cached-{backend.name}"
+
+    async def search(self, query: str, num_results: int = 10) -> List[Dict[str, str]]:
+        results = self.cache.get(query, num_results)
+        if results is not None:
+            return results
+        results = await self.backend.search(query, num_results)
+        self.cache.put(query, num_results, results)
+        return results
+
+    async def close(self) -> None:
+        await self.backend.close()
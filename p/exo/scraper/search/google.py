@@ -0,0 +1,57 @@
+"""
+Search backend that drives a Google results page in the scraper's browser.
+"""
+import logging
+from typing import Any, Dict, List
+from urllib.parse import quote_plus
+
+from ..readiness import wait_until_ready
+from .base import SearchBackend
+
+logger = logging.getLogger(__name__)
+
+# Link, title and snippet of every organic result, collected in one evaluation
+RESULTS_SCRIPT = """
+els => els.map(el => {
+    const a = el.querySelector('a');
+    const h3 = el.querySelector('h3');
+    const snippet = el.querySelector('[data-sncf], .VwiC3b');
+    return {
+        url: a ? a.getAttribute('href') : null,
+        title: h3 ? h3.innerText : '',
+        snippet: snippet ? snippet.innerText : ''
+    };
+})
+"""
+
+class GoogleBrowserBackend(SearchBackend):
+    """
+    Scrapes Google results (``div.g``) with the scraper's search page.
+    """
+
+    name = "google"
+
+    def __init__(self, scraper: Any):
+        """
+        Initialize the backend.
+
+        Args:
+            scraper: The ``WebScraper`` whose browser and main page are used
+        """
+        self.scraper = scraper
+
+    async def search(self, query: str, num_results: int = 10) -> List[Dict[str, str]]:
+        await self.scraper._ensure_browser()
+        page = self.scraper.page
+        logger.info(f"Searching Google for: {query}")
+
+        await page.goto(f"https://www.google.com/search?q={quote_plus(query)}",
+                        wait_until="domcontentloaded")
+        await wait_until_ready(page, selector="div.g")
+        items = await page.eval_on_selector_all("div.g", RESULTS_SCRIPT)
+        results = [
+            {"url": item["url"], "title": item["title"].strip(), "snippet": item["snippet"].strip()}
+            for item in items
+            if item["url"] and item["url"].startswith("http")
+        ]
+        return results[:num_results]
@@ -0,0 +1,76 @@
+"""
+Search backend for an HTTP JSON search API (e.g. a self-hosted SearXNG).
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from ...core.config import get_config
+from ...core.exceptions import ScraperError
+from .base import SearchBackend
+
+logger = logging.getLogger(__name__)
+
+class HttpJsonBackend(SearchBackend):
+    """
+    Queries a JSON search endpoint.
+
+    The endpoint is called as ``GET {endpoint}?q=<query>&format=json`` and
+    must return ``{"results": [{"url", "title", "content"}, ...]}``, the
+    format of SearXNG and compatible metasearch engines.
+    """
+
+    name = "http"
+
+    def __init__(self, endpoint: Optional[str] = None, params: Optional[Dict[str, Any]] = None,
+                 timeout: Optional[float] = None, client: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize the backend.
+
+        Args:
+            endpoint: Search URL (default: from config)
+            params: Extra query parameters (e.g. ``categories``, ``language``)
+            timeout: Request timeout in seconds (default: from config)
+            client: HTTP client to use (default: a private one)
+        """
+        search_config = get_config()["search"]
+        self.endpoint = endpoint or search_config.get("endpoint")
+        if not self.endpoint:
+            raise ValueError("HttpJsonBackend needs an endpoint (or search.endpoint in config)")
+        self.params = params or {}
+        self.timeout = timeout or search_config.get("timeout", 10.0)
+        self._client = client
+        self._owns_client = client is None
+
+    async def search(self, query: str, num_results: int = 10) -> List[Dict[str, str]]:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout, headers={
+                "User-Agent": get_config()["scraping"]["user_agent"]
+            })
+        try:
+            response = await self._client.get(
+                self.endpoint, params={**self.params, "q": query, "format": "json"}
+            )
+            response.raise_for_status()
+            items = response.json().get("results", [])
+        except (httpx.HTTPError, ValueError) as e:
+            raise ScraperError(f"Search request to {self.endpoint} failed: {e}") from e
+
+        results = []
+        for item in items:
+            url = item.get("url")
+            if url and url.startswith("http"):
+                results.append({
+                    "url": url,
+                    "title": item.get("title") or "",
+                    "snippet": item.get("content") or item.get("snippet") or ""
+                })
+            if len(results) >= num_results:
+                break
+        return results
+
+    async def close(self) -> None:
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+        self._client = None
@@ -0,0 +1,64 @@
+"""
+Search backend over locally stored pages, without the network.
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+from .base import SearchBackend
+
+logger = logging.getLogger(__name__)
+
+# Reciprocal rank fusion constant
+RRF_K = 60
+
+class OfflineBackend(SearchBackend):
+    """
+    Searches the document store's full-text index and, if given, the
+    semantic content index; results from both are merged by reciprocal
+    rank fusion.
+    """
+
+    name = "offline"
+
+    def __init__(self, store: Optional[Any] = None, content_index: Optional[Any] = None):
+        """
+        Initialize the backend.
+
+        Args:
+            store: ``DocumentStore`` to search (default: the configured store)
+            content_index: ``ContentIndex`` to search as well
+        """
+        # Imported here: the storage package imports the scraper, which imports this.
+        from ...storage.document_store import get_document_store
+        self.store = store if store is not None else get_document_store()
+        self.content_index = content_index
+        if self.store is None and self.content_index is None:
+            raise ValueError("OfflineBackend needs a document store or a content index")
+
+    async def search(self, query: str, num_results: int = 10) -> List[Dict[str, str]]:
+        rankings = []
+        details: Dict[str, Dict[str, str]] = {}
+        if self.store is not None:
+            documents = self.store.search(query, limit=num_results * 2)
+            rankings.append([document["url"] for document in documents])
+            for document in documents:
+                details.setdefault(document["url"], {
+                    "url": document["url"],
+                    "title": document["title"] or "",
+                    "snippet": document["snippet"]
+                })
+        if self.content_index is not None:
+            passages = await self.content_index.query(query, k=num_results * 4)
+            urls = list(dict.fromkeys(passage["url"] for passage in passages))
+            rankings.append(urls)
+            for passage in passages:
+                details.setdefault(passage["url"], {
+                    "url": passage["url"], "title": "", "snippet": passage["text"][:300]
+                })
+
+        scores: Dict[str, float] = {}
+        for ranking in rankings:
+            for rank, url in enumerate(ranking):
+                scores[url] = scores.get(url, 0.0) + 1.0 / (RRF_K + rank + 1)
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        return [details[url] for url in ranked[:num_results]]
@@ -0,0 +1,88 @@
+"""
+Local stub of a JSON search API, for tests and benchmarks.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+def default_results(query: str) -> List[Dict[str, str]]:
+    """Deterministic fake results for a query."""
+    slug = "-".join(query.lower().split()) or "empty"
+    return [
+        {"url": f"https://example.com/{slug}/{rank}", "title": f"{query} result {rank}",
+         "content": f"Snippet {rank} about {query}."}
+        for rank in range(10)
+    ]
+
+class StubSearchServer:
+    """
+    Serves SearXNG-style JSON results on localhost.
+
+    Use as a context manager and point ``HttpJsonBackend`` at ``endpoint``.
+    Every query received is recorded in ``queries``.
+    """
+
+    def __init__(self, results: Optional[Callable[[str], List[Dict[str, str]]]] = None,
+                 delay: float = 0.0):
+        """
+        Initialize the stub server.
+
+        Args:
+            results: Function from query to result list (default: fake results)
+            delay: Seconds to wait before answering, to mimic a real engine
+        """
+        self.results = results or default_results
+        self.delay = delay
+        self.queries: List[str] = []
+        self._server = None
+        self._thread = None
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                params = parse_qs(urlsplit(self.path).query)
+                query = params.get("q", [""])[0]
+                stub.queries.append(query)
+                if stub.delay:
+                    threading.Event().wait(stub.delay)
+                body = json.dumps({"query": query, "results": stub.results(query)}).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    @property
+    def endpoint(self) -> str:
+        """The search URL to query."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/search"
+
+    def start(self) -> "StubSearchServer":
+        """Start serving in a background thread."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StubSearchServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,152 @@
+"""
+Visible text from a CDP DOM snapshot.
+
+Walking a heavy page element by element (Playwright handles, or an
+XPath snapshot evaluated in the page) costs time proportional to the
+node count on the browser side. ``DOMSnapshot.captureSnapshot``
+returns the whole document flattened into parallel arrays in one CDP
+call: node types, names and values indexed into a shared string table,
+parent indices, and a layout tree with the computed styles asked for.
+The text and its block structure are rebuilt here in one linear pass.
+
+Only nodes with a layout box are rendered, so ``display: none``
+subtrees, scripts and styles drop out for free; ``visibility: hidden``
+and zero opacity are checked from the computed styles.
+"""
+import logging
+from typing import Dict, Any, List, Optional
+
+from playwright.async_api import Page
+
+from .dom import BLOCK_ELEMENTS
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_STYLES = ["visibility", "opacity"]
+
+TEXT_NODE = 3
+
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+
+async def capture_snapshot(page: Page) -> Dict[str, Any]:
+    """
+    Capture a flattened DOM snapshot of the page over CDP (Chromium only).
+
+    Args:
+        page: The Playwright page
+
+    Returns:
+        The raw ``DOMSnapshot.captureSnapshot`` result
+    """
+    session = await page.context.new_cdp_session(page)
+    try:
+        return await session.send("DOMSnapshot.captureSnapshot", {
+            "computedStyles": SNAPSHOT_STYLES,
+            "includeDOMRects": False,
+            "includePaintOrder": False
+        })
+    finally:
+        await session.detach()
+
+def snapshot_text(snapshot: Dict[str, Any], skip_hidden: bool = True) -> Dict[str, Any]:
+    """
+    Rebuild the text of a page from a DOM snapshot.
+
+    Args:
+        snapshot: A ``DOMSnapshot.captureSnapshot`` result
+        skip_hidden: Leave out text that isn't rendered or is invisible
+
+    Returns:
+        Dictionary with ``text`` (one block per line), ``blocks`` (each
+        with the block ``tag`` and its ``text``), ``headings``,
+        ``hidden_chars`` (text left out) and ``nodes`` (node count)
+    """
+    strings = snapshot["strings"]
+    document = snapshot["documents"][0]
+    nodes = document["nodes"]
+    parents = nodes["parentIndex"]
+    types = nodes["nodeType"]
+    names = nodes["nodeName"]
+    values = nodes["nodeValue"]
+    count = len(parents)
+
+    # Layout boxes and the computed styles asked for, per node
+    layout = document["layout"]
+    rendered = [False] * count
+    invisible = [False] * count
+    transparent = [False] * count
+    visibility_at = SNAPSHOT_STYLES.index("visibility")
+    opacity_at = SNAPSHOT_STYLES.index("opacity")
+    for node_index, styles in zip(layout["nodeIndex"], layout["styles"]):
+        rendered[node_index] = True
+        if styles:
+            # Visibility is inherited (and can be overridden), so text nodes carry their own
+            if styles[visibility_at] >= 0 and strings[styles[visibility_at]] in ("hidden", "collapse"):
+                invisible[node_index] = True
+            if styles[opacity_at] >= 0 and strings[styles[opacity_at]] == "0":
+                transparent[node_index] = True
+
+    # Checked once per distinct tag name, not per node
+    block_names = {index for index in set(names) if strings[index].lower() in BLOCK_ELEMENTS}
+
+    # Nodes come in document order, so a parent is always seen before its children.
+    block_of = list(range(count))
+    blocks: List[Dict[str, Any]] = []
+    hidden_chars = 0
+    last_block = None
+    for i in range(count):
+        parent = parents[i]
+        if parent >= 0:
+            # Zero opacity hides the whole subtree
+            transparent[i] = transparent[i] or transparent[parent]
+            if names[i] not in block_names:
+                block_of[i] = block_of[parent]
+        if types[i] != TEXT_NODE or values[i] < 0:
+            continue
+        text = " ".join(strings[values[i]].split())
+        if not text:
+            continue
+        if skip_hidden and (not rendered[i] or invisible[i] or transparent[i]):
+            hidden_chars += len(text)
+            continue
+        block = block_of[i]
+        if block != last_block:
+            blocks.append({"tag": strings[names[block]].lower(), "parts": []})
+            last_block = block
+        blocks[-1]["parts"].append(text)
+
+    for block in blocks:
+        block["text"] = " ".join(block.pop("parts"))
+    return {
+        "text": "\n".join(block["text"] for block in blocks),
+        "blocks": blocks,
+        "headings": [block for block in blocks if block["tag"] in HEADING_TAGS],
+        "hidden_chars": hidden_chars,
+        "nodes": count
+    }
+
+async def extract_snapshot_text(page: Page, skip_hidden: bool = True,
+                                max_chars: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Capture a snapshot and rebuild the page's visible text.
+
+    The snapshot crosses CDP whole, so ``max_chars`` only bounds the
+    returned text.
+
+    Args:
+        page: The Playwright page
+        skip_hidden: Leave out text that isn't rendered or is invisible
+        max_chars: Maximum characters of text to return
+
+    Returns:
+        The ``snapshot_text`` result plus ``length`` (full text length)
+        and ``truncated``
+    """
+    result = snapshot_text(await capture_snapshot(page), skip_hidden)
+    result["length"] = len(result["text"])
+    result["truncated"] = max_chars is not None and result["length"] > max_chars
+    if result["truncated"]:
+        result["text"] = result["text"][:max_chars]
+    logger.debug(f"Snapshot of {result['nodes']} nodes: {result['length']} visible characters, "
+                 f"{result['hidden_chars']} hidden")
+    return result
@@ -0,0 +1,73 @@
+"""
+Table extraction from raw HTML.
+"""
+from typing import Dict, Any, List, Optional, Union
+
+from .dom import Node, parse_html
+
+def _cells(row: Node) -> List[Node]:
+    return [child for child in row.children if isinstance(child, Node) and child.tag in ("td", "th")]
+
+def _rows(table: Node) -> List[Node]:
+    """Rows of a table, not descending into nested tables."""
+    rows = []
+    stack = list(reversed(table.children))
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, Node) or node.tag == "table":
+            continue
+        if node.tag == "tr":
+            rows.append(node)
+        else:
+            stack.extend(reversed(node.children))
+    return rows
+
+def extract_tables(document: Union[str, Node], min_rows: int = 1,
+                   max_tables: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Extract the data tables of a page.
+
+    A first row made only of ``<th>`` cells (or the rows of a ``<thead>``)
+    becomes the header. ``colspan`` is expanded so rows line up.
+
+    Args:
+        document: The page HTML, or an already parsed root
+        min_rows: Skip tables with fewer body rows (layout tables)
+        max_tables: Maximum number of tables to return
+
+    Returns:
+        Tables as dictionaries with ``caption``, ``headers`` and ``rows``
+        (lists of cell text)
+    """
+    root = parse_html(document) if isinstance(document, str) else document
+    tables = []
+    for table in root.iter("table"):
+        rows = _rows(table)
+        headers: List[str] = []
+        body: List[List[str]] = []
+        for row in rows:
+            cells = _cells(row)
+            values = []
+            for cell in cells:
+                text = cell.text(" ")
+                try:
+                    span = max(1, min(int(cell.get("colspan") or 1), 100))
+                except ValueError:
+                    span = 1
+                values.extend([text] + [""] * (span - 1))
+            in_head = row.parent is not None and row.parent.tag == "thead"
+            if not headers and not body and (in_head or all(cell.tag == "th" for cell in cells)):
+                headers = values
+            elif any(values):
+                body.append(values)
+        if len(body) < min_rows:
+            continue
+        caption = table.find("caption")
+        tables.append({
+            "caption": caption.text(" ") if caption is not None else "",
+            "headers": headers,
+            "rows": body
+        })
+        if max_tables is not None and len(tables) >= max_tables:
+            break
+    return tables
@@ -0,0 +1,13 @@
+"""
+Scraper and the web tools agents call.
+"""
+from .scraper import (
+    WebScraper, close_scraper, get_scraper, iter_search_and_scrape, scrape_url,
+    search_and_scrape
+)
+from .web_tools import WEB_TOOLS, scrape_website, search_store, web_search
+
+__all__ = [
+    "WebScraper", "close_scraper", "get_scraper", "iter_search_and_scrape", "scrape_url",
+    "search_and_scrape", "WEB_TOOLS", "scrape_website", "search_store", "web_search"
+]
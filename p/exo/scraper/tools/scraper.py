@@ -1,145 +1,669 @@
 """
 Web scraping tool using Playwright.
+
+Page scrapes try a plain HTTP fetch first (``HttpBrowser``) and only
+render in Chromium when the page needs JavaScript, the selector needs a
+real DOM, or the site refuses non-browser clients. Set
+``browser.backend`` to ``"playwright"`` (or pass ``backend``) to always
+render.
 """
 import logging
 import asyncio
-from typing import Dict, Any, Optional, List
-from playwright.async_api import async_playwright, Browser, Page
+import mmap
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, List, AsyncIterator
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+
+from ...core.config import get_config
+from ...core.exceptions import (
+    BrowserError, DeadlineExceeded, HttpStatusError, ParserError, PoolClosedError
+)
+from ..browser.http_browser import HttpBrowser, HttpPage, needs_browser
+from ..pool import PagePool, page_alive, watch_page
+from ..politeness import HostScheduler
+from ..readiness import wait_until_ready
+from ..extraction import extract_page_content, extract_selectors, selector_spec
+from ..snapshot import extract_snapshot_text
+from ..processing import HtmlProcessor, get_html_processor
+from ..search import SearchBackend, create_search_backend
+from ..workers import ScrapeWorkerPool, get_scrape_workers
+from ...storage.document_store import DocumentStore, get_document_store
+from ...storage.html_archive import HtmlArchive, get_html_archive
+from ...storage.corpus import CorpusWriter, get_corpus_writer
+from ...utils.async_utils import get_retry_policy
+from ...utils.deadline import check, remaining, time_left, within
 
 logger = logging.getLogger(__name__)
 
+# Statuses sites commonly send to non-browser clients; retried in the browser
+RENDER_STATUSES = {401, 403, 429, 503}
+
 class WebScraper:
     """
     Web scraping tool using Playwright.
     """
     
-    def __init__(self):
-        """Initialize the web scraper."""
+    def __init__(self, max_concurrency: Optional[int] = None,
+                 result_timeout: Optional[float] = None,
+                 store: Optional[DocumentStore] = None,
+                 archive: Optional[HtmlArchive] = None,
+                 corpus: Optional[CorpusWriter] = None,
+                 search_backend: Optional[SearchBackend] = None,
+                 backend: Optional[str] = None,
+                 processor: Optional[HtmlProcessor] = None,
+                 workers: Optional[ScrapeWorkerPool] = None):
+        """
+        Initialize the web scraper.
+        
+        Args:
+            max_concurrency: Maximum number of pages scraped at once (default: from config)
+            result_timeout: Seconds allowed per search result (default: from config)
+            store: Document store that page scrapes are served from and
+                saved to (default: the configured store, if any)
+            archive: Archive that the raw HTML of page scrapes is kept in
+                (default: the configured archive, if any)
+            corpus: Corpus that page text is appended to for worker
+                processes (default: the configured corpus, if any)
+            search_backend: Backend that turns queries into result links
+                (default: the configured backend, with a query cache)
+            backend: Page scrape backend, ``"http"`` (falls back to the
+                browser when needed) or ``"playwright"`` (default: from config)
+            processor: Process pool that parses HTML off the event loop
+                (default: the shared one)
+            workers: Worker processes that page scrapes are handed to,
+                sharded by host (default: the configured pool, if any)
+        """
+        scraping_config = get_config()["scraping"]
+        self.max_concurrency = max_concurrency or scraping_config.get("max_concurrency", 4)
+        self.result_timeout = result_timeout or scraping_config.get("result_timeout", 20.0)
         self.browser = None
         self.context = None
         self.page = None
+        self.pool = None
+        # Spaces out requests per host and honours robots.txt
+        self.scheduler = HostScheduler(max_concurrency=self.max_concurrency)
+        # Explicit None checks: an empty store, archive or corpus is falsy
+        self.store = store if store is not None else get_document_store()
+        self.archive = archive if archive is not None else get_html_archive()
+        self.corpus = corpus if corpus is not None else get_corpus_writer()
+        self.search_backend = search_backend or create_search_backend(scraper=self)
+        self.max_age = get_config()["store"].get("max_age", 86400)
+        self.max_content_length = scraping_config.get("max_content_length", 1000000)
+        self.chunk_chars = scraping_config.get("content_chunk_chars", 262144)
+        self.backend = backend or get_config()["browser"].get("backend", "http")
+        self.navigation_timeout = get_config()["browser"].get("timeout", 30000) / 1000
+        self.http_browser = HttpBrowser()
+        self.processor = processor or get_html_processor()
+        self.retry = get_retry_policy("navigation")
+        self.workers = workers or get_scrape_workers()
+        recycle_config = get_config()["browser"].get("recycle", {})
+        self.page_uses = recycle_config.get("page_uses")
+        self.context_navigations = recycle_config.get("context_navigations")
+        max_rss_mb = recycle_config.get("max_rss_mb")
+        self.max_rss = max_rss_mb * 1e6 if max_rss_mb else None
+        self.rss_check_every = recycle_config.get("rss_check_every", 25)
+        self.playwright = None
+        self._navigations = 0
+        self._rss_recycled = False
+        self._retiring = set()
+        self.recycles = 0
+        self.relaunches = 0
+        self._browser_lock = asyncio.Lock()
         logger.info("Initialized WebScraper")
     
     async def _ensure_browser(self):
-        """Ensure the browser is initialized."""
-        if self.browser is None:
-            playwright = await async_playwright().start()
-            self.browser = await playwright.chromium.launch(headless=True)
-            self.context = await self.browser.new_context()
-            self.page = await self.context.new_page()
-            logger.info("Browser initialized")
+        """Ensure the browser is running, relaunching it if it crashed."""
+        async with self._browser_lock:
+            if self.browser is not None and not self.browser.is_connected():
+                logger.warning("Browser disconnected; relaunching")
+                self._retire(self.pool, self.context, self.browser)
+                self.browser = None
+                self.relaunches += 1
+            if self.browser is None:
+                self.browser = await self._launch()
+                await self._new_context()
+                logger.info("Browser initialized")
+            elif not page_alive(self.page):
+                self.page = await self.context.new_page()
+                watch_page(self.page)
+    
+    async def _launch(self) -> Browser:
+        """Launch Chromium, restarting the Playwright driver if it died."""
+        if self.playwright is None:
+            self.playwright = await async_playwright().start()
+        try:
+            return await self.playwright.chromium.launch(headless=True)
+        except Exception as e:
+            logger.warning(f"Browser launch failed ({e}); restarting the Playwright driver")
+            try:
+                await self.playwright.stop()
+            except Exception:
+                pass
+            self.playwright = await async_playwright().start()
+            return await self.playwright.chromium.launch(headless=True)
+    
+    async def _new_context(self) -> None:
+        """Open a fresh context with its main page and page pool."""
+        self.context = await self.browser.new_context()
+        # The main page drives searches; scrapes borrow pages from the pool.
+        self.page = await self.context.new_page()
+        watch_page(self.page)
+        self.pool = PagePool(self.context, size=self.max_concurrency, max_uses=self.page_uses)
+        self._navigations = 0
+    
+    def _retire(self, pool: PagePool, context: BrowserContext,
+                browser: Optional[Browser] = None) -> None:
+        """Close a replaced pool and context (and browser) once their pages are returned."""
+        async def retire() -> None:
+            if not await pool.drain(timeout=self.result_timeout):
+                logger.warning("Closing a recycled browser context with pages still in use")
+            for closable in (context, browser):
+                if closable is None:
+                    continue
+                try:
+                    await closable.close()
+                except Exception as e:
+                    logger.debug(f"Error closing recycled {closable.__class__.__name__}: {e}")
+        
+        task = asyncio.create_task(retire())
+        self._retiring.add(task)
+        task.add_done_callback(self._retiring.discard)
+    
+    async def _browser_rss(self) -> Optional[int]:
+        """Resident memory of all browser processes in bytes (None where unavailable)."""
+        try:
+            session = await self.browser.new_browser_cdp_session()
+            info = await session.send("SystemInfo.getProcessInfo")
+            await session.detach()
+        except Exception as e:
+            logger.debug(f"Could not list browser processes: {e}")
+            return None
+        total = 0
+        for process in info.get("processInfo", []):
+            try:
+                with open(f"/proc/{process['id']}/statm") as f:
+                    total += int(f.read().split()[1]) * mmap.PAGESIZE
+            except (OSError, ValueError, IndexError):
+                # Not Linux, or the process already exited
+                continue
+        return total or None
+    
+    async def _maybe_recycle(self, pool: PagePool) -> None:
+        """Replace the context after enough scrapes, or the browser when it uses too much memory."""
+        if pool is not self.pool:
+            return
+        self._navigations += 1
+        relaunch = False
+        reason = None
+        if self.context_navigations and self._navigations >= self.context_navigations:
+            reason = f"{self._navigations} scrapes"
+        elif self.max_rss and self._navigations % self.rss_check_every == 0:
+            rss = await self._browser_rss()
+            if rss is not None and rss > self.max_rss:
+                reason = f"browser memory reached {rss / 1e6:.0f} MB"
+                # A fresh context didn't help last time; the browser itself has grown.
+                relaunch = self._rss_recycled
+                self._rss_recycled = not relaunch
+            else:
+                self._rss_recycled = False
+        if reason is None:
+            return
+        async with self._browser_lock:
+            if pool is not self.pool or self.browser is None:
+                return
+            if relaunch:
+                logger.info(f"Relaunching the browser: {reason}")
+                self._retire(self.pool, self.context, self.browser)
+                self.browser = await self._launch()
+                self.relaunches += 1
+            else:
+                logger.info(f"Recycling the browser context: {reason}")
+                self._retire(self.pool, self.context)
+                self.recycles += 1
+            await self._new_context()
+    
+    @asynccontextmanager
+    async def borrow_page(self) -> AsyncIterator[Page]:
+        """
+        Borrow a page from the pool, starting the browser if needed.
+        
+        Pages are replaced after ``page_uses`` scrapes or a crash, and the
+        whole context after ``context_navigations`` scrapes or when the
+        browser's memory passes ``max_rss_mb``.
+        
+        Yields:
+            A page reserved for the caller until the block exits
+        """
+        await self._ensure_browser()
+        pool = self.pool
+        while True:
+            borrowed = False
+            try:
+                async with pool.page() as page:
+                    borrowed = True
+                    yield page
+                return
+            except PoolClosedError:
+                # Retired by a recycle or relaunch while waiting for a page:
+                # borrow from its replacement instead
+                if borrowed or self.pool is None or self.pool is pool:
+                    raise
+                pool = self.pool
+            finally:
+                if borrowed:
+                    await self._maybe_recycle(pool)
     
     async def scrape_url(self, url: str, selector: Optional[str] = None, 
                          wait_for: Optional[str] = None, 
-                         extract_text: bool = True) -> Dict[str, Any]:
+                         extract_text: bool = True,
+                         max_items: Optional[int] = None,
+                         max_chars: Optional[int] = None,
+                         main_content: bool = False,
+                         max_age: Optional[float] = None,
+                         max_length: Optional[int] = None,
+                         complete: bool = False,
+                         backend: Optional[str] = None,
+                         snapshot: bool = False) -> Dict[str, Any]:
         """
         Scrape content from a URL.
         
+        With a document store, a stored copy of the page younger than
+        ``max_age`` is returned without touching the network (clipped to
+        ``max_length`` like a fresh read), and complete page scrapes are
+        saved to the store; truncated ones are not, so a stored copy is
+        always the whole page. Selector scrapes bypass it.
+        With scrape workers, the page is fetched and extracted in the
+        worker process that owns its host.
+        
         Args:
             url: The URL to scrape
             selector: CSS selector to target specific elements
             wait_for: Selector to wait for before scraping
             extract_text: Whether to extract text content
+            max_items: Maximum number of selector matches to return
+            max_chars: Maximum characters per selector match
+            main_content: Return only the main article text, title and
+                metadata instead of the whole page (ignored with a selector)
+            max_age: Seconds a stored copy is served instead of refetching
+                (default: from config; 0 always refetches)
+            max_length: Maximum characters of page text or HTML read from
+                the browser (default: ``max_content_length`` from config)
+            complete: Read the whole page, in chunks, regardless of size
+            backend: ``"http"`` or ``"playwright"`` (default: the scraper's)
+            snapshot: Rebuild the visible text from one CDP DOM snapshot
+                instead of reading it in the page; skips hidden text, is
+                fastest on very large pages, and always uses the browser
             
         Returns:
-            Dictionary with scraping results
+            Dictionary with scraping results. Whole-page results carry
+            ``truncated`` and ``content_length``, the full size in
+            characters of the text or HTML read from the page, and
+            ``backend``, the backend that produced them.
         """
-        await self._ensure_browser()
+        mode = None
+        if self.store is not None and not selector:
+            mode = "main" if main_content else (
+                ("visible" if snapshot else "text") if extract_text else "html")
+            stored = self.store.get(url, mode, self.max_age if max_age is None else max_age)
+            if stored is not None:
+                logger.info(f"Serving {url} from the document store")
+                return self._from_store(stored, mode, None if complete else
+                                        max_length or self.max_content_length)
+        if self.workers is not None:
+            try:
+                result = await within(self.workers.scrape_url(
+                    url, keep_html=self.archive is not None, selector=selector,
+                    wait_for=wait_for, extract_text=extract_text, max_items=max_items,
+                    max_chars=max_chars, main_content=main_content, max_length=max_length,
+                    complete=complete, backend=backend, snapshot=snapshot
+                ), what=f"scraping {url}")
+            except DeadlineExceeded as e:
+                return {"url": url, "error": str(e)}
+            html = result.pop("raw_html", None)
+            if html is not None and self.archive is not None:
+                self.archive.add(url, html)
+            if "error" not in result:
+                if mode is not None:
+                    self._store_result(result, mode)
+                if self.corpus is not None:
+                    self.corpus.append_result(result)
+            return result
+        max_length = None if complete else max_length or self.max_content_length
+        try:
+            # Transient failures (timeouts, resets, 5xx) are retried with backoff,
+            # all within the request's deadline
+            result = await within(self.retry.call(self._fetch, url, selector, wait_for,
+                                                  extract_text, max_items, max_chars,
+                                                  main_content, max_length, backend, snapshot),
+                                  what=f"scraping {url}")
+            if mode is not None:
+                self._store_result(result, mode)
+            if self.corpus is not None:
+                self.corpus.append_result(result)
+            return result
+        except Exception as e:
+            logger.error(f"Error scraping {url}: {e}")
+            return {
+                "url": url,
+                "error": str(e)
+            }
+    
+    def _store_result(self, result: Dict[str, Any], mode: str) -> None:
+        """Save a page scrape to the document store unless it was cut short."""
+        if result.get("truncated"):
+            # A partial copy would later be served as if it were the whole page
+            logger.debug(f"Not storing truncated {mode} scrape of {result['url']}")
+            return
+        self.store.put(result, mode)
+
+    @staticmethod
+    def _from_store(stored: Dict[str, Any], mode: str,
+                    max_length: Optional[int]) -> Dict[str, Any]:
+        """Shape a stored page like a fresh scrape read with ``max_length``."""
+        stored["from_store"] = True
+        if mode == "main":
+            # Main-content limits apply to the page HTML, which isn't stored
+            stored["truncated"] = False
+            return stored
+        content = stored["content"]
+        stored["content_length"] = len(content)
+        stored["truncated"] = max_length is not None and len(content) > max_length
+        if stored["truncated"]:
+            stored["content"] = content[:max_length]
+        return stored
+
+    async def _fetch(self, url: str, selector: Optional[str], wait_for: Optional[str],
+                     extract_text: bool, max_items: Optional[int], max_chars: Optional[int],
+                     main_content: bool, max_length: Optional[int], backend: Optional[str],
+                     snapshot: bool) -> Dict[str, Any]:
+        """One scrape attempt, in a politeness slot for the URL's host."""
+        async with self.scheduler.slot(url):
+            result = None
+            if (backend or self.backend) == "http" and not snapshot:
+                result = await self._scrape_http(url, selector, wait_for, extract_text,
+                                                 max_items, max_chars, main_content,
+                                                 max_length)
+            if result is None:
+                result = await self._scrape_in_browser(url, selector, wait_for,
+                                                       extract_text, max_items, max_chars,
+                                                       main_content, max_length, snapshot)
+                result["backend"] = "playwright"
+        return result
+    
+    async def _scrape_http(self, url: str, selector: Optional[str], wait_for: Optional[str],
+                           extract_text: bool, max_items: Optional[int],
+                           max_chars: Optional[int], main_content: bool,
+                           max_length: Optional[int]) -> Optional[Dict[str, Any]]:
+        """
+        Scrape a URL without a browser.
+        
+        Returns:
+            The result, or None when the page has to be rendered instead
+        """
+        page = await self.http_browser.goto(url, page=HttpPage())
+        if page.status in RENDER_STATUSES:
+            logger.debug(f"{url} answered {page.status} over HTTP; rendering it instead")
+            return None
+        if page.status >= 400:
+            raise HttpStatusError(page.status, url)
+        if not page.html or needs_browser(page.html):
+            return None
         
         try:
-            logger.info(f"Scraping URL: {url}")
-            await self.page.goto(url, wait_until="networkidle")
-            
             if wait_for:
-                await self.page.wait_for_selector(wait_for)
-            
+                ready = await self.http_browser.query_all(wait_for, max_items=1, page=page)
+                if not ready["count"]:
+                    return None
             if selector:
-                elements = await self.page.query_selector_all(selector)
-                results = []
-                
-                for element in elements:
-                    if extract_text:
-                        text = await element.text_content()
-                        results.append(text.strip())
-                    else:
-                        html = await element.inner_html()
-                        results.append(html)
-                
+                matches = await self.http_browser.query_all(selector, extract_text, max_items,
+                                                            max_chars, page=page)
+                if not matches["count"]:
+                    # Possibly filled in by scripts
+                    return None
                 return {
                     "url": url,
                     "selector": selector,
-                    "count": len(results),
-                    "results": results
+                    "count": matches["count"],
+                    "results": matches["results"],
+                    "truncated": matches["truncated"],
+                    "backend": "http"
                 }
-            else:
-                # Scrape the entire page
-                if extract_text:
-                    content = await self.page.text_content()
-                else:
-                    content = await self.page.content()
-                
+        except ParserError:
+            # Selector outside what the lightweight DOM supports
+            return None
+        
+        html = page.html
+        if self.archive is not None:
+            self.archive.add(url, html)
+        if main_content:
+            clipped = html if max_length is None else html[:max_length]
+            article = await self.processor.main_content(clipped, page.url)
+            return {
+                "url": url,
+                "title": article["title"],
+                "content": article["text"],
+                "metadata": article["metadata"],
+                "truncated": len(clipped) < len(html),
+                "content_length": len(html),
+                "backend": "http"
+            }
+        if extract_text:
+            processed = await self.processor.process(html, page.url, ("text",))
+            content = processed["body_text"]
+        else:
+            content = html
+        return {
+            "url": url,
+            "content": content if max_length is None else content[:max_length],
+            "truncated": max_length is not None and len(content) > max_length,
+            "content_length": len(content),
+            "backend": "http"
+        }
+    
+    async def _scrape_in_browser(self, url: str, *args) -> Dict[str, Any]:
+        """Scrape a URL in a pooled page, retrying once on a fresh page if the page crashed."""
+        for attempt in range(2):
+            async with self.borrow_page() as page:
+                try:
+                    return await self._scrape_page(page, url, *args)
+                except Exception:
+                    if attempt or page_alive(page):
+                        raise
+                    logger.warning(f"Page crashed while scraping {url}; retrying on a fresh page")
+    
+    async def _scrape_page(self, page: Page, url: str, selector: Optional[str],
+                           wait_for: Optional[str], extract_text: bool,
+                           max_items: Optional[int], max_chars: Optional[int],
+                           main_content: bool = False,
+                           max_length: Optional[int] = None,
+                           snapshot: bool = False) -> Dict[str, Any]:
+        """Navigate a borrowed page to the URL and extract from it."""
+        logger.info(f"Scraping URL: {url}")
+        check(f"navigating to {url}")
+        # Playwright takes milliseconds, and 0 would mean no timeout
+        await page.goto(url, wait_until="domcontentloaded",
+                        timeout=max(1, time_left(self.navigation_timeout) * 1000))
+        
+        readiness = await wait_until_ready(page, selector=wait_for)
+        if wait_for and readiness["reason"] != "selector":
+            raise BrowserError(f"Timed out waiting for selector: {wait_for}")
+        
+        if selector:
+            # One in-page evaluation instead of a round trip per element
+            spec = selector_spec(selector, extract_text, name="results")
+            extracted = await extract_selectors(
+                page, [spec], max_items=max_items, max_chars=max_chars
+            )
+            matches = extracted["results"]
+            
+            return {
+                "url": url,
+                "selector": selector,
+                "count": matches["count"],
+                "results": matches["results"],
+                "truncated": matches["truncated"]
+            }
+        
+        if self.archive is not None:
+            # Keep the whole raw page so it can be re-extracted without refetching
+            page_html = await extract_page_content(page, "html", None, self.chunk_chars)
+            self.archive.add(url, page_html["content"])
+            if max_length is not None and page_html["length"] > max_length:
+                page_html = {"content": page_html["content"][:max_length],
+                             "length": page_html["length"], "truncated": True}
+        else:
+            page_html = None
+        
+        if main_content:
+            # Strip navigation, banners and sidebars around the article
+            page_html = page_html or await extract_page_content(page, "html", max_length,
+                                                                self.chunk_chars)
+            article = await self.processor.main_content(page_html["content"], page.url)
+            return {
+                "url": url,
+                "title": article["title"],
+                "content": article["text"],
+                "metadata": article["metadata"],
+                "truncated": page_html["truncated"],
+                "content_length": page_html["length"]
+            }
+        else:
+            # Scrape the entire page
+            if extract_text and snapshot:
+                visible = await extract_snapshot_text(page, max_chars=max_length)
                 return {
                     "url": url,
-                    "content": content
+                    "content": visible["text"],
+                    "headings": [heading["text"] for heading in visible["headings"]],
+                    "hidden_chars": visible["hidden_chars"],
+                    "truncated": visible["truncated"],
+                    "content_length": visible["length"]
                 }
-                
-        except Exception as e:
-            logger.error(f"Error scraping {url}: {e}")
+            if extract_text:
+                extracted = await extract_page_content(page, "text", max_length, self.chunk_chars)
+            else:
+                extracted = page_html or await extract_page_content(page, "html", max_length,
+                                                                    self.chunk_chars)
+            
             return {
                 "url": url,
-                "error": str(e)
+                "content": extracted["content"],
+                "truncated": extracted["truncated"],
+                "content_length": extracted["length"]
+            }
+    
+    async def _search_links(self, query: str, num_results: int) -> List[str]:
+        """Run the search and return the result URLs in rank order."""
+        results = await self.search_backend.search(query, num_results)
+        return [result["url"] for result in results[:num_results]]
+    
+    async def _scrape_with_timeout(self, url: str, timeout: float,
+                                   main_content: bool = False) -> Dict[str, Any]:
+        """Scrape a URL, turning a per-result timeout into an error result."""
+        # Keep a tenth of the request's remaining time to use the results that did finish
+        left = remaining()
+        timeout = time_left(timeout, reserve=left / 10 if left is not None else 0.0)
+        try:
+            return await asyncio.wait_for(self.scrape_url(url, main_content=main_content),
+                                          timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out after {timeout:.1f}s scraping {url}")
+            return {
+                "url": url,
+                "error": f"Timed out after {timeout:.1f}s",
+                "timed_out": True
             }
     
-    async def search_and_scrape(self, query: str, num_results: int = 3) -> List[Dict[str, Any]]:
+    async def iter_search_and_scrape(self, query: str, num_results: int = 3,
+                                     timeout: Optional[float] = None,
+                                     main_content: bool = False) -> AsyncIterator[Dict[str, Any]]:
         """
-        Search for a query and scrape the top results.
+        Search for a query and yield each scraped result as soon as it finishes.
+        
+        Result pages are scraped concurrently through the page pool, so a
+        slow site only delays its own result. Each result carries its
+        search ``rank`` (0-based).
         
         Args:
             query: The search query
             num_results: Number of results to scrape
+            timeout: Seconds allowed per result (default: ``result_timeout``)
+            main_content: Keep only the main article text of each page
             
-        Returns:
-            List of scraping results
+        Yields:
+            Scraping results in completion order
         """
-        await self._ensure_browser()
+        timeout = timeout or self.result_timeout
         
         try:
-            # Use Google search
-            search_url = f"https://www.google.com/search?q={query}"
-            logger.info(f"Searching for: {query}")
-            
-            await self.page.goto(search_url, wait_until="networkidle")
-            
-            # Extract search results
-            results = []
-            search_results = await self.page.query_selector_all("div.g")
-            
-            for i, result in enumerate(search_results[:num_results]):
-                try:
-                    link_element = await result.query_selector("a")
-                    if link_element:
-                        href = await link_element.get_attribute("href")
-                        if href and href.startswith("http"):
-                            # Scrape the actual page
-                            scrape_result = await self.scrape_url(href)
-                            results.append(scrape_result)
-                except Exception as e:
-                    logger.error(f"Error processing search result: {e}")
-            
-            return results
-            
+            links = await self._search_links(query, num_results)
         except Exception as e:
             logger.error(f"Error during search: {e}")
-            return [{"error": str(e)}]
+            yield {"error": str(e)}
+            return
+        
+        async def ranked(rank: int, url: str) -> Dict[str, Any]:
+            result = await self._scrape_with_timeout(url, timeout, main_content)
+            result["rank"] = rank
+            return result
+        
+        tasks = [asyncio.ensure_future(ranked(rank, url)) for rank, url in enumerate(links)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # The consumer stopped early; don't leave scrapes running.
+            for task in tasks:
+                task.cancel()
+    
+    async def search_and_scrape(self, query: str, num_results: int = 3,
+                                timeout: Optional[float] = None,
+                                main_content: bool = False) -> List[Dict[str, Any]]:
+        """
+        Search for a query and scrape the top results concurrently.
+        
+        Args:
+            query: The search query
+            num_results: Number of results to scrape
+            timeout: Seconds allowed per result (default: ``result_timeout``)
+            main_content: Keep only the main article text of each page
+            
+        Returns:
+            List of scraping results in search rank order
+        """
+        results = [result async for result in
+                   self.iter_search_and_scrape(query, num_results, timeout, main_content)]
+        return sorted(results, key=lambda result: result.get("rank", 0))
     
     async def close(self):
-        """Close the browser."""
+        """Close the browser and stop the Playwright driver."""
+        await self.scheduler.close()
+        await self.search_backend.close()
+        if self.workers is not None:
+            await self.workers.close()
+        await self.http_browser.close()
+        if self.store is not None:
+            self.store.flush()
+        if self.archive is not None:
+            self.archive.flush()
+        if self.corpus is not None:
+            self.corpus.flush()
+        if self._retiring:
+            await asyncio.gather(*self._retiring, return_exceptions=True)
         if self.browser:
-            await self.browser.close()
+            await self.pool.close()
+            try:
+                await self.browser.close()
+            except Exception as e:
+                logger.debug(f"Error closing browser: {e}")
             self.browser = None
             self.context = None
             self.page = None
+            self.pool = None
             logger.info("Browser closed")
+        if self.playwright is not None:
+            await self.playwright.stop()
+            self.playwright = None
 
 # Singleton instance
 _scraper = None
@@ -153,15 +677,37 @@ async def get_scraper() -> WebScraper:
 
 async def scrape_url(url: str, selector: Optional[str] = None, 
                     wait_for: Optional[str] = None, 
-                    extract_text: bool = True) -> Dict[str, Any]:
+                    extract_text: bool = True,
+                    max_items: Optional[int] = None,
+                    max_chars: Optional[int] = None,
+                    main_content: bool = False,
+                    max_age: Optional[float] = None,
+                    max_length: Optional[int] = None,
+                    complete: bool = False,
+                    snapshot: bool = False) -> Dict[str, Any]:
     """Convenience function to scrape a URL."""
     scraper = await get_scraper()
-    return await scraper.scrape_url(url, selector, wait_for, extract_text)
+    return await scraper.scrape_url(url, selector, wait_for, extract_text,
+                                    max_items=max_items, max_chars=max_chars,
+                                    main_content=main_content, max_age=max_age,
+                                    max_length=max_length, complete=complete,
+                                    snapshot=snapshot)
 
-async def search_and_scrape(query: str, num_results: int = 3) -> List[Dict[str, Any]]:
+async def search_and_scrape(query: str, num_results: int = 3,
+                            timeout: Optional[float] = None,
+                            main_content: bool = False) -> List[Dict[str, Any]]:
     """Convenience function to search and scrape."""
     scraper = await get_scraper()
-    return await scraper.search_and_scrape(query, num_results)
+    return await scraper.search_and_scrape(query, num_results, timeout, main_content)
+
+async def iter_search_and_scrape(query: str, num_results: int = 3,
+                                 timeout: Optional[float] = None,
+                                 main_content: bool = False) -> AsyncIterator[Dict[str, Any]]:
+    """Convenience function to search and stream scraped results as they complete."""
+    scraper = await get_scraper()
+    async for result in scraper.iter_search_and_scrape(query, num_results, timeout,
+                                                       main_content):
+        yield result
 
 async def close_scraper():
     """Close the scraper."""
@@ -3,35 +3,76 @@ Web tools for the agent to use.
 """
 import logging
 from typing import Dict, Any, List, Optional
-from exo.agents.tools.scraper import scrape_url, search_and_scrape, close_scraper
+from .scraper import scrape_url, search_and_scrape
+from ...core.config import get_config
+from ...storage.content_index import ContentIndex
+from ...storage.document_store import DocumentStore
+from ..dedup import deduplicate
+from ..prefetch import Prefetcher
+from ..ranking import select_passages
 
 logger = logging.getLogger(__name__)
 
-async def web_search(query: str, num_results: int = 3) -> Dict[str, Any]:
+def _context_budget() -> int:
+    """Token budget for page text passed to the agent."""
+    return get_config()["scraping"].get("context_budget_tokens", 1000)
+
+async def web_search(query: str, num_results: int = 3,
+                     content_index: Optional[ContentIndex] = None,
+                     prefetcher: Optional[Prefetcher] = None) -> Dict[str, Any]:
     """
     Search the web for information and return the results.
     
     Args:
         query: The search query
         num_results: Number of results to return
+        content_index: Index to add the scraped pages to
+        prefetcher: Prefetcher that is handed the scraped pages, for the
+            scrape that usually follows, and loads the results that timed out
         
     Returns:
         Dictionary with search results
     """
     logger.info(f"Web search for: {query}")
-    results = await search_and_scrape(query, num_results)
+    results = await search_and_scrape(query, num_results, main_content=True)
+    if prefetcher is not None:
+        # The pages were just read; only the ones cut off by the result timeout
+        # still need loading
+        prefetcher.cancel()
+        prefetcher.add(results)
+        prefetcher.prefetch(result["url"] for result in results if result.get("timed_out"))
+    
+    # Mirrors and syndicated copies would only repeat the same text
+    results, dedup_report = deduplicate(results, text_key="content")
+    if content_index is not None:
+        await content_index.add_documents(results)
+    
+    return _format_search_results(query, results, dedup_report)
+
+def _format_search_results(query: str, results: List[Dict[str, Any]],
+                           dedup_report: Dict[str, Any]) -> Dict[str, Any]:
+    """Format scraped search results for the agent within the context budget."""
+    # Keep only the passages most relevant to the query, within budget
+    passages = select_passages(results, query, budget_tokens=_context_budget())
+    passages_by_document = {}
+    for passage in sorted(passages, key=lambda p: (p["document"], p["position"])):
+        passages_by_document.setdefault(passage["document"], []).append(passage["text"])
     
     # Format the results for the agent
     formatted_results = []
-    for result in results:
+    for index, result in enumerate(results):
         if "error" in result:
             formatted_results.append(f"Error: {result['error']}")
         elif "content" in result:
-            # Truncate content to avoid overwhelming the agent
-            content = result["content"]
-            if len(content) > 1000:
-                content = content[:1000] + "..."
-            formatted_results.append(f"From {result['url']}:\n{content}")
+            source = result["url"]
+            if result.get("duplicate_urls"):
+                source += f" (also at: {', '.join(result['duplicate_urls'])})"
+            if index not in passages_by_document:
+                # Still tell the model the page was read
+                formatted_results.append(f"From {source}: (no relevant passage within the context budget)")
+                continue
+            content = "\n...\n".join(passages_by_document[index])
+            formatted_results.append(f"From {source}:\n{content}")
         elif "results" in result:
             formatted_results.append(f"From {result['url']} ({result['count']} results):")
             for i, item in enumerate(result["results"][:5]):  # Limit to 5 items
@@ -41,22 +82,74 @@ async def web_search(query: str, num_results: int = 3) -> Dict[str, Any]:
     
     return {
         "query": query,
-        "results": formatted_results
+        "results": formatted_results,
+        "duplicates_removed": dedup_report["duplicates"],
+        "tokens_saved": dedup_report["tokens_saved"]
     }
 
-async def scrape_website(url: str, selector: Optional[str] = None) -> Dict[str, Any]:
+def search_store(query: str, store: DocumentStore, num_results: int = 3,
+                 min_hits: Optional[int] = None, max_age: Optional[float] = None,
+                 min_coverage: float = 0.6) -> Optional[Dict[str, Any]]:
+    """
+    Answer a search from previously scraped pages, without the network.
+    
+    Args:
+        query: The search query
+        store: Document store to search
+        num_results: Number of pages to use
+        min_hits: Matching pages required to answer (default: from config)
+        max_age: Only pages fetched within this many seconds (default: from config)
+        min_coverage: Fraction of query terms a page must contain to count
+        
+    Returns:
+        A result shaped like ``web_search``'s with ``source`` set to
+        ``"store"``, or None if the store doesn't cover the query
+    """
+    if min_hits is None:
+        min_hits = get_config()["index"].get("min_hits", 3)
+    if max_age is None:
+        max_age = get_config()["store"].get("max_age", 86400)
+    documents = [
+        document for document in
+        store.search(query, limit=max(num_results, min_hits), max_age=max_age, mode="main")
+        if document["coverage"] >= min_coverage
+    ]
+    if len(documents) < min(min_hits, num_results):
+        return None
+    logger.info(f"Answering '{query}' from {len(documents)} stored pages")
+    documents, dedup_report = deduplicate(documents, text_key="content")
+    result = _format_search_results(query, documents, dedup_report)
+    result["source"] = "store"
+    return result
+
+async def scrape_website(url: str, selector: Optional[str] = None,
+                         query: Optional[str] = None,
+                         content_index: Optional[ContentIndex] = None,
+                         prefetcher: Optional[Prefetcher] = None) -> Dict[str, Any]:
     """
     Scrape a specific website.
     
     Args:
         url: The URL to scrape
         selector: CSS selector to target specific elements
+        query: What the user is looking for; selects the most relevant
+            passages of the page instead of its opening
+        content_index: Index to add the scraped page to
+        prefetcher: Prefetcher whose page is used if it loaded this URL
+            (its other prefetches are cancelled)
         
     Returns:
         Dictionary with scraping results
     """
     logger.info(f"Scraping website: {url}")
-    result = await scrape_url(url, selector)
+    result = None
+    if prefetcher is not None:
+        if selector is None:
+            result = await prefetcher.get(url)
+        else:
+            prefetcher.cancel()
+    if result is None:
+        result = await scrape_url(url, selector, main_content=selector is None)
     
     # Format the result for the agent
     if "error" in result:
@@ -65,14 +158,22 @@ async def scrape_website(url: str, selector: Optional[str] = None) -> Dict[str,
             "error": result["error"]
         }
     elif "content" in result:
-        # Truncate content to avoid overwhelming the agent
-        content = result["content"]
-        if len(content) > 1000:
-            content = content[:1000] + "..."
-        return {
+        if content_index is not None:
+            await content_index.add_documents([result])
+        # The passages most relevant to the query (without one, the page's
+        # opening passages), in page order, within the prompt budget
+        passages = select_passages([result], query or "", budget_tokens=_context_budget())
+        passages.sort(key=lambda p: p["position"])
+        content = "\n...\n".join(passage["text"] for passage in passages)
+        formatted = {
             "url": url,
             "content": content
         }
+        if result.get("truncated"):
+            # Tell the agent the page was longer than what was read
+            formatted["truncated"] = True
+            formatted["content_length"] = result["content_length"]
+        return formatted
     elif "results" in result:
         formatted_results = []
         for i, item in enumerate(result["results"][:5]):  # Limit to 5 items
@@ -119,6 +220,11 @@ WEB_TOOLS = [
                 "type": "string",
                 "description": "CSS selector to target specific elements",
                 "optional": True
+            },
+            "query": {
+                "type": "string",
+                "description": "What to look for on the page",
+                "optional": True
             }
         },
         "function": scrape_website
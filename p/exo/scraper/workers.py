@@ -0,0 +1,300 @@
+"""
+Scrape worker processes, each driving its own browser.
+
+One process can only orchestrate so many pages: Playwright calls,
+readiness polling and result handling all share one event loop and one
+core. A ``ScrapeWorkerPool`` starts N worker processes, each with its
+own ``WebScraper`` (page pool, HTTP client, browser), and feeds them
+scrape jobs through per-worker queues. Jobs are sharded by a hash of
+the URL's host, so all pages of a site go to the same worker and share
+its connections, cookies, robots.txt cache and politeness state.
+Results come back on a single queue as each job finishes.
+
+Document store, archive and corpus writes stay in the calling process;
+workers only fetch and extract. A caller that archives asks for each
+page's raw HTML back with its result and archives it itself.
+"""
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import queue
+import threading
+import zlib
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from ..core.config import get_config
+from ..utils.async_utils import stream_map
+from ..utils.deadline import deadline, remaining
+
+logger = logging.getLogger(__name__)
+
+class _HtmlCollector:
+    """Stands in for the HTML archive in a worker, holding pages for the caller."""
+
+    def __init__(self):
+        self.pages: Dict[str, str] = {}
+
+    def add(self, url: str, html: str) -> None:
+        self.pages[url] = html
+
+    def flush(self) -> None:
+        pass
+
+# Set in worker processes, so their scrapers don't submit jobs to a pool of their own.
+_in_worker = False
+
+async def _serve(jobs, results) -> None:
+    # Imported here: the scraper module imports this one.
+    from .processing import HtmlProcessor
+    from .tools.scraper import WebScraper
+
+    loop = asyncio.get_running_loop()
+    # The worker is already off the caller's event loop; parse HTML inline.
+    scraper = WebScraper(processor=HtmlProcessor(workers=0))
+    # Single-writer files are written by the calling process only; the
+    # raw HTML of pages goes back to it for archiving, once it asks for it.
+    scraper.store = scraper.archive = scraper.corpus = None
+    collector = _HtmlCollector()
+    running: Dict[int, asyncio.Task] = {}
+
+    async def run(job_id: int, url: str, kwargs: Dict[str, Any],
+                  time_left: Optional[float], keep_html: bool) -> None:
+        try:
+            # The caller's deadline, as the time it had left when it sent the job
+            with deadline(time_left):
+                result = await scraper.scrape_url(url, **kwargs)
+        except asyncio.CancelledError:
+            result = {"url": url, "error": "Cancelled"}
+        except Exception as e:
+            result = {"url": url, "error": str(e)}
+        finally:
+            running.pop(job_id, None)
+            html = collector.pages.pop(url, None)
+        if keep_html and html is not None and "error" not in result:
+            result["raw_html"] = html
+        results.put((job_id, result))
+
+    try:
+        while True:
+            message = await loop.run_in_executor(None, jobs.get)
+            if message is None:
+                break
+            kind, job_id, *args = message
+            if kind == "cancel":
+                task = running.get(job_id)
+                if task is not None:
+                    task.cancel()
+            else:
+                if args[-1]:
+                    scraper.archive = collector
+                running[job_id] = asyncio.create_task(run(job_id, *args))
+        await asyncio.gather(*running.values(), return_exceptions=True)
+    finally:
+        await scraper.close()
+
+def _worker_main(index: int, jobs, results) -> None:
+    global _in_worker
+    _in_worker = True
+    logger.debug(f"Scrape worker {index} started")
+    asyncio.run(_serve(jobs, results))
+
+def shard(url: str, workers: int) -> int:
+    """Worker index for a URL: a stable hash of its host."""
+    # Imported here: the crawler's fetchers import the scraper, which imports this module.
+    from .crawler.urls import url_host
+    return zlib.crc32(url_host(url).encode("utf-8")) % workers
+
+class ScrapeWorkerPool:
+    """
+    Pool of scrape worker processes fed through a sharded job queue.
+    """
+
+    def __init__(self, processes: Optional[int] = None, start_method: Optional[str] = None):
+        """
+        Initialize the pool; worker processes start on the first job.
+
+        Args:
+            processes: Number of worker processes (default: from config)
+            start_method: multiprocessing start method (default: from config)
+        """
+        workers_config = get_config()["workers"]
+        self.processes = processes or workers_config.get("processes") or 1
+        self.start_method = start_method or workers_config.get("start_method", "spawn")
+        self._context = multiprocessing.get_context(self.start_method)
+        self._workers: List[Optional[multiprocessing.Process]] = [None] * self.processes
+        self._jobs: List[Any] = [None] * self.processes
+        self._results = None
+        self._reader: Optional[threading.Thread] = None
+        self._ids = itertools.count()
+        # job id -> (worker index, url, loop, future)
+        self._pending: Dict[int, Tuple[int, str, asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self._lock = threading.Lock()
+        self.closed = False
+
+    def _start_worker(self, index: int) -> None:
+        self._jobs[index] = self._context.Queue()
+        process = self._context.Process(target=_worker_main, args=(index, self._jobs[index], self._results),
+                                        name=f"exo-scrape-worker-{index}", daemon=True)
+        process.start()
+        self._workers[index] = process
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._results is not None:
+                return
+            self._results = self._context.Queue()
+            for index in range(self.processes):
+                self._start_worker(index)
+            self._reader = threading.Thread(target=self._read_results, name="exo-scrape-results",
+                                            daemon=True)
+            self._reader.start()
+            logger.info(f"Started {self.processes} scrape worker processes")
+
+    def _resolve(self, job_id: int, result: Dict[str, Any]) -> None:
+        with self._lock:
+            entry = self._pending.pop(job_id, None)
+        if entry is None:
+            return
+        _, _, loop, future = entry
+
+        def set_result() -> None:
+            if not future.done():
+                future.set_result(result)
+        loop.call_soon_threadsafe(set_result)
+
+    def _read_results(self) -> None:
+        while True:
+            try:
+                message = self._results.get(timeout=1.0)
+            except queue.Empty:
+                self._check_workers()
+                continue
+            except (EOFError, OSError):
+                return
+            if message is None:
+                return
+            self._resolve(*message)
+
+    def _check_workers(self) -> None:
+        """Fail the jobs of workers that died and start replacements."""
+        for index, process in enumerate(self._workers):
+            if self.closed or process is None or process.is_alive():
+                continue
+            logger.warning(f"Scrape worker {index} exited with code {process.exitcode}; restarting")
+            with self._lock:
+                lost = [(job_id, url) for job_id, (worker, url, _, _) in self._pending.items()
+                        if worker == index]
+                self._start_worker(index)
+            for job_id, url in lost:
+                self._resolve(job_id, {"url": url, "error": "Scrape worker exited"})
+
+    async def scrape_url(self, url: str, keep_html: bool = False, **kwargs) -> Dict[str, Any]:
+        """
+        Scrape a URL in the worker that owns its host.
+
+        The worker scrapes within the time left before the caller's
+        deadline, if it has one.
+
+        Args:
+            url: The URL to scrape
+            keep_html: Return the page's raw HTML as ``raw_html``, for the
+                caller to archive (whole-page scrapes only)
+            **kwargs: ``WebScraper.scrape_url`` arguments
+
+        Returns:
+            The scrape result (errors are returned as ``error`` results)
+        """
+        if self.closed:
+            raise RuntimeError("Scrape worker pool is closed")
+        self._ensure_started()
+        index = shard(url, self.processes)
+        job_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        with self._lock:
+            self._pending[job_id] = (index, url, asyncio.get_running_loop(), future)
+            self._jobs[index].put(("scrape", job_id, url, kwargs, remaining(), keep_html))
+        try:
+            return await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if self._pending.pop(job_id, None) is not None:
+                    self._jobs[index].put(("cancel", job_id))
+            raise
+
+    async def scrape_many(self, urls: Iterable[str], concurrency: Optional[int] = None,
+                          **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Scrape URLs across the workers, yielding results as they finish.
+
+        URLs are read lazily, so ``urls`` can be a long or endless
+        iterable. Each result carries ``index``, the URL's position in
+        ``urls``. Leaving the loop early cancels the jobs still running.
+
+        Args:
+            urls: URLs to scrape
+            concurrency: Jobs in flight (default: ``max_concurrency`` per worker)
+            **kwargs: ``WebScraper.scrape_url`` arguments
+        """
+        async def indexed(entry: Tuple[int, str]) -> Dict[str, Any]:
+            index, url = entry
+            result = await self.scrape_url(url, **kwargs)
+            result["index"] = index
+            return result
+
+        concurrency = concurrency or self.processes * get_config()["scraping"].get("max_concurrency", 4)
+        async with aclosing(stream_map(indexed, enumerate(urls), concurrency)) as results:
+            async for result in results:
+                yield result
+
+    def stats(self) -> Dict[str, Any]:
+        """Worker liveness and jobs in flight per worker."""
+        with self._lock:
+            in_flight = [0] * self.processes
+            for worker, _, _, _ in self._pending.values():
+                in_flight[worker] += 1
+        return {
+            "processes": self.processes,
+            "alive": sum(1 for process in self._workers if process is not None and process.is_alive()),
+            "in_flight": in_flight
+        }
+
+    async def close(self) -> None:
+        """Let the workers finish their jobs and close their browsers, then stop them."""
+        if self.closed:
+            return
+        self.closed = True
+        if self._results is None:
+            return
+        for jobs in self._jobs:
+            jobs.put(None)
+        await asyncio.to_thread(self._join)
+        with self._lock:
+            lost = [(job_id, url) for job_id, (_, url, _, _) in self._pending.items()]
+        for job_id, url in lost:
+            self._resolve(job_id, {"url": url, "error": "Scrape worker pool closed"})
+
+    def _join(self) -> None:
+        for process in self._workers:
+            process.join(timeout=30)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._results.put(None)
+        self._reader.join()
+
+_pool = None
+
+def get_scrape_workers() -> Optional[ScrapeWorkerPool]:
+    """
+    The shared scrape worker pool, if worker processes are configured.
+
+    Returns:
+        The singleton pool, or None when ``workers.processes`` is 0 or
+        when called inside a worker
+    """
+    global _pool
+    if (_pool is None or _pool.closed) and not _in_worker and get_config()["workers"].get("processes"):
+        _pool = ScrapeWorkerPool()
+    return _pool
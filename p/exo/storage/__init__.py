@@ -0,0 +1,14 @@
+"""
+Local storage for scraped content.
+"""
+from .vector_index import VectorIndex
+from .content_index import ContentIndex
+from .document_store import DocumentStore, get_document_store
+from .html_archive import HtmlArchive, get_html_archive
+from .corpus import CorpusWriter, CorpusReader, open_corpus, map_corpus, get_corpus_writer
+
+__all__ = [
+    "VectorIndex", "ContentIndex", "DocumentStore", "get_document_store",
+    "HtmlArchive", "get_html_archive", "CorpusWriter", "CorpusReader", "open_corpus",
+    "map_corpus", "get_corpus_writer"
+]
@@ -0,0 +1,173 @@
+"""
+Embedded page chunks for retrieval before scraping.
+
+Pages are split into passages, embedded with a model's ``embed`` method
+and kept in a ``VectorIndex``, so an agent can answer from pages it has
+already seen instead of fetching them again.
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Any, List, Optional, Sequence
+
+from ..core.config import get_config
+from ..scraper.ranking import chunk_text
+from .vector_index import META_FILE, VectorIndex
+
+logger = logging.getLogger(__name__)
+
+class ContentIndex:
+    """
+    Semantic index of scraped page passages.
+    """
+
+    def __init__(self, embedder: Any, index: Optional[VectorIndex] = None,
+                 path: Optional[str] = None, dtype: Optional[str] = None,
+                 chunk_chars: Optional[int] = None):
+        """
+        Initialize the content index.
+
+        Args:
+            embedder: Object with an ``embed(texts) -> np.ndarray`` method
+                (any provider model)
+            index: Vector index to use (default: the one persisted at
+                ``path``, else created on the first add, once the embedding
+                dimension is known)
+            path: Directory to persist a created index to (default: from config)
+            dtype: Storage type of a created index (default: from config)
+            chunk_chars: Maximum passage length in characters (default: from config)
+        """
+        index_config = get_config()["index"]
+        self.embedder = embedder
+        self.index = index
+        self.path = path or index_config.get("path")
+        self.dtype = dtype or index_config.get("dtype", "float32")
+        self.chunk_chars = chunk_chars or index_config.get("chunk_chars", 800)
+        # Writes (and IVF training) run in a worker thread; searches take the
+        # same lock so they never see a half-grown matrix.
+        self._lock = threading.Lock()
+        if self.index is None and self.path:
+            meta_path = os.path.join(self.path, META_FILE)
+            if os.path.exists(meta_path):
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                self.index = VectorIndex(meta["dim"], dtype=meta["dtype"], path=self.path)
+                self.dtype = meta["dtype"]
+
+    async def _embed(self, texts: List[str]):
+        # Embedding calls block (HTTP clients, local models); keep the loop free.
+        return await asyncio.to_thread(self.embedder.embed, texts)
+
+    async def add_documents(self, documents: Sequence[Dict[str, Any]],
+                            text_key: str = "content", url_key: str = "url") -> int:
+        """
+        Embed and index pages, replacing any earlier version of each URL.
+
+        Documents without text under ``text_key`` are skipped.
+
+        Args:
+            documents: Scraped pages
+            text_key: Key holding the page text
+            url_key: Key holding the page URL
+
+        Returns:
+            Number of passages indexed
+        """
+        texts, urls, payloads = [], [], []
+        for document in documents:
+            text = document.get(text_key)
+            url = document.get(url_key)
+            if not isinstance(text, str) or not text.strip() or not url:
+                continue
+            for position, passage in enumerate(chunk_text(text, self.chunk_chars)):
+                texts.append(passage)
+                urls.append(url)
+                payloads.append({"text": passage, "position": position,
+                                 "title": document.get("title")})
+        if not texts:
+            return 0
+
+        vectors = await self._embed(texts)
+        # Adding can grow the matrix or train the IVF layout (seconds on large
+        # indexes), so it runs off the event loop.
+        await asyncio.to_thread(self._replace, vectors, urls, payloads)
+        logger.debug(f"Indexed {len(texts)} passages from {len(set(urls))} pages")
+        return len(texts)
+
+    def _replace(self, vectors, urls: List[str], payloads: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            if self.index is None:
+                self.index = VectorIndex(vectors.shape[1], dtype=self.dtype, path=self.path)
+            for url in set(urls):
+                self.index.delete_url(url)
+            self.index.add(vectors, urls, payloads=payloads)
+
+    def _search(self, *args, **kwargs) -> List[Dict[str, Any]]:
+        with self._lock:
+            return self.index.search(*args, **kwargs)
+
+    async def query(self, text: str, k: int = 5, urls: Optional[Sequence[str]] = None,
+                    domains: Optional[Sequence[str]] = None, max_age: Optional[float] = None,
+                    min_score: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Find indexed passages relevant to a query.
+
+        Args:
+            text: The query
+            k: Maximum number of passages
+            urls: Only passages from these URLs
+            domains: Only passages from these hosts
+            max_age: Only passages indexed within this many seconds
+            min_score: Minimum cosine similarity
+
+        Returns:
+            Passages as dictionaries with ``url``, ``text``, ``score`` and
+            ``timestamp``, best first
+        """
+        if self.index is None or not len(self.index):
+            return []
+        query_vector = (await self._embed([text]))[0]
+        since = time.time() - max_age if max_age is not None else None
+        matches = await asyncio.to_thread(self._search, query_vector, k, urls=urls,
+                                          domains=domains, since=since)
+        return [
+            {"url": match["url"], "text": (match["payload"] or {}).get("text", ""),
+             "score": match["score"], "timestamp": match["timestamp"]}
+            for match in matches
+            if min_score is None or match["score"] >= min_score
+        ]
+
+    def is_fresh(self, url: str, max_age: Optional[float] = None) -> bool:
+        """
+        Whether a URL is indexed and was fetched recently enough.
+
+        Does not wait for an add in progress (it may be training the index);
+        the URL then counts as not fresh.
+
+        Args:
+            url: The page URL
+            max_age: Maximum age in seconds (default: from config)
+        """
+        if self.index is None:
+            return False
+        if max_age is None:
+            max_age = get_config()["index"].get("max_age", 86400)
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            latest = self.index.latest(url)
+        finally:
+            self._lock.release()
+        return latest is not None and time.time() - latest <= max_age
+
+    def save(self) -> None:
+        """Persist the underlying vector index and the embedder's cache (if they have paths)."""
+        if self.index is not None and self.index.path:
+            with self._lock:
+                self.index.save()
+        cache = getattr(self.embedder, "embedding_cache", None)
+        if cache is not None:
+            cache.flush()
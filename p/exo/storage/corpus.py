@@ -0,0 +1,297 @@
+"""
+Append-only, memory-mapped corpus of extracted page text.
+
+Worker processes that rank, deduplicate or embed pages should not
+receive every page text pickled through a pipe. A corpus is a directory
+of two files that any process can ``mmap``:
+
+- ``blobs.bin``: length-prefixed UTF-8 records (a 4-byte little-endian
+  length, then the bytes) holding each document's URL and text
+- ``table.bin``: a small header followed by one fixed-width row per
+  document with the offsets and lengths of its URL and text and its
+  fetch time
+
+Rows are only written after their blobs, so a reader never sees a row
+pointing past the data. Workers are handed the corpus path and a row
+range, and slice documents straight out of the mapping.
+"""
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import numpy as np
+
+from ..core.config import get_config
+
+logger = logging.getLogger(__name__)
+
+BLOBS_FILE = "blobs.bin"
+TABLE_FILE = "table.bin"
+MAGIC = b"EXOCORP1"
+HEADER_SIZE = 16
+LENGTH_PREFIX = struct.Struct("<I")
+
+# One row per document; offsets point at the blob bytes, after the length prefix.
+TABLE_DTYPE = np.dtype([
+    ("text_offset", "<u8"),
+    ("url_offset", "<u8"),
+    ("text_length", "<u4"),
+    ("url_length", "<u4"),
+    ("fetched_at", "<f8"),
+])
+
+class CorpusWriter:
+    """
+    Appends documents to a corpus.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open (or create) a corpus for appending.
+
+        Args:
+            path: Corpus directory (default: from config)
+        """
+        self.path = path or get_config()["corpus"].get("path")
+        if not self.path:
+            raise ValueError("CorpusWriter needs a path (or corpus.path in config)")
+        os.makedirs(self.path, exist_ok=True)
+        self._lock = threading.Lock()
+        self._blobs = open(os.path.join(self.path, BLOBS_FILE), "ab")
+        table_path = os.path.join(self.path, TABLE_FILE)
+        self._table = open(table_path, "ab")
+        if self._table.tell() == 0:
+            self._table.write(MAGIC + bytes(HEADER_SIZE - len(MAGIC)))
+        else:
+            # Drop a partially written row left by a crash.
+            rows = (self._table.tell() - HEADER_SIZE) // TABLE_DTYPE.itemsize
+            self._table.truncate(HEADER_SIZE + rows * TABLE_DTYPE.itemsize)
+        self.count = (self._table.tell() - HEADER_SIZE) // TABLE_DTYPE.itemsize
+
+    def _write_blob(self, data: bytes) -> int:
+        self._blobs.write(LENGTH_PREFIX.pack(len(data)))
+        offset = self._blobs.tell()
+        self._blobs.write(data)
+        return offset
+
+    def append(self, url: str, text: str, fetched_at: Optional[float] = None) -> int:
+        """
+        Append a document.
+
+        Args:
+            url: The document URL
+            text: The extracted text
+            fetched_at: Fetch time (default: now)
+
+        Returns:
+            The document's row number
+        """
+        url_bytes = url.encode("utf-8")
+        text_bytes = text.encode("utf-8")
+        with self._lock:
+            url_offset = self._write_blob(url_bytes)
+            text_offset = self._write_blob(text_bytes)
+            row = np.array([(text_offset, url_offset, len(text_bytes), len(url_bytes),
+                             fetched_at or time.time())], dtype=TABLE_DTYPE)
+            # The row may reach the disk as soon as it is buffered; its blobs must be there first.
+            self._blobs.flush()
+            self._table.write(row.tobytes())
+            self.count += 1
+            return self.count - 1
+
+    def append_result(self, result: Dict[str, Any], text_key: str = "content") -> Optional[int]:
+        """
+        Append a scrape result if it has text.
+
+        Returns:
+            The row number, or None if the result has no text
+        """
+        text = result.get(text_key)
+        if not isinstance(text, str) or not result.get("url"):
+            return None
+        return self.append(result["url"], text)
+
+    def flush(self) -> None:
+        """Make appended documents visible to readers (blobs before rows)."""
+        with self._lock:
+            self._blobs.flush()
+            self._table.flush()
+
+    def close(self) -> None:
+        """Flush and close the corpus files."""
+        with self._lock:
+            if self._blobs.closed:
+                return
+            self._blobs.flush()
+            self._table.flush()
+            self._blobs.close()
+            self._table.close()
+
+    def __enter__(self) -> "CorpusWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+class CorpusReader:
+    """
+    Zero-copy, memory-mapped view of a corpus.
+    """
+
+    def __init__(self, path: str):
+        """
+        Map a corpus.
+
+        Args:
+            path: Corpus directory
+        """
+        self.path = path
+        self._blobs_mmap = None
+        self._table_mmap = None
+        self.table = np.empty(0, dtype=TABLE_DTYPE)
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Re-map the files to pick up documents appended since opening."""
+        self.close()
+        with open(os.path.join(self.path, TABLE_FILE), "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a corpus")
+            size = os.fstat(f.fileno()).st_size
+            rows = (size - HEADER_SIZE) // TABLE_DTYPE.itemsize
+            if rows:
+                self._table_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self.table = np.frombuffer(self._table_mmap, dtype=TABLE_DTYPE,
+                                           count=rows, offset=HEADER_SIZE)
+        blobs_path = os.path.join(self.path, BLOBS_FILE)
+        if rows and os.path.getsize(blobs_path):
+            with open(blobs_path, "rb") as f:
+                self._blobs_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._blobs = memoryview(self._blobs_mmap)
+            # Hide rows whose text isn't fully on disk yet (a writer mid-append).
+            ends = self.table["text_offset"] + self.table["text_length"]
+            self.table = self.table[:int(np.searchsorted(ends, len(self._blobs_mmap), side="right"))]
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def raw_text(self, i: int) -> memoryview:
+        """
+        The UTF-8 bytes of document ``i``, without copying.
+
+        Release the view before ``refresh`` or ``close``.
+        """
+        row = self.table[i]
+        start = int(row["text_offset"])
+        return self._blobs[start:start + int(row["text_length"])]
+
+    def text(self, i: int) -> str:
+        """The text of document ``i``."""
+        return str(self.raw_text(i), "utf-8")
+
+    def url(self, i: int) -> str:
+        """The URL of document ``i``."""
+        row = self.table[i]
+        start = int(row["url_offset"])
+        return str(self._blobs[start:start + int(row["url_length"])], "utf-8")
+
+    def fetched_at(self, i: int) -> float:
+        """The fetch time of document ``i``."""
+        return float(self.table[i]["fetched_at"])
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        return {"url": self.url(i), "content": self.text(i), "fetched_at": self.fetched_at(i)}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self) -> None:
+        """Release the mappings."""
+        self.table = np.empty(0, dtype=TABLE_DTYPE)
+        if self._blobs_mmap is not None:
+            self._blobs.release()
+            self._blobs_mmap.close()
+            self._blobs_mmap = None
+        if self._table_mmap is not None:
+            self._table_mmap.close()
+            self._table_mmap = None
+
+# Readers opened by this (worker) process, by corpus path
+_readers: Dict[str, CorpusReader] = {}
+
+def open_corpus(path: str) -> CorpusReader:
+    """
+    Get this process's reader for a corpus, mapping it on first use.
+
+    Args:
+        path: Corpus directory
+
+    Returns:
+        A shared reader (refreshed if the corpus has grown)
+    """
+    reader = _readers.get(path)
+    if reader is None:
+        reader = _readers[path] = CorpusReader(path)
+    return reader
+
+def _process_range(path: str, start: int, stop: int,
+                   func: Callable[[str, str], Any]) -> list:
+    reader = open_corpus(path)
+    if stop > len(reader):
+        reader.refresh()
+    return [func(reader.url(i), reader.text(i)) for i in range(start, stop)]
+
+def map_corpus(path: str, func: Callable[[str, str], Any], executor: Optional[Executor] = None,
+               batch_size: int = 256, start: int = 0,
+               stop: Optional[int] = None) -> Iterator[Any]:
+    """
+    Apply a function to every document in worker processes.
+
+    Only the corpus path and row ranges cross the process boundary; each
+    worker reads the documents from its own mapping.
+
+    Args:
+        path: Corpus directory
+        func: Top-level function called as ``func(url, text)``
+        executor: Process pool to use (default: a new ``ProcessPoolExecutor``)
+        batch_size: Documents per task
+        start: First row
+        stop: Row to stop before (default: the end of the corpus)
+
+    Yields:
+        ``func`` results in row order
+    """
+    if stop is None:
+        reader = CorpusReader(path)
+        stop = len(reader)
+        reader.close()
+    owns_executor = executor is None
+    executor = executor or ProcessPoolExecutor()
+    try:
+        futures = [executor.submit(_process_range, path, lo, min(lo + batch_size, stop), func)
+                   for lo in range(start, stop, batch_size)]
+        for future in futures:
+            yield from future.result()
+    finally:
+        if owns_executor:
+            executor.shutdown(cancel_futures=True)
+
+_writer = None
+
+def get_corpus_writer() -> Optional[CorpusWriter]:
+    """
+    The shared corpus writer, if a corpus path is configured.
+
+    Returns:
+        The singleton writer, or None when ``corpus.path`` is not set
+    """
+    global _writer
+    if _writer is None and get_config()["corpus"].get("path"):
+        _writer = CorpusWriter()
+    return _writer
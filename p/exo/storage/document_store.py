@@ -0,0 +1,294 @@
+"""
+Persistent store of scraped pages with full-text search.
+
+Pages are normalized to one row per URL and extraction mode (URL, fetch
+time, content hash, title, text, metadata) in SQLite. An FTS5 index over
+title and text, kept in sync by triggers, gives ranked full-text lookup,
+and fetch times support "only refetch if older than X" policies. Writes
+are buffered and committed in bulk transactions.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional, Sequence
+
+from ..core.config import get_config
+from ..scraper.ranking import tokenize
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    content_hash TEXT NOT NULL,
+    title TEXT,
+    text TEXT NOT NULL,
+    metadata TEXT,
+    UNIQUE (url, mode)
+);
+CREATE INDEX IF NOT EXISTS documents_fetched_at ON documents (fetched_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, text, content='documents', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+    INSERT INTO documents_fts (rowid, title, text) VALUES (new.id, new.title, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+    INSERT INTO documents_fts (documents_fts, rowid, title, text)
+    VALUES ('delete', old.id, old.title, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE OF title, text ON documents BEGIN
+    INSERT INTO documents_fts (documents_fts, rowid, title, text)
+    VALUES ('delete', old.id, old.title, old.text);
+    INSERT INTO documents_fts (rowid, title, text) VALUES (new.id, new.title, new.text);
+END;
+"""
+
+def content_hash(text: str) -> str:
+    """Stable hash of a page's extracted text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def _match_expression(query: str) -> str:
+    """Turn free text into an FTS5 query matching any of its terms."""
+    terms = dict.fromkeys(tokenize(query))
+    return " OR ".join(f'"{term}"' for term in terms)
+
+class DocumentStore:
+    """
+    SQLite-backed store of scraped pages with an FTS5 index.
+    """
+
+    def __init__(self, path: Optional[str] = None, batch_size: Optional[int] = None):
+        """
+        Open (or create) a document store.
+
+        Args:
+            path: SQLite database file (default: from config, else in memory)
+            batch_size: Buffered writes committed per transaction (default: from config)
+        """
+        store_config = get_config()["store"]
+        self.path = path or store_config.get("path") or ":memory:"
+        self.batch_size = batch_size or store_config.get("batch_size", 64)
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Calls come from the event loop and from worker threads.
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        self._pending: List[tuple] = []
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        logger.info(f"Opened document store at {self.path}")
+
+    def put(self, document: Dict[str, Any], mode: str = "main",
+            fetched_at: Optional[float] = None) -> None:
+        """
+        Queue a scraped page for storage.
+
+        Writes are committed once ``batch_size`` pages are queued, or on
+        ``flush``, any read, and ``close``.
+
+        Args:
+            document: Scrape result with ``url`` and ``content`` (and
+                optionally ``title`` and ``metadata``)
+            mode: Extraction mode the content came from
+            fetched_at: Fetch time (default: now)
+        """
+        text = document.get("content")
+        if not document.get("url") or not isinstance(text, str):
+            return
+        with self._lock:
+            self._pending.append((
+                document["url"], mode, fetched_at or time.time(), content_hash(text),
+                document.get("title"), text, json.dumps(document.get("metadata") or {})
+            ))
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def put_many(self, documents: Sequence[Dict[str, Any]], mode: str = "main",
+                 fetched_at: Optional[float] = None) -> None:
+        """Store many scraped pages in one transaction."""
+        with self._lock:
+            batch_size, self.batch_size = self.batch_size, float("inf")
+            try:
+                for document in documents:
+                    self.put(document, mode, fetched_at)
+            finally:
+                self.batch_size = batch_size
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Commit queued writes in a single transaction.
+
+        Pages whose content hash is unchanged only get their fetch time
+        refreshed, so the full-text index is not rewritten for them.
+
+        Returns:
+            Number of pages written
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return 0
+            with self._conn:
+                touched = self._conn.executemany(
+                    "UPDATE documents SET fetched_at = ? "
+                    "WHERE url = ? AND mode = ? AND content_hash = ?",
+                    [(row[2], row[0], row[1], row[3]) for row in pending]
+                )
+                self._conn.executemany(
+                    "INSERT INTO documents (url, mode, fetched_at, content_hash, title, text, metadata) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (url, mode) DO UPDATE SET fetched_at = excluded.fetched_at, "
+                    "content_hash = excluded.content_hash, title = excluded.title, "
+                    "text = excluded.text, metadata = excluded.metadata "
+                    "WHERE documents.content_hash != excluded.content_hash",
+                    pending
+                )
+            logger.debug(f"Committed {len(pending)} documents ({touched.rowcount} unchanged)")
+            return len(pending)
+
+    @staticmethod
+    def _row_to_document(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "url": row["url"],
+            "title": row["title"],
+            "content": row["text"],
+            "metadata": json.loads(row["metadata"] or "{}"),
+            "fetched_at": row["fetched_at"],
+            "content_hash": row["content_hash"]
+        }
+
+    def get(self, url: str, mode: str = "main",
+            max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get a stored page.
+
+        Args:
+            url: The page URL
+            mode: Extraction mode
+            max_age: Ignore copies fetched more than this many seconds ago
+
+        Returns:
+            The page as a scrape result with ``fetched_at`` and
+            ``content_hash``, or None if there is no fresh enough copy
+        """
+        with self._lock:
+            self.flush()
+            row = self._conn.execute(
+                "SELECT * FROM documents WHERE url = ? AND mode = ?", (url, mode)
+            ).fetchone()
+        if row is None or (max_age is not None and time.time() - row["fetched_at"] > max_age):
+            return None
+        return self._row_to_document(row)
+
+    def needs_refresh(self, url: str, max_age: float, mode: str = "main") -> bool:
+        """Whether a URL is missing from the store or older than ``max_age`` seconds."""
+        return self.get(url, mode, max_age) is None
+
+    def stale_urls(self, max_age: float, limit: Optional[int] = None) -> List[str]:
+        """
+        URLs whose newest copy is older than ``max_age`` seconds, oldest first.
+
+        Useful for incremental recrawls.
+        """
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(
+                "SELECT url, MAX(fetched_at) AS fetched_at FROM documents GROUP BY url "
+                "HAVING fetched_at < ? ORDER BY fetched_at LIMIT ?",
+                (time.time() - max_age, -1 if limit is None else limit)
+            ).fetchall()
+        return [row["url"] for row in rows]
+
+    def search(self, query: str, limit: int = 10, max_age: Optional[float] = None,
+               mode: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Full-text search over stored pages.
+
+        Args:
+            query: Free-text query (any term may match; BM25-ranked)
+            limit: Maximum number of pages
+            max_age: Only pages fetched within this many seconds
+            mode: Only pages stored in this extraction mode
+
+        Returns:
+            Matching pages, best first, each with a ``snippet``, ``score``
+            and ``coverage`` (fraction of query terms on the page)
+        """
+        expression = _match_expression(query)
+        if not expression:
+            return []
+        sql = ("SELECT documents.*, bm25(documents_fts) AS score, "
+               "snippet(documents_fts, 1, '', '', ' ... ', 24) AS snippet "
+               "FROM documents_fts JOIN documents ON documents.id = documents_fts.rowid "
+               "WHERE documents_fts MATCH ?")
+        params: List[Any] = [expression]
+        if max_age is not None:
+            sql += " AND documents.fetched_at >= ?"
+            params.append(time.time() - max_age)
+        if mode is not None:
+            sql += " AND documents.mode = ?"
+            params.append(mode)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(sql, params).fetchall()
+        terms = set(tokenize(query))
+        results = []
+        for row in rows:
+            document = self._row_to_document(row)
+            # FTS5 bm25() is lower-is-better; flip it so higher is better.
+            document["score"] = -row["score"]
+            document["snippet"] = row["snippet"]
+            words = set(tokenize(f"{row['title'] or ''} {row['text']}"))
+            document["coverage"] = len(terms & words) / len(terms)
+            results.append(document)
+        return results
+
+    def delete(self, url: str) -> int:
+        """Delete every stored copy of a URL and return how many were removed."""
+        with self._lock:
+            self.flush()
+            with self._conn:
+                return self._conn.execute("DELETE FROM documents WHERE url = ?", (url,)).rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.flush()
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self) -> None:
+        """Commit queued writes and close the database."""
+        with self._lock:
+            if self._conn is None:
+                return
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+_store = None
+
+def get_document_store() -> Optional[DocumentStore]:
+    """
+    The shared document store, if a store path is configured.
+
+    Returns:
+        The singleton store, or None when ``store.path`` is not set
+    """
+    global _store
+    if _store is None and get_config()["store"].get("path"):
+        _store = DocumentStore()
+    return _store
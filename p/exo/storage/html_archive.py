@@ -0,0 +1,323 @@
+"""
+Zstandard-compressed archive of raw page HTML.
+
+Pages from the same site share most of their markup (headers, navigation,
+footers, scripts), so each domain gets its own trained zstd dictionary
+once enough of its pages have been archived. Compressed pages are
+appended to a single blob file, and an append-only JSON-lines index
+records each page's offset, sizes and dictionary for random access.
+
+Layout of an archive directory::
+
+    pages.zst      concatenated zstd frames
+    index.jsonl    one record per archived page
+    dicts/         trained dictionaries, one file per dictionary id
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+
+import zstandard
+
+from ..core.config import get_config
+from ..scraper.crawler.urls import url_host
+
+logger = logging.getLogger(__name__)
+
+BLOBS_FILE = "pages.zst"
+INDEX_FILE = "index.jsonl"
+DICTS_DIR = "dicts"
+
+class HtmlArchive:
+    """
+    Append-only archive of compressed HTML with per-domain dictionaries.
+    """
+
+    def __init__(self, path: Optional[str] = None, level: Optional[int] = None,
+                 dict_size: Optional[int] = None, train_after: Optional[int] = None,
+                 sample_bytes: Optional[int] = None, sample_domains: Optional[int] = None):
+        """
+        Open (or create) an archive.
+
+        Args:
+            path: Archive directory (default: from config)
+            level: zstd compression level (default: from config)
+            dict_size: Size of trained dictionaries in bytes (default: from config)
+            train_after: Pages of a domain archived before its dictionary is
+                trained (default: from config)
+            sample_bytes: Training sample bytes buffered per domain; longer
+                pages are sampled from their start (default: from config)
+            sample_domains: Domains buffering samples at once; the least
+                recently archived one loses its samples (default: from config)
+        """
+        archive_config = get_config()["archive"]
+        self.path = path or archive_config.get("path")
+        if not self.path:
+            raise ValueError("HtmlArchive needs a path (or archive.path in config)")
+        self.level = level or archive_config.get("level", 3)
+        self.dict_size = dict_size or archive_config.get("dict_size", 112640)
+        self.train_after = train_after or archive_config.get("train_after", 50)
+        self.sample_bytes = sample_bytes or archive_config.get("sample_bytes", 2097152)
+        self.sample_domains = sample_domains or archive_config.get("sample_domains", 32)
+
+        os.makedirs(os.path.join(self.path, DICTS_DIR), exist_ok=True)
+        self._lock = threading.RLock()
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._domain_dicts: Dict[str, int] = {}
+        self._dicts: Dict[int, zstandard.ZstdCompressionDict] = {}
+        self._compressors: Dict[int, zstandard.ZstdCompressor] = {}
+        self._decompressors: Dict[int, zstandard.ZstdDecompressor] = {}
+        # domain -> sample pages, least recently archived domain first
+        self._samples: "OrderedDict[str, List[bytes]]" = OrderedDict()
+        self._training: Dict[str, threading.Thread] = {}
+        self._load()
+        self._blobs = open(os.path.join(self.path, BLOBS_FILE), "a+b")
+        self._index = open(os.path.join(self.path, INDEX_FILE), "a", encoding="utf-8")
+
+    def _load(self) -> None:
+        dicts_dir = os.path.join(self.path, DICTS_DIR)
+        for name in os.listdir(dicts_dir):
+            dict_id, _, domain = name.partition("-")
+            with open(os.path.join(dicts_dir, name), "rb") as f:
+                self._dicts[int(dict_id)] = zstandard.ZstdCompressionDict(f.read())
+            self._domain_dicts[domain[:-len(".zdict")]] = int(dict_id)
+
+        index_path = os.path.join(self.path, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self._records[record["url"]] = record
+        if self._records:
+            logger.info(f"Opened HTML archive with {len(self._records)} pages at {self.path}")
+
+    def _compressor(self, dict_id: int) -> zstandard.ZstdCompressor:
+        compressor = self._compressors.get(dict_id)
+        if compressor is None:
+            compressor = zstandard.ZstdCompressor(level=self.level,
+                                                  dict_data=self._dicts.get(dict_id))
+            self._compressors[dict_id] = compressor
+        return compressor
+
+    def _decompressor(self, dict_id: int) -> zstandard.ZstdDecompressor:
+        decompressor = self._decompressors.get(dict_id)
+        if decompressor is None:
+            decompressor = zstandard.ZstdDecompressor(dict_data=self._dicts.get(dict_id))
+            self._decompressors[dict_id] = decompressor
+        return decompressor
+
+    def train_dictionary(self, domain: str, samples: Optional[List[bytes]] = None) -> Optional[int]:
+        """
+        Train a zstd dictionary for a domain from sample pages.
+
+        Pages archived afterwards use the new dictionary; earlier pages keep
+        the dictionary they were written with. Training takes a while on
+        large samples and does not hold the archive lock, so pages can keep
+        being added (without a dictionary) in the meantime.
+
+        Args:
+            domain: The domain (host) the dictionary is for
+            samples: Raw pages to train on (default: the buffered samples)
+
+        Returns:
+            The new dictionary id, or None if training failed (too little data)
+        """
+        if samples is None:
+            with self._lock:
+                samples = self._samples.pop(domain, [])
+        if not samples:
+            return None
+        try:
+            trained = zstandard.train_dictionary(self.dict_size, samples, level=self.level)
+        except zstandard.ZstdError as e:
+            logger.debug(f"Could not train a dictionary for {domain}: {e}")
+            return None
+        with self._lock:
+            dict_id = max(self._dicts, default=0) + 1
+            with open(os.path.join(self.path, DICTS_DIR, f"{dict_id}-{domain}.zdict"), "wb") as f:
+                f.write(trained.as_bytes())
+            self._dicts[dict_id] = trained
+            self._domain_dicts[domain] = dict_id
+            logger.info(f"Trained {len(trained.as_bytes())}-byte dictionary for {domain} "
+                        f"from {len(samples)} pages")
+            return dict_id
+
+    def add(self, url: str, html: str, fetched_at: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Compress and append a page.
+
+        Args:
+            url: The page URL (a newer copy replaces the older one in the index)
+            html: Raw page HTML
+            fetched_at: Fetch time (default: now)
+
+        Returns:
+            The index record of the page
+        """
+        raw = html.encode("utf-8")
+        domain = url_host(url)
+        with self._lock:
+            dict_id = self._domain_dicts.get(domain, 0)
+            blob = self._compressor(dict_id).compress(raw)
+            self._blobs.seek(0, os.SEEK_END)
+            offset = self._blobs.tell()
+            self._blobs.write(blob)
+            record = {
+                "url": url,
+                "offset": offset,
+                "size": len(blob),
+                "raw_size": len(raw),
+                "dict": dict_id,
+                "fetched_at": fetched_at or time.time()
+            }
+            self._index.write(json.dumps(record) + "\n")
+            self._records[url] = record
+
+            if not dict_id and domain not in self._training:
+                samples = self._samples.setdefault(domain, [])
+                self._samples.move_to_end(domain)
+                samples.append(raw[:max(1, self.sample_bytes // self.train_after)])
+                while len(self._samples) > self.sample_domains:
+                    dropped, _ = self._samples.popitem(last=False)
+                    logger.debug(f"Dropped dictionary samples of {dropped}")
+                if len(samples) >= self.train_after:
+                    # Train in the background; this domain's pages keep using
+                    # no dictionary until the new one is registered.
+                    thread = threading.Thread(target=self._train_in_background,
+                                              args=(domain, self._samples.pop(domain)),
+                                              name=f"zstd-train-{domain}", daemon=True)
+                    self._training[domain] = thread
+                    thread.start()
+        return record
+
+    def _train_in_background(self, domain: str, samples: List[bytes]) -> None:
+        try:
+            self.train_dictionary(domain, samples)
+        except Exception as e:
+            logger.warning(f"Dictionary training for {domain} failed: {e}")
+        finally:
+            with self._lock:
+                self._training.pop(domain, None)
+
+    def wait_for_training(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for dictionaries being trained in the background.
+
+        Args:
+            timeout: Maximum seconds to wait per dictionary (default: no limit)
+        """
+        with self._lock:
+            threads = list(self._training.values())
+        for thread in threads:
+            thread.join(timeout)
+
+    def flush(self) -> None:
+        """Flush buffered writes to disk."""
+        with self._lock:
+            self._blobs.flush()
+            self._index.flush()
+
+    def _read(self, record: Dict[str, Any]) -> str:
+        with self._lock:
+            self._blobs.flush()
+            self._blobs.seek(record["offset"])
+            blob = self._blobs.read(record["size"])
+        raw = self._decompressor(record["dict"]).decompress(blob, max_output_size=record["raw_size"])
+        return raw.decode("utf-8")
+
+    def get(self, url: str) -> Optional[str]:
+        """
+        Read the latest archived HTML of a URL.
+
+        Returns:
+            The HTML, or None if the URL isn't archived
+        """
+        record = self._records.get(url)
+        return self._read(record) if record is not None else None
+
+    def record(self, url: str) -> Optional[Dict[str, Any]]:
+        """The index record (offset, sizes, dictionary, fetch time) of a URL."""
+        return self._records.get(url)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def iter_pages(self, domain: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+        """
+        Stream archived pages in file order, one decompressed page at a time.
+
+        Args:
+            domain: Only pages from this host
+
+        Yields:
+            ``(url, html)`` for the latest copy of each URL
+        """
+        self.flush()
+        records = sorted(self._records.values(), key=lambda record: record["offset"])
+        with open(os.path.join(self.path, BLOBS_FILE), "rb") as blobs:
+            for record in records:
+                if domain is not None and url_host(record["url"]) != domain:
+                    continue
+                blobs.seek(record["offset"])
+                raw = self._decompressor(record["dict"]).decompress(
+                    blobs.read(record["size"]), max_output_size=record["raw_size"])
+                yield record["url"], raw.decode("utf-8")
+
+    def reextract(self, extractor: Callable[[str, str], Any],
+                  domain: Optional[str] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Re-run an extractor over archived pages without refetching them.
+
+        Args:
+            extractor: Called as ``extractor(html, url)``, e.g.
+                ``extract_main_content``
+            domain: Only pages from this host
+
+        Yields:
+            ``(url, extractor result)`` in file order
+        """
+        for url, html in self.iter_pages(domain):
+            yield url, extractor(html, url)
+
+    def stats(self) -> Dict[str, Any]:
+        """Page count, raw and compressed bytes and the compression ratio."""
+        raw = sum(record["raw_size"] for record in self._records.values())
+        compressed = sum(record["size"] for record in self._records.values())
+        return {
+            "pages": len(self._records),
+            "raw_bytes": raw,
+            "compressed_bytes": compressed,
+            "ratio": raw / compressed if compressed else 0.0,
+            "dictionaries": len(self._dicts)
+        }
+
+    def close(self) -> None:
+        """Finish background training, then flush and close the archive files."""
+        self.wait_for_training()
+        with self._lock:
+            if self._blobs.closed:
+                return
+            self._blobs.close()
+            self._index.close()
+
+_archive = None
+
+def get_html_archive() -> Optional[HtmlArchive]:
+    """
+    The shared HTML archive, if an archive path is configured.
+
+    Returns:
+        The singleton archive, or None when ``archive.path`` is not set
+    """
+    global _archive
+    if _archive is None and get_config()["archive"].get("path"):
+        _archive = HtmlArchive()
+    return _archive
@@ -0,0 +1,459 @@
+"""
+Local vector index for embedded page chunks.
+
+Vectors are L2-normalized on insert and stored in one contiguous
+float32 or float16 matrix, so cosine similarity is a single matrix-vector
+product. Large indexes can be trained into an IVF (inverted file) layout:
+vectors are clustered with spherical k-means and a query only scans the
+clusters whose centroids are closest to it.
+
+Each row carries a URL, its domain and a timestamp for filtering, plus an
+optional JSON payload (e.g. the chunk text). Deletes are tombstones until
+``compact()``. With a ``path`` the matrix is a memory-mapped file and the
+row metadata is written next to it by ``save()``.
+"""
+import json
+import logging
+import os
+import time
+from typing import Dict, Any, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from ..core.config import get_config
+from ..scraper.crawler.urls import url_host
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = "vectors.bin"
+ARRAYS_FILE = "rows.npz"
+META_FILE = "meta.json"
+
+# Rows scored per block when the matrix needs converting (float16, memmap)
+SEARCH_BLOCK_ROWS = 8192
+
+class VectorIndex:
+    """
+    Cosine-similarity index over a contiguous matrix with optional IVF search.
+    """
+
+    def __init__(self, dim: int, dtype: str = "float32", path: Optional[str] = None,
+                 capacity: int = 1024, ivf_threshold: Optional[int] = None,
+                 nlist: Optional[int] = None, nprobe: Optional[int] = None):
+        """
+        Initialize an empty index, or open the one stored at ``path``.
+
+        Args:
+            dim: Vector dimension
+            dtype: Storage type, ``"float32"`` or ``"float16"``
+            path: Directory for the memory-mapped matrix and metadata
+                (default: in memory only)
+            capacity: Initial number of rows allocated
+            ivf_threshold: Live rows at which the IVF layout is trained
+                automatically (default: from config)
+            nlist: Number of IVF clusters (default: about sqrt(rows))
+            nprobe: Clusters scanned per approximate query (default: from config)
+        """
+        if dtype not in ("float32", "float16"):
+            raise ValueError("dtype must be float32 or float16")
+        index_config = get_config()["index"]
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self.path = path
+        self.ivf_threshold = ivf_threshold or index_config.get("ivf_threshold", 50000)
+        self.nlist = nlist or index_config.get("nlist")
+        self.nprobe = nprobe or index_config.get("nprobe", 16)
+
+        self.count = 0
+        self.next_id = 0
+        self._urls: List[str] = []
+        self._url_codes: Dict[str, int] = {}
+        self._domains: List[str] = []
+        self._domain_codes: Dict[str, int] = {}
+        self._payloads: List[Optional[Dict[str, Any]]] = []
+        self._id_rows: Dict[int, int] = {}
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []
+        self._pending: List[List[int]] = []
+
+        if path and os.path.exists(os.path.join(path, META_FILE)):
+            self._load()
+        else:
+            if path:
+                os.makedirs(path, exist_ok=True)
+            self._allocate(max(1, capacity))
+
+    # Storage
+
+    def _allocate(self, capacity: int) -> None:
+        """Allocate (or grow to) ``capacity`` rows, keeping existing rows."""
+        old = getattr(self, "vectors", None)
+        if self.path:
+            if isinstance(old, np.memmap):
+                old.flush()
+            file_path = os.path.join(self.path, VECTORS_FILE)
+            with open(file_path, "ab") as f:
+                f.truncate(capacity * self.dim * self.dtype.itemsize)
+            self.vectors = np.memmap(file_path, dtype=self.dtype, mode="r+",
+                                     shape=(capacity, self.dim))
+        else:
+            self.vectors = np.zeros((capacity, self.dim), dtype=self.dtype)
+            if old is not None:
+                self.vectors[:self.count] = old[:self.count]
+
+        def grow(name: str, dtype, fill) -> None:
+            array = np.full(capacity, fill, dtype=dtype)
+            current = getattr(self, name, None)
+            if current is not None:
+                array[:self.count] = current[:self.count]
+            setattr(self, name, array)
+
+        grow("ids", np.int64, -1)
+        grow("alive", np.bool_, False)
+        grow("timestamps", np.float64, 0.0)
+        grow("url_codes", np.int32, -1)
+        grow("domain_codes", np.int32, -1)
+        grow("assignments", np.int32, -1)
+
+    @property
+    def capacity(self) -> int:
+        return self.vectors.shape[0]
+
+    def __len__(self) -> int:
+        """Number of live (not deleted) vectors."""
+        return len(self._id_rows)
+
+    @staticmethod
+    def _code(value: str, values: List[str], codes: Dict[str, int]) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = len(values)
+            values.append(value)
+            codes[value] = code
+        return code
+
+    # Mutation
+
+    def add(self, vectors: np.ndarray, urls: Sequence[str],
+            timestamps: Optional[Sequence[float]] = None,
+            payloads: Optional[Sequence[Optional[Dict[str, Any]]]] = None) -> np.ndarray:
+        """
+        Add vectors with their URLs.
+
+        Args:
+            vectors: Array of shape ``(n, dim)``
+            urls: URL of each vector
+            timestamps: Fetch time of each vector (default: now)
+            payloads: JSON-serializable data stored with each vector
+
+        Returns:
+            The ids assigned to the new vectors
+        """
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        n = vectors.shape[0]
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dimension {self.dim}, got {vectors.shape[1]}")
+        if len(urls) != n:
+            raise ValueError("Need one URL per vector")
+
+        if self.count + n > self.capacity:
+            self._allocate(max(self.count + n, self.capacity * 2))
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.maximum(norms, 1e-12)
+        rows = np.arange(self.count, self.count + n)
+        ids = np.arange(self.next_id, self.next_id + n, dtype=np.int64)
+
+        self.vectors[rows] = vectors.astype(self.dtype)
+        self.ids[rows] = ids
+        self.alive[rows] = True
+        self.timestamps[rows] = time.time() if timestamps is None else np.asarray(timestamps, dtype=np.float64)
+        self.url_codes[rows] = [self._code(url, self._urls, self._url_codes) for url in urls]
+        self.domain_codes[rows] = [self._code(url_host(url), self._domains, self._domain_codes)
+                                   for url in urls]
+        self._payloads.extend(payloads if payloads is not None else [None] * n)
+        self._id_rows.update(zip(ids.tolist(), rows.tolist()))
+
+        if self.centroids is not None:
+            assignments = self._assign(vectors)
+            self.assignments[rows] = assignments
+            for row, cluster in zip(rows.tolist(), assignments.tolist()):
+                self._pending[cluster].append(row)
+
+        self.count += n
+        self.next_id += n
+        if self.centroids is None and len(self) >= self.ivf_threshold:
+            self.train()
+        return ids
+
+    def delete(self, ids: Iterable[int]) -> int:
+        """
+        Delete vectors by id.
+
+        Returns:
+            Number of vectors deleted
+        """
+        deleted = 0
+        for vector_id in ids:
+            row = self._id_rows.pop(int(vector_id), None)
+            if row is not None:
+                self.alive[row] = False
+                self._payloads[row] = None
+                deleted += 1
+        return deleted
+
+    def delete_url(self, url: str) -> int:
+        """
+        Delete every vector of a URL (e.g. before re-indexing the page).
+
+        Returns:
+            Number of vectors deleted
+        """
+        code = self._url_codes.get(url)
+        if code is None:
+            return 0
+        rows = np.flatnonzero(self.alive[:self.count] & (self.url_codes[:self.count] == code))
+        return self.delete(self.ids[rows].tolist())
+
+    def compact(self) -> None:
+        """Drop deleted rows and rebuild the IVF lists."""
+        keep = np.flatnonzero(self.alive[:self.count])
+        if keep.size == self.count:
+            return
+        n = keep.size
+        self.vectors[:n] = self.vectors[keep]
+        for name in ("ids", "alive", "timestamps", "url_codes", "domain_codes", "assignments"):
+            array = getattr(self, name)
+            array[:n] = array[keep]
+            array[n:self.count] = -1 if array.dtype.kind == "i" else 0
+        self._payloads = [self._payloads[row] for row in keep.tolist()]
+        self.count = n
+        self._id_rows = dict(zip(self.ids[:n].tolist(), range(n)))
+        if self.centroids is not None:
+            self._build_lists()
+        logger.info(f"Compacted vector index to {n} rows")
+
+    # IVF
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        """Nearest centroid of each (normalized) vector."""
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def _build_lists(self) -> None:
+        live = np.flatnonzero(self.alive[:self.count])
+        order = live[np.argsort(self.assignments[live], kind="stable")]
+        bounds = np.searchsorted(self.assignments[order], np.arange(len(self.centroids) + 1))
+        self._lists = [order[bounds[c]:bounds[c + 1]] for c in range(len(self.centroids))]
+        self._pending = [[] for _ in self.centroids]
+
+    def train(self, nlist: Optional[int] = None, iterations: int = 10,
+              sample_size: int = 100_000, seed: int = 0) -> None:
+        """
+        Cluster the vectors with spherical k-means and build the IVF lists.
+
+        Args:
+            nlist: Number of clusters (default: ``nlist`` or about sqrt(rows))
+            iterations: k-means iterations
+            sample_size: Maximum rows used to fit the centroids
+            seed: Random seed
+        """
+        live = np.flatnonzero(self.alive[:self.count])
+        if live.size == 0:
+            return
+        nlist = min(nlist or self.nlist or int(np.sqrt(live.size)), live.size)
+        rng = np.random.default_rng(seed)
+        sample = self.vectors[np.sort(rng.choice(live, min(sample_size, live.size), replace=False))]
+        sample = np.asarray(sample, dtype=np.float32)
+
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            empty = norms[:, 0] == 0
+            # Re-seed empty clusters from random sample rows.
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+        self.centroids = centroids
+
+        for start in range(0, self.count, SEARCH_BLOCK_ROWS):
+            block = np.asarray(self.vectors[start:start + SEARCH_BLOCK_ROWS], dtype=np.float32)
+            self.assignments[start:start + len(block)] = self._assign(block)
+        self._build_lists()
+        logger.info(f"Trained IVF layout with {nlist} clusters over {live.size} vectors")
+
+    def _ivf_rows(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """Rows in the ``nprobe`` clusters closest to the query."""
+        scores = self.centroids @ query
+        probe = np.argpartition(-scores, min(nprobe, len(scores)) - 1)[:nprobe]
+        rows = []
+        for cluster in probe.tolist():
+            if self._pending[cluster]:
+                self._lists[cluster] = np.concatenate(
+                    [self._lists[cluster], np.array(self._pending[cluster], dtype=np.int64)])
+                self._pending[cluster] = []
+            rows.append(self._lists[cluster])
+        return np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+
+    # Search
+
+    def _filter_mask(self, rows: Optional[np.ndarray], urls, domains, since, until) -> np.ndarray:
+        """Which of the given rows (or all rows) are live and match the filters."""
+        select = slice(0, self.count) if rows is None else rows
+        mask = self.alive[select].copy()
+        if urls is not None:
+            codes = [self._url_codes[url] for url in urls if url in self._url_codes]
+            mask &= np.isin(self.url_codes[select], codes)
+        if domains is not None:
+            codes = [self._domain_codes[d.lower()] for d in domains if d.lower() in self._domain_codes]
+            mask &= np.isin(self.domain_codes[select], codes)
+        if since is not None:
+            mask &= self.timestamps[select] >= since
+        if until is not None:
+            mask &= self.timestamps[select] <= until
+        return mask
+
+    def _scores(self, query: np.ndarray, rows: Optional[np.ndarray]) -> np.ndarray:
+        if rows is not None:
+            return np.asarray(self.vectors[rows], dtype=np.float32) @ query
+        if self.dtype == np.float32 and not isinstance(self.vectors, np.memmap):
+            return self.vectors[:self.count] @ query
+        scores = np.empty(self.count, dtype=np.float32)
+        for start in range(0, self.count, SEARCH_BLOCK_ROWS):
+            block = np.asarray(self.vectors[start:min(start + SEARCH_BLOCK_ROWS, self.count)],
+                               dtype=np.float32)
+            scores[start:start + len(block)] = block @ query
+        return scores
+
+    def search(self, query: np.ndarray, k: int = 10, urls: Optional[Sequence[str]] = None,
+               domains: Optional[Sequence[str]] = None, since: Optional[float] = None,
+               until: Optional[float] = None, exact: Optional[bool] = None,
+               nprobe: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Find the vectors most similar to a query.
+
+        Args:
+            query: Query vector of shape ``(dim,)``
+            k: Number of results
+            urls: Only vectors of these URLs
+            domains: Only vectors from these hosts
+            since: Only vectors timestamped at or after this time
+            until: Only vectors timestamped at or before this time
+            exact: Force exact (True) or IVF (False) search (default: IVF
+                once trained)
+            nprobe: Clusters scanned in IVF search (default: ``nprobe``)
+
+        Returns:
+            Matches as dictionaries with ``id``, ``score`` (cosine
+            similarity), ``url``, ``timestamp`` and ``payload``, best first
+        """
+        if self.count == 0 or k <= 0:
+            return []
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+        use_ivf = self.centroids is not None and not exact
+        rows = self._ivf_rows(query, nprobe or self.nprobe) if use_ivf else None
+        mask = self._filter_mask(rows, urls, domains, since, until)
+        if rows is not None:
+            rows = rows[mask]
+            scores = self._scores(query, rows)
+        else:
+            candidates = np.flatnonzero(mask)
+            # Narrow filters: score only the matching rows.
+            if candidates.size < self.count // 4:
+                rows = candidates
+                scores = self._scores(query, rows)
+            else:
+                scores = np.where(mask, self._scores(query, None), -np.inf)
+
+        if scores.size == 0:
+            return []
+        k = min(k, scores.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        results = []
+        for position in top.tolist():
+            if not np.isfinite(scores[position]):
+                break
+            row = int(rows[position]) if rows is not None else position
+            results.append({
+                "id": int(self.ids[row]),
+                "score": float(scores[position]),
+                "url": self._urls[self.url_codes[row]],
+                "timestamp": float(self.timestamps[row]),
+                "payload": self._payloads[row]
+            })
+        return results
+
+    def latest(self, url: str) -> Optional[float]:
+        """Most recent timestamp of a URL's vectors, or None if it isn't indexed."""
+        code = self._url_codes.get(url)
+        if code is None:
+            return None
+        mask = self.alive[:self.count] & (self.url_codes[:self.count] == code)
+        return float(self.timestamps[:self.count][mask].max()) if mask.any() else None
+
+    # Persistence
+
+    def save(self) -> None:
+        """
+        Flush the matrix and write the row metadata next to it.
+
+        Raises:
+            ValueError: If the index has no ``path``
+        """
+        if not self.path:
+            raise ValueError("VectorIndex has no path to save to")
+        self.vectors.flush()
+        n = self.count
+        arrays = {name: getattr(self, name)[:n] for name in
+                  ("ids", "alive", "timestamps", "url_codes", "domain_codes", "assignments")}
+        if self.centroids is not None:
+            arrays["centroids"] = self.centroids
+        tmp_path = os.path.join(self.path, f"{ARRAYS_FILE}.tmp.npz")
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, os.path.join(self.path, ARRAYS_FILE))
+
+        meta = {
+            "dim": self.dim,
+            "dtype": self.dtype.name,
+            "count": n,
+            "capacity": self.capacity,
+            "next_id": self.next_id,
+            "urls": self._urls,
+            "domains": self._domains,
+            "payloads": self._payloads
+        }
+        tmp_path = os.path.join(self.path, f"{META_FILE}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(self.path, META_FILE))
+        logger.debug(f"Saved vector index with {len(self)} vectors to {self.path}")
+
+    def _load(self) -> None:
+        with open(os.path.join(self.path, META_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta["dim"] != self.dim or meta["dtype"] != self.dtype.name:
+            raise ValueError(f"Index at {self.path} stores {meta['dtype']} vectors of dimension {meta['dim']}")
+        self.count = 0
+        self._allocate(meta["capacity"])
+        self.count = meta["count"]
+        self.next_id = meta["next_id"]
+        self._urls = meta["urls"]
+        self._url_codes = {url: code for code, url in enumerate(self._urls)}
+        self._domains = meta["domains"]
+        self._domain_codes = {domain: code for code, domain in enumerate(self._domains)}
+        self._payloads = meta["payloads"]
+
+        with np.load(os.path.join(self.path, ARRAYS_FILE)) as arrays:
+            for name in ("ids", "alive", "timestamps", "url_codes", "domain_codes", "assignments"):
+                getattr(self, name)[:self.count] = arrays[name]
+            if "centroids" in arrays.files:
+                self.centroids = arrays["centroids"]
+        live = np.flatnonzero(self.alive[:self.count])
+        self._id_rows = dict(zip(self.ids[live].tolist(), live.tolist()))
+        if self.centroids is not None:
+            self._build_lists()
+        logger.info(f"Opened vector index with {len(self)} vectors from {self.path}")
@@ -3,14 +3,26 @@ Simple web scraper implementation that extracts text content from a webpage.
 """
 from typing import Dict, Any
 from .web_scraper import WebScraper
+from ..scraper.readiness import wait_until_ready
+from ..scraper.readability import extract_main_content
+from ..scraper.snapshot import extract_snapshot_text
 
 class SimpleScraper(WebScraper):
     """A simple web scraper that extracts text content from a webpage."""
     
     async def _scrape(self, **kwargs) -> str:
         """Extract text content from the webpage."""
-        # Wait for the page to load
-        await self.page.wait_for_load_state("networkidle")
+        # Wait for the page to settle (networkidle never fires on polling pages)
+        await wait_until_ready(self.page, selector=kwargs.get('wait_for'))
+        
+        # Optionally keep only the main article text
+        if kwargs.get('main_content'):
+            html = await self.page.content()
+            return extract_main_content(html, self.page.url)["text"]
+        
+        # Visible text from one CDP snapshot; much faster on heavy pages
+        if kwargs.get('snapshot'):
+            return (await extract_snapshot_text(self.page))["text"]
         
         # Get all text content
         content = await self.page.evaluate("""
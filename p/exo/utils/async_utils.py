@@ -2,47 +2,394 @@
 Async utility functions.
 """
 import asyncio
-from typing import Any, Callable, List
+import itertools
+import logging
+import random
+import time
+from typing import (
+    Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+)
 from functools import wraps
 
+import httpx
+
+from ..core.config import get_config
+from ..core.exceptions import DeadlineExceeded, HttpStatusError
+from .deadline import remaining
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying: timeouts, rate limits and temporary server failures
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# Chromium network errors that are usually transient
+TRANSIENT_NET_ERRORS = (
+    "net::ERR_CONNECTION_RESET", "net::ERR_CONNECTION_CLOSED", "net::ERR_CONNECTION_REFUSED",
+    "net::ERR_CONNECTION_TIMED_OUT", "net::ERR_TIMED_OUT", "net::ERR_EMPTY_RESPONSE",
+    "net::ERR_NETWORK_CHANGED", "net::ERR_INTERNET_DISCONNECTED",
+)
+
+def _classify(error: BaseException) -> Optional[bool]:
+    """Whether a single exception is transient, or None if it says nothing either way."""
+    if isinstance(error, DeadlineExceeded):
+        return False
+    if isinstance(error, HttpStatusError):
+        return error.status in RETRY_STATUSES
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRY_STATUSES
+    if isinstance(error, (httpx.TimeoutException, httpx.TransportError)):
+        return True
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    # SDK errors (OpenAI, Playwright, ...) without importing the SDKs
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status in RETRY_STATUSES
+    name = type(error).__name__
+    if "Timeout" in name or name in ("APIConnectionError", "RateLimitError", "InternalServerError"):
+        return True
+    if any(marker in str(error) for marker in TRANSIENT_NET_ERRORS):
+        return True
+    return None
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether an error is worth retrying.
+
+    Timeouts, connection failures, rate limits and 5xx responses are;
+    programming errors (``ValueError``, ``KeyError``, ...) and exo errors
+    that aren't caused by one of the former (bad configuration, parse
+    failures, robots.txt refusals) are not. Errors raised ``from``
+    another are judged by their cause.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        verdict = _classify(error)
+        if verdict is not None:
+            return verdict
+        error = error.__cause__
+    return False
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of calls, across everything sharing it.
+
+    Every call deposits ``ratio`` of a retry and every retry spends one,
+    with up to ``min_retries`` banked. When a dependency is down, callers
+    stop retrying once the budget is spent instead of multiplying the
+    load on it.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10):
+        """
+        Initialize the budget.
+
+        Args:
+            ratio: Retries allowed per call in the long run
+            min_retries: Retries available up front and the most that can be banked
+        """
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self._balance = float(min_retries)
+
+    def record_call(self) -> None:
+        """Deposit a call's share of retries."""
+        self._balance = min(self._balance + self.ratio, float(self.min_retries))
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget, if there is one."""
+        if self._balance < 1:
+            return False
+        self._balance -= 1
+        return True
+
+class RetryPolicy:
+    """
+    Retries transient failures with exponential backoff and full jitter.
+
+    Attempt ``n`` (from 1) waits a random delay between 0 and
+    ``min(max_delay, base_delay * 2 ** (n - 1))``, so tasks that failed
+    together don't retry together. Retries stop after ``max_attempts``,
+    when the next wait would pass ``max_elapsed`` seconds since the first
+    attempt or the request's deadline, when ``retry_on`` rejects the
+    error, or when the shared budget is spent.
+    """
+
+    def __init__(self, max_attempts: Optional[int] = None, base_delay: Optional[float] = None,
+                 max_delay: Optional[float] = None, max_elapsed: Optional[float] = None,
+                 retry_on: Callable[[BaseException], bool] = is_retryable,
+                 budget: Optional[RetryBudget] = None,
+                 on_attempt: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 name: str = "retry"):
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts: Attempts per call, including the first (default: from config)
+            base_delay: Backoff cap of the first retry in seconds (default: from config)
+            max_delay: Largest backoff cap in seconds (default: from config)
+            max_elapsed: Seconds after which no new attempt starts (default: from config)
+            retry_on: Predicate deciding whether an error is retried
+            budget: Retry budget shared across calls (default: a new one from config)
+            on_attempt: Called after every failed attempt with its metrics
+                (``attempt``, ``error``, ``elapsed``, ``delay``, ``retry``)
+            name: Label used in logs
+        """
+        retry_config = get_config()["retry"]
+        self.max_attempts = max_attempts or retry_config.get("max_attempts", 3)
+        self.base_delay = retry_config.get("base_delay", 0.5) if base_delay is None else base_delay
+        self.max_delay = retry_config.get("max_delay", 10.0) if max_delay is None else max_delay
+        self.max_elapsed = retry_config.get("max_elapsed", 30.0) if max_elapsed is None else max_elapsed
+        self.retry_on = retry_on
+        self.budget = budget or RetryBudget(retry_config.get("budget_ratio", 0.2),
+                                            retry_config.get("budget_min", 10))
+        self.on_attempt = on_attempt
+        self.name = name
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.failures = 0
+        self.budget_exhausted = 0
+
+    def backoff(self, attempt: int) -> float:
+        """Random delay before retrying after failed attempt ``attempt`` (from 1)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    async def call(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Await ``func(*args, **kwargs)``, retrying transient failures.
+
+        Returns:
+            The result of the first successful attempt
+
+        Raises:
+            The last error, when it isn't retried
+        """
+        self.calls += 1
+        self.budget.record_call()
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            self.attempts += 1
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                elapsed = time.monotonic() - start
+                delay = self.backoff(attempt)
+                left = remaining()
+                retry = (attempt < self.max_attempts and elapsed + delay < self.max_elapsed
+                         and (left is None or delay < left) and self.retry_on(e))
+                if retry and not self.budget.try_spend():
+                    self.budget_exhausted += 1
+                    retry = False
+                if self.on_attempt is not None:
+                    self.on_attempt({"attempt": attempt, "error": e, "elapsed": elapsed,
+                                     "delay": delay if retry else None, "retry": retry})
+                if not retry:
+                    self.failures += 1
+                    raise
+                self.retries += 1
+                logger.debug(f"{self.name}: attempt {attempt} failed ({e}); "
+                             f"retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    def __call__(self, func: Callable) -> Callable:
+        """Use the policy as a decorator."""
+        @wraps(func)
+        async def wrapper(*args, **kwargs) -> Any:
+            return await self.call(func, *args, **kwargs)
+        return wrapper
+
+    def stats(self) -> Dict[str, Any]:
+        """Calls, attempts, retries, final failures and budget refusals."""
+        return {
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "failures": self.failures,
+            "budget_exhausted": self.budget_exhausted
+        }
+
+_policies: Dict[str, RetryPolicy] = {}
+
+def get_retry_policy(name: str) -> RetryPolicy:
+    """
+    The shared retry policy for a kind of call, e.g. ``"navigation"`` or ``"provider"``.
+
+    Settings come from ``retry`` in the config, overridden by
+    ``retry[name]``; all callers of one policy share its budget.
+    """
+    policy = _policies.get(name)
+    if policy is None:
+        retry_config = get_config()["retry"]
+        overrides = retry_config.get(name) or {}
+        policy = _policies[name] = RetryPolicy(
+            max_attempts=overrides.get("max_attempts"), base_delay=overrides.get("base_delay"),
+            max_delay=overrides.get("max_delay"), max_elapsed=overrides.get("max_elapsed"),
+            budget=RetryBudget(overrides.get("budget_ratio", retry_config.get("budget_ratio", 0.2)),
+                               overrides.get("budget_min", retry_config.get("budget_min", 10))),
+            name=name
+        )
+    return policy
+
 def async_retry(max_retries: int = 3, delay: float = 1.0):
     """
     Decorator for retrying async functions.
-    
+
+    Only transient errors (see ``is_retryable``) are retried, with
+    exponential backoff and full jitter starting from ``delay``.
+
     Args:
-        max_retries: Maximum number of retry attempts
-        delay: Delay between retries in seconds
+        max_retries: Maximum number of attempts
+        delay: Backoff cap of the first retry in seconds
     """
     def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        async def wrapper(*args, **kwargs) -> Any:
-            last_exception = None
-            for attempt in range(max_retries):
-                try:
-                    return await func(*args, **kwargs)
-                except Exception as e:
-                    last_exception = e
-                    if attempt < max_retries - 1:
-                        await asyncio.sleep(delay)
-            raise last_exception
-        return wrapper
+        return RetryPolicy(max_attempts=max_retries, base_delay=delay, name=func.__name__)(func)
     return decorator
 
-async def gather_with_concurrency(n: int, *tasks: List[Callable]) -> List[Any]:
+async def _iterate(items: Iterable[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+async def stream_map(func: Callable[[Any], Awaitable[Any]],
+                     items: Union[Iterable[Any], AsyncIterable[Any]], concurrency: int = 10,
+                     ordered: bool = False, timeout: Optional[float] = None,
+                     return_exceptions: bool = False,
+                     buffer: Optional[int] = None) -> AsyncIterator[Any]:
+    """
+    Apply an async function to a stream of inputs with bounded concurrency.
+
+    ``concurrency`` workers pull inputs one at a time, so inputs are
+    only read (and coroutines only created) as workers free up. At most
+    ``buffer`` inputs are in flight or finished but not yet consumed,
+    which bounds memory even when results are consumed slowly or, in
+    input order, when an early input is slow.
+
+    Leaving the loop early cancels the work in flight; wrap the call in
+    ``contextlib.aclosing`` to have that happen as soon as the loop exits.
+
+    Args:
+        func: Coroutine function called with each input
+        items: Inputs, a sync or async iterable
+        concurrency: Number of workers
+        ordered: Yield results in input order instead of completion order
+        timeout: Seconds allowed per input (raises ``asyncio.TimeoutError``)
+        return_exceptions: Yield the exception of a failed input (including
+            a ``CancelledError`` raised by ``func``) in place of its result
+            instead of cancelling everything and raising it
+        buffer: Inputs in flight or awaiting consumption (default: twice
+            ``concurrency``)
+
+    Yields:
+        ``func`` results (or exceptions, with ``return_exceptions``)
+    """
+    if concurrency < 1:
+        raise ValueError("stream_map needs a concurrency of at least 1")
+    source = items.__aiter__() if hasattr(items, "__aiter__") else _iterate(items)
+    window = asyncio.Semaphore(buffer or 2 * concurrency)
+    source_lock = asyncio.Lock()
+    # (index, result, error); index None is a failure of the inputs themselves, and
+    # None marks a worker that ended.
+    finished: asyncio.Queue = asyncio.Queue()
+    indexes = itertools.count()
+    stopping = False
+
+    async def worker() -> None:
+        try:
+            while True:
+                await window.acquire()
+                async with source_lock:
+                    try:
+                        item = await source.__anext__()
+                    except StopAsyncIteration:
+                        window.release()
+                        return
+                    except Exception as e:
+                        finished.put_nowait((None, None, e))
+                        return
+                    index = next(indexes)
+                try:
+                    result = await (func(item) if timeout is None
+                                    else asyncio.wait_for(func(item), timeout))
+                except asyncio.CancelledError as e:
+                    if asyncio.current_task().cancelling():
+                        raise
+                    # Raised inside func, the worker wasn't cancelled: a failed
+                    # input like any other
+                    finished.put_nowait((index, None, e))
+                except BaseException as e:
+                    finished.put_nowait((index, None, e))
+                    if not isinstance(e, Exception):
+                        raise
+                else:
+                    finished.put_nowait((index, result, None))
+        except asyncio.CancelledError as e:
+            if not stopping:
+                # Cancelled from outside (e.g. at shutdown), not by the
+                # consumer: stop the whole map instead of finishing short
+                finished.put_nowait((None, None, e))
+            raise
+        finally:
+            # However the worker ended, don't leave the consumer waiting for it
+            finished.put_nowait(None)
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    waiting: Dict[int, Any] = {}
+    next_index = 0
+    running = concurrency
+    try:
+        while running:
+            message = await finished.get()
+            if message is None:
+                running -= 1
+                continue
+            index, result, error = message
+            if error is not None and (index is None or not return_exceptions or
+                                      not isinstance(error, (Exception, asyncio.CancelledError))):
+                raise error
+            result = error if error is not None else result
+            if not ordered:
+                window.release()
+                yield result
+                continue
+            waiting[index] = result
+            while next_index in waiting:
+                result = waiting.pop(next_index)
+                next_index += 1
+                window.release()
+                yield result
+    finally:
+        stopping = True
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+async def _await(awaitable: Awaitable[Any]) -> Any:
+    return await awaitable
+
+async def gather_with_concurrency(n: int, *tasks: Awaitable[Any]) -> List[Any]:
     """
     Run multiple tasks with a concurrency limit.
     
+    Prefer ``stream_map``, which creates coroutines lazily and streams
+    results; this collects them all.
+    
     Args:
         n: Maximum number of concurrent tasks
-        tasks: List of coroutines to run
+        tasks: Coroutines to run
         
     Returns:
-        List of results from the tasks
+        List of results from the tasks, in order
+        
+    Raises:
+        The first error; the remaining tasks are cancelled
     """
-    semaphore = asyncio.Semaphore(n)
-    
-    async def sem_task(task):
-        async with semaphore:
-            return await task
-    
-    return await asyncio.gather(*(sem_task(task) for task in tasks)) 
\ No newline at end of file
+    try:
+        return [result async for result in stream_map(_await, tasks, n, ordered=True)]
+    finally:
+        # Coroutines never started after a failure
+        for task in tasks:
+            if asyncio.iscoroutine(task):
+                task.close()
@@ -0,0 +1,118 @@
+"""
+Request-scoped deadlines.
+
+A deadline is a point on the ``time.monotonic`` clock held in a context
+variable, so it follows a request into every coroutine and task started
+under it without being passed along. Steps with a timeout of their own
+(model calls, page navigations, readiness waits, retry backoff) cap it
+with ``time_left``, and ``within`` bounds an awaitable by the deadline.
+Deadlines only tighten: a nested ``deadline`` with more time than is
+left keeps the outer one.
+"""
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Iterator, Optional
+
+from ..core.exceptions import DeadlineExceeded
+
+_deadline: ContextVar[Optional[float]] = ContextVar("exo_deadline", default=None)
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[Optional[float]]:
+    """
+    Run the enclosed code with at most ``seconds`` left.
+
+    Args:
+        seconds: Time budget (None: keep the current deadline, if any)
+
+    Yields:
+        The deadline in effect, on the ``time.monotonic`` clock
+    """
+    current = _deadline.get()
+    if seconds is not None:
+        candidate = time.monotonic() + max(0.0, seconds)
+        if current is None or candidate < current:
+            current = candidate
+    token = _deadline.set(current)
+    try:
+        yield current
+    finally:
+        _deadline.reset(token)
+
+@contextmanager
+def no_deadline() -> Iterator[None]:
+    """Run the enclosed code without the caller's deadline, e.g. work that outlives the request."""
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def remaining() -> Optional[float]:
+    """Seconds left before the deadline (never negative), or None without one."""
+    current = _deadline.get()
+    if current is None:
+        return None
+    return max(0.0, current - time.monotonic())
+
+def expired() -> bool:
+    """Whether the deadline has passed."""
+    left = remaining()
+    return left is not None and left <= 0
+
+def check(what: str = "request") -> None:
+    """
+    Raise if the deadline has passed.
+
+    Raises:
+        DeadlineExceeded: If no time is left
+    """
+    if expired():
+        raise DeadlineExceeded(f"Deadline exceeded before {what}")
+
+def time_left(timeout: Optional[float], reserve: float = 0.0) -> Optional[float]:
+    """
+    A step's timeout, capped by the time left.
+
+    Args:
+        timeout: The step's own limit in seconds (None: no limit of its own)
+        reserve: Seconds to keep back for the steps after this one
+
+    Returns:
+        The smaller of ``timeout`` and the time left minus ``reserve``
+        (never negative); ``timeout`` when there is no deadline
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    left = max(0.0, left - reserve)
+    return left if timeout is None else min(timeout, left)
+
+async def within(awaitable: Awaitable[Any], timeout: Optional[float] = None,
+                 what: str = "operation") -> Any:
+    """
+    Await something, giving up at its own timeout or the deadline.
+
+    Args:
+        awaitable: What to await (cancelled when time runs out)
+        timeout: Its own limit in seconds (None: only the deadline)
+        what: Description used in the error message
+
+    Returns:
+        The awaitable's result
+
+    Raises:
+        DeadlineExceeded: If the deadline cut it short
+        asyncio.TimeoutError: If its own timeout did
+    """
+    limit = time_left(timeout)
+    if limit is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, limit)
+    except asyncio.TimeoutError as e:
+        if timeout is None or limit < timeout:
+            raise DeadlineExceeded(f"Deadline exceeded during {what}") from e
+        raise
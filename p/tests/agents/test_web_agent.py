@@ -0,0 +1,105 @@
+"""
+Tests for the web agent's tool calls, recall and request deadline.
+"""
+import asyncio
+
+import pytest
+from exo.agents.web_agent import WebAgent
+from exo.providers.base import BaseProvider
+from exo.scraper.prefetch import Prefetcher
+from exo.scraper.tools import scraper as scraper_module
+from exo.storage.document_store import DocumentStore
+
+from ..scraper.fakes import FakeScraper
+
+PAGE = ("Zebra migration crosses the Mara river every July, and the herds follow the rains "
+        "north across the plains. ") * 3
+SEARCH = "Let me look that up.\nweb_search\nquery: zebra migration river\n"
+
+class FakeProvider(BaseProvider):
+    """Answers with scripted responses, recording the prompts; a (delay, response) pair waits first."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.prompts = []
+
+    async def initialize(self, **kwargs):
+        pass
+
+    async def generate(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        response = self.responses.pop(0)
+        if isinstance(response, tuple):
+            delay, response = response
+            await asyncio.sleep(delay)
+        return response
+
+    async def get_model_info(self):
+        return {"name": "fake"}
+
+    async def list_models(self):
+        return ["fake"]
+
+    async def close(self):
+        pass
+
+class SlowScraper(FakeScraper):
+    async def search_and_scrape(self, query, num_results=3, timeout=None, main_content=False):
+        await asyncio.sleep(5)
+
+@pytest.fixture
+def fake_scraper(monkeypatch):
+    def install(scraper):
+        monkeypatch.setattr(scraper_module, "_scraper", scraper)
+        return scraper
+    return install
+
+def ask(provider, message, timeout=None, **kwargs):
+    async def run():
+        agent = WebAgent(provider, prefetcher=Prefetcher(), **kwargs)
+        try:
+            return await agent.process_message(message, timeout=timeout), agent.prefetcher.stats()
+        finally:
+            await agent.close()
+    return asyncio.run(run())
+
+def test_search_is_answered_from_the_store(fake_scraper):
+    scraper = fake_scraper(FakeScraper())
+    store = DocumentStore(":memory:")
+    for i in range(3):
+        store.put({"url": f"https://s{i}.example/zebra", "title": "Zebras", "content": PAGE + str(i)})
+    provider = FakeProvider(SEARCH, "They cross in July.")
+    answer, _ = ask(provider, "When do zebras cross the Mara?", document_store=store)
+    assert answer == "They cross in July."
+    assert scraper.searches == []
+    assert "https://s0.example/zebra" in provider.prompts[1]
+
+def test_search_results_reach_the_answer_and_the_prefetcher(fake_scraper):
+    scraper = fake_scraper(FakeScraper([
+        {"url": "https://a.example/zebra", "title": "Zebras", "content": PAGE},
+        {"url": "https://mirror.example/zebra", "title": "Zebras", "content": PAGE},
+    ]))
+    provider = FakeProvider(SEARCH, "They cross in July.")
+    answer, stats = ask(provider, "When do zebras cross the Mara?",
+                        document_store=DocumentStore(":memory:"))
+    assert answer == "They cross in July."
+    assert [search[0] for search in scraper.searches] == ["zebra migration river"]
+    assert "also at: https://mirror.example/zebra" in provider.prompts[1]
+    assert stats["pages"] == 2
+
+def test_slow_final_answer_returns_the_tool_results(fake_scraper):
+    fake_scraper(FakeScraper([{"url": "https://a.example/zebra", "title": "Zebras",
+                               "content": PAGE}]))
+    provider = FakeProvider(SEARCH, (5, "too late"))
+    answer, _ = ask(provider, "When do zebras cross the Mara?", timeout=0.5,
+                    document_store=DocumentStore(":memory:"))
+    assert answer.startswith("I ran out of time before I could write a full answer.")
+    assert "From https://a.example/zebra" in answer
+
+def test_slow_tool_leaves_time_for_the_answer(fake_scraper):
+    fake_scraper(SlowScraper())
+    provider = FakeProvider(SEARCH, "I couldn't search in time.")
+    answer, _ = ask(provider, "When do zebras cross the Mara?", timeout=0.5,
+                    document_store=DocumentStore(":memory:"))
+    assert answer == "I couldn't search in time."
+    assert '"error": "web_search ran out of time"' in provider.prompts[1]
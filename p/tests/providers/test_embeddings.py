@@ -0,0 +1,75 @@
+"""
+Tests for the embedding cache, its per-file sharing and batched embedding.
+"""
+import numpy as np
+import pytest
+
+from exo.core.config import DEFAULT_CONFIG
+from exo.providers import embeddings
+from exo.providers.base import BaseModel
+from exo.providers.embeddings import EmbeddingCache, get_embedding_cache
+
+class FakeModel(BaseModel):
+    """Embeds a text as (length, first character), recording each batch."""
+
+    embedding_batch_size = 2
+
+    def __init__(self, name="fake-embed"):
+        super().__init__(name)
+        self.batches = []
+
+    async def generate(self, prompt, **kwargs):
+        return ""
+
+    async def get_model_info(self):
+        return {"name": self.model_name}
+
+    def _embed_batch(self, texts):
+        self.batches.append(list(texts))
+        return np.array([[len(text), ord(text[0])] for text in texts], dtype=np.float32)
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    monkeypatch.setattr(embeddings, "_caches", {})
+
+def test_duplicates_and_cached_texts_are_embedded_once():
+    model = FakeModel()
+    model.embedding_cache = EmbeddingCache()
+    first = model.embed(["ccc", "a", "bb", "a", "dddd"])
+    assert model.batches == [["a", "bb"], ["ccc", "dddd"]]
+    assert first.tolist() == [[3, 99], [1, 97], [2, 98], [1, 97], [4, 100]]
+
+    second = model.embed(["bb", "eeeee", "a"], batch_size=8)
+    assert model.batches[2:] == [["eeeee"]]
+    assert second.tolist() == [[2, 98], [5, 101], [1, 97]]
+    assert model.embedding_cache.hits == 2
+
+def test_models_share_one_cache_per_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "embeddings.npz")
+    monkeypatch.setitem(DEFAULT_CONFIG["embeddings"], "cache_path", path)
+    one, two = FakeModel("model-one"), FakeModel("model-two")
+    one.embed(["alpha"])
+    two.embed(["beta"])
+    assert one.embedding_cache is two.embedding_cache is get_embedding_cache(path)
+    assert get_embedding_cache(str(tmp_path / "." / "embeddings.npz")) is one.embedding_cache
+
+    one.embedding_cache.flush()
+    reloaded = EmbeddingCache(path=path)
+    assert len(reloaded) == 2
+    assert reloaded.get(EmbeddingCache.key("model-one", "alpha")).tolist() == [5, 97]
+    assert reloaded.get(EmbeddingCache.key("model-two", "beta")).tolist() == [4, 98]
+
+def test_other_paths_and_memory_get_their_own_cache(tmp_path):
+    memory = get_embedding_cache()
+    assert memory.path is None and get_embedding_cache() is memory
+    assert get_embedding_cache(str(tmp_path / "a.npz")) is not get_embedding_cache(str(tmp_path / "b.npz"))
+
+def test_autosave_writes_after_save_every(tmp_path):
+    path = str(tmp_path / "embeddings.npz")
+    cache = EmbeddingCache(path=path, save_every=3)
+    model = FakeModel()
+    model.embedding_cache = cache
+    model.embed(["a", "b"])
+    assert not (tmp_path / "embeddings.npz").exists()
+    model.embed(["c"])
+    assert len(EmbeddingCache(path=path)) == 3
@@ -0,0 +1,44 @@
+"""
+Tests for the crawler against local stub hosts.
+"""
+
+import asyncio
+
+from exo.examples.benchmarks.fixtures import FixtureServer
+from exo.scraper.crawler import Crawler
+from exo.scraper.politeness import HostScheduler
+from exo.scraper.processing import HtmlProcessor
+
+def _site(pages: int, robots: str = ""):
+    """Routes of a small site whose pages link to each other."""
+    paths = ["/"] + [f"/p{i}" for i in range(1, pages)]
+    routes = {"/robots.txt": ("text/plain", robots)}
+    for path in paths:
+        links = "".join(f'<a href="{other}">{other}</a>' for other in paths if other != path)
+        links += '<a href="/private/secret">secret</a>'
+        routes[path] = (
+            "text/html", f"<html><body><h1>{path}</h1>{links}</body></html>"
+        )
+    routes["/private/secret"] = ("text/html", "<html><body>secret</body></html>")
+    return routes
+
+def test_crawl_two_hosts():
+    """Both sites are crawled completely, interleaved, honouring robots.txt."""
+    robots = "User-agent: *\nDisallow: /private\n"
+    with FixtureServer(_site(4, robots)) as first, FixtureServer(_site(4, robots)) as second:
+        scheduler = HostScheduler(min_delay=0.02, per_host_concurrency=1, max_concurrency=4,
+                                  respect_robots=True)
+        crawler = Crawler([first.url("/"), second.url("/")], max_depth=2, max_pages=50,
+                          concurrency=4, tier="http", scheduler=scheduler,
+                          processor=HtmlProcessor(workers=0))
+        pages = asyncio.run(crawler.run())
+        asyncio.run(scheduler.close())
+
+        fetched = [page["url"] for page in pages if "error" not in page]
+        assert len(fetched) == 8
+        assert crawler.stats["disallowed"] == 2
+        assert first.hits.get("/private/secret") is None
+        assert second.hits.get("/private/secret") is None
+        # Neither host waits for the other to finish
+        hosts = [url.split("/")[2] for url in fetched]
+        assert hosts[:4].count(hosts[0]) < 4
@@ -0,0 +1,73 @@
+"""
+Tests for URL canonicalization and the crawl frontier.
+"""
+
+from exo.scraper.crawler.frontier import Frontier
+from exo.scraper.crawler.urls import canonicalize_url, url_host
+
+def test_canonicalize_equivalent_spellings():
+    """Equivalent spellings of a URL canonicalize to the same string."""
+    canonical = "http://example.com/a/c?x=1&y=2"
+    for url in [
+        "HTTP://Example.COM:80/a/b/../c?y=2&x=1",
+        "http://example.com/a/./c?x=1&y=2#section",
+        "http://example.com/a/c?x=1&utm_source=feed&y=2&fbclid=abc",
+        "http://example.com./a/%63?x=1&y=2",
+    ]:
+        assert canonicalize_url(url) == canonical
+
+def test_canonicalize_keeps_meaningful_differences():
+    """Ports, schemes and real query parameters are kept."""
+    assert canonicalize_url("https://example.com:8443/") == "https://example.com:8443/"
+    assert canonicalize_url("https://example.com:443") == "https://example.com/"
+    assert canonicalize_url("http://example.com/?page=2") != canonicalize_url("http://example.com/")
+    assert canonicalize_url("http://example.com/a%2fb") == "http://example.com/a%2Fb"
+
+def test_canonicalize_rejects_uncrawlable():
+    """Non-http(s) and malformed URLs are rejected."""
+    assert canonicalize_url("mailto:someone@example.com") is None
+    assert canonicalize_url("javascript:void(0)") is None
+    assert canonicalize_url("http://example.com:notaport/") is None
+
+def test_canonicalize_relative():
+    """Relative URLs resolve against the base."""
+    assert canonicalize_url("../b", base="http://example.com/x/y/z") == "http://example.com/x/b"
+    assert url_host("http://user@Example.com:8080/p") == "example.com:8080"
+
+def test_frontier_dedup_depth_and_order():
+    """The frontier drops duplicates and deep links and pops breadth first."""
+    frontier = Frontier(max_depth=1, max_pages=10)
+    assert frontier.add("http://example.com/deep", depth=1)
+    assert frontier.add("http://example.com/")
+    assert not frontier.add("HTTP://EXAMPLE.COM/#top")
+    assert not frontier.add("http://example.com/deeper", depth=2)
+    assert frontier.pop() == ("http://example.com/", 0)
+    assert frontier.pop() == ("http://example.com/deep", 1)
+    assert frontier.pop() is None
+
+def test_frontier_page_budget():
+    """No more than ``max_pages`` URLs are handed out."""
+    frontier = Frontier(max_pages=2)
+    for i in range(5):
+        frontier.add(f"http://example.com/{i}")
+    assert frontier.pop() and frontier.pop()
+    assert frontier.exhausted
+    assert frontier.pop() is None
+
+def test_frontier_resume_requeues_in_flight(tmp_path):
+    """URLs in flight when the frontier is saved are fetched again after loading."""
+    frontier = Frontier()
+    for i in range(3):
+        frontier.add(f"http://example.com/{i}")
+    first, _ = frontier.pop()
+    done, _ = frontier.pop()
+    frontier.done(done)
+    path = str(tmp_path / "frontier.json")
+    frontier.save(path)
+
+    resumed = Frontier.load(path)
+    assert resumed.scheduled == 1
+    urls = [resumed.pop()[0], resumed.pop()[0]]
+    assert first in urls
+    assert done not in urls
+    assert not resumed.add(done)
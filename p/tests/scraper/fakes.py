@@ -0,0 +1,115 @@
+"""
+Minimal stand-ins for Playwright browsers, contexts and pages, and for
+the scraper behind the agent tools.
+"""
+
+import json
+import subprocess
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.url = "about:blank"
+        self.closed = False
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    def crash(self):
+        for handler in self.handlers.get("crash", []):
+            handler(self)
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.pages = []
+        self.closed = False
+
+    async def new_page(self):
+        if self.closed:
+            raise RuntimeError("Target context has been closed")
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+        for page in self.pages:
+            page.closed = True
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self):
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.connected = False
+
+NODE_PAGE = r"""
+const readline = require("readline");
+globalThis.window = globalThis;
+globalThis.document = {doctype: null, documentElement: {outerHTML: ""}, body: null};
+readline.createInterface({input: process.stdin}).on("line", line => {
+    const {script, arg, text, html} = JSON.parse(line);
+    if (text !== undefined) document.body = {innerText: text};
+    if (html !== undefined) document.documentElement.outerHTML = html;
+    let result = null;
+    if (script) result = eval(script)(arg);
+    process.stdout.write(JSON.stringify(result) + "\n");
+});
+"""
+
+class NodePage:
+    """A page whose ``evaluate`` runs scripts in Node against fixed text."""
+
+    def __init__(self, text: str = "", html: str = ""):
+        self.calls = 0
+        self.process = subprocess.Popen(["node", "-e", NODE_PAGE], stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE, encoding="utf-8",
+                                        errors="surrogatepass")
+        self._send({"text": text, "html": html})
+
+    def _send(self, message):
+        self.process.stdin.write(json.dumps(message) + "\n")
+        self.process.stdin.flush()
+        return json.loads(self.process.stdout.readline())
+
+    async def evaluate(self, script, arg=None):
+        self.calls += 1
+        return self._send({"script": script, "arg": arg})
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+
+class FakeScraper:
+    """Serves canned search results and pages, recording what was asked for."""
+
+    def __init__(self, results=(), pages=None):
+        self.results = list(results)
+        self.pages = pages or {}
+        self.searches = []
+        self.scraped = []
+
+    async def search_and_scrape(self, query, num_results=3, timeout=None, main_content=False):
+        self.searches.append((query, num_results, main_content))
+        return [dict(result) for result in self.results[:num_results]]
+
+    async def scrape_url(self, url, selector=None, wait_for=None, extract_text=True, **kwargs):
+        self.scraped.append((url, selector, kwargs.get("main_content")))
+        return dict(self.pages.get(url) or {"url": url, "error": "Not found"})
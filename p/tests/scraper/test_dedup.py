@@ -0,0 +1,86 @@
+"""
+Tests for SimHash/MinHash near-duplicate detection.
+"""
+
+import random
+
+import numpy as np
+from exo.scraper.dedup import (
+    LSHIndex, MinHasher, NearDuplicateFilter, deduplicate, hamming_distances, shingle_hashes,
+    simhash
+)
+
+WORDS = ("market growth report analysis data model system policy research energy climate "
+         "city health school network software design history science river bank").split()
+
+def _text(seed: int, words: int = 400) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+def _edit(text: str, changes: int, seed: int = 0) -> str:
+    """Replace a few words of a text."""
+    rng = random.Random(seed)
+    words = text.split()
+    for _ in range(changes):
+        words[rng.randrange(len(words))] = "changed"
+    return " ".join(words)
+
+def test_shingles_are_stable_and_distinct():
+    """Shingle hashes don't depend on case or repetition."""
+    assert np.array_equal(np.sort(shingle_hashes("A b c d e")), np.sort(shingle_hashes("a B c d e")))
+    assert shingle_hashes("a b c d e a b c d e").size == 5
+    assert shingle_hashes("").size == 0
+
+def test_simhash_distance():
+    """Small edits move the SimHash a few bits; unrelated texts many."""
+    original = simhash(shingle_hashes(_text(1)))
+    near = simhash(shingle_hashes(_edit(_text(1), 3)))
+    other = simhash(shingle_hashes(_text(2)))
+    distances = hamming_distances(original, np.array([original, near, other], dtype=np.uint64))
+    assert distances[0] == 0
+    assert distances[1] < distances[2]
+    assert distances[2] > 10
+
+def test_minhash_estimates_jaccard():
+    """Signature agreement tracks the Jaccard similarity of the shingle sets."""
+    hasher = MinHasher(num_perm=256)
+    first = shingle_hashes(_text(1))
+    second = shingle_hashes(_edit(_text(1), 20))
+    exact = len(np.intersect1d(first, second)) / len(np.union1d(first, second))
+    estimate = (hasher.signature(first) == hasher.signature(second)).mean()
+    assert abs(estimate - exact) < 0.1
+
+def test_lsh_index_finds_only_similar():
+    """LSH returns near-duplicates above the threshold and nothing else."""
+    hasher = MinHasher()
+    index = LSHIndex(threshold=0.7)
+    index.add("original", hasher.signature(shingle_hashes(_text(1))))
+    index.add("other", hasher.signature(shingle_hashes(_text(2))))
+    matches = index.query(hasher.signature(shingle_hashes(_edit(_text(1), 5))))
+    assert [key for key, _ in matches] == ["original"]
+    assert index.query(hasher.signature(shingle_hashes(_text(3)))) == []
+
+def test_filter_catches_copies():
+    """Exact, reformatted and lightly edited copies are all caught."""
+    dedup_filter = NearDuplicateFilter()
+    assert dedup_filter.check("a", _text(1)) is None
+    assert dedup_filter.check("b", "  " + _text(1).replace(" ", "\n")) == "a"
+    assert dedup_filter.check("c", _edit(_text(1), 4)) == "a"
+    assert dedup_filter.check("d", _text(2)) is None
+
+def test_deduplicate_keeps_first_and_reports():
+    """The first copy is kept with the dropped URLs recorded on it."""
+    documents = [
+        {"url": "https://a.test/story", "content": _text(1)},
+        {"url": "https://b.test/error", "error": "timeout"},
+        {"url": "https://mirror.test/story", "content": _edit(_text(1), 2)},
+        {"url": "https://c.test/other", "content": _text(2)},
+    ]
+    kept, report = deduplicate(documents)
+    assert [document["url"] for document in kept] == [
+        "https://a.test/story", "https://b.test/error", "https://c.test/other"
+    ]
+    assert kept[0]["duplicate_urls"] == ["https://mirror.test/story"]
+    assert report["duplicates"] == 1
+    assert report["duplicate_of"] == {"https://mirror.test/story": "https://a.test/story"}
+    assert report["tokens_saved"] > 0
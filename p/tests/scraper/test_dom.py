@@ -0,0 +1,53 @@
+"""
+Tests for the standard-library DOM builder.
+"""
+
+from exo.scraper.dom import parse_html, select
+
+def _shape(node):
+    """Tag tree of an element, without text."""
+    return (node.tag, [_shape(child) for child in node.children if not isinstance(child, str)])
+
+def test_unclosed_cells_and_rows_close_each_other():
+    root = parse_html("<table><tr><th>h1<th>h2<tr><td>a<td><b>b</table><p>after")
+    table = root.find("table")
+    assert _shape(table) == ("table", [("tr", [("th", []), ("th", [])]),
+                                       ("tr", [("td", []), ("td", [("b", [])])])])
+    assert [child.tag for child in root.children] == ["table", "p"]
+
+def test_row_closes_open_cell_and_section():
+    root = parse_html("<table><thead><tr><td>h<tbody><tr><td>a<div>x<tr><td>b</table>")
+    assert _shape(root.find("table")) == (
+        "table", [("thead", [("tr", [("td", [])])]),
+                  ("tbody", [("tr", [("td", [("div", [])])]), ("tr", [("td", [])])])])
+
+def test_nested_table_keeps_outer_cell_open():
+    root = parse_html("<table><tr><td><table><tr><td>in</table>out<td>next</table>")
+    outer = root.find("table")
+    row = outer.children[0]
+    assert [cell.tag for cell in row.children] == ["td", "td"]
+    assert row.children[0].text() == "in\nout"
+
+def test_block_start_closes_paragraph():
+    root = parse_html("<div><p>intro<ul><li>one<li>two</ul><p>a<p>b<h2>t</h2></div>")
+    div = root.find("div")
+    assert [child.tag for child in div.children] == ["p", "ul", "p", "p", "h2"]
+    assert [li.text() for li in select(root, "div>ul>li")] == ["one", "two"]
+
+def test_paragraph_in_cell_does_not_close_across_table():
+    root = parse_html("<p>x<table><tr><td><p>cell<div>d</div></table>")
+    assert [child.tag for child in root.children] == ["p", "table"]
+    cell = root.find("td")
+    assert [child.tag for child in cell.children] == ["p", "div"]
+
+def test_list_items_close_within_their_list():
+    root = parse_html("<ul><li>a<ul><li>b<li>c</ul><li>d</ul><dl><dt>t<dd>d<dt>u</dl>")
+    outer = root.find("ul")
+    assert [li.text(" ") for li in outer.children if not isinstance(li, str)] == ["a b c", "d"]
+    assert [child.tag for child in root.find("dl").children] == ["dt", "dd", "dt"]
+
+def test_void_and_stray_end_tags():
+    root = parse_html("<div><img src=a><br>text</span></div><p>next")
+    div = root.find("div")
+    assert _shape(div) == ("div", [("img", []), ("br", [])])
+    assert [child.tag for child in root.children] == ["div", "p"]
@@ -0,0 +1,56 @@
+"""
+Tests for chunked page content reads.
+"""
+
+import asyncio
+import shutil
+
+import pytest
+from exo.scraper.extraction import extract_page_content, iter_page_content
+
+from .fakes import NodePage
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+
+ASTRAL = "a\U0001F600" * 10
+
+def _read(page, **kwargs):
+    async def run():
+        return [chunk async for chunk in iter_page_content(page, **kwargs)]
+    return asyncio.run(run())
+
+def test_chunks_cover_astral_text_once():
+    """Chunks advance by the page's offsets and never split a surrogate pair."""
+    page = NodePage(text=ASTRAL)
+    try:
+        for chunk_chars in (1, 2, 3, 4, 7):
+            chunks = _read(page, chunk_chars=chunk_chars)
+            assert "".join(chunks) == ASTRAL
+            for chunk in chunks:
+                chunk.encode("utf-8")
+    finally:
+        page.close()
+
+def test_chunks_of_plain_text():
+    text = "".join(str(i % 10) for i in range(1000))
+    page = NodePage(text=text)
+    try:
+        chunks = _read(page, chunk_chars=300)
+        assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+        assert "".join(chunks) == text
+    finally:
+        page.close()
+
+def test_clipped_content_reports_code_points():
+    page = NodePage(text=ASTRAL)
+    try:
+        clipped = asyncio.run(extract_page_content(page, max_chars=5))
+        assert clipped["content"] == "a\U0001F600a"
+        assert clipped["length"] == len(ASTRAL) == 20
+        assert clipped["truncated"]
+        whole = asyncio.run(extract_page_content(page, max_chars=30))
+        assert whole == {"content": ASTRAL, "length": 20, "truncated": False}
+        chunked = asyncio.run(extract_page_content(page, chunk_chars=3))
+        assert chunked == {"content": ASTRAL, "length": 20, "truncated": False}
+    finally:
+        page.close()
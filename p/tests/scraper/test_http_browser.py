@@ -0,0 +1,84 @@
+"""
+Tests for the HTTP browser's selectors and HTML serialization.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from exo.core.exceptions import BrowserError, ParserError
+from exo.scraper.browser.http_browser import HttpBrowser, HttpPage, needs_browser
+
+HTML = """<!DOCTYPE html><html><head><title>T</title><style>p > a { color: red }</style></head>
+<body><main id="main" class="content wide">
+<p class="lead">Fish &amp; chips <a href="/menu?a=1&amp;b=2" title='say "hi"'>menu</a></p>
+<ul><li data-kind="x-1">one<li data-kind="y-2">two<br>lines<li>three</ul>
+<script>if (a < b && c > d) { run(); }</script>
+</main><p class="lead">outside</p></body></html>"""
+
+def load(html=HTML, content_type="text/html; charset=utf-8"):
+    page = HttpPage()
+    page._load(httpx.Response(200, headers={"content-type": content_type}, text=html,
+                              request=httpx.Request("GET", "https://example.com/")))
+    browser = HttpBrowser()
+    browser.page = page
+    return browser
+
+def query(selector, **kwargs):
+    return asyncio.run(load().query_all(selector, **kwargs))
+
+@pytest.mark.parametrize("selector, expected", [
+    ("li", ["one", "two lines", "three"]),
+    ("ul > li", ["one", "two lines", "three"]),
+    ("#main p.lead", ["Fish & chips menu"]),
+    ("main > ul li:not-supported", None),
+    ("p.lead, li[data-kind^=y]", ["Fish & chips menu", "two lines", "outside"]),
+    ("li[data-kind$='-1']", ["one"]),
+    ("li[data-kind*=\"-\"]", ["one", "two lines"]),
+    ("[class~=wide] a[href]", ["menu"]),
+    ("main.content.wide > p > a", ["menu"]),
+    ("body > p", ["outside"]),
+    ("*[title]", ["menu"]),
+    ("div p", []),
+])
+def test_selectors(selector, expected):
+    if expected is None:
+        with pytest.raises(ParserError):
+            query(selector)
+    else:
+        assert query(selector)["results"] == expected
+
+def test_limits_are_reported_as_truncated():
+    result = query("li", max_items=2, max_chars=2)
+    assert result == {"count": 3, "results": ["on", "tw"], "truncated": True}
+    assert query("li", max_items=3)["truncated"] is False
+
+def test_inner_html_escapes_text_and_attributes():
+    result = query("p.lead", text=False, max_items=1)
+    assert result["results"] == ['Fish &amp; chips <a href="/menu?a=1&amp;b=2" '
+                                 'title="say &quot;hi&quot;">menu</a>']
+    assert query("ul", text=False)["results"] == [
+        '<li data-kind="x-1">one</li><li data-kind="y-2">two<br>lines</li><li>three</li>']
+
+def test_inner_html_keeps_script_and_style_raw():
+    main = query("main", text=False)["results"][0]
+    assert "<script>if (a < b && c > d) { run(); }</script>" in main
+    assert query("head", text=False)["results"][0].endswith("<style>p > a { color: red }</style>")
+
+def test_serialized_html_parses_back_the_same():
+    browser = load()
+    first = asyncio.run(browser.query_all("body", text=False))["results"][0]
+    reparsed = load(f"<html><body>{first}</body></html>")
+    assert asyncio.run(reparsed.query_all("body", text=False))["results"][0] == first
+
+def test_page_text_and_missing_selector():
+    browser = load()
+    assert browser.page.text().startswith("Fish & chips menu\none\ntwo\nlines")
+    with pytest.raises(BrowserError):
+        asyncio.run(browser.wait_for_selector("table"))
+    assert load(content_type="application/pdf").page.html == ""
+
+def test_needs_browser():
+    assert needs_browser("<html><body><div id=app></div><script src=app.js></script></body></html>")
+    assert not needs_browser("<html><body>" + "<p>server text</p>" * 30 + "<script></script></body></html>")
+    assert not needs_browser("<html><body>short</body></html>")
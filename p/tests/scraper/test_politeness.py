@@ -0,0 +1,90 @@
+"""
+Tests for robots.txt handling and the per-host scheduler.
+"""
+
+import asyncio
+import time
+
+import pytest
+from exo.core.exceptions import RobotsDisallowedError
+from exo.examples.benchmarks.fixtures import FixtureServer
+from exo.scraper.politeness import HostScheduler, RobotsCache, parse_crawl_delays
+
+ROBOTS = """User-agent: *
+Disallow: /private
+Crawl-delay: 0.2
+"""
+
+async def _request_starts(scheduler, urls):
+    """Take a slot for every URL concurrently and record when each started."""
+    starts = []
+
+    async def request(url):
+        async with scheduler.slot(url):
+            starts.append((url, time.monotonic()))
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(request(url) for url in urls))
+    await scheduler.close()
+    return starts
+
+def test_parse_crawl_delays():
+    """Fractional delays are parsed per user-agent group."""
+    delays = parse_crawl_delays([
+        "User-agent: exo",
+        "User-agent: other",
+        "Crawl-delay: 0.5  # half a second",
+        "",
+        "User-agent: *",
+        "Disallow: /x",
+        "Crawl-delay: 2",
+    ])
+    assert delays == {"exo": 0.5, "other": 0.5, "*": 2.0}
+
+def test_spacing_per_host():
+    """Requests to one host start at least ``min_delay`` apart."""
+    scheduler = HostScheduler(min_delay=0.1, per_host_concurrency=4, max_concurrency=4,
+                              respect_robots=False)
+    starts = asyncio.run(_request_starts(scheduler, [f"http://a.test/{i}" for i in range(4)]))
+    times = sorted(start for _, start in starts)
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    assert min(gaps) >= 0.09
+
+def test_hosts_interleave():
+    """A queue of requests to one host doesn't starve another host."""
+    scheduler = HostScheduler(min_delay=0, per_host_concurrency=1, max_concurrency=1,
+                              respect_robots=False)
+    urls = [f"http://a.test/{i}" for i in range(3)] + [f"http://b.test/{i}" for i in range(3)]
+    starts = asyncio.run(_request_starts(scheduler, urls))
+    hosts = [url.split("/")[2] for url, _ in starts]
+    assert hosts == ["a.test", "b.test"] * 3
+
+def test_robots_disallow_and_crawl_delay():
+    """robots.txt rules are enforced and its crawl-delay spaces requests."""
+    with FixtureServer({"/robots.txt": ("text/plain", ROBOTS)}) as server:
+        async def run():
+            scheduler = HostScheduler(min_delay=0, per_host_concurrency=2, max_concurrency=4,
+                                      respect_robots=True)
+            with pytest.raises(RobotsDisallowedError):
+                async with scheduler.slot(server.url("/private/page")):
+                    pass
+            return await _request_starts(scheduler, [server.url(f"/public/{i}") for i in range(3)])
+
+        starts = asyncio.run(run())
+        times = sorted(start for _, start in starts)
+        assert times[-1] - times[0] >= 0.38
+        assert server.hits["/robots.txt"] == 1
+
+def test_robots_missing_or_forbidden():
+    """A missing robots.txt allows everything; a forbidden one disallows everything."""
+    with FixtureServer() as missing, \
+            FixtureServer({"/robots.txt": lambda path: (403, "text/plain", "no")}) as forbidden:
+        async def run():
+            robots = RobotsCache()
+            try:
+                return (await robots.can_fetch(missing.url("/a")),
+                        await robots.can_fetch(forbidden.url("/a")))
+            finally:
+                await robots.close()
+
+        assert asyncio.run(run()) == (True, False)
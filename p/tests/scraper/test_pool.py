@@ -0,0 +1,52 @@
+"""
+Tests for the page pool: reuse, replacement and closing with waiters.
+"""
+import asyncio
+
+import pytest
+
+from exo.core.exceptions import PoolClosedError
+from exo.scraper.pool import PagePool
+
+from .fakes import FakeBrowser, FakeContext
+
+def test_pages_are_reused_and_replaced_after_max_uses():
+    async def run():
+        context = FakeContext(FakeBrowser())
+        pool = PagePool(context, size=1, max_uses=2)
+        pages = []
+        for _ in range(3):
+            async with pool.page() as page:
+                pages.append(page)
+        return context, pages
+
+    context, pages = asyncio.run(run())
+    assert pages[0] is pages[1] and pages[2] is not pages[0]
+    assert pages[0].closed and len(context.pages) == 2
+
+def test_crashed_page_is_replaced():
+    async def run():
+        pool = PagePool(FakeContext(FakeBrowser()), size=1)
+        async with pool.page() as first:
+            first.crash()
+        async with pool.page() as second:
+            return first, second
+
+    first, second = asyncio.run(run())
+    assert second is not first and first.closed
+
+def test_close_rejects_waiters_without_opening_pages():
+    async def run():
+        context = FakeContext(FakeBrowser())
+        pool = PagePool(context, size=1)
+        async with pool.page():
+            waiter = asyncio.create_task(pool.page().__aenter__())
+            await asyncio.sleep(0)
+            drained = asyncio.create_task(pool.drain())
+            await asyncio.sleep(0)
+        with pytest.raises(PoolClosedError):
+            await waiter
+        return context, await drained
+
+    context, drained = asyncio.run(run())
+    assert drained and len(context.pages) == 1 and context.pages[0].closed
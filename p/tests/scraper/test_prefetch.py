@@ -0,0 +1,63 @@
+"""
+Tests for the prefetch cache: pages handed over by a search and background loads.
+"""
+import asyncio
+
+from exo.scraper.prefetch import Prefetcher
+
+def page(url, size=100):
+    return {"url": url, "content": "x" * size}
+
+def test_added_pages_are_served_without_fetching():
+    fetched = []
+
+    async def fetch(url):
+        fetched.append(url)
+        return page(url)
+
+    async def run():
+        prefetcher = Prefetcher(fetch=fetch, max_bytes=1000)
+        added = prefetcher.add([page("https://a.example/1"),
+                                {"url": "https://a.example/2", "error": "Timed out"}])
+        return added, await prefetcher.get("https://a.example/1"), await prefetcher.get("https://a.example/2")
+
+    added, hit, miss = asyncio.run(run())
+    assert added == 1
+    assert hit["prefetched"] and hit["content"] == "x" * 100
+    assert miss is None and not fetched
+
+def test_added_pages_are_copied():
+    async def run():
+        prefetcher = Prefetcher(fetch=None, max_bytes=1000)
+        result = page("https://a.example/1")
+        prefetcher.add([result])
+        result["duplicate_urls"] = ["https://b.example/1"]
+        return await prefetcher.get("https://a.example/1")
+
+    assert "duplicate_urls" not in asyncio.run(run())
+
+def test_cache_is_bounded_in_bytes():
+    prefetcher = Prefetcher(fetch=None, max_bytes=250)
+    prefetcher.add([page(f"https://a.example/{i}") for i in range(3)])
+    assert prefetcher.stats()["pages"] == 2 and prefetcher.bytes == 200
+
+def test_get_joins_a_running_prefetch_and_cancels_the_rest():
+    started = []
+
+    async def fetch(url):
+        started.append(url)
+        await asyncio.sleep(0.05)
+        return page(url)
+
+    async def run():
+        prefetcher = Prefetcher(fetch=fetch, top_k=2, max_concurrency=2, max_bytes=1000)
+        prefetcher.prefetch(["https://a.example/1", "https://a.example/2", "https://a.example/3"])
+        await asyncio.sleep(0)  # let both fetches start
+        result = await prefetcher.get("https://a.example/1")
+        stats = prefetcher.stats()
+        await prefetcher.close()
+        return result, stats
+
+    result, stats = asyncio.run(run())
+    assert started == ["https://a.example/1", "https://a.example/2"]
+    assert result["prefetched"] and stats["joined"] == 1 and stats["cancelled"] == 1
@@ -0,0 +1,51 @@
+"""
+Tests for the HTML processing pool: batching and recovery from a broken pool.
+"""
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+
+from exo.scraper.processing import HtmlProcessor, process_html
+
+PAGE = ("<html><head><title>Report</title></head><body><nav>Home | About</nav>"
+        "<article><h1>Report</h1><p>" + "The committee published its findings today. " * 20 +
+        "</p></article></body></html>")
+
+def test_pool_matches_inline_processing():
+    async def run():
+        processor = HtmlProcessor(workers=1, inline_chars=0)
+        try:
+            results = await processor.process_many([(PAGE, "https://example.com/a")] * 3,
+                                                   ("main", "text"))
+            return results, processor._batches
+        finally:
+            await processor.close()
+
+    results, batches = asyncio.run(run())
+    expected = process_html(PAGE, "https://example.com/a", ("main", "text"))
+    assert results == [expected] * 3
+    assert not batches
+
+def test_restarts_a_broken_pool():
+    async def run():
+        processor = HtmlProcessor(workers=1, inline_chars=0)
+        try:
+            await processor.process(PAGE)
+            broken = processor._executor
+            for process in list(broken._processes.values()):
+                process.kill()
+            try:
+                await processor.process(PAGE)
+            except Exception as e:
+                first_error = e
+            else:
+                first_error = None
+            result = await processor.process(PAGE)
+            return broken, processor._executor, first_error, result
+        finally:
+            await processor.close()
+
+    broken, executor, error, result = asyncio.run(run())
+    assert executor is not broken
+    # The job in flight when the worker died may fail; later ones get a fresh pool
+    assert error is None or isinstance(error, BrokenProcessPool)
+    assert result["title"] == "Report"
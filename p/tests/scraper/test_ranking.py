@@ -0,0 +1,59 @@
+"""
+Tests for passage chunking, BM25 scoring and passage selection.
+"""
+
+from exo.scraper.dedup import estimate_tokens
+from exo.scraper.ranking import BM25Index, chunk_text, select_passages, tokenize
+
+def test_tokenize_drops_stopwords():
+    assert tokenize("The Rate of the Bank, and its rates!") == ["rate", "bank", "rates"]
+
+def test_chunk_text_limits_and_order():
+    """Lines merge up to the limit; long paragraphs split on sentences."""
+    sentence = "This sentence has exactly fifty characters in it. "
+    text = "Short intro.\nSecond line.\n" + sentence * 10
+    passages = chunk_text(text, max_chars=120)
+    assert passages[0].startswith("Short intro.\nSecond line.")
+    assert all(len(passage) <= 120 for passage in passages)
+    assert " ".join(" ".join(passages).split()) == " ".join(text.split())
+
+def test_chunk_text_hard_splits_unbroken_text():
+    passages = chunk_text("x" * 250, max_chars=100)
+    assert [len(passage) for passage in passages] == [100, 100, 50]
+
+def test_bm25_ranks_relevant_passages_first():
+    passages = [
+        "Weather forecast for the weekend: sunny with light wind.",
+        "The central bank raised interest rates by half a point.",
+        "Interest in gardening grows as spring arrives.",
+    ]
+    index = BM25Index(passages)
+    ranked = index.top("central bank interest rates", 3)
+    assert ranked[0][0] == 1
+    assert 0 not in [passage_id for passage_id, _ in ranked]
+
+def test_bm25_idf_and_length_normalization():
+    """Rare terms weigh more; a match in a short passage beats one in a long one."""
+    index = BM25Index(["apple banana", "apple cherry", "apple " + "filler " * 50 + "cherry"])
+    assert index.idf("cherry") > index.idf("apple")
+    scores = index.score("cherry")
+    assert scores[1] > scores[2] > 0
+    assert scores[0] == 0
+
+def test_select_passages_respects_budget():
+    documents = [{"url": f"https://a.test/{i}",
+                  "content": "\n".join(f"Paragraph about solar energy storage number {j}. " * 8
+                                       for j in range(10))} for i in range(3)]
+    selected = select_passages(documents, "solar storage", budget_tokens=300, passage_chars=400)
+    assert selected
+    assert sum(estimate_tokens(passage["text"]) for passage in selected) <= 300
+    assert {"url", "text", "score", "document", "position"} <= set(selected[0])
+
+def test_select_passages_without_query_reads_from_the_top():
+    """With no matching query, opening passages come first, then the next ones."""
+    documents = [{"url": "https://a.test", "content": "\n".join(f"Alpha part {i}." * 20 for i in range(5))},
+                 {"url": "https://b.test", "content": "\n".join(f"Beta part {i}." * 20 for i in range(5))}]
+    selected = select_passages(documents, "", budget_tokens=400, passage_chars=300)
+    order = [(passage["position"], passage["document"]) for passage in selected]
+    assert order[:4] == [(0, 0), (0, 1), (1, 0), (1, 1)]
+    assert all(passage["score"] == 0.0 for passage in selected)
@@ -0,0 +1,126 @@
+"""
+Tests for the scraper's browser lifecycle: relaunching, recycling and crash retries.
+"""
+import asyncio
+
+from exo.scraper.tools.scraper import WebScraper
+
+from .fakes import FakeBrowser
+
+def make_scraper(**settings):
+    scraper = WebScraper(max_concurrency=1, backend="playwright")
+    scraper.result_timeout = 1.0
+    browsers = []
+
+    async def launch():
+        browsers.append(FakeBrowser())
+        return browsers[-1]
+
+    scraper._launch = launch
+    for name, value in settings.items():
+        setattr(scraper, name, value)
+    return scraper, browsers
+
+def run_with(scraper, body):
+    async def run():
+        try:
+            return await body()
+        finally:
+            await scraper.close()
+    return asyncio.run(run())
+
+def test_ensure_browser_relaunches_a_disconnected_browser():
+    scraper, browsers = make_scraper()
+
+    async def body():
+        await scraper._ensure_browser()
+        browsers[0].connected = False
+        await scraper._ensure_browser()
+        await asyncio.gather(*scraper._retiring)
+
+    run_with(scraper, body)
+    assert len(browsers) == 2 and scraper.relaunches == 1
+    assert scraper.browser is None  # closed
+    assert browsers[0].contexts[0].closed
+
+def test_context_is_recycled_after_navigations():
+    scraper, browsers = make_scraper(context_navigations=2)
+
+    async def body():
+        contexts = []
+        for _ in range(3):
+            async with scraper.borrow_page() as page:
+                contexts.append(page.context)
+        await asyncio.gather(*scraper._retiring)
+        return contexts
+
+    contexts = run_with(scraper, body)
+    assert contexts[0] is contexts[1] and contexts[2] is not contexts[0]
+    assert contexts[0].closed and scraper.recycles == 1 and len(browsers) == 1
+
+def test_memory_growth_recycles_the_context_then_relaunches():
+    scraper, browsers = make_scraper(max_rss=100e6, rss_check_every=1)
+
+    async def rss():
+        return 200e6
+
+    scraper._browser_rss = rss
+
+    async def body():
+        for _ in range(2):
+            async with scraper.borrow_page():
+                pass
+        await asyncio.gather(*scraper._retiring)
+
+    run_with(scraper, body)
+    assert scraper.recycles == 1 and scraper.relaunches == 1 and len(browsers) == 2
+    assert not browsers[0].connected
+
+def test_waiter_on_a_recycled_pool_borrows_from_its_replacement():
+    scraper, browsers = make_scraper(context_navigations=1)
+
+    async def body():
+        release = asyncio.Event()
+
+        async def hold():
+            async with scraper.borrow_page() as page:
+                await release.wait()
+                return page
+
+        async def wait_for_page():
+            async with scraper.borrow_page() as page:
+                return page
+
+        first = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        second = asyncio.create_task(wait_for_page())
+        await asyncio.sleep(0)
+        # Recycled while the second scrape waits for the pool's only page
+        await scraper._maybe_recycle(scraper.pool)
+        await asyncio.sleep(0)
+        release.set()
+        pages = await asyncio.gather(first, second)
+        await asyncio.gather(*scraper._retiring)
+        return pages
+
+    first, second = run_with(scraper, body)
+    old_context, new_context = browsers[0].contexts[:2]
+    assert first.context is old_context and second.context is new_context
+    # The context's main page and the first scrape's page; none for the waiter
+    assert old_context.pages[1:] == [first] and old_context.closed
+
+def test_crashed_page_is_retried_on_a_fresh_page():
+    scraper, browsers = make_scraper()
+    pages = []
+
+    async def scrape_page(page, url, *args):
+        pages.append(page)
+        if len(pages) == 1:
+            page.crash()
+            raise RuntimeError("Target crashed")
+        return {"url": url, "content": "ok"}
+
+    scraper._scrape_page = scrape_page
+    result = run_with(scraper, lambda: scraper._scrape_in_browser("https://example.com/"))
+    assert result["content"] == "ok"
+    assert len(pages) == 2 and pages[0] is not pages[1] and pages[0].closed
@@ -0,0 +1,40 @@
+"""
+Tests for serving page scrapes from the document store.
+"""
+import asyncio
+
+from exo.examples.benchmarks.fixtures import FixtureServer
+from exo.scraper.tools.scraper import WebScraper
+from exo.storage.document_store import DocumentStore
+
+PAGE = "<html><body><p>" + "lorem ipsum dolor " * 100 + "</p></body></html>"
+
+def scrape_twice(first, second):
+    async def run():
+        scraper = WebScraper(store=DocumentStore(":memory:"), backend="http")
+        try:
+            with FixtureServer({"/page": ("text/html", PAGE)}) as server:
+                url = server.url("/page")
+                results = (await scraper.scrape_url(url, extract_text=False, **first),
+                           await scraper.scrape_url(url, extract_text=False, **second))
+                return results, server.hits.get("/page", 0)
+        finally:
+            await scraper.close()
+    return asyncio.run(run())
+
+def test_stored_copy_is_clipped_like_a_fresh_read():
+    (first, second), hits = scrape_twice({}, {"max_length": 100})
+    assert hits == 1 and second["from_store"]
+    assert second["content"] == PAGE[:100]
+    assert second["truncated"] and second["content_length"] == len(PAGE)
+
+def test_truncated_scrape_is_not_stored():
+    (first, second), hits = scrape_twice({"max_length": 100}, {"complete": True})
+    assert first["truncated"]
+    assert hits == 2 and not second.get("from_store")
+    assert second["content"] == PAGE and not second["truncated"]
+
+def test_complete_read_is_served_from_the_store():
+    (first, second), hits = scrape_twice({}, {"complete": True})
+    assert hits == 1 and second["from_store"]
+    assert second["content"] == PAGE and not second["truncated"]
@@ -0,0 +1,59 @@
+"""
+Tests for the search cache and the offline backend.
+"""
+
+import asyncio
+
+from exo.scraper.search import CachedSearchBackend, OfflineBackend, SearchBackend, SearchCache
+from exo.storage.document_store import DocumentStore
+
+RESULTS = [{"url": "https://example.com/a", "title": "A", "snippet": ""}]
+
+class CountingBackend(SearchBackend):
+    name = "counting"
+
+    def __init__(self, results):
+        self.results = results
+        self.calls = 0
+
+    async def search(self, query, num_results=10):
+        self.calls += 1
+        return self.results(query) if callable(self.results) else self.results
+
+def test_cache_hits_reworded_queries():
+    cache = SearchCache(ttl=60, similarity=0.6)
+    cache.put("python asyncio tutorial", 5, RESULTS)
+    assert cache.get("Tutorial for asyncio in Python", 5) == RESULTS
+    assert cache.get("python asyncio tutorial guide", 5) == RESULTS
+    assert cache.get("rust tutorial", 5) is None
+    assert (cache.hits, cache.similar_hits, cache.misses) == (1, 1, 1)
+
+def test_empty_results_expire_quickly_and_stay_exact():
+    cache = SearchCache(ttl=60, similarity=0.5, empty_ttl=0.05)
+    cache.put("python asyncio tutorial", 5, [])
+    assert cache.get("python asyncio tutorial", 5) == []
+    assert cache.get("python asyncio tutorial guide", 5) is None
+    asyncio.run(asyncio.sleep(0.06))
+    assert cache.get("python asyncio tutorial", 5) is None
+
+    uncached = SearchCache(ttl=60, empty_ttl=0)
+    uncached.put("python asyncio tutorial", 5, [])
+    assert len(uncached) == 0
+
+def test_cached_backend_retries_after_a_blank_page():
+    answers = [[], RESULTS]
+    backend = CountingBackend(lambda query: answers[min(backend.calls - 1, 1)])
+    cached = CachedSearchBackend(backend, SearchCache(ttl=60, empty_ttl=0))
+    assert asyncio.run(cached.search("consent wall", 5)) == []
+    assert asyncio.run(cached.search("consent wall", 5)) == RESULTS
+    assert asyncio.run(cached.search("consent wall", 5)) == RESULTS
+    assert backend.calls == 2
+
+def test_offline_backend_accepts_an_empty_store():
+    store = DocumentStore(":memory:")
+    backend = OfflineBackend(store=store)
+    assert backend.store is store
+    assert asyncio.run(backend.search("anything")) == []
+    store.put({"url": "https://example.com/tea", "title": "Tea", "content": "green tea brewing"})
+    results = asyncio.run(backend.search("tea brewing"))
+    assert [result["url"] for result in results] == ["https://example.com/tea"]
@@ -0,0 +1,85 @@
+"""
+Tests for rebuilding page text from a CDP DOM snapshot.
+"""
+from exo.scraper.snapshot import SNAPSHOT_STYLES, snapshot_text
+
+def element(name, *children, rendered=True, **styles):
+    return {"name": name, "children": children, "rendered": rendered, "styles": styles}
+
+def text(value, rendered=True, **styles):
+    return {"name": "#text", "value": value, "children": (), "rendered": rendered,
+            "styles": styles}
+
+def build_snapshot(root):
+    """
+    Flatten a tree into the arrays ``DOMSnapshot.captureSnapshot`` returns,
+    computing styles as a browser does: visibility is inherited, opacity isn't.
+    """
+    strings = []
+    nodes = {"parentIndex": [], "nodeType": [], "nodeName": [], "nodeValue": []}
+    layout = {"nodeIndex": [], "styles": []}
+
+    def string(value):
+        if value not in strings:
+            strings.append(value)
+        return strings.index(value)
+
+    def add(node, parent, visibility):
+        index = len(nodes["parentIndex"])
+        is_text = node["name"] == "#text"
+        nodes["parentIndex"].append(parent)
+        nodes["nodeType"].append(3 if is_text else 1)
+        nodes["nodeName"].append(string(node["name"] if is_text else node["name"].upper()))
+        nodes["nodeValue"].append(string(node["value"]) if is_text else -1)
+        computed = {"visibility": node["styles"].get("visibility", visibility),
+                    "opacity": node["styles"].get("opacity", "1")}
+        if node["rendered"]:
+            layout["nodeIndex"].append(index)
+            layout["styles"].append([string(computed[name]) for name in SNAPSHOT_STYLES])
+        for child in node["children"]:
+            add(child, index, computed["visibility"])
+
+    add(root, -1, "visible")
+    return {"strings": strings, "documents": [{"nodes": nodes, "layout": layout}]}
+
+PAGE = element(
+    "html",
+    element("head", element("script", text("var tracking = 1;", rendered=False), rendered=False),
+            rendered=False),
+    element(
+        "body",
+        element("h1", text("Zebra migration")),
+        element("p", text("Herds cross "), element("b", text("the Mara")), text(" in July.")),
+        element("div", text("Cookie banner"), visibility="hidden"),
+        element("div", element("p", text("Faded away")), opacity="0"),
+        element("div", text("Shown again", visibility="visible"), visibility="hidden"),
+        element("section", text("Not laid out", rendered=False)),
+        element("ul", element("li", text("  first   item ")), element("li", text("second"))),
+        text("Loose body text"),
+    ),
+)
+
+def test_visible_text_is_grouped_by_block():
+    result = snapshot_text(build_snapshot(PAGE))
+    assert result["text"] == ("Zebra migration\nHerds cross the Mara in July.\nShown again\n"
+                              "first item\nsecond\nLoose body text")
+    assert [block["tag"] for block in result["blocks"]] == ["h1", "p", "div", "li", "li", "body"]
+    assert result["headings"] == [{"tag": "h1", "text": "Zebra migration"}]
+    hidden = ("var tracking = 1;", "Cookie banner", "Faded away", "Not laid out")
+    assert result["hidden_chars"] == sum(len(value) for value in hidden)
+    assert result["nodes"] == 27
+
+def test_hidden_text_is_kept_on_request():
+    result = snapshot_text(build_snapshot(PAGE), skip_hidden=False)
+    for value in ("Cookie banner", "Faded away", "Not laid out", "var tracking = 1;"):
+        assert value in result["text"]
+    assert result["hidden_chars"] == 0
+
+def test_opacity_is_inherited_but_visibility_can_be_overridden():
+    page = element("body", element("div", element("span", text("under zero opacity",
+                                                             opacity="1")), opacity="0"),
+                   element("div", element("p", text("visible child", visibility="visible")),
+                           visibility="hidden"))
+    result = snapshot_text(build_snapshot(page))
+    assert result["text"] == "visible child"
+    assert result["hidden_chars"] == len("under zero opacity")
@@ -0,0 +1,30 @@
+"""
+Tests for table extraction.
+"""
+
+from exo.scraper.tables import extract_tables
+
+def test_unclosed_rows_and_cells():
+    tables = extract_tables("<table><tr><th>h1<th>h2<tr><td>a<td>b<tr><td>c<td>d</table>")
+    assert tables == [{"caption": "", "headers": ["h1", "h2"], "rows": [["a", "b"], ["c", "d"]]}]
+
+def test_unclosed_sections_and_colspan():
+    tables = extract_tables(
+        "<table><caption>Prices<thead><tr><td>item<td>q1<td>q2"
+        "<tbody><tr><td>tea<td colspan=2>3<tr><td>milk<td>1<td>2</table>"
+    )
+    assert tables == [{"caption": "Prices", "headers": ["item", "q1", "q2"],
+                       "rows": [["tea", "3", ""], ["milk", "1", "2"]]}]
+
+def test_nested_table_rows_stay_in_their_table():
+    tables = extract_tables(
+        "<table><tr><th>k<th>v<tr><td>a<td><table><tr><td>x<td>y</table><tr><td>b<td>2</table>"
+    )
+    assert tables[0]["headers"] == ["k", "v"]
+    assert tables[0]["rows"] == [["a", "x y"], ["b", "2"]]
+    assert tables[1] == {"caption": "", "headers": [], "rows": [["x", "y"]]}
+
+def test_min_rows_skips_layout_tables():
+    html = "<table><tr><td>layout</table><table><tr><td>1<tr><td>2</table>"
+    assert [table["rows"] for table in extract_tables(html, min_rows=2)] == [[["1"], ["2"]]]
+    assert len(extract_tables(html, max_tables=1)) == 1
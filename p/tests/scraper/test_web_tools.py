@@ -0,0 +1,95 @@
+"""
+Tests for the web_search and scrape_website agent tools.
+"""
+import asyncio
+
+import pytest
+from exo.scraper.prefetch import Prefetcher
+from exo.scraper.tools import scrape_website, web_search
+from exo.scraper.tools import scraper as scraper_module
+
+from .fakes import FakeScraper
+
+FILLER = " ".join(f"Paragraph {i} talks about weather, trains and local sport." for i in range(200))
+RELEVANT = "Zebra migration crosses the Mara river every July with the wildebeest herds."
+
+def article(url, relevant=True):
+    content = FILLER + (" " + RELEVANT if relevant else "") + " " + FILLER
+    return {"url": url, "title": url, "content": content}
+
+class FakeIndex:
+    def __init__(self):
+        self.added = []
+
+    async def add_documents(self, documents):
+        self.added.extend(document["url"] for document in documents)
+
+@pytest.fixture
+def fake_scraper(monkeypatch):
+    def install(scraper):
+        monkeypatch.setattr(scraper_module, "_scraper", scraper)
+        return scraper
+    return install
+
+def test_web_search_dedups_selects_passages_and_hands_off(fake_scraper):
+    slow = "https://slow.example/page"
+    scraper = fake_scraper(FakeScraper([
+        article("https://a.example/zebra"),
+        article("https://mirror.example/zebra"),
+        {"url": slow, "error": "Timed out", "timed_out": True},
+    ], pages={slow: article(slow, relevant=False)}))
+    index = FakeIndex()
+
+    async def run():
+        prefetcher = Prefetcher(fetch=lambda url: scraper.scrape_url(url, main_content=True))
+        try:
+            result = await web_search("zebra migration river", 3, content_index=index,
+                                      prefetcher=prefetcher)
+            prefetched = await prefetcher.get(slow)
+            handed_off = await prefetcher.get("https://a.example/zebra")
+            return result, handed_off, prefetched, prefetcher.stats()
+        finally:
+            await prefetcher.close()
+
+    result, handed_off, prefetched, stats = asyncio.run(run())
+    assert scraper.searches == [("zebra migration river", 3, True)]
+    assert result["duplicates_removed"] == 1
+    first, error = result["results"]
+    assert first.startswith("From https://a.example/zebra (also at: https://mirror.example/zebra):")
+    assert RELEVANT in first and len(first) < len(FILLER)
+    assert error == "Error: Timed out"
+    assert index.added == ["https://a.example/zebra", slow]
+    # The scraped page comes from the prefetch cache; only the timed-out one was fetched
+    assert handed_off["content"].startswith(FILLER[:100])
+    assert prefetched["url"] == slow
+    assert scraper.scraped == [(slow, None, True)]
+    assert stats["hits"] + stats["joined"] == 2
+
+def test_scrape_website_prefers_the_prefetched_page(fake_scraper):
+    url = "https://a.example/zebra"
+    scraper = fake_scraper(FakeScraper(pages={url: article(url)}))
+
+    async def run():
+        prefetcher = Prefetcher(fetch=scraper.scrape_url)
+        try:
+            prefetcher.add([dict(article(url), content=RELEVANT)])
+            from_cache = await scrape_website(url, query="zebra", prefetcher=prefetcher)
+            fresh = await scrape_website(url, query="zebra migration")
+            missing = await scrape_website("https://b.example/")
+            return from_cache, fresh, missing
+        finally:
+            await prefetcher.close()
+
+    from_cache, fresh, missing = asyncio.run(run())
+    assert from_cache == {"url": url, "content": RELEVANT}
+    assert scraper.scraped == [(url, None, True), ("https://b.example/", None, True)]
+    assert RELEVANT in fresh["content"] and len(fresh["content"]) < len(FILLER)
+    assert missing == {"url": "https://b.example/", "error": "Not found"}
+
+def test_scrape_website_reports_truncated_pages(fake_scraper):
+    url = "https://big.example/"
+    fake_scraper(FakeScraper(pages={url: dict(article(url), truncated=True,
+                                              content_length=10 ** 7)}))
+    result = asyncio.run(scrape_website(url))
+    assert result["truncated"] and result["content_length"] == 10 ** 7
+    assert result["content"].startswith("Paragraph 0")
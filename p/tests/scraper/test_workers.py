@@ -0,0 +1,39 @@
+"""
+Tests for scraping in worker processes.
+"""
+import asyncio
+
+from exo.examples.benchmarks.fixtures import FixtureServer
+from exo.scraper.tools.scraper import WebScraper
+from exo.scraper.workers import ScrapeWorkerPool, shard
+from exo.storage.document_store import DocumentStore
+from exo.storage.html_archive import HtmlArchive
+
+PAGE = "<html><body><main><p>" + "worker page text " * 50 + "</p></main></body></html>"
+
+def test_shard_is_stable_per_host():
+    urls = [f"https://example.com/{i}" for i in range(10)]
+    assert len({shard(url, 4) for url in urls}) == 1
+    assert shard("https://a.example/x", 4) == shard("https://a.example/y?q=1", 4)
+
+def test_worker_scrapes_are_stored_and_archived_by_the_caller(tmp_path):
+    async def run():
+        archive = HtmlArchive(str(tmp_path))
+        pool = ScrapeWorkerPool(processes=1)
+        scraper = WebScraper(store=DocumentStore(":memory:"), archive=archive,
+                             workers=pool, backend="http")
+        try:
+            with FixtureServer({"/page": ("text/html", PAGE)}) as server:
+                url = server.url("/page")
+                result = await scraper.scrape_url(url, main_content=True, backend="http")
+                again = await scraper.scrape_url(url, main_content=True, backend="http")
+                return url, result, again, archive.get(url)
+        finally:
+            await scraper.close()
+            archive.close()
+
+    url, result, again, archived = asyncio.run(run())
+    assert "worker page text" in result["content"]
+    assert "raw_html" not in result
+    assert again["from_store"]
+    assert archived == PAGE
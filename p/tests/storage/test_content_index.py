@@ -0,0 +1,57 @@
+"""
+Tests for the content index: persistence across restarts and adds off the event loop.
+"""
+import asyncio
+import threading
+import zlib
+
+import numpy as np
+
+from exo.storage.content_index import ContentIndex
+
+class FakeEmbedder:
+    """Bag-of-words hashing embedder."""
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), 64), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, zlib.crc32(word.encode()) % 64] += 1.0
+        return vectors
+
+DOCUMENTS = [
+    {"url": "https://a.example/rates", "content": "The central bank raised interest rates."},
+    {"url": "https://b.example/garden", "content": "Tomatoes grow well in sunny gardens."},
+]
+
+def test_reopens_persisted_index(tmp_path):
+    index = ContentIndex(FakeEmbedder(), path=str(tmp_path))
+    assert asyncio.run(index.add_documents(DOCUMENTS)) == 2
+    index.save()
+
+    reopened = ContentIndex(FakeEmbedder(), path=str(tmp_path))
+    assert reopened.index is not None
+    assert reopened.is_fresh("https://a.example/rates")
+    passages = asyncio.run(reopened.query("interest rates", k=1))
+    assert passages[0]["url"] == "https://a.example/rates"
+
+def test_add_runs_off_the_event_loop(monkeypatch):
+    index = ContentIndex(FakeEmbedder())
+    threads = []
+    original = ContentIndex._replace
+
+    def record(self, *args):
+        threads.append(threading.current_thread())
+        return original(self, *args)
+
+    monkeypatch.setattr(ContentIndex, "_replace", record)
+    asyncio.run(index.add_documents(DOCUMENTS))
+    assert threads and threads[0] is not threading.main_thread()
+
+def test_readding_a_url_replaces_its_passages():
+    index = ContentIndex(FakeEmbedder())
+    asyncio.run(index.add_documents(DOCUMENTS))
+    asyncio.run(index.add_documents([{"url": "https://a.example/rates",
+                                      "content": "Rates were left unchanged."}]))
+    passages = asyncio.run(index.query("rates", k=5, urls=["https://a.example/rates"]))
+    assert [passage["text"] for passage in passages] == ["Rates were left unchanged."]
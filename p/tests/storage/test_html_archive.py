@@ -0,0 +1,65 @@
+"""
+Tests for the HTML archive: round trips and background dictionary training.
+"""
+import threading
+
+import zstandard
+
+from exo.storage.html_archive import HtmlArchive
+
+def page(i):
+    nav = "".join(f'<li><a href="/section/{n}">Section {n}</a></li>' for n in range(40))
+    return (f"<html><head><title>Page {i}</title></head><body><ul class='nav'>{nav}</ul>"
+            f"<main><h1>Article {i}</h1><p>Body text number {i * 7919}.</p></main>"
+            f"<footer>Copyright example.com, all rights reserved.</footer></body></html>")
+
+def test_round_trip_and_reopen(tmp_path):
+    archive = HtmlArchive(str(tmp_path), train_after=1000)
+    archive.add("https://example.com/a", page(1))
+    archive.close()
+    reopened = HtmlArchive(str(tmp_path))
+    assert reopened.get("https://example.com/a") == page(1)
+    assert "https://example.com/b" not in reopened
+    reopened.close()
+
+def test_training_does_not_block_adds(tmp_path, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    train = zstandard.train_dictionary
+
+    def slow_train(*args, **kwargs):
+        started.set()
+        release.wait(5)
+        return train(*args, **kwargs)
+
+    monkeypatch.setattr(zstandard, "train_dictionary", slow_train)
+    archive = HtmlArchive(str(tmp_path), dict_size=4096, train_after=20)
+    for i in range(20):
+        archive.add(f"https://example.com/{i}", page(i))
+    assert started.wait(5)
+
+    # Training is still running: adds go through without a dictionary
+    record = archive.add("https://example.com/during", page(100))
+    assert record["dict"] == 0
+
+    release.set()
+    archive.wait_for_training()
+    record = archive.add("https://example.com/after", page(101))
+    assert record["dict"] == 1
+    assert archive.get("https://example.com/during") == page(100)
+    assert archive.get("https://example.com/after") == page(101)
+    archive.close()
+
+def test_sample_buffers_are_bounded(tmp_path):
+    archive = HtmlArchive(str(tmp_path), train_after=100, sample_bytes=100 * 200,
+                          sample_domains=3)
+    for round_ in range(3):
+        for site in ("a", "b", "c", "d", "e"):
+            archive.add(f"https://{site}.example/{round_}", page(round_))
+        archive.add(f"https://a.example/again-{round_}", page(round_))
+    assert list(archive._samples) == ["d.example", "e.example", "a.example"]
+    for samples in archive._samples.values():
+        assert all(len(sample) <= 200 for sample in samples)
+    # Evicted in every round, so a.example starts over from its last page
+    assert len(archive._samples["a.example"]) == 1
+    assert archive.get("https://b.example/2") == page(2)
+    archive.close()
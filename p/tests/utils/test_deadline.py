@@ -0,0 +1,99 @@
+"""
+Tests for request-scoped deadlines.
+"""
+import asyncio
+import time
+
+import pytest
+
+from exo.core.exceptions import DeadlineExceeded
+from exo.utils.async_utils import RetryPolicy
+from exo.utils.deadline import (
+    check, deadline, expired, no_deadline, remaining, time_left, within
+)
+
+def test_deadlines_only_tighten():
+    assert remaining() is None
+    with deadline(10) as outer:
+        with deadline(100) as looser:
+            assert looser == outer
+            assert 9 < remaining() <= 10
+        with deadline(1) as tighter:
+            assert tighter < outer
+            assert remaining() <= 1
+            with deadline(None) as kept:
+                assert kept == tighter
+        assert 9 < remaining() <= 10
+    assert remaining() is None
+
+def test_no_deadline_lifts_it_for_the_block():
+    with deadline(1):
+        with no_deadline():
+            assert remaining() is None
+            with deadline(5):
+                assert 4 < remaining() <= 5
+        assert remaining() <= 1
+
+def test_time_left_caps_timeouts_and_keeps_a_reserve():
+    assert time_left(3.0) == 3.0 and time_left(None) is None
+    with deadline(2):
+        assert time_left(1.0) == 1.0
+        assert 1.9 < time_left(10.0) <= 2.0
+        assert 0.9 < time_left(None, reserve=1.0) <= 1.0
+        assert time_left(None, reserve=5.0) == 0.0
+
+def test_expired_deadline_is_checked():
+    with deadline(0):
+        assert expired() and remaining() == 0.0
+        with pytest.raises(DeadlineExceeded, match="before scraping"):
+            check("scraping")
+    check()
+
+def test_deadline_follows_tasks():
+    async def left():
+        await asyncio.sleep(0)
+        return remaining()
+
+    async def run():
+        with deadline(2):
+            task = asyncio.create_task(left())
+        # The task took a copy of the context, deadline included
+        return remaining(), await task
+
+    outside, in_task = asyncio.run(run())
+    assert outside is None and 1.9 < in_task <= 2
+
+def test_within_tells_the_deadline_from_its_own_timeout():
+    async def run(budget, timeout):
+        with deadline(budget):
+            return await within(asyncio.sleep(1), timeout, what="sleeping")
+
+    with pytest.raises(DeadlineExceeded, match="during sleeping"):
+        asyncio.run(run(0.05, None))
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(run(0.05, 0.5))
+    with pytest.raises(asyncio.TimeoutError) as info:
+        asyncio.run(run(5, 0.05))
+    assert not isinstance(info.value, DeadlineExceeded)
+    assert asyncio.run(within(asyncio.sleep(0, result="done"))) == "done"
+
+def test_retries_never_sleep_past_the_deadline():
+    calls = []
+
+    async def failing():
+        calls.append(time.monotonic())
+        raise ConnectionResetError()
+
+    policy = RetryPolicy(max_attempts=10, base_delay=0.2, max_delay=0.2)
+    policy.backoff = lambda attempt: 0.2
+
+    async def run():
+        with deadline(0.5):
+            await policy.call(failing)
+
+    start = time.monotonic()
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(run())
+    # Two backoffs fit in the budget; a third would end past the deadline
+    assert len(calls) == 3
+    assert time.monotonic() - start < 0.5
@@ -0,0 +1,128 @@
+"""
+Tests for retry classification, backoff and the shared retry budget.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from exo.core.exceptions import (
+    DeadlineExceeded, HttpStatusError, ParserError, RobotsDisallowedError, ScraperError
+)
+from exo.utils.async_utils import RetryBudget, RetryPolicy, is_retryable
+from exo.utils.deadline import deadline
+
+class RateLimitError(Exception):
+    """Named like the SDK error, without importing the SDK."""
+
+class SdkError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+def wrapped(cause):
+    try:
+        raise ScraperError("scrape failed") from cause
+    except ScraperError as e:
+        return e
+
+@pytest.mark.parametrize("error, expected", [
+    (HttpStatusError(503, "https://example.com/"), True),
+    (HttpStatusError(429, "https://example.com/"), True),
+    (HttpStatusError(404, "https://example.com/"), False),
+    (httpx.ConnectTimeout("timed out"), True),
+    (httpx.ConnectError("refused"), True),
+    (asyncio.TimeoutError(), True),
+    (ConnectionResetError(), True),
+    (SdkError(502), True),
+    (SdkError(400), False),
+    (RateLimitError("slow down"), True),
+    (Exception("page.goto: net::ERR_CONNECTION_RESET at https://example.com/"), True),
+    (ValueError("bad value"), False),
+    (KeyError("missing"), False),
+    (ParserError("unsupported selector"), False),
+    (RobotsDisallowedError("disallowed"), False),
+    (DeadlineExceeded("out of time"), False),
+    (wrapped(TimeoutError()), True),
+    (wrapped(ValueError()), False),
+])
+def test_is_retryable(error, expected):
+    assert is_retryable(error) is expected
+
+def flaky(failures, error=ConnectionResetError):
+    calls = []
+
+    async def func():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise error()
+        return "ok"
+
+    return func, calls
+
+def test_backoff_is_capped():
+    policy = RetryPolicy(base_delay=1.0, max_delay=3.0)
+    for attempt, cap in ((1, 1.0), (2, 2.0), (3, 3.0), (10, 3.0)):
+        assert all(0 <= policy.backoff(attempt) <= cap for _ in range(50))
+
+def test_transient_errors_are_retried_until_success():
+    policy = RetryPolicy(max_attempts=3, base_delay=0)
+    func, calls = flaky(2)
+    assert asyncio.run(policy.call(func)) == "ok"
+    assert len(calls) == 3
+    assert policy.stats() == {"calls": 1, "attempts": 3, "retries": 2, "failures": 0,
+                              "budget_exhausted": 0}
+
+def test_attempts_are_capped():
+    policy = RetryPolicy(max_attempts=2, base_delay=0)
+    func, calls = flaky(5)
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(policy.call(func))
+    assert len(calls) == 2 and policy.failures == 1
+
+def test_permanent_errors_are_not_retried():
+    attempts = []
+    policy = RetryPolicy(max_attempts=5, base_delay=0, on_attempt=attempts.append)
+    func, calls = flaky(1, ValueError)
+    with pytest.raises(ValueError):
+        asyncio.run(policy.call(func))
+    assert len(calls) == 1
+    assert attempts[0]["retry"] is False and attempts[0]["delay"] is None
+
+def test_no_retry_past_the_deadline():
+    policy = RetryPolicy(max_attempts=3, base_delay=5.0, max_delay=5.0)
+    policy.backoff = lambda attempt: 5.0
+    func, calls = flaky(1)
+
+    async def run():
+        with deadline(1.0):
+            return await policy.call(func)
+
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(run())
+    assert len(calls) == 1
+
+def test_budget_accrues_per_call_and_caps():
+    budget = RetryBudget(ratio=0.5, min_retries=2)
+    assert budget.try_spend() and budget.try_spend() and not budget.try_spend()
+    budget.record_call()
+    assert not budget.try_spend()
+    budget.record_call()
+    assert budget.try_spend()
+    for _ in range(10):
+        budget.record_call()
+    assert budget.try_spend() and budget.try_spend() and not budget.try_spend()
+
+def test_shared_budget_stops_retries_across_calls():
+    budget = RetryBudget(ratio=0.0, min_retries=2)
+    first = RetryPolicy(max_attempts=5, base_delay=0, budget=budget)
+    second = RetryPolicy(max_attempts=5, base_delay=0, budget=budget)
+    func, calls = flaky(100)
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(first.call(func))
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(second.call(func))
+    # Two retries in all, then both policies give up after one attempt each
+    assert len(calls) == 4
+    assert first.retries + second.retries == 2
+    assert first.budget_exhausted + second.budget_exhausted == 2
@@ -0,0 +1,138 @@
+"""
+Tests for stream_map: ordering, bounds, errors and cancellation.
+"""
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+from exo.utils.async_utils import gather_with_concurrency, stream_map
+
+def collect(*args, **kwargs):
+    async def run():
+        # Guard: a regression here used to hang forever
+        return await asyncio.wait_for(_collect(*args, **kwargs), 5)
+
+    async def _collect(*args, **kwargs):
+        return [result async for result in stream_map(*args, **kwargs)]
+
+    return asyncio.run(run())
+
+async def jittered(n):
+    await asyncio.sleep((n % 3) * 0.002)
+    return n * n
+
+def test_ordered_results_follow_the_input():
+    assert collect(jittered, range(20), 4, ordered=True) == [n * n for n in range(20)]
+    assert sorted(collect(jittered, range(20), 4)) == [n * n for n in range(20)]
+
+def test_concurrency_and_buffer_bound_the_work_in_flight():
+    active, peak, read, consumed = [0], [0], [], [0]
+
+    def inputs():
+        for n in range(50):
+            read.append(n)
+            yield n
+
+    async def func(n):
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        await asyncio.sleep(0.001)
+        active[0] -= 1
+        return n
+
+    async def run():
+        async with aclosing(stream_map(func, inputs(), 3, buffer=5)) as results:
+            async for _ in results:
+                await asyncio.sleep(0.005)
+                # Inputs are read lazily: the buffer plus the result being handled
+                assert len(read) <= consumed[0] + 1 + 5
+                consumed[0] += 1
+
+    asyncio.run(run())
+    assert peak[0] == 3 and consumed[0] == 50
+
+def test_errors_raise_or_are_returned():
+    async def func(n):
+        if n == 3:
+            raise ValueError(n)
+        return n
+
+    with pytest.raises(ValueError):
+        collect(func, range(6), 2)
+    results = collect(func, range(6), 2, ordered=True, return_exceptions=True)
+    assert results[:3] == [0, 1, 2] and isinstance(results[3], ValueError)
+
+def test_cancelled_error_from_func_does_not_hang():
+    async def func(n):
+        if n % 2:
+            raise asyncio.CancelledError()
+        return n
+
+    results = collect(func, range(10), 2, ordered=True, return_exceptions=True)
+    assert results[::2] == [0, 2, 4, 6, 8]
+    assert all(isinstance(result, asyncio.CancelledError) for result in results[1::2])
+
+    async def run():
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(_consume(), 5)
+
+    async def _consume():
+        async for _ in stream_map(func, range(10), 2):
+            pass
+
+    asyncio.run(run())
+
+def test_cancelling_a_worker_stops_the_map():
+    started = []
+
+    async def func(n):
+        started.append(n)
+        await asyncio.sleep(0.01)
+        return n
+
+    async def run():
+        results = []
+        async for result in stream_map(func, range(1000), 2, return_exceptions=True):
+            results.append(result)
+            if len(results) == 3:
+                # Cancelled from outside, as asyncio.run does at shutdown
+                for task in asyncio.all_tasks():
+                    if "stream_map" in task.get_coro().__qualname__:
+                        task.cancel()
+        return results
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(asyncio.wait_for(run(), 5))
+    assert len(started) < 10
+
+def test_leaving_early_cancels_work_in_flight():
+    cancelled = []
+
+    async def func(n):
+        try:
+            await asyncio.sleep(0 if n == 0 else 10)
+        except asyncio.CancelledError:
+            cancelled.append(n)
+            raise
+        return n
+
+    async def run():
+        async with aclosing(stream_map(func, range(10), 3)) as results:
+            async for result in results:
+                return result
+
+    assert asyncio.run(asyncio.wait_for(run(), 5)) == 0
+    assert sorted(cancelled) == [1, 2, 3]
+
+def test_gather_with_concurrency_closes_unstarted_coroutines():
+    async def fail():
+        raise ValueError()
+
+    async def never():
+        await asyncio.sleep(10)
+
+    coroutines = [fail()] + [never() for _ in range(5)]
+    with pytest.raises(ValueError):
+        asyncio.run(gather_with_concurrency(1, *coroutines))
+    assert all(coroutine.cr_frame is None for coroutine in coroutines)